@@ -2,58 +2,90 @@ from fastapi import APIRouter, HTTPException
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime
-import psycopg2
-import mysql.connector
-import sqlite3
-import pandas as pd
-from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 
+from app.core.config import settings
 from app.models.knowledge import DatabaseConnection, MongoDBConnection, APIResponse, KnowledgeSource
 from app.services.document_service import document_service
+from app.services.platform.connection_manager import connection_manager, fingerprint
 from app.services.vector_service import vector_service
+from app.utils.sql_io import count_rows, fetch_preview, fetch_records, normalize_dialect
 
 router = APIRouter()
 
+
+def _target_key(connection: DatabaseConnection, dialect: str) -> str:
+    return fingerprint(
+        dialect,
+        host=connection.host,
+        port=connection.port,
+        database=connection.database,
+        user=connection.username,
+        password=connection.password,
+    )
+
+
+def _sql_dialect(connection: DatabaseConnection) -> str:
+    try:
+        return normalize_dialect(connection.database_type)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Unsupported database type")
+
+
+def _sql_connection(connection: DatabaseConnection, dialect: str):
+    """Pooled connection to the source database, returned to the pool on exit."""
+    return connection_manager.sql_connection(
+        dialect,
+        host=connection.host,
+        port=connection.port,
+        database=connection.database,
+        user=connection.username,
+        password=connection.password,
+    )
+
+
+def _list_tables(connection: DatabaseConnection, dialect: str) -> Dict[str, List[str]]:
+    with _sql_connection(connection, dialect) as conn:
+        cursor = conn.cursor()
+        try:
+            if dialect == "postgresql":
+                cursor.execute("""
+                    SELECT schemaname, tablename 
+                    FROM pg_tables 
+                    WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
+                    ORDER BY schemaname, tablename
+                """)
+            elif dialect == "mysql":
+                cursor.execute("SHOW TABLES")
+            else:
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            tables = cursor.fetchall()
+        finally:
+            cursor.close()
+
+    if dialect == "postgresql":
+        schemas: Dict[str, List[str]] = {}
+        for schema, table in tables:
+            schemas.setdefault(schema, []).append(table)
+        return schemas
+    return {"default": [table[0] for table in tables]}
+
 @router.post("/connect", response_model=APIResponse)
 async def connect_database(connection: DatabaseConnection):
     """Connect to a database and import data"""
     try:
-        # Test connection based on database type
-        if connection.database.lower() in ['postgresql', 'postgres']:
-            conn = psycopg2.connect(
-                host=connection.host,
-                port=connection.port,
-                database=connection.database,
-                user=connection.username,
-                password=connection.password
-            )
-        elif connection.database.lower() in ['mysql', 'mariadb']:
-            conn = mysql.connector.connect(
-                host=connection.host,
-                port=connection.port,
-                database=connection.database,
-                user=connection.username,
-                password=connection.password
-            )
-        elif connection.database.lower() == 'sqlite':
-            conn = sqlite3.connect(connection.database)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported database type")
+        dialect = _sql_dialect(connection)
         
         # Execute query
         query = connection.query or f"SELECT * FROM {connection.table_name}"
         
         try:
-            df = pd.read_sql_query(query, conn)
-            conn.close()
+            # Server-side cursor, fetched in batches: no DataFrame copy of the whole result.
+            with _sql_connection(connection, dialect) as conn:
+                _, data = fetch_records(conn, query, dialect, batch_size=settings.SQL_FETCH_BATCH_ROWS)
         except Exception as e:
-            conn.close()
             raise HTTPException(status_code=400, detail=f"Query execution failed: {str(e)}")
         
-        # Convert DataFrame to list of dictionaries
-        data = df.to_dict('records')
-        
         if not data:
             raise HTTPException(status_code=400, detail="No data found in the query")
         
@@ -106,39 +138,20 @@ async def connect_database(connection: DatabaseConnection):
 async def test_database_connection(connection: DatabaseConnection):
     """Test database connection without importing data"""
     try:
-        # Test connection based on database type
-        if connection.database.lower() in ['postgresql', 'postgres']:
-            conn = psycopg2.connect(
-                host=connection.host,
-                port=connection.port,
-                database=connection.database,
-                user=connection.username,
-                password=connection.password
-            )
-        elif connection.database.lower() in ['mysql', 'mariadb']:
-            conn = mysql.connector.connect(
-                host=connection.host,
-                port=connection.port,
-                database=connection.database,
-                user=connection.username,
-                password=connection.password
-            )
-        elif connection.database.lower() == 'sqlite':
-            conn = sqlite3.connect(connection.database)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported database type")
+        dialect = _sql_dialect(connection)
         
         # Test query
         query = connection.query or f"SELECT COUNT(*) FROM {connection.table_name}"
         
         try:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
+            with _sql_connection(connection, dialect) as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(query)
+                    result = cursor.fetchone()
+                finally:
+                    cursor.close()
         except Exception as e:
-            conn.close()
             raise HTTPException(status_code=400, detail=f"Query execution failed: {str(e)}")
         
         return APIResponse(
@@ -147,7 +160,7 @@ async def test_database_connection(connection: DatabaseConnection):
             data={
                 "connection_status": "success",
                 "row_count": result[0] if result else 0,
-                "database_type": connection.database,
+                "database_type": connection.database_type,
                 "table_name": connection.table_name
             }
         )
@@ -161,62 +174,18 @@ async def test_database_connection(connection: DatabaseConnection):
 async def get_database_schemas(connection: DatabaseConnection):
     """Get available schemas and tables from database"""
     try:
-        # Connect to database
-        if connection.database.lower() in ['postgresql', 'postgres']:
-            conn = psycopg2.connect(
-                host=connection.host,
-                port=connection.port,
-                database=connection.database,
-                user=connection.username,
-                password=connection.password
-            )
-        elif connection.database.lower() in ['mysql', 'mariadb']:
-            conn = mysql.connector.connect(
-                host=connection.host,
-                port=connection.port,
-                database=connection.database,
-                user=connection.username,
-                password=connection.password
-            )
-        elif connection.database.lower() == 'sqlite':
-            conn = sqlite3.connect(connection.database)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported database type")
-        
-        # Get schemas and tables
-        cursor = conn.cursor()
+        dialect = _sql_dialect(connection)
         
-        if connection.database.lower() in ['postgresql', 'postgres']:
-            cursor.execute("""
-                SELECT schemaname, tablename 
-                FROM pg_tables 
-                WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
-                ORDER BY schemaname, tablename
-            """)
-        elif connection.database.lower() in ['mysql', 'mariadb']:
-            cursor.execute("SHOW TABLES")
-        elif connection.database.lower() == 'sqlite':
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        
-        tables = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        
-        # Format results
-        if connection.database.lower() in ['postgresql', 'postgres']:
-            schemas = {}
-            for schema, table in tables:
-                if schema not in schemas:
-                    schemas[schema] = []
-                schemas[schema].append(table)
-        else:
-            schemas = {"default": [table[0] for table in tables]}
+        # Table listings are cached briefly per target so schema browsing does not re-query
+        schemas = connection_manager.cached_metadata(
+            _target_key(connection, dialect), "schemas", lambda: _list_tables(connection, dialect)
+        )
         
         return APIResponse(
             success=True,
             message="Database schemas retrieved successfully",
             data={
-                "database_type": connection.database,
+                "database_type": connection.database_type,
                 "schemas": schemas,
                 "total_tables": sum(len(tables) for tables in schemas.values())
             }
@@ -230,48 +199,29 @@ async def get_database_schemas(connection: DatabaseConnection):
 @router.get("/preview", response_model=APIResponse)
 async def preview_database_data(
     connection: DatabaseConnection,
-    limit: int = 10
+    limit: int = 10,
+    include_count: bool = False
 ):
-    """Preview data from a database table"""
+    """Preview data from a database table; ``total_rows`` is only counted when ``include_count`` is set"""
     try:
-        # Connect to database
-        if connection.database.lower() in ['postgresql', 'postgres']:
-            conn = psycopg2.connect(
-                host=connection.host,
-                port=connection.port,
-                database=connection.database,
-                user=connection.username,
-                password=connection.password
-            )
-        elif connection.database.lower() in ['mysql', 'mariadb']:
-            conn = mysql.connector.connect(
-                host=connection.host,
-                port=connection.port,
-                database=connection.database,
-                user=connection.username,
-                password=connection.password
-            )
-        elif connection.database.lower() == 'sqlite':
-            conn = sqlite3.connect(connection.database)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported database type")
+        dialect = _sql_dialect(connection)
         
-        # Execute preview query
-        query = connection.query or f"SELECT * FROM {connection.table_name} LIMIT {limit}"
+        # Execute preview query with the limit pushed down to the database
+        query = connection.query or f"SELECT * FROM {connection.table_name}"
         
         try:
-            df = pd.read_sql_query(query, conn)
-            conn.close()
+            with _sql_connection(connection, dialect) as conn:
+                columns, rows = fetch_preview(conn, query, dialect, limit)
+                total_rows = count_rows(conn, query, dialect) if include_count else None
         except Exception as e:
-            conn.close()
             raise HTTPException(status_code=400, detail=f"Query execution failed: {str(e)}")
         
         # Convert to preview format
         preview_data = {
-            "columns": df.columns.tolist(),
-            "data": df.head(limit).to_dict('records'),
-            "total_rows": len(df),
-            "preview_rows": min(limit, len(df))
+            "columns": columns,
+            "data": rows,
+            "total_rows": total_rows,
+            "preview_rows": len(rows)
         }
         
         return APIResponse(
@@ -320,24 +270,21 @@ async def sync_database_changes(
 async def connect_mongodb(connection: MongoDBConnection):
     """Connect to MongoDB Atlas and import data"""
     try:
-        # Test MongoDB connection
-        client = MongoClient(connection.connection_string, serverSelectionTimeoutMS=5000)
-        
-        # Test the connection
-        client.admin.command('ping')
+        # Shared, pooled client per connection string (pinged when created or stale)
+        with connection_manager.mongo_client(connection.connection_string) as client:
         
-        # Get database and collection
-        db = client[connection.database_name]
-        collection = db[connection.collection_name]
+            # Get database and collection
+            db = client[connection.database_name]
+            collection = db[connection.collection_name]
         
-        # Execute query
-        query = connection.query or {}
-        projection = connection.projection
-        limit = connection.limit or 1000
+            # Execute query
+            query = connection.query or {}
+            projection = connection.projection
+            limit = connection.limit or 1000
         
-        # Get data from MongoDB
-        cursor = collection.find(query, projection).limit(limit)
-        data = list(cursor)
+            # Get data from MongoDB
+            cursor = collection.find(query, projection).limit(limit)
+            data = list(cursor)
         
         if not data:
             raise HTTPException(status_code=400, detail="No data found in the collection")
@@ -377,8 +324,6 @@ async def connect_mongodb(connection: MongoDBConnection):
             status="active"
         )
         
-        # Close MongoDB connection
-        client.close()
         
         return APIResponse(
             success=True,
@@ -408,21 +353,16 @@ async def connect_mongodb(connection: MongoDBConnection):
 async def test_mongodb_connection(connection: MongoDBConnection):
     """Test MongoDB Atlas connection without importing data"""
     try:
-        # Test MongoDB connection
-        client = MongoClient(connection.connection_string, serverSelectionTimeoutMS=5000)
-        
-        # Test the connection
-        client.admin.command('ping')
+        # Shared, pooled client per connection string (pinged when created or stale)
+        with connection_manager.mongo_client(connection.connection_string) as client:
         
-        # Get database and collection
-        db = client[connection.database_name]
-        collection = db[connection.collection_name]
+            # Get database and collection
+            db = client[connection.database_name]
+            collection = db[connection.collection_name]
         
-        # Count documents
-        document_count = collection.count_documents(connection.query or {})
+            # Count documents
+            document_count = collection.count_documents(connection.query or {})
         
-        # Close connection
-        client.close()
         
         return APIResponse(
             success=True,
@@ -446,30 +386,26 @@ async def test_mongodb_connection(connection: MongoDBConnection):
 async def get_mongodb_collections(connection: MongoDBConnection):
     """Get available collections from MongoDB database"""
     try:
-        # Connect to MongoDB
-        client = MongoClient(connection.connection_string, serverSelectionTimeoutMS=5000)
-        
-        # Test the connection
-        client.admin.command('ping')
-        
-        # Get database
-        db = client[connection.database_name]
-        
-        # Get collections
-        collections = db.list_collection_names()
-        
-        # Get collection info
-        collection_info = []
-        for collection_name in collections:
-            collection = db[collection_name]
-            count = collection.count_documents({})
-            collection_info.append({
-                "name": collection_name,
-                "document_count": count
-            })
+        # Shared, pooled client per connection string (pinged when created or stale)
+        with connection_manager.mongo_client(connection.connection_string) as client:
+        
+            # Get database
+            db = client[connection.database_name]
+        
+            # Get collection info (cached briefly: counting every collection is expensive)
+            def list_collections() -> List[Dict[str, Any]]:
+                return [
+                    {"name": name, "document_count": db[name].count_documents({})}
+                    for name in db.list_collection_names()
+                ]
+
+            collection_info = connection_manager.cached_metadata(
+                fingerprint("mongodb", connection_string=connection.connection_string),
+                f"collections:{connection.database_name}",
+                list_collections,
+            )
+        collections = [info["name"] for info in collection_info]
         
-        # Close connection
-        client.close()
         
         return APIResponse(
             success=True,
@@ -495,35 +431,30 @@ async def preview_mongodb_data(
 ):
     """Preview data from a MongoDB collection"""
     try:
-        # Connect to MongoDB
-        client = MongoClient(connection.connection_string, serverSelectionTimeoutMS=5000)
-        
-        # Test the connection
-        client.admin.command('ping')
-        
-        # Get database and collection
-        db = client[connection.database_name]
-        collection = db[connection.collection_name]
-        
-        # Execute preview query
-        query = connection.query or {}
-        projection = connection.projection
-        
-        # Get sample documents
-        cursor = collection.find(query, projection).limit(limit)
-        documents = list(cursor)
-        
-        # Convert to preview format
-        preview_data = {
-            "sample_documents": documents,
-            "total_documents": collection.count_documents(query),
-            "preview_count": len(documents),
-            "collection_name": connection.collection_name,
-            "database_name": connection.database_name
-        }
+        # Shared, pooled client per connection string (pinged when created or stale)
+        with connection_manager.mongo_client(connection.connection_string) as client:
+        
+            # Get database and collection
+            db = client[connection.database_name]
+            collection = db[connection.collection_name]
+        
+            # Execute preview query
+            query = connection.query or {}
+            projection = connection.projection
+        
+            # Get sample documents
+            cursor = collection.find(query, projection).limit(limit)
+            documents = list(cursor)
+        
+            # Convert to preview format
+            preview_data = {
+                "sample_documents": documents,
+                "total_documents": collection.count_documents(query),
+                "preview_count": len(documents),
+                "collection_name": connection.collection_name,
+                "database_name": connection.database_name
+            }
         
-        # Close connection
-        client.close()
         
         return APIResponse(
             success=True,
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
@@ -12,6 +12,14 @@ from app.services.graph.adapters.neo4j_adapter import neo4j_adapter
 from app.services.graph.adapters.rdf_adapter import rdf_adapter
 from app.services.graph.graph_materialization_service import graph_materialization_service
 from app.services.graph.graph_store import graph_store
+from app.services.graph.graph_window import (
+    check_window_params,
+    decode_cursor,
+    encode_cursor,
+    make_etag,
+    not_modified,
+    window_graph,
+)
 from app.services.ontology.ontology_db_repository import ontology_db_repository
 from app.services.platform.fabric_store import fabric_store
 from app.services.platform.job_service import job_service
@@ -96,19 +104,71 @@ async def build_graph(fabric_id: str, body: GraphBuildRequest):
 
 
 @router.get("/fabrics/{fabric_id}/graph", response_model=APIResponse)
-async def get_canonical_graph(fabric_id: str, ontology_version_id: Optional[str] = None):
+async def get_canonical_graph(
+    fabric_id: str,
+    request: Request,
+    response: Response,
+    ontology_version_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: str = "full",
+    top_n: Optional[int] = None,
+):
+    """Canonical graph; ``limit``/``cursor`` page it, ``top_n`` returns a degree-ranked overview."""
     fabric = fabric_store.get(fabric_id)
     if not fabric:
         raise HTTPException(status_code=404, detail="Fabric not found")
-    version_id = ontology_version_id or fabric.get("approved_ontology_version_id")
-    payload = graph_store.get_graph_payload(fabric_id, version_id)
-    if payload.get("node_count", 0) == 0:
+    check_window_params(limit, fields, top_n)
+    version_id = graph_store.resolve_version_id(
+        fabric_id, ontology_version_id or fabric.get("approved_ontology_version_id")
+    )
+    revision = graph_store.graph_revision(fabric_id, version_id) if version_id else {"node_count": 0}
+    etag = make_etag("canonical", fabric_id, version_id, revision, limit, cursor, fields, top_n)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+
+    if revision.get("node_count", 0) == 0:
         return APIResponse(
             success=True,
             message="No canonical graph yet — approve ontology and run graph build",
-            data={**payload, "graph_type": "canonical"},
+            data={"nodes": [], "edges": [], "node_count": 0, "edge_count": 0, "graph_type": "canonical"},
         )
-    return APIResponse(success=True, message="Canonical graph", data={**payload, "graph_type": "canonical"})
+
+    base = {
+        "fabric_id": fabric_id,
+        "ontology_version_id": version_id,
+        "node_count": revision["node_count"],
+        "edge_count": revision["edge_count"],
+        "graph_type": "canonical",
+    }
+    if top_n:
+        top = graph_store.top_nodes_by_degree(fabric_id, version_id, top_n, fields=fields)
+        data = {**base, **top, "window": {"mode": "top_n", "top_n": top_n, "next_cursor": None}}
+        return APIResponse(success=True, message="Canonical graph overview", data=data)
+    if limit:
+        state = decode_cursor(cursor)
+        if any(not isinstance(state.get(key), (str, type(None))) for key in ("n", "e")):
+            raise HTTPException(status_code=400, detail="Invalid graph cursor")
+        page = graph_store.get_graph_page(
+            fabric_id, version_id, limit,
+            node_after=state.get("n"), edge_after=state.get("e"), fields=fields,
+        )
+        next_cursor = (
+            encode_cursor({"n": page["node_after"], "e": page["edge_after"]}) if page["has_more"] else None
+        )
+        data = {
+            **base,
+            "nodes": page["nodes"],
+            "edges": page["edges"],
+            "window": {"mode": "page", "limit": limit, "next_cursor": next_cursor},
+        }
+        return APIResponse(success=True, message="Canonical graph page", data=data)
+
+    payload = graph_store.get_graph_payload(fabric_id, version_id)
+    data = window_graph({**payload, "graph_type": "canonical"}, fields=fields)
+    return APIResponse(success=True, message="Canonical graph", data=data)
 
 
 @router.get("/fabrics/{fabric_id}/graph/neighbors/{node_id}", response_model=APIResponse)
@@ -117,8 +177,16 @@ async def get_graph_neighbors(
     node_id: str,
     hops: int = 1,
     ontology_version_id: Optional[str] = None,
+    direction: str = "out",
+    limit: Optional[int] = None,
 ):
-    data = graph_store.get_neighbors(fabric_id, node_id, hops=hops, ontology_version_id=ontology_version_id)
+    if direction not in ("out", "in", "both"):
+        raise HTTPException(status_code=400, detail="direction must be one of out, in, both")
+    check_window_params(limit, "ids", None)
+    data = graph_store.get_neighbors(
+        fabric_id, node_id, hops=hops, ontology_version_id=ontology_version_id,
+        direction=direction, limit=limit,
+    )
     return APIResponse(success=True, message="Graph neighbors", data=data)
 
 
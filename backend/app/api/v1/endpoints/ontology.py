@@ -3,7 +3,6 @@ import os
 import threading
 import uuid
 import json
-import html
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
@@ -17,7 +16,6 @@ from app.models.ontology import (
     OntologyRelationship,
     OntologyAttribute,
     OntologyElementStatus,
-    SourceArtifact,
     GovernanceMode,
     ChangeStatus,
 )
@@ -50,7 +48,10 @@ from app.services.ontology import (
     OntologyEnrichmentService,
 )
 from app.services.ontology.llm_ontology_service import LLMOntologyService
-from app.services.vector_service import vector_service
+from app.services.ontology.fabric_artifact_bridge import (
+    refresh_fabric_chunk_artifacts,
+    resolve_artifacts_for_fabric,
+)
 from app.core.config import settings
 from app.services.platform.fabric_store import fabric_store
 from app.services.ontology.ontology_access import (
@@ -69,19 +70,6 @@ FABRICS_STORAGE_FILE = os.path.join(settings.DATA_DIR, "fabrics.json")
 AGENT_UTILS_STATE_FILE = os.path.join(settings.DATA_DIR, "agent_utilities_state.json")
 
 
-def _source_type_from_name(file_name: str, fallback: str = "xml") -> str:
-    ext = os.path.splitext(file_name.lower())[1]
-    if ext == ".pdf":
-        return "pdf"
-    if ext == ".docx":
-        return "docx"
-    if ext in {".png", ".jpg", ".jpeg", ".gif", ".webp"}:
-        return "image"
-    if ext == ".xml":
-        return "xml"
-    return fallback
-
-
 def _extract_fabric_reference_from_project(project: Any) -> Dict[str, Optional[str]]:
     description = getattr(project, "description", None) or ""
     if not isinstance(description, str):
@@ -137,35 +125,12 @@ def _load_fabric_by_name(fabric_name: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def _materialize_fabric_documents_to_xml(fabric_id: str) -> Optional[str]:
-    docs_payload = vector_service.get_source_documents(fabric_id)
-    documents = docs_payload.get("documents") if isinstance(docs_payload, dict) else []
-    if not isinstance(documents, list) or not documents:
-        return None
-
-    upload_dir = getattr(settings, "ONTOLOGY_UPLOAD_DIR", None) or os.path.join(settings.ONTOLOGY_DATA_DIR, "uploads")
-    os.makedirs(upload_dir, exist_ok=True)
-    file_name = f"{fabric_id}_fabric_source.xml"
-    file_path = os.path.join(upload_dir, file_name)
-
-    # Keep generated source bounded for fast discovery runs.
-    selected_docs = [str(doc) for doc in documents[:300] if isinstance(doc, str) and doc.strip()]
-    if not selected_docs:
-        return None
-
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write("<fabricSource>\n")
-        for idx, chunk in enumerate(selected_docs, start=1):
-            f.write(f'  <chunk id="{idx}">{html.escape(chunk)}</chunk>\n')
-        f.write("</fabricSource>\n")
-    return file_path
-
-
 def _ensure_fabric_artifacts_for_project(project: Any) -> List[str]:
     project_id = getattr(project, "id", "")
     existing = getattr(project, "source_artifacts", None) or []
     existing_paths = [a.file_name for a in existing if getattr(a, "file_name", None)]
     if existing_paths:
+        refresh_fabric_chunk_artifacts(existing)
         return existing_paths
 
     ref = _extract_fabric_reference_from_project(project)
@@ -179,52 +144,7 @@ def _ensure_fabric_artifacts_for_project(project: Any) -> List[str]:
     if not fabric_id:
         return []
 
-    linked_artifacts: List[SourceArtifact] = []
-    processed_files = fabric.get("processed_files") if isinstance(fabric, dict) and isinstance(fabric.get("processed_files"), list) else []
-    candidate_roots = [
-        getattr(settings, "ONTOLOGY_UPLOAD_DIR", None) or os.path.join(settings.ONTOLOGY_DATA_DIR, "uploads"),
-        settings.UPLOAD_DIR,
-    ]
-    for item in processed_files:
-        if not isinstance(item, dict):
-            continue
-        file_name = str(item.get("filename") or "").strip()
-        if not file_name:
-            continue
-        for root in candidate_roots:
-            if not root:
-                continue
-            file_path = os.path.join(root, file_name)
-            if not os.path.isfile(file_path):
-                continue
-            linked_artifacts.append(
-                SourceArtifact(
-                    id=f"art_{uuid.uuid4().hex[:12]}",
-                    file_name=file_name,
-                    file_path=os.path.abspath(file_path),
-                    source_type=_source_type_from_name(file_name, fallback="xml"),
-                    project_id=project_id,
-                    ingestion_time=datetime.utcnow(),
-                    metadata={"fabric_id": fabric_id, "linked_from": "processed_files"},
-                )
-            )
-            break
-
-    if not linked_artifacts:
-        materialized_path = _materialize_fabric_documents_to_xml(fabric_id)
-        if materialized_path and os.path.isfile(materialized_path):
-            file_name = os.path.basename(materialized_path)
-            linked_artifacts.append(
-                SourceArtifact(
-                    id=f"art_{uuid.uuid4().hex[:12]}",
-                    file_name=file_name,
-                    file_path=os.path.abspath(materialized_path),
-                    source_type="xml",
-                    project_id=project_id,
-                    ingestion_time=datetime.utcnow(),
-                    metadata={"fabric_id": fabric_id, "linked_from": "vector_documents"},
-                )
-            )
+    linked_artifacts = resolve_artifacts_for_fabric(fabric_id, project_id, fabric=fabric)
 
     if linked_artifacts:
         persistence.add_artifacts_to_project(project_id, linked_artifacts)
@@ -382,52 +302,7 @@ async def create_project_from_fabric(request: CreateProjectFromFabricRequest):
             domain=request.domain,
         )
         register_project_owner(proj.id, proj.name)
-        linked_artifacts: List[SourceArtifact] = []
-        processed_files = fabric.get("processed_files") if isinstance(fabric.get("processed_files"), list) else []
-        candidate_roots = [
-            getattr(settings, "ONTOLOGY_UPLOAD_DIR", None) or os.path.join(settings.ONTOLOGY_DATA_DIR, "uploads"),
-            settings.UPLOAD_DIR,
-        ]
-        for item in processed_files:
-            if not isinstance(item, dict):
-                continue
-            file_name = str(item.get("filename") or "").strip()
-            if not file_name:
-                continue
-            for root in candidate_roots:
-                if not root:
-                    continue
-                file_path = os.path.join(root, file_name)
-                if not os.path.isfile(file_path):
-                    continue
-                linked_artifacts.append(
-                    SourceArtifact(
-                        id=f"art_{uuid.uuid4().hex[:12]}",
-                        file_name=file_name,
-                        file_path=os.path.abspath(file_path),
-                        source_type=_source_type_from_name(file_name, fallback="xml"),
-                        project_id=proj.id,
-                        ingestion_time=datetime.utcnow(),
-                        metadata={"fabric_id": request.fabric_id, "linked_from": "processed_files"},
-                    )
-                )
-                break
-
-        if not linked_artifacts:
-            materialized_path = _materialize_fabric_documents_to_xml(request.fabric_id)
-            if materialized_path and os.path.isfile(materialized_path):
-                file_name = os.path.basename(materialized_path)
-                linked_artifacts.append(
-                    SourceArtifact(
-                        id=f"art_{uuid.uuid4().hex[:12]}",
-                        file_name=file_name,
-                        file_path=os.path.abspath(materialized_path),
-                        source_type="xml",
-                        project_id=proj.id,
-                        ingestion_time=datetime.utcnow(),
-                        metadata={"fabric_id": request.fabric_id, "linked_from": "vector_documents"},
-                    )
-                )
+        linked_artifacts = resolve_artifacts_for_fabric(request.fabric_id, proj.id, fabric=fabric)
 
         if linked_artifacts:
             persistence.add_artifacts_to_project(proj.id, linked_artifacts)
@@ -920,6 +795,34 @@ async def get_enrichment_candidate(candidate_id: str):
     return APIResponse(success=True, message="OK", data={"candidate": candidate.model_dump(), "policy_logs": policy_logs})
 
 
+@router.get("/enrichment/policy-logs", response_model=APIResponse)
+async def list_enrichment_policy_logs(
+    candidate_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    rows = persistence.list_policy_decisions(candidate_id, limit=limit + 1, offset=offset)
+    return APIResponse(
+        success=True,
+        message="OK",
+        data={"items": [p.model_dump() for p in rows[:limit]], "limit": limit, "offset": offset, "has_more": len(rows) > limit},
+    )
+
+
+@router.get("/enrichment/audit-logs", response_model=APIResponse)
+async def list_enrichment_audit_logs(
+    candidate_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    rows = persistence.list_audit_logs(candidate_id, limit=limit + 1, offset=offset)
+    return APIResponse(
+        success=True,
+        message="OK",
+        data={"items": [a.model_dump() for a in rows[:limit]], "limit": limit, "offset": offset, "has_more": len(rows) > limit},
+    )
+
+
 @router.post("/enrichment/candidates/{candidate_id}/approve", response_model=APIResponse)
 async def approve_candidate(candidate_id: str, body: CandidateReviewRequest):
     updated = persistence.update_candidate_status(candidate_id, ChangeStatus.APPROVED.value, body.reviewer, body.notes)
@@ -14,7 +14,7 @@ router = APIRouter()
 
 
 class EnqueueJobRequest(BaseModel):
-    job_type: str = Field(..., description="fabric_ingest | ontology_discovery | graph_build | graph_export")
+    job_type: str = Field(..., description="fabric_ingest | ontology_discovery | graph_build | graph_export | model_training | fabric_gc")
     fabric_id: Optional[str] = None
     config: Dict[str, Any] = Field(default_factory=dict)
 
@@ -40,7 +40,7 @@ async def list_fabric_jobs(fabric_id: str):
 
 @router.post("/jobs", response_model=APIResponse)
 async def enqueue_job(body: EnqueueJobRequest):
-    if body.job_type not in ("fabric_ingest", "ontology_discovery", "graph_build", "graph_export"):
+    if body.job_type not in ("fabric_ingest", "ontology_discovery", "graph_build", "graph_export", "model_training", "fabric_gc"):
         raise HTTPException(status_code=400, detail="Invalid job_type")
     job_id = job_service.enqueue(body.job_type, body.fabric_id, body.config)
     return APIResponse(success=True, message="Job enqueued", data={"job_id": job_id})
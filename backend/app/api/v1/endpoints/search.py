@@ -53,71 +53,44 @@ async def semantic_search(
     threshold: float = 0.7,
     context_window: int = 3
 ):
-    """Perform semantic search with context window"""
+    """Perform semantic search with context window.
+
+    Each hit's ``context_window`` preceding and following chunks of the same
+    document are read by id from its adjacency metadata in one batched lookup.
+    """
     try:
         start_time = time.time()
         
-        # Perform initial search
-        initial_results = vector_service.search_documents(
+        results = vector_service.search_documents(
             query=query,
-            limit=limit * 2,  # Get more results for context
+            limit=limit,
             threshold=threshold
         )
+        windows = vector_service.expand_context(results, max(0, context_window))
         
-        # Group results by source and add context
-        grouped_results = {}
-        for result in initial_results:
-            source = result["source"]
-            if source not in grouped_results:
-                grouped_results[source] = []
-            grouped_results[source].append(result)
-        
-        # Create contextual results
-        contextual_results = []
-        for source, results in grouped_results.items():
-            # Sort by page number if available
-            sorted_results = sorted(results, key=lambda x: x.get("page_number", 0))
-            
-            # Create context windows
-            for i, result in enumerate(sorted_results):
-                context_start = max(0, i - context_window)
-                context_end = min(len(sorted_results), i + context_window + 1)
-                
-                # Build contextual content
-                context_parts = []
-                for j in range(context_start, context_end):
-                    if j != i:  # Don't include the main result twice
-                        context_parts.append(sorted_results[j]["content"][:200] + "...")
-                
-                contextual_content = result["content"]
-                if context_parts:
-                    contextual_content = f"Context: {' '.join(context_parts)}\n\nMain Content: {result['content']}"
-                
-                contextual_results.append({
-                    "id": result["id"],
-                    "content": contextual_content,
-                    "source": result["source"],
-                    "similarity_score": result["similarity_score"],
-                    "metadata": result["metadata"],
-                    "page_number": result.get("page_number")
-                })
-        
-        # Sort by similarity and take top results
-        contextual_results.sort(key=lambda x: x["similarity_score"], reverse=True)
-        final_results = contextual_results[:limit]
-        
-        # Convert to SearchResult objects
         search_results = []
-        for result in final_results:
-            search_result = SearchResult(
+        for result in results:
+            window = windows.get(result["id"]) or {}
+            before, after = window.get("before") or [], window.get("after") or []
+            content = result["content"]
+            metadata = result["metadata"]
+            if before or after:
+                parts = []
+                if before:
+                    parts.append("Preceding Context: " + "\n".join(chunk["content"] for chunk in before))
+                parts.append(f"Main Content: {content}")
+                if after:
+                    parts.append("Following Context: " + "\n".join(chunk["content"] for chunk in after))
+                content = "\n\n".join(parts)
+                metadata = {**metadata, "context_chunk_ids": [chunk["id"] for chunk in before + after]}
+            search_results.append(SearchResult(
                 id=result["id"],
-                content=result["content"],
+                content=content,
                 source=result["source"],
                 similarity_score=result["similarity_score"],
-                metadata=result["metadata"],
+                metadata=metadata,
                 page_number=result.get("page_number")
-            )
-            search_results.append(search_result)
+            ))
         
         processing_time = time.time() - start_time
         
@@ -52,12 +52,38 @@ class Settings(BaseSettings):
     STARDOG_DATABASE: Optional[str] = os.environ.get("STARDOG_DATABASE")
     STARDOG_USERNAME: Optional[str] = os.environ.get("STARDOG_USERNAME")
     STARDOG_PASSWORD: Optional[str] = os.environ.get("STARDOG_PASSWORD")
+    # Streaming graph exports (graph_export jobs): rows per UNWIND / N-Triples chunk
+    GRAPH_EXPORT_BATCH_SIZE: int = int(os.environ.get("GRAPH_EXPORT_BATCH_SIZE", "1000"))
+    GRAPH_EXPORT_DIR: str = os.path.join(_resolve_dir("KF_DATA_DIR", "data"), "graph_exports")
+    # Bulky fabric sub-documents (code graph, inventory, blueprint, ...) larger than this
+    # are kept out of the fabric record in a content-addressed artifact directory
+    FABRIC_ARTIFACT_DIR: str = os.path.join(_resolve_dir("KF_DATA_DIR", "data"), "fabric_artifacts")
+    FABRIC_ARTIFACT_INLINE_MAX_BYTES: int = int(os.environ.get("FABRIC_ARTIFACT_INLINE_MAX_BYTES", "16384"))
+    # Codebase migration packages (v2) are cut into NDJSON parts of about PART_BYTES;
+    # export and import each hold one part in memory, import indexes chunks IMPORT_BATCH at a time
+    MIGRATION_PACKAGE_PART_BYTES: int = int(os.environ.get("MIGRATION_PACKAGE_PART_BYTES", str(4 * 1024 * 1024)))
+    MIGRATION_IMPORT_BATCH_SIZE: int = int(os.environ.get("MIGRATION_IMPORT_BATCH_SIZE", "500"))
 
     # Job worker
     ENABLE_JOB_WORKER: bool = os.environ.get("ENABLE_JOB_WORKER", "true").lower() in (
         "1", "true", "yes",
     )
     JOB_POLL_INTERVAL_SECONDS: float = float(os.environ.get("JOB_POLL_INTERVAL_SECONDS", "2"))
+    # Fabric garbage collection: the worker enqueues a fabric_gc job every INTERVAL seconds
+    # (0 = on demand only); orphans are purged once orphaned for GRACE seconds, BATCH_SIZE
+    # vector chunks per delete; a sweep without a heartbeat for STALE seconds is re-queued
+    FABRIC_GC_INTERVAL_SECONDS: float = float(os.environ.get("FABRIC_GC_INTERVAL_SECONDS", "86400"))
+    FABRIC_GC_GRACE_SECONDS: float = float(os.environ.get("FABRIC_GC_GRACE_SECONDS", "3600"))
+    FABRIC_GC_BATCH_SIZE: int = int(os.environ.get("FABRIC_GC_BATCH_SIZE", "1000"))
+    FABRIC_GC_STALE_SECONDS: float = float(os.environ.get("FABRIC_GC_STALE_SECONDS", "600"))
+    # Database fabric builds (database_fabric jobs) fetch, embed and checkpoint BATCH_ROWS rows at a
+    # time, spooling rows under SPOOL_DIR; a running build without a checkpoint for STALE seconds
+    # (crashed or restarted worker) is re-queued and resumes from its last checkpoint
+    DATABASE_FABRIC_BATCH_ROWS: int = int(os.environ.get("DATABASE_FABRIC_BATCH_ROWS", "2000"))
+    DATABASE_FABRIC_STALE_SECONDS: float = float(os.environ.get("DATABASE_FABRIC_STALE_SECONDS", "300"))
+    DATABASE_FABRIC_SPOOL_DIR: str = os.path.join(_resolve_dir("KF_DATA_DIR", "data"), "database_builds")
+    # Key that seals connection credentials inside queued job configs (defaults to SECRET_KEY)
+    JOB_SECRETS_KEY: str = os.environ.get("JOB_SECRETS_KEY", "")
 
     # Vector Database Configuration
     CHROMA_PERSIST_DIRECTORY: str = _resolve_dir("KF_CHROMA_DIR", "chroma_db")
@@ -75,6 +101,20 @@ class Settings(BaseSettings):
     # File Upload Configuration
     UPLOAD_DIR: str = _resolve_dir("KF_UPLOAD_DIR", "uploads")
     MAX_FILE_SIZE: int = 100 * 1024 * 1024  # 100MB
+    # Progress bus: snapshot interval to UPLOAD_DIR/progress (0 = memory only) and SSE keep-alive;
+    # memory-only stores keep the newest MEMORY_TERMINAL_ENTRIES finished entries
+    PROGRESS_SNAPSHOT_SECONDS: float = float(os.environ.get("PROGRESS_SNAPSHOT_SECONDS", "5"))
+    PROGRESS_HEARTBEAT_SECONDS: float = float(os.environ.get("PROGRESS_HEARTBEAT_SECONDS", "15"))
+    PROGRESS_MEMORY_TERMINAL_ENTRIES: int = int(os.environ.get("PROGRESS_MEMORY_TERMINAL_ENTRIES", "1000"))
+    # Source-database imports fetch rows through server-side cursors this many at a time.
+    SQL_FETCH_BATCH_ROWS: int = int(os.environ.get("SQL_FETCH_BATCH_ROWS", "5000"))
+    # Connector endpoints reuse source connections: at most N per target, idle ones are
+    # pinged after HEALTHCHECK seconds and closed after IDLE seconds; schema listings are cached
+    CONNECTOR_POOL_MAX_PER_TARGET: int = int(os.environ.get("CONNECTOR_POOL_MAX_PER_TARGET", "4"))
+    CONNECTOR_POOL_IDLE_SECONDS: float = float(os.environ.get("CONNECTOR_POOL_IDLE_SECONDS", "300"))
+    CONNECTOR_POOL_HEALTHCHECK_SECONDS: float = float(os.environ.get("CONNECTOR_POOL_HEALTHCHECK_SECONDS", "30"))
+    CONNECTOR_POOL_ACQUIRE_TIMEOUT_SECONDS: float = float(os.environ.get("CONNECTOR_POOL_ACQUIRE_TIMEOUT_SECONDS", "30"))
+    CONNECTOR_SCHEMA_CACHE_SECONDS: float = float(os.environ.get("CONNECTOR_SCHEMA_CACHE_SECONDS", "60"))
     # Comma-separated in .env (e.g. .pdf,.txt,.docx) — not a JSON list field.
     ALLOWED_EXTENSIONS_RAW: str = Field(
         default=".pdf,.txt,.docx,.xml",
@@ -85,6 +125,11 @@ class Settings(BaseSettings):
     def ALLOWED_EXTENSIONS(self) -> list[str]:
         return [part.strip() for part in self.ALLOWED_EXTENSIONS_RAW.split(",") if part.strip()]
 
+    # PDF text extraction (shared by fabrics, /query fallback and ontology discovery)
+    PDF_TEXT_CACHE_DIR: str = os.path.join(_resolve_dir("KF_DATA_DIR", "data"), "pdf_text_cache")
+    PDF_EXTRACT_WORKERS: int = int(os.environ.get("PDF_EXTRACT_WORKERS", "0"))  # 0 = min(cpu_count, 8)
+    PDF_PARALLEL_MIN_PAGES: int = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "32"))
+
     # Ontology Discovery Configuration (own uploads, not shared with Knowledge Fabric)
     ONTOLOGY_DATA_DIR: str = _resolve_dir("KF_ONTOLOGY_DATA_DIR", "ontology_data")
     ONTOLOGY_UPLOAD_DIR: str = _resolve_dir(
@@ -97,12 +142,53 @@ class Settings(BaseSettings):
     ONTOLOGY_MAX_ARTIFACTS_PER_RUN: int = 0  # 0 = no limit; set e.g. 100–500 for large catalogs
     ONTOLOGY_MAX_CHUNKS_TOTAL: int = 0  # 0 = no limit; cap total text chunks used in classification/relations
     ONTOLOGY_MAX_CHUNKS_FOR_LLM: int = 10  # max chunks sent to LLM per run (cost/latency)
+    # Fabric chunks sampled (stratified by chunk group) into the artifact a fabric-linked discovery reads
+    ONTOLOGY_FABRIC_SAMPLE_CHUNKS: int = int(os.environ.get("ONTOLOGY_FABRIC_SAMPLE_CHUNKS", "300"))
+    # Column profiling of tabular fabrics: 0 = stream every row; else a stratified sample of ~N rows
+    ONTOLOGY_PROFILE_MAX_ROWS: int = int(os.environ.get("ONTOLOGY_PROFILE_MAX_ROWS", "0"))
+    ONTOLOGY_PROFILE_BATCH_SIZE: int = int(os.environ.get("ONTOLOGY_PROFILE_BATCH_SIZE", "2000"))
+    # Enrichment discovery: fields per LLM prompt, concurrent prompts, and the fallback
+    # confidence at which a field skips the LLM entirely
+    ONTOLOGY_ENRICHMENT_LLM_BATCH_SIZE: int = int(os.environ.get("ONTOLOGY_ENRICHMENT_LLM_BATCH_SIZE", "20"))
+    ONTOLOGY_ENRICHMENT_LLM_CONCURRENCY: int = int(os.environ.get("ONTOLOGY_ENRICHMENT_LLM_CONCURRENCY", "4"))
+    ONTOLOGY_ENRICHMENT_LLM_SKIP_CONFIDENCE: float = float(
+        os.environ.get("ONTOLOGY_ENRICHMENT_LLM_SKIP_CONFIDENCE", "0.9")
+    )
+    # Reply budget: tokens reserved per field and the cap per prompt (batches shrink to fit the cap)
+    ONTOLOGY_ENRICHMENT_LLM_TOKENS_PER_FIELD: int = int(os.environ.get("ONTOLOGY_ENRICHMENT_LLM_TOKENS_PER_FIELD", "350"))
+    ONTOLOGY_ENRICHMENT_LLM_MAX_TOKENS: int = int(os.environ.get("ONTOLOGY_ENRICHMENT_LLM_MAX_TOKENS", "4000"))
+    # Fuzzy attribute matching: trigram-index candidates scored exactly per field
+    ONTOLOGY_MATCH_TOP_K: int = int(os.environ.get("ONTOLOGY_MATCH_TOP_K", "64"))
+    # Append-only governance (policy / audit) logs roll over to a new JSONL segment at this size
+    ONTOLOGY_LOG_SEGMENT_BYTES: int = int(os.environ.get("ONTOLOGY_LOG_SEGMENT_BYTES", str(8 * 1024 * 1024)))
     
     # Security Configuration
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
     # Training Configuration
+    # Loaded model bundles kept in memory for /models/{id}/predict (LRU by count and size)
+    MODEL_REGISTRY_MAX_MODELS: int = int(os.environ.get("MODEL_REGISTRY_MAX_MODELS", "8"))
+    MODEL_REGISTRY_MAX_MB: int = int(os.environ.get("MODEL_REGISTRY_MAX_MB", "512"))
+    # Default serving backend ("native" or "onnx"); models may override it and the
+    # ONNX Runtime thread counts in their metadata["serving"]
+    MODEL_SERVING_BACKEND: str = os.environ.get("MODEL_SERVING_BACKEND", "native")
+    ONNX_INTRA_OP_THREADS: int = int(os.environ.get("ONNX_INTRA_OP_THREADS", "1"))
+    ONNX_INTER_OP_THREADS: int = int(os.environ.get("ONNX_INTER_OP_THREADS", "1"))
+    # Model training jobs: process pool size for candidate/CV-fold fits (0 = all cores); a
+    # running job without a progress heartbeat for STALE seconds (dead worker) is failed
+    TRAINING_MAX_WORKERS: int = int(os.environ.get("TRAINING_MAX_WORKERS", "0"))
+    TRAINING_CV_FOLDS: int = int(os.environ.get("TRAINING_CV_FOLDS", "5"))
+    TRAINING_STALE_SECONDS: float = float(os.environ.get("TRAINING_STALE_SECONDS", "1800"))
+    # Training uploads are converted to Parquet this many rows at a time; string columns
+    # with at most TRAINING_CATEGORY_MAX_UNIQUE distinct values are stored as categoricals
+    TRAINING_INGEST_CHUNK_ROWS: int = int(os.environ.get("TRAINING_INGEST_CHUNK_ROWS", "100000"))
+    TRAINING_CATEGORY_MAX_UNIQUE: int = int(os.environ.get("TRAINING_CATEGORY_MAX_UNIQUE", "1000"))
+    # Staged datasets above TRAINING_MAX_ROWS rows are trained on a sample of that many rows,
+    # stratified by target class and read batch by batch (0 = always load every row)
+    TRAINING_MAX_ROWS: int = int(os.environ.get("TRAINING_MAX_ROWS", "1000000"))
+    # Rows scored per chunk by /models/{id}/predict-batch (bounds memory per request)
+    PREDICT_BATCH_CHUNK_ROWS: int = int(os.environ.get("PREDICT_BATCH_CHUNK_ROWS", "10000"))
     BATCH_SIZE: int = 32
     LEARNING_RATE: float = 2e-5
     NUM_EPOCHS: int = 3
@@ -168,10 +168,49 @@ class GraphBuildRunRecord(Base):
     node_count: Mapped[int] = mapped_column(Integer, default=0)
     edge_count: Mapped[int] = mapped_column(Integer, default=0)
     export_uris: Mapped[dict] = mapped_column(JSON, default=dict)
+    phase_timings: Mapped[dict] = mapped_column(JSON, default=dict)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     built_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
+class GraphInsightRecord(Base):
+    """Cached graph analytics and LLM briefing for one fabric content version."""
+
+    __tablename__ = "graph_insights"
+
+    fabric_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    content_version: Mapped[str] = mapped_column(String(64))
+    analytics: Mapped[dict] = mapped_column(JSON, default=dict)
+    llm_insight: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    insight_version: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+
+class FabricTombstoneRecord(Base):
+    """A deleted fabric: its id stays known so the GC may sweep data written under it later."""
+
+    __tablename__ = "fabric_tombstones"
+
+    fabric_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class FabricGcSuspectRecord(Base):
+    """An orphaned owner the fabric GC has seen; purged once orphaned for the grace period."""
+
+    __tablename__ = "fabric_gc_suspects"
+
+    kind: Mapped[str] = mapped_column(String(32), primary_key=True)
+    owner_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    first_seen: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+# Fabric listing: newest-first keyset pagination with and without the owner filter,
+# and its ETag revision (count, max updated_at) without touching payload rows
+Index("ix_fabrics_created", FabricRecord.created_at, FabricRecord.id)
+Index("ix_fabrics_owner_created", FabricRecord.owner_id, FabricRecord.created_at, FabricRecord.id)
+Index("ix_fabrics_owner_updated", FabricRecord.owner_id, FabricRecord.updated_at)
 Index("ix_graph_nodes_fabric_version", GraphNodeRecord.fabric_id, GraphNodeRecord.ontology_version_id)
 Index("ix_graph_edges_fabric_version", GraphEdgeRecord.fabric_id, GraphEdgeRecord.ontology_version_id)
@@ -72,11 +72,21 @@ def init_db() -> None:
     eng = get_engine()
     Base.metadata.create_all(bind=eng)
     _ensure_schema_columns(eng)
+    _ensure_indexes(eng)
     with eng.connect() as conn:
         conn.execute(text("SELECT 1"))
     logger.info("Platform database schema ready")
 
 
+def _ensure_indexes(engine) -> None:
+    """Create indexes declared after their table already existed (create_all skips those)."""
+    from app.db.base import Base
+
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 def _ensure_schema_columns(engine) -> None:
     """Add columns introduced after initial release (SQLite-safe)."""
     additions = {
@@ -86,6 +96,7 @@ def _ensure_schema_columns(engine) -> None:
             ("role", "VARCHAR(32) DEFAULT 'user'"),
             ("allowed_features", "TEXT"),
         ],
+        "graph_build_runs": [("phase_timings", "JSON")],
     }
     with engine.connect() as conn:
         for table, columns in additions.items():
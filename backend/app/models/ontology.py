@@ -169,7 +169,7 @@ class SourceArtifact(BaseModel):
     id: str
     file_name: str
     file_path: str
-    source_type: str  # pdf | xml
+    source_type: str  # pdf | docx | image | xml | fabric_chunks
     project_id: str
     ingestion_time: Optional[datetime] = None
     version: Optional[str] = None
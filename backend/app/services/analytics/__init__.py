@@ -1,5 +1,6 @@
 """Deterministic tabular analytics for CSV/database knowledge fabrics."""
 
+from app.services.analytics.column_profiler import ColumnProfiler, profile_rows
 from app.services.analytics.tabular_analytics import (
     analyze_tabular_query,
     build_fabric_analytics_snapshot,
@@ -11,6 +12,7 @@ from app.services.analytics.tabular_analytics import (
 )
 
 __all__ = [
+    "ColumnProfiler",
     "analyze_tabular_query",
     "build_fabric_analytics_snapshot",
     "format_value_counts_answer",
@@ -18,4 +20,5 @@ __all__ = [
     "load_rows_from_source_documents",
     "markdown_table",
     "parse_row_text",
+    "profile_rows",
 ]
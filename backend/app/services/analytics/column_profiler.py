@@ -0,0 +1,278 @@
+"""
+Streaming column profiler for CSV / database fabrics.
+
+Consumes rows in batches (dict rows or ``key: value | key: value`` row chunk
+text) and keeps only fixed-size sketches per column, so profiling every row of
+a fabric is linear in cells and bounded in memory:
+
+- HyperLogLog registers for distinct-value estimates,
+- bottom-k MinHash samples for Jaccard / containment between columns (FK
+  evidence); all columns share one hash, so samples are coordinated,
+- counters for null ratio and value types.
+
+Hashing, sketch updates and type checks run on numpy/pandas arrays per batch
+instead of per value in Python.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+NULL_TOKENS = ("", "none", "nan", "null")
+BOOL_TOKENS = ("true", "false", "yes", "no", "y", "n")
+TYPE_PROBE_SIZE = 64
+SAMPLE_VALUES = 5
+
+_U64 = np.uint64
+_MAX_U64 = np.iinfo(np.uint64).max
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Exact bit length of each uint64 (0 for 0), via binary search on shifts."""
+    w = values.copy()
+    n = np.zeros(w.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = (w >> _U64(shift)) != 0
+        n += big * shift
+        w = np.where(big, w >> _U64(shift), w)
+    return n + (w != 0)
+
+
+class _ColumnSketch:
+    __slots__ = ("non_null", "registers", "bottom_k", "int_count", "num_count",
+                 "bool_count", "probe", "samples")
+
+    def __init__(self, precision: int) -> None:
+        self.non_null = 0
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+        self.bottom_k = np.empty(0, dtype=np.uint64)
+        self.int_count = 0
+        self.num_count = 0
+        self.bool_count = 0
+        self.probe: List[str] = []
+        self.samples: List[str] = []
+
+
+class ColumnProfiler:
+    """Accumulate per-column sketches over batches of rows."""
+
+    def __init__(self, precision: int = 12, sample_size: int = 1024) -> None:
+        self.precision = precision
+        self.sample_size = sample_size
+        self.row_count = 0
+        self._columns: Dict[str, _ColumnSketch] = {}
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def add_rows(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Profile a batch of dict rows; missing keys count as nulls."""
+        if not rows:
+            return
+        self.add_frame(pd.DataFrame.from_records(list(rows)))
+
+    def add_frame(self, frame: pd.DataFrame) -> None:
+        """Profile a batch already held as a DataFrame (one column per field)."""
+        self.row_count += len(frame)
+        for column in frame.columns:
+            series = frame[column]
+            series = series[series.notna()].astype(str).str.strip()
+            self._update(str(column).strip(), series)
+
+    def add_row_texts(self, texts: Sequence[str]) -> None:
+        """Profile a batch of ``key: value | key: value`` row chunk strings."""
+        if not texts:
+            return
+        self.row_count += len(texts)
+        parts = pd.Series(list(texts), dtype=object).astype(str).str.split("|").explode()
+        pieces = parts.str.partition(":")
+        keys = pieces[0].str.strip()
+        keep = (pieces[1] == ":") & (keys != "")
+        cells = pd.DataFrame({"key": keys[keep], "value": pieces[2][keep].str.strip()})
+        for key, group in cells.groupby("key", sort=False):
+            self._update(str(key), group["value"])
+
+    def _update(self, name: str, values: pd.Series) -> None:
+        sketch = self._columns.get(name)
+        if sketch is None:
+            sketch = self._columns[name] = _ColumnSketch(self.precision)
+        if values.empty:
+            return
+        lowered = values.str.lower()
+        values = values[~lowered.isin(NULL_TOKENS)]
+        if values.empty:
+            return
+        lowered = lowered[values.index]
+
+        sketch.non_null += len(values)
+        # Cheap regex gate first: to_numeric(errors="coerce") is slow on text columns.
+        numeric_like = values[values.str.match(r"[+-]?\.?\d")]
+        if not numeric_like.empty:
+            sketch.int_count += int(numeric_like.str.fullmatch(r"[+-]?\d+").sum())
+            sketch.num_count += int(pd.to_numeric(numeric_like, errors="coerce").notna().sum())
+        sketch.bool_count += int(lowered.isin(BOOL_TOKENS).sum())
+        if len(sketch.probe) < TYPE_PROBE_SIZE:
+            sketch.probe.extend(values.iloc[: TYPE_PROBE_SIZE - len(sketch.probe)].tolist())
+        if len(sketch.samples) < SAMPLE_VALUES:
+            for value in values.iloc[:200].unique():
+                if len(sketch.samples) >= SAMPLE_VALUES:
+                    break
+                if value not in sketch.samples:
+                    sketch.samples.append(value)
+
+        hashes = np.unique(pd.util.hash_array(values.to_numpy(dtype=object)))
+        self._update_hll(sketch, hashes)
+        sketch.bottom_k = np.union1d(sketch.bottom_k, hashes[: self.sample_size])[: self.sample_size]
+
+    def _update_hll(self, sketch: _ColumnSketch, hashes: np.ndarray) -> None:
+        p = self.precision
+        index = (hashes >> _U64(64 - p)).astype(np.intp)
+        # Guard bit keeps rank <= 64 - p + 1 when the remaining bits are all zero.
+        rest = (hashes << _U64(p)) | (_U64(1) << _U64(p - 1))
+        rank = (65 - _bit_length(rest)).astype(np.uint8)
+        np.maximum.at(sketch.registers, index, rank)
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names in first-seen order."""
+        return list(self._columns.keys())
+
+    def distinct_estimate(self, name: str) -> int:
+        sketch = self._columns[name]
+        if sketch.non_null == 0:
+            return 0
+        m = float(len(sketch.registers))
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.power(2.0, -sketch.registers.astype(np.float64))))
+        zeros = int(np.count_nonzero(sketch.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(min(round(estimate), sketch.non_null))
+
+    def _coordinated_samples(self, left: str, right: str):
+        """Both columns' bottom-k hashes below a shared threshold (same hash => same values)."""
+        a = self._columns[left].bottom_k
+        b = self._columns[right].bottom_k
+        threshold = _MAX_U64
+        if len(a) >= self.sample_size:
+            threshold = min(threshold, a[-1])
+        if len(b) >= self.sample_size:
+            threshold = min(threshold, b[-1])
+        return a[a <= threshold], b[b <= threshold]
+
+    def jaccard(self, left: str, right: str) -> float:
+        a, b = self._coordinated_samples(left, right)
+        union = len(np.union1d(a, b))
+        return len(np.intersect1d(a, b, assume_unique=True)) / union if union else 0.0
+
+    def containment(self, child: str, parent: str) -> float:
+        """Estimated share of ``child``'s distinct values that also occur in ``parent``."""
+        a, b = self._coordinated_samples(child, parent)
+        if not len(a):
+            return 0.0
+        return len(np.intersect1d(a, b, assume_unique=True)) / len(a)
+
+    def column_stats(self) -> List[Dict[str, Any]]:
+        rows = max(self.row_count, 1)
+        stats: List[Dict[str, Any]] = []
+        for name, sketch in self._columns.items():
+            distinct = self.distinct_estimate(name)
+            stats.append({
+                "name": name,
+                "non_null": sketch.non_null,
+                "null_ratio": round(1.0 - sketch.non_null / rows, 4),
+                "distinct_estimate": distinct,
+                "unique_ratio": round(distinct / sketch.non_null, 4) if sketch.non_null else 0.0,
+                "type": self._infer_type(sketch),
+                "sample_values": list(sketch.samples),
+            })
+        return stats
+
+    def column_overlaps(
+        self,
+        min_containment: float = 0.8,
+        min_distinct: int = 3,
+        parent_min_unique_ratio: float = 0.9,
+    ) -> List[Dict[str, Any]]:
+        """Column pairs whose values are largely contained in a key-like column."""
+        stats = {s["name"]: s for s in self.column_stats()}
+        parents = [
+            name for name, s in stats.items()
+            if s["distinct_estimate"] >= min_distinct and s["unique_ratio"] >= parent_min_unique_ratio
+        ]
+        overlaps: List[Dict[str, Any]] = []
+        for child, s in stats.items():
+            if s["distinct_estimate"] < min_distinct:
+                continue
+            for parent in parents:
+                if parent == child:
+                    continue
+                score = self.containment(child, parent)
+                if score >= min_containment:
+                    overlaps.append({
+                        "column": child,
+                        "target_column": parent,
+                        "containment": round(score, 3),
+                        "jaccard": round(self.jaccard(child, parent), 3),
+                    })
+        overlaps.sort(key=lambda o: o["containment"], reverse=True)
+        return overlaps
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "row_count": self.row_count,
+            "column_stats": self.column_stats(),
+            "column_overlaps": self.column_overlaps(),
+        }
+
+    def _infer_type(self, sketch: _ColumnSketch) -> str:
+        n = sketch.non_null
+        if n == 0:
+            return "unknown"
+        if sketch.int_count >= 0.98 * n:
+            return "integer"
+        if sketch.num_count >= 0.98 * n:
+            return "number"
+        if sketch.bool_count >= 0.98 * n:
+            return "boolean"
+        if sketch.probe:
+            parsed = pd.to_datetime(pd.Series(sketch.probe), errors="coerce", format="mixed")
+            if parsed.notna().mean() >= 0.9:
+                return "datetime"
+        return "string"
+
+
+def profile_rows(rows: Iterable[Mapping[str, Any]], batch_size: int = 5000) -> Dict[str, Any]:
+    """Convenience wrapper: profile an iterable of dict rows in batches."""
+    profiler = ColumnProfiler()
+    batch: List[Mapping[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            profiler.add_rows(batch)
+            batch = []
+    profiler.add_rows(batch)
+    return profiler.result()
+
+
+def stratified_offsets(total: int, sample_rows: int, page_size: int, seed: Optional[int] = None) -> List[int]:
+    """Page start offsets spread evenly over ``total`` rows to read ~``sample_rows`` of them."""
+    if total <= 0 or sample_rows <= 0 or sample_rows >= total:
+        return list(range(0, max(total, 0), page_size))
+    strata = max(1, math.ceil(sample_rows / page_size))
+    rng = np.random.default_rng(seed)
+    offsets: List[int] = []
+    for stratum in range(strata):
+        lo = stratum * total // strata
+        hi = (stratum + 1) * total // strata
+        span = max(0, hi - lo - page_size)
+        offsets.append(lo + (int(rng.integers(0, span + 1)) if span else 0))
+    return offsets
@@ -2,6 +2,8 @@
 
 ANALYSIS_VERSION = "weave.codebase.analysis/v1"
 MIGRATION_SCHEMA = "weave.codebase.migration/v1"
+# Streamed tar-of-NDJSON package; see migration_package
+MIGRATION_SCHEMA_V2 = "weave.codebase.migration/v2"
 
 DEFAULT_IGNORE_DIRS = {
     ".git",
@@ -7,6 +7,36 @@ from typing import Any, Dict, List, Optional
 from app.services.codebase import ANALYSIS_VERSION, MIGRATION_SCHEMA
 
 
+def safe_inventory(inventory: Dict[str, Any]) -> Dict[str, Any]:
+    # Strip secrets / absolute paths
+    safe = {
+        k: v
+        for k, v in inventory.items()
+        if k not in ("all_relative_files",)  # keep sample only in export via files_sample
+    }
+    if "files_sample" not in safe and inventory.get("all_relative_files"):
+        safe["files_sample"] = inventory["all_relative_files"][:200]
+        safe["file_count"] = inventory.get("file_count") or len(inventory["all_relative_files"])
+    return safe
+
+
+def migration_manifest(fabric: Dict[str, Any], inventory: Dict[str, Any]) -> Dict[str, Any]:
+    codebase_meta = fabric.get("codebase") or {}
+    return {
+        "fabric_id": fabric.get("id"),
+        "name": fabric.get("name"),
+        "source_type": "codebase",
+        "analysis_version": ANALYSIS_VERSION,
+        "exported_at": datetime.utcnow().isoformat(),
+        "languages": (codebase_meta.get("languages") or inventory.get("languages") or {}),
+        "frameworks": codebase_meta.get("frameworks") or inventory.get("frameworks") or [],
+        "git_remote": codebase_meta.get("git_remote"),
+        "git_ref": codebase_meta.get("git_ref"),
+        "workspace_fingerprint": codebase_meta.get("workspace_fingerprint")
+        or inventory.get("workspace_fingerprint"),
+    }
+
+
 def build_migration_package(
     *,
     fabric: Dict[str, Any],
@@ -24,17 +54,6 @@ def build_migration_package(
         "discovery_summary": fabric.get("discovery_summary") or "",
     }
     blueprint = blueprint or fabric.get("migration_blueprint") or {}
-    codebase_meta = fabric.get("codebase") or {}
-
-    # Strip secrets / absolute paths
-    safe_inventory = {
-        k: v
-        for k, v in inventory.items()
-        if k not in ("all_relative_files",)  # keep sample only in export via files_sample
-    }
-    if "files_sample" not in safe_inventory and inventory.get("all_relative_files"):
-        safe_inventory["files_sample"] = inventory["all_relative_files"][:200]
-        safe_inventory["file_count"] = inventory.get("file_count") or len(inventory["all_relative_files"])
 
     evidence = []
     for doc in evidence_docs or []:
@@ -59,20 +78,8 @@ def build_migration_package(
 
     return {
         "schema": MIGRATION_SCHEMA,
-        "manifest": {
-            "fabric_id": fabric.get("id"),
-            "name": fabric.get("name"),
-            "source_type": "codebase",
-            "analysis_version": ANALYSIS_VERSION,
-            "exported_at": datetime.utcnow().isoformat(),
-            "languages": (codebase_meta.get("languages") or inventory.get("languages") or {}),
-            "frameworks": codebase_meta.get("frameworks") or inventory.get("frameworks") or [],
-            "git_remote": codebase_meta.get("git_remote"),
-            "git_ref": codebase_meta.get("git_ref"),
-            "workspace_fingerprint": codebase_meta.get("workspace_fingerprint")
-            or inventory.get("workspace_fingerprint"),
-        },
-        "inventory": safe_inventory,
+        "manifest": migration_manifest(fabric, inventory),
+        "inventory": safe_inventory(inventory),
         "graph": {
             "nodes": graph.get("nodes") or [],
             "edges": graph.get("edges") or [],
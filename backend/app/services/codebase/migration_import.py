@@ -1,34 +1,25 @@
-"""Import a migration JSON package into a new codebase fabric."""
+"""Import a migration package (v1 JSON or v2 streamed archive) into a new codebase fabric."""
 from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
+from app.core.config import settings
 from app.core.user_context import get_current_user_id
-from app.services.codebase import ANALYSIS_VERSION, MIGRATION_SCHEMA
+from app.services.codebase import ANALYSIS_VERSION, MIGRATION_SCHEMA, MIGRATION_SCHEMA_V2
 from app.services.codebase.migration_export import validate_migration_package
+from app.services.codebase.migration_package import SECTIONS, read_migration_package
+from app.services.platform.fabric_gc import fabric_reclaimer
 from app.services.platform.fabric_store import fabric_store
 from app.services.vector_service import vector_service
 
 
-def import_migration_package(
-    package: Dict[str, Any],
-    *,
-    name: Optional[str] = None,
-) -> Dict[str, Any]:
-    validate_migration_package(package)
-    manifest = package.get("manifest") or {}
-    inventory = package.get("inventory") or {}
-    graph = package.get("graph") or {"nodes": [], "edges": []}
-    domain = package.get("domain_map") or {}
-    blueprint = package.get("blueprint") or {}
-    evidence = package.get("evidence") or []
+def _new_fabric_id() -> str:
+    return f"fabric_codebase_import_{uuid.uuid4().hex[:10]}"
 
-    fabric_id = f"fabric_codebase_import_{uuid.uuid4().hex[:10]}"
-    now = datetime.utcnow().isoformat()
-    fabric_name = name or manifest.get("name") or f"Imported Codebase {fabric_id[-6:]}"
 
+def _summary_docs(domain: Dict[str, Any], blueprint: Dict[str, Any], now: str) -> List[Dict[str, Any]]:
     docs = []
     if domain.get("discovery_summary"):
         docs.append(
@@ -64,37 +55,52 @@ def import_migration_package(
                     "metadata": {"source_type": "codebase", "chunk_kind": "module_summary"},
                 }
             )
-    for ev in evidence[:200]:
-        if not isinstance(ev, dict):
-            continue
-        content = ev.get("content") or ""
-        if not content:
-            continue
-        docs.append(
-            {
-                "content": content,
-                "page_number": 1,
-                "file_name": str(ev.get("path") or "evidence"),
-                "source_name": "evidence",
-                "created_at": now,
-                "metadata": {
-                    "source_type": "codebase",
-                    "chunk_kind": ev.get("kind") or "evidence",
-                },
-            }
-        )
+    return docs
+
+
+def _chunk_doc(record: Dict[str, Any], now: str) -> Dict[str, Any]:
+    """A v2 ``chunks`` record as an ``add_documents`` input; identity keys are re-stamped on add."""
+    metadata = {
+        k: v
+        for k, v in (record.get("metadata") or {}).items()
+        if k not in ("source_id", "source_name", "page_number", "file_name", "created_at") and v is not None
+    }
+    original = record.get("metadata") or {}
+    return {
+        "content": record.get("document") or "",
+        "page_number": original.get("page_number") or 1,
+        "file_name": original.get("file_name") or "chunk",
+        "source_name": original.get("source_name") or "import",
+        "created_at": original.get("created_at") or now,
+        "metadata": {"source_type": "codebase", **metadata},
+    }
 
-    chunk_ids = vector_service.add_documents(docs, fabric_id) if docs else []
 
-    fabric = {
+def _fabric_record(
+    fabric_id: str,
+    fabric_name: str,
+    now: str,
+    *,
+    schema: str,
+    manifest: Dict[str, Any],
+    inventory: Dict[str, Any],
+    graph: Dict[str, Any],
+    contracts: List[Any],
+    domain: Dict[str, Any],
+    blueprint: Dict[str, Any],
+    risks: List[Any],
+    document_count: int,
+    total_chunks: int,
+) -> Dict[str, Any]:
+    return {
         "id": fabric_id,
         "name": fabric_name,
         "source_type": "codebase",
         "description": "Imported from Weave migration JSON",
         "status": "active",
         "model_status": "not_trained",
-        "document_count": len(docs),
-        "total_chunks": len(chunk_ids) or len(docs),
+        "document_count": document_count,
+        "total_chunks": total_chunks,
         "tags": ["codebase", "imported", "migration"],
         "created_at": now,
         "updated_at": now,
@@ -110,27 +116,156 @@ def import_migration_package(
             "analyzed_at": now,
             "analysis_version": ANALYSIS_VERSION,
             "workspace_fingerprint": manifest.get("workspace_fingerprint"),
-            "imported_from_schema": package.get("schema") or MIGRATION_SCHEMA,
+            "imported_from_schema": schema,
         },
         "codebase_inventory": inventory,
         "code_graph": {
             "nodes": graph.get("nodes") or [],
             "edges": graph.get("edges") or [],
             "stats": graph.get("stats") or {},
-            "contracts": package.get("contracts") or [],
+            "contracts": contracts,
         },
-        "contracts": package.get("contracts") or [],
+        "contracts": contracts,
         "module_summaries": domain.get("module_summaries") or [],
         "domain_concepts": domain.get("concepts") or [],
         "discovery_summary": domain.get("discovery_summary") or "",
         "migration_blueprint": {
             "waves": blueprint.get("waves") or [],
             "bounded_contexts": blueprint.get("bounded_contexts") or [],
-            "risks": package.get("risks") or blueprint.get("risks") or [],
+            "risks": risks,
             "narrative": blueprint.get("narrative"),
             "migration_goal": blueprint.get("migration_goal"),
             "hotspots": blueprint.get("hotspots") or [],
         },
     }
+
+
+def import_migration_package(
+    package: Dict[str, Any],
+    *,
+    name: Optional[str] = None,
+) -> Dict[str, Any]:
+    validate_migration_package(package)
+    manifest = package.get("manifest") or {}
+    inventory = package.get("inventory") or {}
+    graph = package.get("graph") or {"nodes": [], "edges": []}
+    domain = package.get("domain_map") or {}
+    blueprint = package.get("blueprint") or {}
+    evidence = package.get("evidence") or []
+
+    fabric_id = _new_fabric_id()
+    now = datetime.utcnow().isoformat()
+    fabric_name = name or manifest.get("name") or f"Imported Codebase {fabric_id[-6:]}"
+
+    docs = _summary_docs(domain, blueprint, now)
+    for ev in evidence[:200]:
+        if not isinstance(ev, dict):
+            continue
+        content = ev.get("content") or ""
+        if not content:
+            continue
+        docs.append(
+            {
+                "content": content,
+                "page_number": 1,
+                "file_name": str(ev.get("path") or "evidence"),
+                "source_name": "evidence",
+                "created_at": now,
+                "metadata": {
+                    "source_type": "codebase",
+                    "chunk_kind": ev.get("kind") or "evidence",
+                },
+            }
+        )
+
+    chunk_ids = vector_service.add_documents(docs, fabric_id) if docs else []
+
+    fabric = _fabric_record(
+        fabric_id,
+        fabric_name,
+        now,
+        schema=package.get("schema") or MIGRATION_SCHEMA,
+        manifest=manifest,
+        inventory=inventory,
+        graph=graph,
+        contracts=package.get("contracts") or [],
+        domain=domain,
+        blueprint=blueprint,
+        risks=package.get("risks") or blueprint.get("risks") or [],
+        document_count=len(docs),
+        total_chunks=len(chunk_ids) or len(docs),
+    )
     fabric_store.save(fabric)
     return fabric
+
+
+def import_migration_stream(fileobj: Any, *, name: Optional[str] = None) -> Dict[str, Any]:
+    """Import a v2 package while reading it; ``chunks`` parts are indexed as they arrive.
+
+    A placeholder record (status ``importing``) is saved first so fabric GC
+    does not take the new chunks for orphans; on any failure the fabric and
+    whatever was indexed are removed again.
+    """
+    parts = read_migration_package(fileobj)
+    _, header = next(parts)
+    manifest = header.get("manifest") or {}
+    fabric_id = _new_fabric_id()
+    now = datetime.utcnow().isoformat()
+    fabric_name = name or manifest.get("name") or f"Imported Codebase {fabric_id[-6:]}"
+    fabric_store.save(
+        {
+            "id": fabric_id,
+            "name": fabric_name,
+            "source_type": "codebase",
+            "status": "importing",
+            "tags": ["codebase", "imported", "migration"],
+            "created_at": now,
+            "updated_at": now,
+            "owner_id": get_current_user_id(),
+        }
+    )
+    batch_size = max(1, settings.MIGRATION_IMPORT_BATCH_SIZE)
+    try:
+        sections: Dict[str, List[Any]] = {section: [] for section in SECTIONS if section != "chunks"}
+        total_chunks = 0
+        for section, records in parts:
+            if section == "chunks":
+                docs = [_chunk_doc(record, now) for record in records if record.get("document")]
+                for start in range(0, len(docs), batch_size):
+                    total_chunks += len(vector_service.add_documents(docs[start:start + batch_size], fabric_id))
+            elif section in sections:
+                sections[section].extend(records)
+        summary = (sections["summary"] or [{}])[0]
+        blueprint = summary.get("blueprint") or {}
+        domain = {
+            "concepts": sections["domain_concepts"],
+            "module_summaries": sections["module_summaries"],
+            "discovery_summary": summary.get("discovery_summary") or "",
+        }
+        if not total_chunks:
+            total_chunks = len(vector_service.add_documents(_summary_docs(domain, blueprint, now), fabric_id))
+        fabric = _fabric_record(
+            fabric_id,
+            fabric_name,
+            now,
+            schema=header.get("schema") or MIGRATION_SCHEMA_V2,
+            manifest=manifest,
+            inventory=(sections["inventory"] or [{}])[0],
+            graph={
+                "nodes": sections["graph_nodes"],
+                "edges": sections["graph_edges"],
+                "stats": (sections["graph_stats"] or [{}])[0],
+            },
+            contracts=sections["contracts"],
+            domain=domain,
+            blueprint=blueprint,
+            risks=sections["risks"],
+            document_count=(summary.get("rag_index_meta") or {}).get("document_count") or total_chunks,
+            total_chunks=total_chunks,
+        )
+        fabric["description"] = "Imported from Weave migration package"
+        fabric_store.save(fabric)
+    except Exception:
+        fabric_reclaimer.delete_fabric(fabric_id)
+        raise
+    return fabric
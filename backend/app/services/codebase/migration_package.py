@@ -0,0 +1,226 @@
+"""Streaming codebase migration package (``weave.codebase.migration/v2``).
+
+A package is a tar stream (gzip-compressed by default) of:
+
+``manifest.json``
+    schema, fabric manifest and the ordered section names; always first.
+``sections/<name>/<part>.ndjson``
+    one JSON record per line, cut into parts of about
+    MIGRATION_PACKAGE_PART_BYTES; each part's SHA-256 and record count travel
+    in its pax header.
+``end.json``
+    record and part counts per section; a package without it is truncated.
+
+Writer and reader both hold one part at a time, so a fabric's size does not
+decide how much memory an export or import needs.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import tarfile
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from app.core.config import settings
+from app.services.codebase import MIGRATION_SCHEMA_V2
+from app.services.codebase.migration_export import migration_manifest, safe_inventory
+from app.services.platform.fabric_store import fabric_store
+from app.utils.ndjson_stream import ndjson_lines
+
+MANIFEST_NAME = "manifest.json"
+END_NAME = "end.json"
+SHA256_HEADER = "weave.sha256"
+RECORDS_HEADER = "weave.records"
+
+# Written in this order; import relies on everything but ``chunks`` arriving first.
+SECTIONS = (
+    "inventory",
+    "summary",
+    "risks",
+    "module_summaries",
+    "domain_concepts",
+    "contracts",
+    "graph_stats",
+    "graph_nodes",
+    "graph_edges",
+    "chunks",
+)
+
+
+class _Sink:
+    """Write-only file object that hands tarfile's output back to the generator."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buf += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        out = bytes(self._buf)
+        self._buf.clear()
+        return out
+
+
+def _artifact(fabric: Dict[str, Any], key: str) -> Any:
+    """One artifact of ``fabric``, loaded without caching it on the dict so it is freed after use."""
+    if key in fabric:
+        return fabric[key]
+    return fabric_store.load_artifacts({"artifact_refs": fabric.get("artifact_refs") or {}}, keys=[key]).get(key)
+
+
+def _section_records(
+    fabric: Dict[str, Any], chunks: Iterable[Dict[str, Any]]
+) -> Iterator[Tuple[str, Iterable[Any]]]:
+    inventory = _artifact(fabric, "codebase_inventory") or {}
+    yield "inventory", [safe_inventory(inventory)]
+    del inventory
+
+    blueprint = _artifact(fabric, "migration_blueprint") or {}
+    yield "summary", [{
+        "discovery_summary": fabric.get("discovery_summary") or "",
+        "blueprint": {
+            "waves": blueprint.get("waves") or [],
+            "bounded_contexts": blueprint.get("bounded_contexts") or [],
+            "narrative": blueprint.get("narrative"),
+            "migration_goal": blueprint.get("migration_goal"),
+            "hotspots": blueprint.get("hotspots") or [],
+        },
+        "rag_index_meta": {
+            "document_count": fabric.get("document_count") or 0,
+            "total_chunks": fabric.get("total_chunks") or 0,
+        },
+    }]
+    yield "risks", blueprint.get("risks") or []
+    del blueprint
+
+    yield "module_summaries", _artifact(fabric, "module_summaries") or []
+    yield "domain_concepts", _artifact(fabric, "domain_concepts") or []
+
+    graph = _artifact(fabric, "code_graph") or {}
+    yield "contracts", _artifact(fabric, "contracts") or graph.get("contracts") or []
+    yield "graph_stats", [graph.get("stats") or {}]
+    yield "graph_nodes", graph.get("nodes") or []
+    yield "graph_edges", graph.get("edges") or []
+    del graph
+
+    yield "chunks", chunks
+
+
+def _add_member(tar: tarfile.TarFile, name: str, data: bytes, pax: Optional[Dict[str, str]] = None) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    info.mode = 0o644
+    if pax:
+        info.pax_headers = pax
+    tar.addfile(info, io.BytesIO(data))
+
+
+def iter_migration_package(
+    fabric: Dict[str, Any],
+    chunks: Iterable[Dict[str, Any]] = (),
+    *,
+    compress: bool = True,
+    part_bytes: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Encode ``fabric`` (artifacts loaded lazily, one section at a time) and its ``chunks``.
+
+    ``chunks`` are ``{"id", "document", "metadata"}`` records, e.g. from
+    ``vector_service.iter_export_records``.
+    """
+    part_bytes = max(1, part_bytes or settings.MIGRATION_PACKAGE_PART_BYTES)
+    sink = _Sink()
+    tar = tarfile.open(fileobj=sink, mode="w|gz" if compress else "w|", format=tarfile.PAX_FORMAT)
+    manifest = {
+        "schema": MIGRATION_SCHEMA_V2,
+        "manifest": migration_manifest(fabric, _artifact(fabric, "codebase_inventory") or {}),
+        "sections": list(SECTIONS),
+    }
+    _add_member(tar, MANIFEST_NAME, json.dumps(manifest, default=str).encode("utf-8"))
+    yield sink.drain()
+
+    totals: Dict[str, Dict[str, int]] = {}
+    for section, records in _section_records(fabric, chunks):
+        counts = totals.setdefault(section, {"records": 0, "parts": 0})
+        buf, n = bytearray(), 0
+
+        def flush() -> None:
+            _add_member(
+                tar,
+                f"sections/{section}/{counts['parts']:06d}.ndjson",
+                bytes(buf),
+                {SHA256_HEADER: hashlib.sha256(buf).hexdigest(), RECORDS_HEADER: str(n)},
+            )
+            counts["records"] += n
+            counts["parts"] += 1
+
+        for line in ndjson_lines(records):
+            buf += line
+            n += 1
+            if len(buf) >= part_bytes:
+                flush()
+                buf, n = bytearray(), 0
+                yield sink.drain()
+        if n:
+            flush()
+            yield sink.drain()
+
+    _add_member(tar, END_NAME, json.dumps({"sections": totals}).encode("utf-8"))
+    tar.close()
+    yield sink.drain()
+
+
+def read_migration_package(fileobj: Any) -> Iterator[Tuple[str, Any]]:
+    """Decode a package from a readable binary stream, one verified part at a time.
+
+    Yields ``("manifest", manifest)`` first, then ``(section, records)`` per
+    part and finally ``("end", counts)``. Raises ``ValueError`` on a bad
+    checksum, unknown member, or a stream that ends before ``end.json``.
+    """
+    try:
+        tar = tarfile.open(fileobj=fileobj, mode="r|*")
+    except tarfile.TarError as exc:
+        raise ValueError(f"Not a migration package archive: {exc}") from exc
+    seen: Dict[str, Dict[str, int]] = {}
+    manifest = None
+    try:
+        for member in tar:
+            if not member.isfile():
+                continue
+            data = tar.extractfile(member).read()
+            if manifest is None:
+                if member.name != MANIFEST_NAME:
+                    raise ValueError(f"Migration package must start with {MANIFEST_NAME}, got {member.name}")
+                manifest = json.loads(data)
+                schema = str(manifest.get("schema") or "")
+                if not schema.startswith("weave.codebase.migration"):
+                    raise ValueError(f"Unsupported migration schema: {schema}")
+                yield "manifest", manifest
+                continue
+            if member.name == END_NAME:
+                expected = {k: v for k, v in (json.loads(data).get("sections") or {}).items() if v.get("parts")}
+                if expected != seen:
+                    raise ValueError("Migration package section counts do not match end.json")
+                yield "end", expected
+                return
+            parts = member.name.split("/")
+            if len(parts) != 3 or parts[0] != "sections" or parts[1] not in SECTIONS:
+                raise ValueError(f"Unexpected migration package member: {member.name}")
+            section = parts[1]
+            if hashlib.sha256(data).hexdigest() != member.pax_headers.get(SHA256_HEADER):
+                raise ValueError(f"Checksum mismatch in {member.name}")
+            # One decode per part: json shares dict-key strings within a call, per-line loads would not.
+            records = json.loads(b"[" + b",".join(line for line in data.splitlines() if line) + b"]")
+            if str(len(records)) != member.pax_headers.get(RECORDS_HEADER):
+                raise ValueError(f"Record count mismatch in {member.name}")
+            counts = seen.setdefault(section, {"records": 0, "parts": 0})
+            counts["records"] += len(records)
+            counts["parts"] += 1
+            yield section, records
+    except (tarfile.TarError, EOFError, OSError) as exc:
+        raise ValueError(f"Corrupt migration package: {exc}") from exc
+    raise ValueError("Migration package is truncated (no end.json)")
@@ -1,11 +1,11 @@
-import PyPDF2
 import os
 import uuid
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Iterable, Optional, Set, Tuple
 from datetime import datetime
 import aiofiles
 from fastapi import UploadFile
 from app.core.config import settings
+from app.services.pdf_text_service import pdf_text_service
 
 class DocumentService:
     def __init__(self):
@@ -31,25 +31,25 @@ class DocumentService:
         documents = []
         
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                for page_num, page in enumerate(pdf_reader.pages, 1):
-                    text = page.extract_text()
-                    
-                    if text.strip():  # Only add non-empty pages
-                        documents.append({
-                            "content": text.strip(),
-                            "page_number": page_num,
-                            "file_name": os.path.basename(file_path),
-                            "source_name": os.path.splitext(os.path.basename(file_path))[0],
-                            "created_at": datetime.now().isoformat(),
-                            "metadata": {
-                                "total_pages": len(pdf_reader.pages),
-                                "file_size": os.path.getsize(file_path),
-                                "file_type": "pdf"
-                            }
-                        })
+            file_size = os.path.getsize(file_path)
+            total_pages = 0
+
+            for page_num, text in pdf_text_service.iter_pages(file_path):
+                total_pages = page_num
+                if text.strip():  # Only add non-empty pages
+                    documents.append({
+                        "content": text.strip(),
+                        "page_number": page_num,
+                        "file_name": os.path.basename(file_path),
+                        "source_name": os.path.splitext(os.path.basename(file_path))[0],
+                        "created_at": datetime.now().isoformat(),
+                        "metadata": {
+                            "file_size": file_size,
+                            "file_type": "pdf"
+                        }
+                    })
+            for document in documents:
+                document["metadata"]["total_pages"] = total_pages
         
         except Exception as e:
             print(f"Error extracting text from PDF {file_path}: {e}")
@@ -150,17 +150,168 @@ class DocumentService:
     
     def process_database_data(self, data: List[Dict[str, Any]], source_name: str) -> List[Dict[str, Any]]:
         """Process data from database connection"""
-        row_documents = self._build_row_documents(data, source_name)
-        linked_documents = self._build_linked_row_documents(data, source_name)
+        row_documents = self.process_database_rows(data, source_name, total_rows=len(data))
+        linked_documents = self.process_database_links(data, source_name)
         if linked_documents:
             # Keep both granular row chunks (for deterministic counts) and linked chunks (for relational reasoning).
             return row_documents + linked_documents
         return row_documents
 
-    def _build_row_documents(self, data: List[Dict[str, Any]], source_name: str) -> List[Dict[str, Any]]:
+    def process_database_rows(
+        self,
+        data: List[Dict[str, Any]],
+        source_name: str,
+        row_offset: int = 0,
+        total_rows: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Row chunks for one batch of a table; ``row_offset`` rows precede it."""
+        return self._build_row_documents(data, source_name, row_offset, total_rows)
+
+    def process_database_links(self, data: List[Dict[str, Any]], source_name: str) -> List[Dict[str, Any]]:
+        """Linked-pair chunks; needs every row of the table to resolve link targets."""
+        return self._build_linked_row_documents(data, source_name)
+
+    def plan_database_links(self, read_rows: Callable[[], Iterable[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Primary id and link columns of a table too large to hold, from two passes over ``read_rows()``.
+
+        Applies the same heuristics as ``_build_linked_row_documents`` while
+        keeping only the id columns' values. None when the table has no links.
+        """
+        columns: List[str] = []
+        tracked: Dict[str, Set[str]] = {}
+        non_empty: Dict[str, int] = {}
+        row_count = 0
+        for row in read_rows():
+            if not row_count:
+                columns = [str(k).strip() for k in (row or {}).keys()]
+                lowered = {c.lower(): c for c in columns}
+                preferred = next((lowered[p] for p in ("id", "claim_id", "record_id", "row_id") if p in lowered), None)
+                candidates = [preferred] if preferred else [
+                    c for c in columns if c.lower() == "id" or c.lower().endswith("_id")
+                ]
+                tracked = {c: set() for c in candidates}
+                non_empty = {c: 0 for c in candidates}
+            row_count += 1
+            for col, values in tracked.items():
+                value = self._string_value(row.get(col))
+                if value:
+                    values.add(value)
+                    non_empty[col] += 1
+
+        primary_id_col = None
+        best_score = -1.0
+        for col, values in tracked.items():
+            if not non_empty[col]:
+                continue
+            score = (len(values) / float(non_empty[col])) * 0.8 + (non_empty[col] / float(row_count)) * 0.2
+            if score > best_score:
+                primary_id_col, best_score = col, score
+        if not primary_id_col:
+            return None
+        id_set = tracked[primary_id_col]
+
+        link_keywords = ("parent", "prior", "prev", "original", "source", "reference", "ref", "match", "related")
+        link_like = [
+            c for c in columns
+            if c != primary_id_col and (
+                c.lower().endswith("_id") or c.lower().endswith("id") or "_id_" in c.lower()
+                or any(k in c.lower() for k in link_keywords)
+            )
+        ]
+        filled = {c: 0 for c in link_like}
+        matched = {c: 0 for c in link_like}
+        if link_like:
+            for row in read_rows():
+                for col in link_like:
+                    value = self._string_value(row.get(col))
+                    if value:
+                        filled[col] += 1
+                        matched[col] += value in id_set
+        link_cols = [
+            c for c in link_like
+            if filled[c] and matched[c] >= 3 and matched[c] / float(filled[c]) >= 0.3
+            and filled[c] / float(max(row_count, 1)) >= 0.02
+        ]
+        if not link_cols:
+            return None
+        return {"primary_id_column": primary_id_col, "link_columns": link_cols}
+
+    def link_row_id(self, row: Dict[str, Any], plan: Dict[str, Any]) -> str:
+        """The row's primary id under ``plan`` ("" when missing)."""
+        return self._string_value(row.get(plan["primary_id_column"]))
+
+    def link_row_documents(
+        self,
+        row_idx: int,
+        row: Dict[str, Any],
+        plan: Dict[str, Any],
+        target_row: Callable[[str], Optional[Dict[str, Any]]],
+        source_name: str,
+        seen_pairs: Set[Tuple[str, str, str]],
+        first_page: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """Linked-pair chunks of one row; ``seen_pairs`` carries de-duplication across rows."""
+        primary_id_col = plan["primary_id_column"]
+        documents: List[Dict[str, Any]] = []
+        row_id = self.link_row_id(row, plan)
+        if not row_id:
+            return documents
+        for link_col in plan["link_columns"]:
+            target_id = self._string_value(row.get(link_col))
+            if not target_id:
+                continue
+            pair_key = (link_col, row_id, target_id)
+            if pair_key in seen_pairs:
+                continue
+            seen_pairs.add(pair_key)
+
+            target = target_row(target_id)
+            header = [
+                "Linked Row Pair",
+                f"primary_id_column: {primary_id_col}",
+                f"source_row_id: {row_id}",
+                f"link_column: {link_col}",
+                f"target_row_id: {target_id}",
+            ]
+            source_text = self._row_to_text(row)
+            target_text = self._row_to_text(target) if target else f"{primary_id_col}: {target_id} | target row not found in dataset"
+            content = "\n".join(
+                header + [
+                    "",
+                    f"Source Row: {source_text}",
+                    f"Target Row: {target_text}",
+                ]
+            )
+
+            documents.append({
+                "content": content,
+                "page_number": first_page + len(documents),
+                "file_name": f"{source_name}_db",
+                "source_name": source_name,
+                "created_at": datetime.now().isoformat(),
+                "metadata": {
+                    "source_type": "database",
+                    "chunk_type": "linked_pair",
+                    "row_number": row_idx + 1,
+                    "primary_id_column": primary_id_col,
+                    "source_row_id": row_id,
+                    "target_row_id": target_id,
+                    "link_column": link_col,
+                    "pair_found_target": bool(target),
+                }
+            })
+        return documents
+
+    def _build_row_documents(
+        self,
+        data: List[Dict[str, Any]],
+        source_name: str,
+        row_offset: int = 0,
+        total_rows: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         """Build one chunk per row for deterministic aggregations."""
         documents = []
-        for i, row in enumerate(data):
+        for i, row in enumerate(data, start=row_offset):
             content = self._row_to_text(row)
             column_keys = [str(k) for k in row.keys()] if row else []
             duplicate_match_type = self._first_present(row, ("duplicate_match_type", "match_type", "label"))
@@ -174,7 +325,6 @@ class DocumentService:
                 "created_at": datetime.now().isoformat(),
                 "metadata": {
                     "row_number": i + 1,
-                    "total_rows": len(data),
                     "source_type": "database",
                     "chunk_type": "row",
                     "columns": ",".join(column_keys),
@@ -183,6 +333,8 @@ class DocumentService:
                     "claim_id": claim_id,
                 }
             })
+            if total_rows is not None:
+                documents[-1]["metadata"]["total_rows"] = total_rows
         return documents
 
     def _build_linked_row_documents(self, data: List[Dict[str, Any]], source_name: str) -> List[Dict[str, Any]]:
@@ -211,59 +363,13 @@ class DocumentService:
         if not link_cols:
             return []
 
-        rows_with_idx: List[Tuple[int, Dict[str, Any]]] = list(enumerate(data))
+        plan = {"primary_id_column": primary_id_col, "link_columns": link_cols}
         documents: List[Dict[str, Any]] = []
-        seen_pairs = set()
-
-        for row_idx, row in rows_with_idx:
-            row_id = self._string_value(row.get(primary_id_col))
-            if not row_id:
-                continue
-            for link_col in link_cols:
-                target_id = self._string_value(row.get(link_col))
-                if not target_id:
-                    continue
-                pair_key = (link_col, row_id, target_id)
-                if pair_key in seen_pairs:
-                    continue
-                seen_pairs.add(pair_key)
-
-                target_row = id_to_row.get(target_id)
-                header = [
-                    "Linked Row Pair",
-                    f"primary_id_column: {primary_id_col}",
-                    f"source_row_id: {row_id}",
-                    f"link_column: {link_col}",
-                    f"target_row_id: {target_id}",
-                ]
-                source_text = self._row_to_text(row)
-                target_text = self._row_to_text(target_row) if target_row else f"{primary_id_col}: {target_id} | target row not found in dataset"
-                content = "\n".join(
-                    header + [
-                        "",
-                        f"Source Row: {source_text}",
-                        f"Target Row: {target_text}",
-                    ]
-                )
-
-                documents.append({
-                    "content": content,
-                    "page_number": len(documents) + 1,
-                    "file_name": f"{source_name}_db",
-                    "source_name": source_name,
-                    "created_at": datetime.now().isoformat(),
-                    "metadata": {
-                        "source_type": "database",
-                        "chunk_type": "linked_pair",
-                        "row_number": row_idx + 1,
-                        "primary_id_column": primary_id_col,
-                        "source_row_id": row_id,
-                        "target_row_id": target_id,
-                        "link_column": link_col,
-                        "pair_found_target": bool(target_row),
-                    }
-                })
-
+        seen_pairs: Set[Tuple[str, str, str]] = set()
+        for row_idx, row in enumerate(data):
+            documents.extend(self.link_row_documents(
+                row_idx, row, plan, id_to_row.get, source_name, seen_pairs, first_page=len(documents) + 1
+            ))
         return documents
 
     def _infer_primary_id_column(self, data: List[Dict[str, Any]], columns: List[str]) -> Optional[str]:
@@ -376,12 +482,7 @@ class DocumentService:
     def extract_text_from_pdf_simple(self, file_path: str) -> str:
         """Extract text from a PDF file (simple version)"""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            return pdf_text_service.extract_text(file_path)
         except Exception as e:
             print(f"Error extracting text from PDF: {e}")
             return ""
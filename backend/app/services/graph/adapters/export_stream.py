@@ -0,0 +1,83 @@
+"""Shared batching, checkpoints and throughput metrics for streaming graph exports.
+
+A checkpoint is a small JSON-able dict::
+
+    {"phase": "nodes" | "edges" | "done", "after_id": str | None,
+     "nodes_written": int, "edges_written": int, ...}
+
+Exporters persist it after every batch they have durably written; passing it
+back resumes right after the last written row.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.services.graph.graph_store import graph_store
+
+CheckpointCallback = Callable[[Dict[str, Any]], None]
+
+
+def new_checkpoint() -> Dict[str, Any]:
+    return {"phase": "nodes", "after_id": None, "nodes_written": 0, "edges_written": 0}
+
+
+def iter_graph_batches(
+    fabric_id: str,
+    ontology_version_id: str,
+    batch_size: int,
+    checkpoint: Optional[Dict[str, Any]] = None,
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Yield ``("nodes", rows)`` then ``("edges", rows)`` batches, resuming from ``checkpoint``."""
+    cp = checkpoint or new_checkpoint()
+    if cp.get("phase") == "done":
+        return
+    if cp.get("phase", "nodes") == "nodes":
+        for rows in graph_store.iter_node_batches(
+            fabric_id, ontology_version_id, batch_size, after_id=cp.get("after_id")
+        ):
+            yield "nodes", rows
+        edge_after = None
+    else:
+        edge_after = cp.get("after_id")
+    for rows in graph_store.iter_edge_batches(fabric_id, ontology_version_id, batch_size, after_id=edge_after):
+        yield "edges", rows
+
+
+def advance(checkpoint: Dict[str, Any], phase: str, rows: List[Dict[str, Any]]) -> None:
+    """Record ``rows`` of ``phase`` as written."""
+    checkpoint["phase"] = phase
+    checkpoint["after_id"] = rows[-1]["id"]
+    checkpoint[f"{phase}_written"] = checkpoint.get(f"{phase}_written", 0) + len(rows)
+
+
+def finish(checkpoint: Dict[str, Any]) -> None:
+    checkpoint["phase"] = "done"
+    checkpoint["after_id"] = None
+
+
+class ExportMetrics:
+    """Rows, batches and rows/second for one export run (resumed rows are not re-counted)."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.batches = 0
+        self.nodes = 0
+        self.edges = 0
+
+    def add(self, phase: str, count: int) -> None:
+        self.batches += 1
+        if phase == "nodes":
+            self.nodes += count
+        else:
+            self.edges += count
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            "batches": self.batches,
+            "nodes_exported": self.nodes,
+            "edges_exported": self.edges,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round((self.nodes + self.edges) / elapsed, 1),
+        }
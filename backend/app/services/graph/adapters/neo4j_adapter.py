@@ -5,10 +5,39 @@ import logging
 from typing import Any, Dict, Optional
 
 from app.core.config import settings
+from app.services.graph.adapters.export_stream import (
+    CheckpointCallback,
+    ExportMetrics,
+    advance,
+    finish,
+    iter_graph_batches,
+    new_checkpoint,
+)
 from app.services.graph.graph_store import graph_store
 
 logger = logging.getLogger(__name__)
 
+CREATE_INDEX_CYPHER = (
+    "CREATE INDEX weave_node_key IF NOT EXISTS FOR (n:WeaveNode) ON (n.graph_key, n.node_id)"
+)
+CLEAR_GRAPH_CYPHER = """
+MATCH (n:WeaveNode {graph_key: $gk})
+CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS
+"""
+# MERGE keeps re-sent batches idempotent when an export resumes.
+UNWIND_NODES_CYPHER = """
+UNWIND $rows AS row
+MERGE (n:WeaveNode {graph_key: $gk, node_id: row.id})
+SET n.label = row.label, n.normalized_name = row.normalized_name, n.fabric_id = $fabric_id
+"""
+UNWIND_EDGES_CYPHER = """
+UNWIND $rows AS row
+MATCH (a:WeaveNode {graph_key: $gk, node_id: row.source})
+MATCH (b:WeaveNode {graph_key: $gk, node_id: row.target})
+MERGE (a)-[r:WEAVE_REL {graph_key: $gk, edge_id: row.id}]->(b)
+SET r.type = row.relationship_type, r.confidence = row.confidence
+"""
+
 
 class Neo4jAdapter:
     def is_configured(self) -> bool:
@@ -85,6 +114,69 @@ class Neo4jAdapter:
         finally:
             driver.close()
 
+    def stream_export(
+        self,
+        fabric_id: str,
+        ontology_version_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        checkpoint: Optional[Dict[str, Any]] = None,
+        on_checkpoint: Optional[CheckpointCallback] = None,
+        driver: Any = None,
+    ) -> Dict[str, Any]:
+        """Write the stored graph to Neo4j with one ``UNWIND`` statement per batch.
+
+        Rows are read from the graph store in id order, so memory stays at one batch.
+        ``checkpoint`` (as last passed to ``on_checkpoint``) resumes a previous run;
+        ``driver`` may be any object with the neo4j driver's ``session()``/``close()``.
+        """
+        version_id = graph_store.resolve_version_id(fabric_id, ontology_version_id)
+        if not version_id:
+            return {"status": "skipped", "reason": "No canonical graph for fabric"}
+        owns_driver = driver is None
+        if owns_driver:
+            if not self.is_configured():
+                return {"status": "skipped", "reason": "NEO4J_URI/NEO4J_PASSWORD not configured"}
+            try:
+                from neo4j import GraphDatabase
+            except ImportError:
+                return {"status": "skipped", "reason": "neo4j driver not installed (pip install neo4j)"}
+            driver = GraphDatabase.driver(
+                settings.NEO4J_URI,
+                auth=(settings.NEO4J_USER or "neo4j", settings.NEO4J_PASSWORD),
+            )
+
+        batch_size = max(1, batch_size or settings.GRAPH_EXPORT_BATCH_SIZE)
+        graph_key = f"{fabric_id}:{version_id}"
+        cp = dict(checkpoint) if checkpoint else new_checkpoint()
+        metrics = ExportMetrics()
+        try:
+            with driver.session() as session:
+                session.run(CREATE_INDEX_CYPHER)
+                if not checkpoint:
+                    session.run(CLEAR_GRAPH_CYPHER, gk=graph_key)
+                for phase, rows in iter_graph_batches(fabric_id, version_id, batch_size, cp):
+                    query = UNWIND_NODES_CYPHER if phase == "nodes" else UNWIND_EDGES_CYPHER
+                    session.run(query, rows=rows, gk=graph_key, fabric_id=fabric_id)
+                    advance(cp, phase, rows)
+                    metrics.add(phase, len(rows))
+                    if on_checkpoint:
+                        on_checkpoint(dict(cp))
+            finish(cp)
+            if on_checkpoint:
+                on_checkpoint(dict(cp))
+        finally:
+            if owns_driver:
+                driver.close()
+        return {
+            "status": "exported",
+            "uri": settings.NEO4J_URI,
+            "graph_key": graph_key,
+            "node_count": cp["nodes_written"],
+            "edge_count": cp["edges_written"],
+            "checkpoint": cp,
+            "metrics": metrics.as_dict(),
+        }
+
     def _cypher_preview(self, payload: Dict[str, Any]) -> str:
         lines = ["// Weave schema graph export preview"]
         for n in payload.get("nodes") or []:
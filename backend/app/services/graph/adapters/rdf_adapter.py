@@ -1,17 +1,29 @@
 """RDF / Stardog export adapter (Phase 3c)."""
 from __future__ import annotations
 
+import gzip
 import logging
-from typing import Any, Dict, Optional
+import os
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import quote
 
 import httpx
 
 from app.core.config import settings
+from app.services.graph.adapters.export_stream import (
+    CheckpointCallback,
+    ExportMetrics,
+    advance,
+    finish,
+    iter_graph_batches,
+    new_checkpoint,
+)
 from app.services.graph.graph_store import graph_store
 
 logger = logging.getLogger(__name__)
 
 WEAVE_NS = "http://weave.ai/ontology#"
+RDF_TYPE = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>"
 
 
 class RdfAdapter:
@@ -32,6 +44,125 @@ class RdfAdapter:
             "edge_count": payload.get("edge_count", 0),
         }
 
+    def stream_ntriples(
+        self,
+        fabric_id: str,
+        ontology_version_id: Optional[str] = None,
+        path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        compress: bool = True,
+        checkpoint: Optional[Dict[str, Any]] = None,
+        on_checkpoint: Optional[CheckpointCallback] = None,
+    ) -> Dict[str, Any]:
+        """Write the stored graph as N-Triples to ``path`` one batch at a time.
+
+        With ``compress`` each batch is appended as its own gzip member (the file
+        stays a valid .gz stream). The checkpoint records the file size after the
+        last complete batch; resuming truncates back to it, so no triple is
+        written twice and a torn write is discarded.
+        """
+        version_id = graph_store.resolve_version_id(fabric_id, ontology_version_id)
+        if not version_id:
+            return {"status": "skipped", "reason": "No canonical graph for fabric"}
+        if not path:
+            suffix = ".nt.gz" if compress else ".nt"
+            path = os.path.join(settings.GRAPH_EXPORT_DIR, quote(fabric_id, safe=""), f"{version_id}{suffix}")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        batch_size = max(1, batch_size or settings.GRAPH_EXPORT_BATCH_SIZE)
+        resume = bool(checkpoint) and os.path.exists(path)
+        cp = dict(checkpoint) if resume else new_checkpoint()
+        cp.setdefault("bytes_written", 0)
+        metrics = ExportMetrics()
+        with open(path, "r+b" if resume else "wb") as f:
+            f.truncate(cp["bytes_written"])
+            f.seek(cp["bytes_written"])
+            for phase, rows in iter_graph_batches(fabric_id, version_id, batch_size, cp):
+                lines = self._node_triples(fabric_id, rows) if phase == "nodes" else self._edge_triples(fabric_id, rows)
+                data = "".join(lines).encode("utf-8")
+                f.write(gzip.compress(data, compresslevel=6) if compress else data)
+                f.flush()
+                os.fsync(f.fileno())
+                advance(cp, phase, rows)
+                cp["bytes_written"] = f.tell()
+                metrics.add(phase, len(rows))
+                if on_checkpoint:
+                    on_checkpoint(dict(cp))
+        finish(cp)
+        if on_checkpoint:
+            on_checkpoint(dict(cp))
+        return {
+            "status": "generated",
+            "format": "ntriples",
+            "compressed": compress,
+            "path": path,
+            "node_count": cp["nodes_written"],
+            "edge_count": cp["edges_written"],
+            "bytes": cp["bytes_written"],
+            "checkpoint": cp,
+            "metrics": metrics.as_dict(),
+        }
+
+    def push_file_to_stardog(self, fabric_id: str, path: str) -> Dict[str, Any]:
+        """Upload an N-Triples file produced by ``stream_ntriples`` without loading it in memory."""
+        if not settings.STARDOG_ENDPOINT or not settings.STARDOG_DATABASE:
+            return {"status": "skipped", "reason": "STARDOG_ENDPOINT/STARDOG_DATABASE not configured"}
+        url = (
+            f"{settings.STARDOG_ENDPOINT.rstrip('/')}/"
+            f"{settings.STARDOG_DATABASE}/data?graph-uri=weave:{fabric_id}"
+        )
+        headers = {"Content-Type": "application/n-triples"}
+        if path.endswith(".gz"):
+            headers["Content-Encoding"] = "gzip"
+        auth = None
+        if settings.STARDOG_USERNAME and settings.STARDOG_PASSWORD:
+            auth = (settings.STARDOG_USERNAME, settings.STARDOG_PASSWORD)
+
+        def chunks() -> Iterator[bytes]:
+            with open(path, "rb") as f:
+                while True:
+                    block = f.read(1 << 20)
+                    if not block:
+                        return
+                    yield block
+
+        try:
+            resp = httpx.post(url, content=chunks(), headers=headers, auth=auth, timeout=600.0)
+            resp.raise_for_status()
+            return {"status": "uploaded", "url": url, "response_code": resp.status_code}
+        except Exception as exc:
+            logger.warning("Stardog upload failed: %s", exc)
+            return {"status": "failed", "error": str(exc)}
+
+    def _node_iri(self, fabric_id: str, node_id: str) -> str:
+        return f"<{WEAVE_NS}fabric/{quote(fabric_id, safe='')}/node/{quote(node_id, safe='')}>"
+
+    def _node_triples(self, fabric_id: str, rows: List[Dict[str, Any]]) -> List[str]:
+        lines: List[str] = []
+        for n in rows:
+            iri = self._node_iri(fabric_id, n["id"])
+            lines.append(f"{iri} {RDF_TYPE} <{WEAVE_NS}Entity> .\n")
+            lines.append(f'{iri} <{WEAVE_NS}label> "{self._nt_literal(n["label"])}" .\n')
+            lines.append(f'{iri} <{WEAVE_NS}normalizedName> "{self._nt_literal(n["normalized_name"])}" .\n')
+        return lines
+
+    def _edge_triples(self, fabric_id: str, rows: List[Dict[str, Any]]) -> List[str]:
+        return [
+            f"{self._node_iri(fabric_id, e['source'])} "
+            f"<{WEAVE_NS}{self._local_name(e['relationship_type'])}> "
+            f"{self._node_iri(fabric_id, e['target'])} .\n"
+            for e in rows
+        ]
+
+    def _nt_literal(self, value: str) -> str:
+        return (
+            (value or "")
+            .replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+
     def push_to_stardog(
         self,
         fabric_id: str,
@@ -101,8 +232,10 @@ class RdfAdapter:
         return {"@context": {"weave": WEAVE_NS}, "@graph": graph}
 
     def _pred(self, rel: str) -> str:
-        safe = "".join(c if c.isalnum() else "_" for c in rel)
-        return f"weave:{safe}"
+        return f"weave:{self._local_name(rel)}"
+
+    def _local_name(self, rel: str) -> str:
+        return "".join(c if c.isalnum() else "_" for c in rel)
 
     def _esc(self, value: str) -> str:
         return (value or "").replace('"', '\\"')
@@ -0,0 +1,117 @@
+"""Per-fabric cache of graph analytics and the LLM graph briefing.
+
+Entries are keyed by a content version: a hash of whatever the graph was
+built from (fabric document counts and timestamps, ontology version, canonical
+graph revision). Analytics are recomputed once per version. The LLM briefing
+records the version it was generated for. After a content change the previous
+briefing keeps being served, marked ``stale``, while a background thread
+generates the new one, so page views never wait on the LLM once a fabric has
+a briefing.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from app.db.models import GraphInsightRecord
+from app.db.session import db_session, get_session_factory
+
+logger = logging.getLogger(__name__)
+
+
+def content_version(*parts: Any) -> str:
+    payload = json.dumps(parts, default=str, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+
+
+class GraphInsightCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Thread] = {}
+
+    def get(self, fabric_id: str) -> Optional[Dict[str, Any]]:
+        session = get_session_factory()()
+        try:
+            row = session.get(GraphInsightRecord, fabric_id)
+            if not row:
+                return None
+            return {
+                "content_version": row.content_version,
+                "analytics": row.analytics or {},
+                "llm_insight": row.llm_insight,
+                "insight_version": row.insight_version,
+                "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+            }
+        finally:
+            session.close()
+
+    def put_analytics(self, fabric_id: str, version: str, analytics: Dict[str, Any]) -> None:
+        """Store analytics for ``version``; an existing (possibly stale) briefing is kept."""
+        with db_session() as session:
+            row = session.get(GraphInsightRecord, fabric_id)
+            if row is None:
+                row = GraphInsightRecord(fabric_id=fabric_id)
+                session.add(row)
+            row.content_version = version
+            row.analytics = analytics
+            row.updated_at = datetime.utcnow()
+
+    def put_insight(self, fabric_id: str, version: str, insight: Dict[str, Any]) -> bool:
+        """Store a briefing unless the fabric's content moved past ``version`` meanwhile."""
+        with db_session() as session:
+            row = session.get(GraphInsightRecord, fabric_id)
+            if row is None or row.content_version != version:
+                return False
+            row.llm_insight = insight
+            row.insight_version = version
+            row.updated_at = datetime.utcnow()
+        return True
+
+    def refresh_insight(
+        self,
+        fabric_id: str,
+        version: str,
+        compute: Callable[[], Dict[str, Any]],
+    ) -> bool:
+        """Generate the briefing for ``version`` on a background thread (one per fabric and version)."""
+        key = f"{fabric_id}:{version}"
+        with self._lock:
+            if key in self._inflight:
+                return False
+
+            def run() -> None:
+                try:
+                    insight = compute()
+                    # Failed generations are not cached; the next view retries.
+                    if insight.get("generated"):
+                        self.put_insight(fabric_id, version, insight)
+                except Exception:
+                    logger.exception("Background graph insight failed for %s", fabric_id)
+                finally:
+                    with self._lock:
+                        self._inflight.pop(key, None)
+
+            thread = threading.Thread(target=run, name=f"graph-insight-{fabric_id}", daemon=True)
+            self._inflight[key] = thread
+        thread.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until in-flight background refreshes finish."""
+        with self._lock:
+            threads = list(self._inflight.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def invalidate(self, fabric_id: str) -> None:
+        with db_session() as session:
+            row = session.get(GraphInsightRecord, fabric_id)
+            if row is not None:
+                session.delete(row)
+
+
+graph_insight_cache = GraphInsightCache()
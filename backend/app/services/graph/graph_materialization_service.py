@@ -1,9 +1,11 @@
 """Materialize canonical knowledge graph from approved ontology."""
 from __future__ import annotations
 
+import hashlib
 import logging
-import uuid
-from typing import Any, Dict, List, Optional
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.config import settings
 from app.models.ontology import OntologyElementStatus
@@ -14,6 +16,16 @@ from app.services.platform.fabric_store import fabric_store
 logger = logging.getLogger(__name__)
 
 
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 2)
+
+
+def _stable_id(prefix: str, *parts: str) -> str:
+    """Deterministic graph id so rebuilds of the same version reuse their rows."""
+    digest = hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+    return f"{prefix}_{digest[:20]}"
+
+
 class GraphMaterializationService:
     def materialize(
         self,
@@ -22,59 +34,22 @@ class GraphMaterializationService:
         storage_backend: Optional[str] = None,
     ) -> Dict[str, Any]:
         backend = (storage_backend or settings.GRAPH_STORAGE_BACKEND or "postgres").lower()
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
         version = ontology_db_repository.get_version(ontology_version_id)
         if not version:
             raise ValueError(f"Ontology version not found: {ontology_version_id}")
+        timings["load_ontology_ms"] = _elapsed_ms(started)
 
-        approved_classes = [
-            c for c in version.classes
-            if c.status in (OntologyElementStatus.APPROVED, OntologyElementStatus.DRAFT, OntologyElementStatus.REVIEWED)
-        ]
-        approved_rels = [
-            r for r in version.relationships
-            if r.status not in (OntologyElementStatus.REJECTED,)
-            and r.source_class_id and r.target_class_id
-        ]
-
-        class_to_node: Dict[str, str] = {}
-        nodes: List[Dict[str, Any]] = []
-        for c in approved_classes:
-            node_id = f"gn_{uuid.uuid4().hex[:12]}"
-            class_to_node[c.id] = node_id
-            props = {}
-            source_table = None
-            for a in version.attributes:
-                if a.class_id == c.id:
-                    props[a.attribute_name] = a.data_type_guess or "string"
-            nodes.append({
-                "id": node_id,
-                "ontology_class_id": c.id,
-                "label": c.name,
-                "normalized_name": c.normalized_name,
-                "properties": props,
-                "source_table": source_table,
-            })
+        started = time.perf_counter()
+        nodes, edges = self.build_graph(fabric_id, ontology_version_id, version)
+        timings["build_ms"] = _elapsed_ms(started)
 
-        edges: List[Dict[str, Any]] = []
-        for r in approved_rels:
-            src = class_to_node.get(r.source_class_id)
-            tgt = class_to_node.get(r.target_class_id)
-            if not src or not tgt:
-                continue
-            edges.append({
-                "id": f"ge_{uuid.uuid4().hex[:12]}",
-                "source_node_id": src,
-                "target_node_id": tgt,
-                "relationship_type": r.relationship_name,
-                "confidence": r.confidence_score,
-                "evidence_refs": [
-                    {"snippet": (ev.text_snippet or "")[:200]}
-                    for ev in (r.evidence or [])[:3]
-                ],
-            })
+        started = time.perf_counter()
+        counts = graph_store.sync_graph(fabric_id, ontology_version_id, nodes, edges)
+        timings["store_ms"] = _elapsed_ms(started)
 
-        graph_store.clear_fabric_version(fabric_id, ontology_version_id)
-        counts = graph_store.insert_graph(fabric_id, ontology_version_id, nodes, edges)
+        started = time.perf_counter()
         export_uris: Dict[str, Any] = {}
 
         if backend in ("neo4j", "all"):
@@ -86,6 +61,8 @@ class GraphMaterializationService:
             export_uris["rdf"] = rdf_adapter.export_fabric_graph(fabric_id, ontology_version_id)
             if backend == "stardog" and settings.STARDOG_ENDPOINT:
                 export_uris["stardog"] = rdf_adapter.push_to_stardog(fabric_id, ontology_version_id)
+        if export_uris:
+            timings["export_ms"] = _elapsed_ms(started)
 
         run_id = graph_store.record_build_run(
             fabric_id=fabric_id,
@@ -95,6 +72,7 @@ class GraphMaterializationService:
             edge_count=counts["edge_count"],
             storage_backend=backend,
             export_uris=export_uris,
+            phase_timings=timings,
         )
 
         fabric = fabric_store.get(fabric_id)
@@ -110,7 +88,68 @@ class GraphMaterializationService:
             "edge_count": counts["edge_count"],
             "storage_backend": backend,
             "export_uris": export_uris,
+            "changes": {k: v for k, v in counts.items() if k not in ("node_count", "edge_count")},
+            "phase_timings": timings,
         }
 
+    def build_graph(
+        self,
+        fabric_id: str,
+        ontology_version_id: str,
+        version: Any,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Nodes for approved classes and edges for their relationships, with stable ids."""
+        approved_classes = [
+            c for c in version.classes
+            if c.status in (OntologyElementStatus.APPROVED, OntologyElementStatus.DRAFT, OntologyElementStatus.REVIEWED)
+        ]
+        approved_rels = [
+            r for r in version.relationships
+            if r.status not in (OntologyElementStatus.REJECTED,)
+            and r.source_class_id and r.target_class_id
+        ]
+
+        props_by_class: Dict[str, Dict[str, str]] = defaultdict(dict)
+        for a in version.attributes:
+            props_by_class[a.class_id][a.attribute_name] = a.data_type_guess or "string"
+
+        class_to_node: Dict[str, str] = {}
+        nodes: List[Dict[str, Any]] = []
+        for c in approved_classes:
+            node_id = _stable_id("gn", fabric_id, ontology_version_id, c.id)
+            class_to_node[c.id] = node_id
+            nodes.append({
+                "id": node_id,
+                "ontology_class_id": c.id,
+                "label": c.name,
+                "normalized_name": c.normalized_name,
+                "properties": dict(props_by_class.get(c.id, {})),
+                "source_table": None,
+            })
+
+        edges: List[Dict[str, Any]] = []
+        seen_edges: set = set()
+        for r in approved_rels:
+            src = class_to_node.get(r.source_class_id)
+            tgt = class_to_node.get(r.target_class_id)
+            if not src or not tgt:
+                continue
+            edge_id = _stable_id("ge", fabric_id, ontology_version_id, r.id)
+            if edge_id in seen_edges:
+                continue
+            seen_edges.add(edge_id)
+            edges.append({
+                "id": edge_id,
+                "source_node_id": src,
+                "target_node_id": tgt,
+                "relationship_type": r.relationship_name,
+                "confidence": r.confidence_score,
+                "evidence_refs": [
+                    {"snippet": (ev.text_snippet or "")[:200]}
+                    for ev in (r.evidence or [])[:3]
+                ],
+            })
+        return nodes, edges
+
 
 graph_materialization_service = GraphMaterializationService()
@@ -4,13 +4,75 @@ from __future__ import annotations
 import logging
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from sqlalchemy import func, literal_column, or_, select, union_all
 
 from app.db.models import GraphBuildRunRecord, GraphEdgeRecord, GraphNodeRecord
 from app.db.session import db_session, get_session_factory
 
 logger = logging.getLogger(__name__)
 
+# Rows per bulk statement; keeps IN (...) lists under SQLite's variable limit.
+SYNC_BATCH_SIZE = 500
+
+_NODE_FIELDS = ("ontology_class_id", "label", "normalized_name", "properties", "source_table", "source_column")
+_EDGE_FIELDS = (
+    "source_node_id", "target_node_id", "relationship_type", "properties", "confidence", "evidence_refs",
+)
+
+
+def _node_columns(fields: str = "full"):
+    if fields == "ids":
+        return (GraphNodeRecord.id, GraphNodeRecord.label)
+    return (
+        GraphNodeRecord.id, GraphNodeRecord.label, GraphNodeRecord.normalized_name,
+        GraphNodeRecord.ontology_class_id, GraphNodeRecord.properties, GraphNodeRecord.source_table,
+    )
+
+
+def _edge_columns(fields: str = "full"):
+    columns = (
+        GraphEdgeRecord.id, GraphEdgeRecord.source_node_id.label("source"),
+        GraphEdgeRecord.target_node_id.label("target"), GraphEdgeRecord.relationship_type,
+    )
+    if fields == "ids":
+        return columns
+    return columns + (GraphEdgeRecord.confidence, GraphEdgeRecord.evidence_refs)
+
+
+def _batches(items: List[Any], size: int = SYNC_BATCH_SIZE) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _node_row(fabric_id: str, ontology_version_id: str, n: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": n["id"],
+        "fabric_id": fabric_id,
+        "ontology_version_id": ontology_version_id,
+        "ontology_class_id": n.get("ontology_class_id"),
+        "label": n["label"],
+        "normalized_name": n["normalized_name"],
+        "properties": n.get("properties") or {},
+        "source_table": n.get("source_table"),
+        "source_column": n.get("source_column"),
+    }
+
+
+def _edge_row(fabric_id: str, ontology_version_id: str, e: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": e["id"],
+        "fabric_id": fabric_id,
+        "ontology_version_id": ontology_version_id,
+        "source_node_id": e["source_node_id"],
+        "target_node_id": e["target_node_id"],
+        "relationship_type": e["relationship_type"],
+        "properties": e.get("properties") or {},
+        "confidence": float(e.get("confidence", 1.0)),
+        "evidence_refs": e.get("evidence_refs") or [],
+    }
+
 
 class GraphStore:
     def clear_fabric_version(self, fabric_id: str, ontology_version_id: str) -> None:
@@ -71,6 +133,83 @@ class GraphStore:
                 )
         return {"node_count": len(nodes), "edge_count": len(edges)}
 
+    def sync_graph(
+        self,
+        fabric_id: str,
+        ontology_version_id: str,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+    ) -> Dict[str, int]:
+        """Bring stored nodes/edges for a fabric version in line with ``nodes``/``edges``.
+
+        Rows are matched by id (callers use deterministic ids), so a rebuild only
+        inserts, updates or deletes what changed, using bulk statements.
+        """
+        node_rows = {n["id"]: _node_row(fabric_id, ontology_version_id, n) for n in nodes}
+        edge_rows = {e["id"]: _edge_row(fabric_id, ontology_version_id, e) for e in edges}
+        with db_session() as session:
+            existing_nodes = {
+                r.id: {f: getattr(r, f) for f in _NODE_FIELDS}
+                for r in session.query(GraphNodeRecord.id, *[getattr(GraphNodeRecord, f) for f in _NODE_FIELDS])
+                .filter(
+                    GraphNodeRecord.fabric_id == fabric_id,
+                    GraphNodeRecord.ontology_version_id == ontology_version_id,
+                )
+            }
+            existing_edges = {
+                r.id: {f: getattr(r, f) for f in _EDGE_FIELDS}
+                for r in session.query(GraphEdgeRecord.id, *[getattr(GraphEdgeRecord, f) for f in _EDGE_FIELDS])
+                .filter(
+                    GraphEdgeRecord.fabric_id == fabric_id,
+                    GraphEdgeRecord.ontology_version_id == ontology_version_id,
+                )
+            }
+
+            node_diff = self._diff(existing_nodes, node_rows, _NODE_FIELDS)
+            edge_diff = self._diff(existing_edges, edge_rows, _EDGE_FIELDS)
+
+            # Edges first on delete and nodes first on insert, for the FK constraints.
+            for ids in _batches(edge_diff["delete"]):
+                session.query(GraphEdgeRecord).filter(GraphEdgeRecord.id.in_(ids)).delete(
+                    synchronize_session=False
+                )
+            for ids in _batches(node_diff["delete"]):
+                session.query(GraphNodeRecord).filter(GraphNodeRecord.id.in_(ids)).delete(
+                    synchronize_session=False
+                )
+            session.bulk_insert_mappings(GraphNodeRecord, node_diff["insert"])
+            session.bulk_update_mappings(GraphNodeRecord, node_diff["update"])
+            session.bulk_insert_mappings(GraphEdgeRecord, edge_diff["insert"])
+            session.bulk_update_mappings(GraphEdgeRecord, edge_diff["update"])
+
+        return {
+            "node_count": len(node_rows),
+            "edge_count": len(edge_rows),
+            "nodes_inserted": len(node_diff["insert"]),
+            "nodes_updated": len(node_diff["update"]),
+            "nodes_deleted": len(node_diff["delete"]),
+            "edges_inserted": len(edge_diff["insert"]),
+            "edges_updated": len(edge_diff["update"]),
+            "edges_deleted": len(edge_diff["delete"]),
+        }
+
+    @staticmethod
+    def _diff(
+        existing: Dict[str, Dict[str, Any]],
+        desired: Dict[str, Dict[str, Any]],
+        fields: tuple,
+    ) -> Dict[str, List[Any]]:
+        insert: List[Dict[str, Any]] = []
+        update: List[Dict[str, Any]] = []
+        for row_id, row in desired.items():
+            current = existing.get(row_id)
+            if current is None:
+                insert.append(row)
+            elif any(current[f] != row[f] for f in fields):
+                update.append({"id": row_id, **{f: row[f] for f in fields}})
+        delete = [row_id for row_id in existing if row_id not in desired]
+        return {"insert": insert, "update": update, "delete": delete}
+
     def record_build_run(
         self,
         fabric_id: str,
@@ -81,6 +220,7 @@ class GraphStore:
         storage_backend: str = "postgres",
         export_uris: Optional[Dict[str, Any]] = None,
         error_message: Optional[str] = None,
+        phase_timings: Optional[Dict[str, float]] = None,
     ) -> str:
         run_id = f"gbr_{uuid.uuid4().hex[:12]}"
         with db_session() as session:
@@ -95,6 +235,7 @@ class GraphStore:
                     edge_count=edge_count,
                     export_uris=export_uris or {},
                     error_message=error_message,
+                    phase_timings=phase_timings or {},
                     built_at=datetime.utcnow() if status == "ready" else None,
                 )
             )
@@ -154,45 +295,284 @@ class GraphStore:
         finally:
             session.close()
 
+    def resolve_version_id(self, fabric_id: str, ontology_version_id: Optional[str] = None) -> Optional[str]:
+        """``ontology_version_id`` or, when omitted, the version of the fabric's stored graph."""
+        if ontology_version_id:
+            return ontology_version_id
+        session = get_session_factory()()
+        try:
+            row = (
+                session.query(GraphNodeRecord.ontology_version_id)
+                .filter(GraphNodeRecord.fabric_id == fabric_id)
+                .first()
+            )
+            return row[0] if row else None
+        finally:
+            session.close()
+
+    def count_graph(self, fabric_id: str, ontology_version_id: str) -> Dict[str, int]:
+        session = get_session_factory()()
+        try:
+            node_count = (
+                session.query(GraphNodeRecord.id)
+                .filter(
+                    GraphNodeRecord.fabric_id == fabric_id,
+                    GraphNodeRecord.ontology_version_id == ontology_version_id,
+                )
+                .count()
+            )
+            edge_count = (
+                session.query(GraphEdgeRecord.id)
+                .filter(
+                    GraphEdgeRecord.fabric_id == fabric_id,
+                    GraphEdgeRecord.ontology_version_id == ontology_version_id,
+                )
+                .count()
+            )
+            return {"node_count": node_count, "edge_count": edge_count}
+        finally:
+            session.close()
+
+    def graph_revision(self, fabric_id: str, ontology_version_id: str) -> Dict[str, Any]:
+        """Cheap fingerprint of a stored graph (latest build run + row counts) for ETags."""
+        session = get_session_factory()()
+        try:
+            run = (
+                session.query(GraphBuildRunRecord.id, GraphBuildRunRecord.created_at)
+                .filter(
+                    GraphBuildRunRecord.fabric_id == fabric_id,
+                    GraphBuildRunRecord.ontology_version_id == ontology_version_id,
+                )
+                .order_by(GraphBuildRunRecord.created_at.desc())
+                .first()
+            )
+        finally:
+            session.close()
+        return {
+            "build_run_id": run[0] if run else None,
+            **self.count_graph(fabric_id, ontology_version_id),
+        }
+
+    def get_graph_page(
+        self,
+        fabric_id: str,
+        ontology_version_id: str,
+        limit: int,
+        node_after: Optional[str] = None,
+        edge_after: Optional[str] = None,
+        fields: str = "full",
+    ) -> Dict[str, Any]:
+        """One page of up to ``limit`` nodes and ``limit`` edges, each after the given ids."""
+        session = get_session_factory()()
+        try:
+            nodes: List[Dict[str, Any]] = []
+            edges: List[Dict[str, Any]] = []
+            if node_after != "":
+                nodes = self._fetch_batch(
+                    session, GraphNodeRecord, _node_columns(fields), fabric_id, ontology_version_id,
+                    limit + 1, node_after,
+                )
+            if edge_after != "":
+                edges = self._fetch_batch(
+                    session, GraphEdgeRecord, _edge_columns(fields), fabric_id, ontology_version_id,
+                    limit + 1, edge_after,
+                )
+        finally:
+            session.close()
+        # "" marks an exhausted side so later pages skip its query.
+        more_nodes = len(nodes) > limit
+        more_edges = len(edges) > limit
+        nodes, edges = nodes[:limit], edges[:limit]
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "node_after": nodes[-1]["id"] if more_nodes else "",
+            "edge_after": edges[-1]["id"] if more_edges else "",
+            "has_more": more_nodes or more_edges,
+        }
+
+    def top_nodes_by_degree(
+        self,
+        fabric_id: str,
+        ontology_version_id: str,
+        top_n: int,
+        fields: str = "full",
+    ) -> Dict[str, Any]:
+        """The ``top_n`` highest-degree nodes (degree counted in SQL) and the edges among them."""
+        scope = (
+            GraphEdgeRecord.fabric_id == fabric_id,
+            GraphEdgeRecord.ontology_version_id == ontology_version_id,
+        )
+        endpoints = union_all(
+            select(GraphEdgeRecord.source_node_id.label("node_id")).where(*scope),
+            select(GraphEdgeRecord.target_node_id.label("node_id")).where(*scope),
+        ).subquery()
+        degree = func.count(literal_column("*")).label("degree")
+        session = get_session_factory()()
+        try:
+            ranked = session.execute(
+                select(endpoints.c.node_id, degree)
+                .group_by(endpoints.c.node_id)
+                .order_by(degree.desc(), endpoints.c.node_id)
+                .limit(top_n)
+            ).all()
+            degrees = {row.node_id: row.degree for row in ranked}
+            if len(degrees) < top_n:
+                # Pad with isolated nodes so small or sparse graphs still fill the overview.
+                isolated = (
+                    session.query(GraphNodeRecord.id)
+                    .filter(
+                        GraphNodeRecord.fabric_id == fabric_id,
+                        GraphNodeRecord.ontology_version_id == ontology_version_id,
+                    )
+                    .order_by(GraphNodeRecord.id)
+                    .limit(top_n)
+                )
+                for (node_id,) in isolated:
+                    if len(degrees) >= top_n:
+                        break
+                    degrees.setdefault(node_id, 0)
+            ids = list(degrees)
+            nodes: List[Dict[str, Any]] = []
+            edges: List[Dict[str, Any]] = []
+            for chunk in _batches(ids):
+                nodes.extend(
+                    dict(r._mapping)
+                    for r in session.query(*_node_columns(fields)).filter(GraphNodeRecord.id.in_(chunk))
+                )
+                edges.extend(
+                    dict(r._mapping)
+                    for r in session.query(*_edge_columns(fields)).filter(
+                        *scope, GraphEdgeRecord.source_node_id.in_(chunk),
+                    )
+                )
+        finally:
+            session.close()
+        keep = set(ids)
+        for n in nodes:
+            n["degree"] = degrees.get(n["id"], 0)
+        nodes.sort(key=lambda n: (-n["degree"], n["id"]))
+        return {"nodes": nodes, "edges": [e for e in edges if e["target"] in keep]}
+
+    def iter_node_batches(
+        self,
+        fabric_id: str,
+        ontology_version_id: str,
+        batch_size: int = 1000,
+        after_id: Optional[str] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream nodes in id order, ``batch_size`` at a time, starting after ``after_id``."""
+        yield from self._iter_batches(
+            GraphNodeRecord, _node_columns(), fabric_id, ontology_version_id, batch_size, after_id
+        )
+
+    def iter_edge_batches(
+        self,
+        fabric_id: str,
+        ontology_version_id: str,
+        batch_size: int = 1000,
+        after_id: Optional[str] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream edges in id order, ``batch_size`` at a time, starting after ``after_id``."""
+        columns = _edge_columns("ids") + (GraphEdgeRecord.confidence,)
+        yield from self._iter_batches(
+            GraphEdgeRecord, columns, fabric_id, ontology_version_id, batch_size, after_id
+        )
+
+    def _iter_batches(self, model, columns, fabric_id, ontology_version_id, batch_size, after_id):
+        # Keyset pagination on the primary key: each batch is an index range scan, memory stays
+        # at one batch, and the last id seen is a stable resume point.
+        session = get_session_factory()()
+        try:
+            while True:
+                rows = self._fetch_batch(
+                    session, model, columns, fabric_id, ontology_version_id, batch_size, after_id
+                )
+                if not rows:
+                    return
+                yield rows
+                after_id = rows[-1]["id"]
+                if len(rows) < batch_size:
+                    return
+        finally:
+            session.close()
+
+    @staticmethod
+    def _fetch_batch(session, model, columns, fabric_id, ontology_version_id, limit, after_id):
+        q = session.query(*columns).filter(
+            model.fabric_id == fabric_id,
+            model.ontology_version_id == ontology_version_id,
+        )
+        if after_id is not None:
+            q = q.filter(model.id > after_id)
+        return [dict(r._mapping) for r in q.order_by(model.id).limit(limit)]
+
     def get_neighbors(
         self,
         fabric_id: str,
         node_id: str,
         hops: int = 1,
         ontology_version_id: Optional[str] = None,
+        direction: str = "out",
+        limit: Optional[int] = None,
     ) -> Dict[str, Any]:
+        """Breadth-first neighbourhood of ``node_id``.
+
+        ``direction`` follows outgoing, incoming or both edge directions; ``limit``
+        caps the number of edges returned so hub nodes expand in bounded pages.
+        """
         hops = max(1, min(hops, 3))
         session = get_session_factory()()
         try:
             visited: Set[str] = {node_id}
             frontier: Set[str] = {node_id}
-            all_edges: List[GraphEdgeRecord] = []
+            seen_edges: Set[str] = set()
+            all_edges: List[Any] = []
+            truncated = False
             for _ in range(hops):
-                if not frontier:
+                if not frontier or truncated:
                     break
-                q = session.query(GraphEdgeRecord).filter(
+                clauses = []
+                if direction in ("out", "both"):
+                    clauses.append(GraphEdgeRecord.source_node_id.in_(list(frontier)))
+                if direction in ("in", "both"):
+                    clauses.append(GraphEdgeRecord.target_node_id.in_(list(frontier)))
+                q = session.query(*_edge_columns("ids")).filter(
                     GraphEdgeRecord.fabric_id == fabric_id,
-                    GraphEdgeRecord.source_node_id.in_(list(frontier)),
+                    or_(*clauses),
                 )
                 if ontology_version_id:
                     q = q.filter(GraphEdgeRecord.ontology_version_id == ontology_version_id)
-                edges = q.all()
-                all_edges.extend(edges)
+                q = q.order_by(GraphEdgeRecord.id)
+                if limit:
+                    q = q.limit(limit - len(all_edges) + 1)
                 next_frontier: Set[str] = set()
-                for e in edges:
-                    if e.target_node_id not in visited:
-                        next_frontier.add(e.target_node_id)
-                        visited.add(e.target_node_id)
+                for e in q:
+                    if e.id in seen_edges:
+                        continue
+                    if limit and len(all_edges) >= limit:
+                        truncated = True
+                        break
+                    seen_edges.add(e.id)
+                    all_edges.append(e)
+                    for other in (e.source, e.target):
+                        if other not in visited:
+                            next_frontier.add(other)
+                            visited.add(other)
                 frontier = next_frontier
 
-            node_recs = (
-                session.query(GraphNodeRecord)
-                .filter(GraphNodeRecord.id.in_(list(visited)))
-                .all()
-            )
+            node_recs = []
+            for chunk in _batches(list(visited)):
+                node_recs.extend(
+                    session.query(GraphNodeRecord.id, GraphNodeRecord.label, GraphNodeRecord.normalized_name)
+                    .filter(GraphNodeRecord.id.in_(chunk))
+                    .all()
+                )
             return {
                 "root_node_id": node_id,
                 "hops": hops,
+                "direction": direction,
+                "truncated": truncated,
                 "nodes": [
                     {"id": n.id, "label": n.label, "normalized_name": n.normalized_name}
                     for n in node_recs
@@ -200,8 +580,8 @@ class GraphStore:
                 "edges": [
                     {
                         "id": e.id,
-                        "source": e.source_node_id,
-                        "target": e.target_node_id,
+                        "source": e.source,
+                        "target": e.target,
                         "relationship_type": e.relationship_type,
                     }
                     for e in all_edges
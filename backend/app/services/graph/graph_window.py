@@ -0,0 +1,147 @@
+"""Windowing helpers for graph API payloads: cursors, field projection, top-N and ETags.
+
+Large fabrics produce graphs with tens of thousands of nodes; the UI pages
+through them (``limit`` + opaque ``cursor``), asks for ``fields=ids`` when it
+only needs ids and labels, or renders a ``top_n`` overview of the best
+connected nodes and expands neighbourhoods on demand.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, Request, Response
+
+MAX_PAGE_SIZE = 5000
+FIELD_SETS = ("full", "ids")
+
+_ID_NODE_KEYS = ("id", "label")
+_ID_EDGE_KEYS = ("id", "source", "target", "label", "relationship_type", "relation")
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    raw = json.dumps(state, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Dict[str, Any]:
+    if not cursor:
+        return {}
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid graph cursor")
+    if not isinstance(state, dict):
+        raise HTTPException(status_code=400, detail="Invalid graph cursor")
+    return state
+
+
+def decode_offset_cursor(cursor: Optional[str]) -> Dict[str, int]:
+    """Node and edge offsets (``n``/``e``) of an in-memory graph page cursor; 400 if malformed."""
+    state = decode_cursor(cursor)
+    offsets = {}
+    for key in ("n", "e"):
+        value = state.get(key, 0)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise HTTPException(status_code=400, detail="Invalid graph cursor")
+        offsets[key] = value
+    return offsets
+
+
+def check_window_params(limit: Optional[int], fields: str, top_n: Optional[int]) -> None:
+    if fields not in FIELD_SETS:
+        raise HTTPException(status_code=400, detail=f"fields must be one of {', '.join(FIELD_SETS)}")
+    for name, value in (("limit", limit), ("top_n", top_n)):
+        if value is not None and not 1 <= value <= MAX_PAGE_SIZE:
+            raise HTTPException(status_code=400, detail=f"{name} must be between 1 and {MAX_PAGE_SIZE}")
+
+
+def project(items: Iterable[Dict[str, Any]], keys: Iterable[str], fields: str) -> List[Dict[str, Any]]:
+    if fields == "full":
+        return list(items)
+    keys = tuple(keys)
+    return [{k: item[k] for k in keys if k in item} for item in items]
+
+
+def project_nodes(nodes: Iterable[Dict[str, Any]], fields: str) -> List[Dict[str, Any]]:
+    return project(nodes, _ID_NODE_KEYS, fields)
+
+
+def project_edges(edges: Iterable[Dict[str, Any]], fields: str) -> List[Dict[str, Any]]:
+    return project(edges, _ID_EDGE_KEYS, fields)
+
+
+def degree_counts(edges: Iterable[Dict[str, Any]]) -> Counter:
+    degrees: Counter = Counter()
+    for e in edges:
+        degrees[e.get("source")] += 1
+        degrees[e.get("target")] += 1
+    return degrees
+
+
+def window_graph(
+    graph: Dict[str, Any],
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: str = "full",
+    top_n: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Window an in-memory graph payload (``nodes``/``edges`` lists) in place and return it.
+
+    ``top_n`` keeps the highest-degree nodes and the edges among them; otherwise
+    ``limit`` pages nodes then edges with an offset cursor. Totals stay in
+    ``node_count``/``edge_count``.
+    """
+    nodes = graph.get("nodes") or []
+    edges = graph.get("edges") or []
+    if top_n:
+        degrees = degree_counts(edges)
+        ranked = sorted(nodes, key=lambda n: -degrees.get(n.get("id"), 0))[:top_n]
+        keep = {n.get("id") for n in ranked}
+        graph["nodes"] = project_nodes(
+            [{**n, "degree": degrees.get(n.get("id"), 0)} for n in ranked], fields
+        )
+        graph["edges"] = project_edges(
+            [e for e in edges if e.get("source") in keep and e.get("target") in keep], fields
+        )
+        graph["window"] = {"mode": "top_n", "top_n": top_n, "next_cursor": None}
+        return graph
+    if limit:
+        offsets = decode_offset_cursor(cursor)
+        node_offset, edge_offset = offsets["n"], offsets["e"]
+        page_nodes = nodes[node_offset:node_offset + limit]
+        page_edges = edges[edge_offset:edge_offset + limit]
+        next_state = {"n": node_offset + len(page_nodes), "e": edge_offset + len(page_edges)}
+        more = next_state["n"] < len(nodes) or next_state["e"] < len(edges)
+        graph["nodes"] = project_nodes(page_nodes, fields)
+        graph["edges"] = project_edges(page_edges, fields)
+        graph["window"] = {
+            "mode": "page",
+            "limit": limit,
+            "next_cursor": encode_cursor(next_state) if more else None,
+        }
+        return graph
+    graph["nodes"] = project_nodes(nodes, fields)
+    graph["edges"] = project_edges(edges, fields)
+    return graph
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1(
+        json.dumps(parts, default=str, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response when the client's ``If-None-Match`` already has ``etag``."""
+    header = request.headers.get("if-none-match") or ""
+    # Weak comparison (RFC 9110): ignore the W/ prefix on either side.
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if etag.removeprefix("W/") in candidates or "*" in candidates:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
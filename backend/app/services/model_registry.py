@@ -0,0 +1,199 @@
+"""
+In-process registry of loaded ML model bundles.
+
+A bundle is everything ``predict`` needs for one trained model: the best
+estimator, the fitted scaler, the per-column categorical encoders and the
+target label encoder. Bundles are loaded from disk once and kept in an LRU
+bounded by entry count and by approximate size (bytes of the pickles on disk),
+so steady-state predictions are pure inference.
+
+The estimator is served natively or, when the model's serving backend is
+``onnx`` (``metadata["serving"]`` or ``MODEL_SERVING_BACKEND``), through ONNX
+Runtime with per-model thread counts; models without an ONNX converter fall
+back to the native estimator.
+
+Entries are keyed by model id and stamped with the metadata version; a new
+stamp (retrain / overwrite) or an explicit ``invalidate`` forces a reload.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelBundle:
+    model_id: str
+    stamp: str
+    model_name: str
+    estimator: Any
+    scaler: Any
+    label_encoder: Any = None
+    feature_encoders: Optional[Dict[str, Any]] = None
+    feature_columns: Optional[List[str]] = None
+    size_bytes: int = 0
+    backend: str = "native"
+
+
+def model_stamp(metadata: Dict[str, Any]) -> str:
+    return str(metadata.get("updated_at") or metadata.get("created_at") or "")
+
+
+def best_model_name(metadata: Dict[str, Any]) -> str:
+    if metadata.get("best_model"):
+        return metadata["best_model"]
+    return max(metadata["models"], key=lambda m: m["accuracy"])["type"]
+
+
+def serving_options(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Serving backend and ONNX Runtime thread counts for a model (metadata overrides settings)."""
+    options = {
+        "backend": settings.MODEL_SERVING_BACKEND,
+        "intra_op_threads": settings.ONNX_INTRA_OP_THREADS,
+        "inter_op_threads": settings.ONNX_INTER_OP_THREADS,
+    }
+    options.update({k: v for k, v in (metadata.get("serving") or {}).items() if v is not None})
+    return options
+
+
+def _onnx_estimator(metadata: Dict[str, Any], estimator: Any, onnx_path: str, options: Dict[str, Any]) -> Any:
+    from app.services.onnx_serving import OnnxUnavailable, load_onnx_estimator
+
+    try:
+        return load_onnx_estimator(
+            estimator,
+            onnx_path,
+            n_features=metadata["preprocessing"]["feature_count"],
+            intra_op_threads=int(options["intra_op_threads"]),
+            inter_op_threads=int(options["inter_op_threads"]),
+        )
+    except OnnxUnavailable as exc:
+        logger.warning("Serving %s natively: %s", metadata["id"], exc)
+        return None
+
+
+def _load_pickle(path: str) -> Any:
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_bundle(metadata: Dict[str, Any]) -> ModelBundle:
+    """Read a model's artifacts from its model directory."""
+    paths = metadata["file_paths"]
+    model_dir = paths["model_dir"]
+    name = best_model_name(metadata)
+    files = {
+        "estimator": os.path.join(model_dir, paths["models"].get(name) or f"{name}.pkl"),
+        "scaler": os.path.join(model_dir, paths.get("scaler") or "scaler.pkl"),
+        "label_encoder": os.path.join(model_dir, paths.get("label_encoder") or "label_encoder.pkl"),
+        "feature_encoders": os.path.join(model_dir, paths.get("feature_encoders") or "feature_encoders.pkl"),
+    }
+    loaded = {key: _load_pickle(path) if os.path.exists(path) else None for key, path in files.items()}
+    if loaded["estimator"] is None or loaded["scaler"] is None:
+        raise ValueError(f"Model artifacts missing for {metadata['id']}")
+    sizes = {key: os.path.getsize(path) for key, path in files.items() if os.path.exists(path)}
+    backend = "native"
+    options = serving_options(metadata)
+    if options["backend"] == "onnx":
+        onnx_estimator = _onnx_estimator(
+            metadata, loaded["estimator"], os.path.join(model_dir, f"{name}.onnx"), options
+        )
+        if onnx_estimator is not None:
+            # The native estimator is dropped; only the ONNX session stays resident.
+            loaded["estimator"], backend = onnx_estimator, "onnx"
+            sizes["estimator"] = onnx_estimator.size_bytes
+    return ModelBundle(
+        model_id=metadata["id"],
+        stamp=model_stamp(metadata),
+        model_name=name,
+        estimator=loaded["estimator"],
+        scaler=loaded["scaler"],
+        label_encoder=loaded["label_encoder"],
+        feature_encoders=loaded["feature_encoders"],
+        feature_columns=(metadata.get("preprocessing") or {}).get("feature_columns"),
+        size_bytes=sum(sizes.values()),
+        backend=backend,
+    )
+
+
+class ModelRegistry:
+    """Thread-safe LRU of loaded ``ModelBundle``s."""
+
+    def __init__(self, max_models: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        self.max_models = max_models if max_models is not None else settings.MODEL_REGISTRY_MAX_MODELS
+        self.max_bytes = max_bytes if max_bytes is not None else settings.MODEL_REGISTRY_MAX_MB * 1024 * 1024
+        self._entries: "OrderedDict[str, ModelBundle]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        metadata: Dict[str, Any],
+        loader: Callable[[Dict[str, Any]], ModelBundle] = load_bundle,
+    ) -> ModelBundle:
+        model_id = metadata["id"]
+        stamp = model_stamp(metadata)
+        with self._lock:
+            bundle = self._entries.get(model_id)
+            if bundle is not None and bundle.stamp == stamp:
+                self._entries.move_to_end(model_id)
+                self.hits += 1
+                return bundle
+            load_lock = self._load_locks.setdefault(model_id, threading.Lock())
+        # One loader per model; concurrent callers wait for it instead of unpickling twice.
+        with load_lock:
+            with self._lock:
+                bundle = self._entries.get(model_id)
+                if bundle is not None and bundle.stamp == stamp:
+                    self._entries.move_to_end(model_id)
+                    self.hits += 1
+                    return bundle
+            bundle = loader(metadata)
+            with self._lock:
+                self.misses += 1
+                self._entries[model_id] = bundle
+                self._entries.move_to_end(model_id)
+                self._evict()
+            return bundle
+
+    def invalidate(self, model_id: str) -> None:
+        with self._lock:
+            self._entries.pop(model_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded_models": list(self._entries.keys()),
+                "backends": {model_id: b.backend for model_id, b in self._entries.items()},
+                "resident_bytes": sum(b.size_bytes for b in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _evict(self) -> None:
+        total = sum(b.size_bytes for b in self._entries.values())
+        # Always keep the most recently used entry, even if it alone exceeds the budget.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_models or total > self.max_bytes
+        ):
+            model_id, bundle = self._entries.popitem(last=False)
+            total -= bundle.size_bytes
+            logger.info("Evicted model %s from registry", model_id)
+
+
+model_registry = ModelRegistry()
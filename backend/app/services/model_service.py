@@ -1,61 +1,289 @@
+import copy
 import os
 import pickle
 import json
 import joblib
+import shutil
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Any, Optional
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.svm import SVC
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedKFold, train_test_split
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import accuracy_score, classification_report
 from imblearn.over_sampling import SMOTE
 
 from app.core.config import settings
+from app.services.model_registry import ModelBundle, best_model_name, model_registry
+from app.utils.tabular_io import copy_and_hash, ingest_to_parquet
+
+
+def _build_candidates(data_type: str) -> Dict[str, Any]:
+    """Unfitted candidate estimators for a data type"""
+    models = {}
+    if data_type == 'enterprise':
+        # Enterprise models
+        models['random_forest'] = RandomForestClassifier(n_estimators=100, random_state=42)
+        models['gradient_boosting'] = GradientBoostingClassifier(n_estimators=100, random_state=42)
+    elif data_type == 'text':
+        # Text models (simplified for demo)
+        models['svm'] = SVC(kernel='rbf', random_state=42)
+        models['random_forest'] = RandomForestClassifier(n_estimators=50, random_state=42)
+    else:
+        # General models
+        try:
+            import xgboost as xgb  # Lazy import: avoids native init at API startup
+            models['xgboost'] = xgb.XGBClassifier(random_state=42, n_jobs=1)
+        except Exception as xgb_error:
+            print(f"Warning: xgboost unavailable, falling back to RandomForest: {xgb_error}")
+            models['random_forest'] = RandomForestClassifier(n_estimators=100, random_state=42)
+        models['svm'] = SVC(kernel='rbf', random_state=42)
+    return models
+
+
+def _cv_fold_count(y: np.ndarray, requested: int) -> int:
+    """Stratified folds possible for ``y`` (0 disables CV when a class is too small)"""
+    if requested < 2 or len(y) == 0:
+        return 0
+    smallest_class = int(np.min(np.unique(y, return_counts=True)[1]))
+    folds = min(requested, smallest_class)
+    return folds if folds >= 2 else 0
+
+
+def _training_worker_count(requested: Optional[int], task_count: int) -> int:
+    budget = requested if requested else settings.TRAINING_MAX_WORKERS
+    if budget <= 0:
+        budget = os.cpu_count() or 1
+    return max(1, min(budget, task_count))
+
+
+def _task_message(result: Dict[str, Any]) -> str:
+    step = "final fit" if result['fold'] is None else f"CV fold {result['fold'] + 1}"
+    return f"{result['model_name']} {step}: accuracy {result['accuracy']:.3f}"
+
+
+def _run_training_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Fit one candidate on one CV fold (or the full training split) in a worker process"""
+    work_dir = task['work_dir']
+    X_train = np.load(os.path.join(work_dir, "X_train.npy"), mmap_mode='r')
+    y_train = np.load(os.path.join(work_dir, "y_train.npy"), mmap_mode='r')
+    model = _build_candidates(task['data_type'])[task['model_name']]
+
+    if task['fold'] is None:
+        with open(os.path.join(task['model_dir'], "scaler.pkl"), 'rb') as f:
+            scaler = pickle.load(f)
+        columns = task['feature_columns']
+        fit_X = scaler.transform(pd.DataFrame(X_train, columns=columns))
+        fit_y = np.asarray(y_train)
+        eval_X = scaler.transform(pd.DataFrame(np.load(os.path.join(work_dir, "X_test.npy")), columns=columns))
+        eval_y = np.load(os.path.join(work_dir, "y_test.npy"))
+    else:
+        splitter = StratifiedKFold(n_splits=task['folds'], shuffle=True, random_state=42)
+        train_idx, val_idx = list(splitter.split(np.zeros(len(y_train)), y_train))[task['fold']]
+        scaler = StandardScaler().fit(X_train[train_idx])
+        fit_X, fit_y = scaler.transform(X_train[train_idx]), y_train[train_idx]
+        eval_X, eval_y = scaler.transform(X_train[val_idx]), y_train[val_idx]
+
+    if task['smote']:
+        fit_X, fit_y = SMOTE(random_state=42).fit_resample(fit_X, fit_y)
+
+    started = time.perf_counter()
+    model.fit(fit_X, fit_y)
+    fit_seconds = time.perf_counter() - started
+    accuracy = float(accuracy_score(eval_y, model.predict(eval_X)))
+
+    if task['fold'] is None:
+        with open(os.path.join(task['model_dir'], f"{task['model_name']}.pkl"), 'wb') as f:
+            pickle.dump(model, f)
+    return {
+        'model_name': task['model_name'],
+        'fold': task['fold'],
+        'accuracy': accuracy,
+        'fit_seconds': fit_seconds,
+    }
 
 
 class ModelService:
     def __init__(self):
         self.models_dir = settings.MODELS_DIR
         self.metadata_file = os.path.join(settings.DATA_DIR, "trained_models.json")
+        # Uploaded training files converted to Parquet, named by the SHA-256 of the upload
+        self.datasets_dir = os.path.join(settings.DATA_DIR, "training_datasets")
         os.makedirs(self.models_dir, exist_ok=True)
         os.makedirs(settings.DATA_DIR, exist_ok=True)
-        
-    def load_models_metadata(self) -> List[Dict]:
-        """Load models metadata from file"""
-        if os.path.exists(self.metadata_file):
+        # (mtime_ns, size) of the metadata file -> parsed list and id index
+        self._metadata_cache = None
+
+    def _metadata_snapshot(self) -> Optional[tuple]:
+        """(key, models, id index) for the current metadata file, or None if there is none.
+
+        Callers use the returned tuple, never ``self._metadata_cache`` again:
+        a concurrent ``save_models_metadata`` may reset the cache meanwhile.
+        """
+        try:
+            st = os.stat(self.metadata_file)
+        except FileNotFoundError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        snapshot = self._metadata_cache
+        if not snapshot or snapshot[0] != key:
             with open(self.metadata_file, 'r') as f:
-                return json.load(f)
-        return []
+                models = json.load(f)
+            snapshot = (key, models, {m['id']: m for m in models})
+            self._metadata_cache = snapshot
+        return snapshot
+
+    def load_models_metadata(self) -> List[Dict]:
+        """Load models metadata from file (re-parsed only when the file changes)"""
+        snapshot = self._metadata_snapshot()
+        # Copies, so callers editing an entry cannot change the cached one.
+        return [dict(m) for m in snapshot[1]] if snapshot else []
     
     def save_models_metadata(self, models: List[Dict]):
         """Save models metadata to file"""
-        with open(self.metadata_file, 'w') as f:
+        tmp_path = f"{self.metadata_file}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(models, f, indent=2)
+        os.replace(tmp_path, self.metadata_file)
+        self._metadata_cache = None
     
-    def train_models(self, data: pd.DataFrame, data_type: str, preprocessing_options: Dict) -> Dict:
-        """Train ML models based on data type and options"""
+    def stage_training_upload(self, source: BinaryIO, filename: str, fmt: str) -> Dict:
+        """Convert an uploaded training file into a downcast Parquet dataset.
+
+        The upload is spooled to disk while hashing; a file whose hash was
+        ingested before reuses the existing Parquet without parsing.
+        """
+        import pyarrow.parquet as pq
+
+        os.makedirs(self.datasets_dir, exist_ok=True)
+        spool_path = os.path.join(self.datasets_dir, f".upload_{uuid.uuid4().hex}.{fmt}")
+        try:
+            digest = copy_and_hash(source, spool_path)
+            dataset_path = os.path.join(self.datasets_dir, f"{digest}.parquet")
+            cached = os.path.exists(dataset_path)
+            if cached:
+                info = {"path": dataset_path, "rows": pq.ParquetFile(dataset_path).metadata.num_rows}
+            else:
+                info = ingest_to_parquet(
+                    spool_path, fmt, dataset_path,
+                    chunk_rows=settings.TRAINING_INGEST_CHUNK_ROWS,
+                    category_max_unique=settings.TRAINING_CATEGORY_MAX_UNIQUE,
+                )
+        finally:
+            if os.path.exists(spool_path):
+                os.remove(spool_path)
+        return {**info, "filename": filename, "sha256": digest, "cached": cached}
+
+    def load_training_dataset(self, paths: List[str], max_rows: Optional[int] = None) -> pd.DataFrame:
+        """Read staged Parquet datasets (keeping their compact dtypes) as one frame.
+
+        Datasets above ``max_rows`` rows (default ``TRAINING_MAX_ROWS``) are
+        read record batch by record batch, keeping a sample stratified by the
+        target column, so memory is bounded by the sample rather than the files.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        max_rows = settings.TRAINING_MAX_ROWS if max_rows is None else max_rows
+        files = [pq.ParquetFile(path) for path in paths]
+        total = sum(f.metadata.num_rows for f in files)
+        if max_rows <= 0 or total <= max_rows:
+            frames = [pd.read_parquet(path) for path in paths]
+            return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+        # Same target column train_models picks: "target", else the last column.
+        names = files[0].schema_arrow.names
+        target = "target" if "target" in names else names[-1]
+        counts = pd.Series(dtype="int64")
+        for f in files:
+            column = f.read(columns=[target]).column(0).to_pandas().astype(str)
+            counts = counts.add(column.value_counts(), fill_value=0)
+        # A continuous target has no classes to balance: one stratum, sampled uniformly.
+        uniform = len(counts) > 100
+        counts = pd.Series({"*": total}) if uniform else counts.astype("int64")
+        # Every class keeps enough rows for cross-validation; the rest of the sample is proportional.
+        floor = max(2, settings.TRAINING_CV_FOLDS)
+        needed = {
+            key: int(min(count, max(floor, round(max_rows * count / total))))
+            for key, count in counts.items()
+        }
+        remaining = {key: int(count) for key, count in counts.items()}
+        rng = np.random.default_rng(42)
+        batches = []
+        for f in files:
+            for batch in f.iter_batches(batch_size=max(1, settings.TRAINING_INGEST_CHUNK_ROWS)):
+                values = batch.column(target).to_pandas()
+                keys = pd.Series("*", index=values.index) if uniform else values.astype(str)
+                keep: List[int] = []
+                for key, positions in keys.groupby(keys).indices.items():
+                    # Exact-size sampling over the stream: this batch's share of what the class still needs.
+                    others = remaining[key] - len(positions)
+                    take = needed[key]
+                    if take and others:
+                        take = int(rng.hypergeometric(len(positions), others, take))
+                    if take:
+                        keep.extend(rng.choice(positions, size=take, replace=False).tolist())
+                    needed[key] -= take
+                    remaining[key] = others
+                if keep:
+                    batches.append(batch.take(pa.array(sorted(keep))))
+        sample = pa.Table.from_batches(batches, schema=files[0].schema_arrow).to_pandas()
+        print(f"Training on a stratified sample of {len(sample)} of {total} rows")
+        return sample
+
+    def train_models(
+        self,
+        data: pd.DataFrame,
+        data_type: str,
+        preprocessing_options: Dict,
+        progress: Optional[Callable[[float, str], None]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict:
+        """Train ML models based on data type and options.
+
+        Every candidate is scored with stratified k-fold cross-validation on the
+        training split and refit on the full split for the holdout accuracy. The
+        fold fits and final fits run as independent tasks in a process pool capped
+        at ``max_workers`` (default ``TRAINING_MAX_WORKERS``); workers read the
+        feature matrix from memory-mapped .npy files in the model directory.
+        """
         try:
+            started = time.perf_counter()
+            report = progress or (lambda pct, message: None)
+            report(2.0, "Preparing features")
             # Prepare data
             if 'target' in data.columns:
                 X = data.drop('target', axis=1)
                 y = data['target']
             else:
                 # If no target column, use the last column as target
-                X = data.iloc[:, :-1]
+                X = data.iloc[:, :-1].copy()
                 y = data.iloc[:, -1]
             
-            # Handle categorical variables
-            categorical_columns = X.select_dtypes(include=['object']).columns
+            # Handle categorical variables; the fitted encoders are saved with the model
+            # so predictions reuse the training codes.
+            feature_encoders = {}
+            categorical_columns = X.select_dtypes(exclude=['number', 'bool']).columns
             for col in categorical_columns:
                 le = LabelEncoder()
-                X[col] = le.fit_transform(X[col].astype(str))
+                if isinstance(X[col].dtype, pd.CategoricalDtype):
+                    # Staged datasets arrive as categoricals: remap their codes instead of
+                    # materialising strings. Missing values get -1, as at prediction time.
+                    categories = X[col].cat.categories.astype(str)
+                    remap = le.fit(categories).transform(categories)
+                    codes = X[col].cat.codes.to_numpy()
+                    X[col] = np.where(codes >= 0, remap[codes], -1)
+                else:
+                    X[col] = le.fit_transform(X[col].astype(str))
+                feature_encoders[col] = le
             
             # Handle target variable
-            if y.dtype == 'object':
+            if not pd.api.types.is_numeric_dtype(y):
                 le_target = LabelEncoder()
                 y = le_target.fit_transform(y.astype(str))
             
@@ -64,69 +292,85 @@ class ModelService:
             
             # Apply preprocessing
             scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
-            
-            # Apply SMOTE if enabled
-            if preprocessing_options.get('smote_enabled', False):
-                smote = SMOTE(random_state=42)
-                X_train_scaled, y_train = smote.fit_resample(X_train_scaled, y_train)
-            
-            # Train models based on data type
-            models = {}
-            model_results = []
-            
-            if data_type == 'enterprise':
-                # Enterprise models
-                models['random_forest'] = RandomForestClassifier(n_estimators=100, random_state=42)
-                models['gradient_boosting'] = GradientBoostingClassifier(n_estimators=100, random_state=42)
-            elif data_type == 'text':
-                # Text models (simplified for demo)
-                models['svm'] = SVC(kernel='rbf', random_state=42)
-                models['random_forest'] = RandomForestClassifier(n_estimators=50, random_state=42)
-            else:
-                # General models
-                try:
-                    import xgboost as xgb  # Lazy import: avoids native init at API startup
-                    models['xgboost'] = xgb.XGBClassifier(random_state=42)
-                except Exception as xgb_error:
-                    print(f"Warning: xgboost unavailable, falling back to RandomForest: {xgb_error}")
-                    models['random_forest'] = RandomForestClassifier(n_estimators=100, random_state=42)
-                models['svm'] = SVC(kernel='rbf', random_state=42)
-            
-            # Train and evaluate models
-            for model_name, model in models.items():
-                model.fit(X_train_scaled, y_train)
-                y_pred = model.predict(X_test_scaled)
-                accuracy = accuracy_score(y_test, y_pred)
-                
-                model_results.append({
-                    'name': f"{data_type.title()} {model_name.replace('_', ' ').title()}",
-                    'type': model_name,
-                    'accuracy': accuracy,
-                    'status': 'completed'
-                })
-            
-            # Save models and preprocessing objects
+            scaler.fit(X_train)
+
             model_id = f"model_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
             model_dir = os.path.join(self.models_dir, model_id)
             os.makedirs(model_dir, exist_ok=True)
-            
-            # Save models
-            for model_name, model in models.items():
-                model_path = os.path.join(model_dir, f"{model_name}.pkl")
-                with open(model_path, 'wb') as f:
-                    pickle.dump(model, f)
-            
-            # Save preprocessing objects
-            scaler_path = os.path.join(model_dir, "scaler.pkl")
-            with open(scaler_path, 'wb') as f:
+            with open(os.path.join(model_dir, "scaler.pkl"), 'wb') as f:
                 pickle.dump(scaler, f)
+
+            work_dir = os.path.join(model_dir, "_train")
+            os.makedirs(work_dir, exist_ok=True)
+            for name, array in (
+                ("X_train", np.asarray(X_train, dtype=np.float64)),
+                ("X_test", np.asarray(X_test, dtype=np.float64)),
+                ("y_train", np.asarray(y_train)),
+                ("y_test", np.asarray(y_test)),
+            ):
+                np.save(os.path.join(work_dir, f"{name}.npy"), array)
+
+            smote_enabled = bool(preprocessing_options.get('smote_enabled', False))
+            candidate_names = list(_build_candidates(data_type).keys())
+            folds = _cv_fold_count(np.asarray(y_train), settings.TRAINING_CV_FOLDS)
+            base_task = {
+                'work_dir': work_dir,
+                'model_dir': model_dir,
+                'data_type': data_type,
+                'smote': smote_enabled,
+                'folds': folds,
+                'feature_columns': [str(c) for c in X.columns],
+            }
+            tasks = [
+                {**base_task, 'model_name': name, 'fold': fold}
+                for name in candidate_names
+                for fold in list(range(folds)) + [None]
+            ]
+            workers = _training_worker_count(max_workers, len(tasks))
+            report(5.0, f"Fitting {len(candidate_names)} model(s) x {folds} CV folds on {workers} worker(s)")
+            task_results = []
+            try:
+                if workers <= 1:
+                    for task in tasks:
+                        task_results.append(_run_training_task(task))
+                        report(5.0 + 90.0 * len(task_results) / len(tasks), _task_message(task_results[-1]))
+                else:
+                    with ProcessPoolExecutor(max_workers=workers) as pool:
+                        for done in as_completed([pool.submit(_run_training_task, t) for t in tasks]):
+                            task_results.append(done.result())
+                            report(5.0 + 90.0 * len(task_results) / len(tasks), _task_message(task_results[-1]))
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+            model_results = []
+            for name in candidate_names:
+                cv_scores = sorted(
+                    (r for r in task_results if r['model_name'] == name and r['fold'] is not None),
+                    key=lambda r: r['fold'],
+                )
+                final = next(r for r in task_results if r['model_name'] == name and r['fold'] is None)
+                scores = [r['accuracy'] for r in cv_scores]
+                model_results.append({
+                    'name': f"{data_type.title()} {name.replace('_', ' ').title()}",
+                    'type': name,
+                    'accuracy': final['accuracy'],
+                    'cv_scores': scores,
+                    'cv_mean': float(np.mean(scores)) if scores else None,
+                    'cv_std': float(np.std(scores)) if scores else None,
+                    'fit_seconds': round(final['fit_seconds'] + sum(r['fit_seconds'] for r in cv_scores), 3),
+                    'status': 'completed'
+                })
             
             if 'le_target' in locals():
                 le_path = os.path.join(model_dir, "label_encoder.pkl")
                 with open(le_path, 'wb') as f:
                     pickle.dump(le_target, f)
+
+            with open(os.path.join(model_dir, "feature_encoders.pkl"), 'wb') as f:
+                pickle.dump(feature_encoders, f)
+
+            best = max(model_results, key=lambda m: (m['cv_mean'] if m['cv_mean'] is not None else m['accuracy']))
+            training_seconds = round(time.perf_counter() - started, 3)
             
             # Save model metadata
             model_metadata = {
@@ -135,17 +379,27 @@ class ModelService:
                 'created_at': datetime.now().isoformat(),
                 'status': 'trained',
                 'models': model_results,
+                'best_model': best['type'],
+                'cross_validation': {
+                    'folds': folds,
+                    'strategy': 'stratified_kfold' if folds else 'none',
+                    'best_cv_score': best['cv_mean'],
+                },
+                'training_seconds': training_seconds,
+                'training_workers': workers,
                 'preprocessing': {
                     'scaler': True,
-                    'smote_applied': preprocessing_options.get('smote_enabled', False),
+                    'smote_applied': smote_enabled,
                     'feature_count': X.shape[1],
+                    'feature_columns': [str(c) for c in X.columns],
                     'sample_count': len(data)
                 },
                 'file_paths': {
                     'model_dir': model_dir,
-                    'models': {name: f"{name}.pkl" for name in models.keys()},
+                    'models': {name: f"{name}.pkl" for name in candidate_names},
                     'scaler': 'scaler.pkl',
-                    'label_encoder': 'label_encoder.pkl' if 'le_target' in locals() else None
+                    'label_encoder': 'label_encoder.pkl' if 'le_target' in locals() else None,
+                    'feature_encoders': 'feature_encoders.pkl'
                 }
             }
             
@@ -153,6 +407,8 @@ class ModelService:
             all_models = self.load_models_metadata()
             all_models.append(model_metadata)
             self.save_models_metadata(all_models)
+            model_registry.invalidate(model_id)
+            report(100.0, f"Training complete; best model {best['type']}")
             
             return {
                 'model_id': model_id,
@@ -166,12 +422,51 @@ class ModelService:
     
     def get_model(self, model_id: str) -> Optional[Dict]:
         """Get model metadata by ID"""
+        snapshot = self._metadata_snapshot()
+        model = snapshot[2].get(model_id) if snapshot else None
+        return copy.deepcopy(model) if model is not None else None
+
+    def delete_model(self, model_id: str) -> bool:
+        """Remove a model's metadata and artifacts and drop it from the registry"""
         models = self.load_models_metadata()
-        for model in models:
-            if model['id'] == model_id:
-                return model
-        return None
+        remaining = [m for m in models if m['id'] != model_id]
+        if len(remaining) == len(models):
+            return False
+        model = next(m for m in models if m['id'] == model_id)
+        self.save_models_metadata(remaining)
+        model_registry.invalidate(model_id)
+        model_dir = (model.get('file_paths') or {}).get('model_dir')
+        if model_dir and os.path.isdir(model_dir):
+            shutil.rmtree(model_dir, ignore_errors=True)
+        return True
     
+    def set_serving_options(
+        self,
+        model_id: str,
+        backend: Optional[str] = None,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None,
+    ) -> Dict:
+        """Choose the serving backend ("native" or "onnx") and ONNX Runtime threads for a model"""
+        if backend is not None and backend not in ("native", "onnx"):
+            raise ValueError(f"Unsupported serving backend: {backend}")
+        models = self.load_models_metadata()
+        model = next((m for m in models if m['id'] == model_id), None)
+        if model is None:
+            raise ValueError(f"Model {model_id} not found")
+        serving = dict(model.get('serving') or {})
+        for key, value in (
+            ('backend', backend), ('intra_op_threads', intra_op_threads), ('inter_op_threads', inter_op_threads),
+        ):
+            if value is not None:
+                serving[key] = value
+        model['serving'] = serving
+        # A new stamp makes the registry reload the bundle with the new backend.
+        model['updated_at'] = datetime.now().isoformat()
+        self.save_models_metadata(models)
+        model_registry.invalidate(model_id)
+        return serving
+
     def get_all_models(self) -> List[Dict]:
         """Get all trained models"""
         return self.load_models_metadata()
@@ -227,8 +522,8 @@ class ModelService:
                 from skl2onnx.common.data_types import FloatTensorType
                 
                 # Get the best model
-                best_model_name = max(model['models'], key=lambda x: x['accuracy'])['type']
-                model_path = os.path.join(model_dir, f"{best_model_name}.pkl")
+                best_name = best_model_name(model)
+                model_path = os.path.join(model_dir, f"{best_name}.pkl")
                 
                 with open(model_path, 'rb') as f:
                     sklearn_model = pickle.load(f)
@@ -247,12 +542,12 @@ class ModelService:
                     'format': 'onnx'
                 }
             except ImportError:
-                raise ValueError("ONNX conversion requires skl2onnx package")
+                raise ValueError("ONNX conversion requires skl2onnx (pip install -r requirements-onnx.txt)")
         
         elif format == 'joblib':
             # Use joblib format (scikit-learn standard)
-            best_model_name = max(model['models'], key=lambda x: x['accuracy'])['type']
-            model_path = os.path.join(model_dir, f"{best_model_name}.pkl")
+            best_name = best_model_name(model)
+            model_path = os.path.join(model_dir, f"{best_name}.pkl")
             
             # Convert to joblib
             with open(model_path, 'rb') as f:
@@ -270,58 +565,130 @@ class ModelService:
         else:
             raise ValueError(f"Unsupported format: {format}")
     
-    def predict(self, model_id: str, data: List[Dict]) -> Dict:
-        """Make predictions using a trained model"""
+    def get_bundle(self, model_id: str) -> ModelBundle:
+        """Loaded estimator + preprocessing for a model, served from the resident registry"""
         model = self.get_model(model_id)
         if not model:
             raise ValueError(f"Model {model_id} not found")
-        
-        model_dir = model['file_paths']['model_dir']
-        
-        # Load preprocessing objects
-        scaler_path = os.path.join(model_dir, 'scaler.pkl')
-        with open(scaler_path, 'rb') as f:
-            scaler = pickle.load(f)
-        
-        le_path = os.path.join(model_dir, 'label_encoder.pkl')
-        label_encoder = None
-        if os.path.exists(le_path):
-            with open(le_path, 'rb') as f:
-                label_encoder = pickle.load(f)
-        
-        # Convert data to DataFrame
-        df = pd.DataFrame(data)
-        
-        # Handle categorical variables
-        categorical_columns = df.select_dtypes(include=['object']).columns
-        for col in categorical_columns:
-            le = LabelEncoder()
-            df[col] = le.fit_transform(df[col].astype(str))
-        
-        # Scale data
-        X_scaled = scaler.transform(df)
-        
-        # Get best model
-        best_model_name = max(model['models'], key=lambda x: x['accuracy'])['type']
-        model_path = os.path.join(model_dir, f"{best_model_name}.pkl")
-        
-        with open(model_path, 'rb') as f:
-            sklearn_model = pickle.load(f)
+        return model_registry.get(model)
+
+    def prepare_features(self, bundle: ModelBundle, df: pd.DataFrame) -> np.ndarray:
+        """Encode and scale raw records the same way as at training time"""
+        if bundle.feature_columns:
+            missing = [c for c in bundle.feature_columns if c not in df.columns]
+            if missing:
+                raise ValueError(f"Missing feature columns: {', '.join(missing)}")
+            df = df.reindex(columns=bundle.feature_columns)
+        else:
+            df = df.copy()
+
+        if bundle.feature_encoders is None:
+            # Models trained before encoders were persisted: encode per request as before.
+            for col in df.select_dtypes(include=['object']).columns:
+                df[col] = LabelEncoder().fit_transform(df[col].astype(str))
+        else:
+            for col, encoder in bundle.feature_encoders.items():
+                if col in df.columns:
+                    # Same codes as LabelEncoder.transform; categories unseen at training map to -1.
+                    df[col] = pd.Categorical(df[col].astype(str), categories=encoder.classes_).codes
+        return bundle.scaler.transform(df)
+
+    def predict(self, model_id: str, data: List[Dict]) -> Dict:
+        """Make predictions using a trained model"""
+        bundle = self.get_bundle(model_id)
+        X_scaled = self.prepare_features(bundle, pd.DataFrame(data))
+        sklearn_model = bundle.estimator
         
         # Make predictions
         predictions = sklearn_model.predict(X_scaled)
         probabilities = sklearn_model.predict_proba(X_scaled) if hasattr(sklearn_model, 'predict_proba') else None
         
         # Convert predictions back to original labels if needed
-        if label_encoder:
-            predictions = label_encoder.inverse_transform(predictions)
+        if bundle.label_encoder is not None:
+            predictions = bundle.label_encoder.inverse_transform(predictions)
         
         return {
             'predictions': predictions.tolist(),
             'probabilities': probabilities.tolist() if probabilities is not None else None,
-            'model_used': best_model_name,
+            'model_used': bundle.model_name,
+            'serving_backend': bundle.backend,
             'confidence': float(np.max(probabilities)) if probabilities is not None else None
         }
 
+    def predict_chunks(
+        self,
+        model_id: str,
+        frames: Iterable[pd.DataFrame],
+        id_column: Optional[str] = None,
+        include_probabilities: bool = False,
+    ) -> Iterator[pd.DataFrame]:
+        """Score record chunks with the resident model; one output frame per input chunk"""
+        bundle = self.get_bundle(model_id)
+        estimator = bundle.estimator
+        has_proba = hasattr(estimator, 'predict_proba')
+        class_labels = None
+        if has_proba and include_probabilities:
+            class_labels = estimator.classes_
+            if bundle.label_encoder is not None:
+                class_labels = bundle.label_encoder.inverse_transform(class_labels)
+        row_offset = 0
+        for frame in frames:
+            if frame.empty:
+                continue
+            ids = frame[id_column].to_numpy() if id_column and id_column in frame.columns else None
+            features = frame
+            if ids is not None and not bundle.feature_columns:
+                features = frame.drop(columns=[id_column])
+            X_scaled = self.prepare_features(bundle, features)
+
+            out = pd.DataFrame({'row': np.arange(row_offset, row_offset + len(frame))})
+            if ids is not None:
+                out[id_column] = ids
+            predictions = estimator.predict(X_scaled)
+            if bundle.label_encoder is not None:
+                predictions = bundle.label_encoder.inverse_transform(predictions)
+            out['prediction'] = predictions
+            if has_proba:
+                probabilities = estimator.predict_proba(X_scaled)
+                out['confidence'] = probabilities.max(axis=1)
+                if class_labels is not None:
+                    for idx, label in enumerate(class_labels):
+                        out[f"proba_{label}"] = probabilities[:, idx]
+            row_offset += len(frame)
+            yield out
+
+    def stream_predictions(
+        self,
+        model_id: str,
+        frames: Iterable[pd.DataFrame],
+        output_format: str = 'ndjson',
+        id_column: Optional[str] = None,
+        include_probabilities: bool = False,
+    ) -> Iterator[str]:
+        """NDJSON or CSV text chunks for ``predict_chunks``.
+
+        The first chunk is scored before returning, so an unknown model or missing
+        feature columns raise ValueError here rather than midway through a response.
+        """
+        if output_format not in ('ndjson', 'csv'):
+            raise ValueError("output_format must be 'ndjson' or 'csv'")
+        chunks = self.predict_chunks(model_id, frames, id_column, include_probabilities)
+        first = next(chunks, None)
+
+        def render(out: pd.DataFrame, header: bool) -> str:
+            if output_format == 'csv':
+                return out.to_csv(index=False, header=header)
+            text = out.to_json(orient='records', lines=True)
+            return text if text.endswith('\n') else text + '\n'
+
+        def generate() -> Iterator[str]:
+            if first is None:
+                return
+            yield render(first, True)
+            for out in chunks:
+                yield render(out, False)
+
+        return generate()
+
 # Global instance
 model_service = ModelService()
@@ -0,0 +1,114 @@
+"""
+ONNX Runtime serving backend for trained tabular models.
+
+``OnnxEstimator`` wraps an ``onnxruntime.InferenceSession`` behind the subset of
+the scikit-learn estimator API that ``ModelService`` uses for scoring
+(``predict``, ``predict_proba``, ``classes_``), so a registry bundle can hold
+either. The graph is converted once with skl2onnx and cached next to the
+pickles as ``{model_name}.onnx``.
+
+Both packages are optional: when either is missing or the estimator has no
+converter (e.g. XGBoost without onnxmltools), ``load_onnx_estimator`` raises
+``OnnxUnavailable`` and the caller keeps the native estimator.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class OnnxUnavailable(Exception):
+    """The model cannot be served through ONNX Runtime."""
+
+
+def convert_estimator(estimator: Any, n_features: int) -> bytes:
+    """Serialized ONNX graph for a fitted scikit-learn estimator taking float32 features."""
+    try:
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+    except ImportError as exc:
+        raise OnnxUnavailable("skl2onnx is not installed") from exc
+
+    try:
+        onnx_model = convert_sklearn(
+            estimator,
+            initial_types=[("float_input", FloatTensorType([None, n_features]))],
+            options={id(estimator): {"zipmap": False}},
+        )
+    except Exception as exc:
+        raise OnnxUnavailable(f"No ONNX converter for {type(estimator).__name__}: {exc}") from exc
+    return onnx_model.SerializeToString()
+
+
+class OnnxEstimator:
+    """Scores float features through an ONNX Runtime CPU session."""
+
+    def __init__(
+        self,
+        model_bytes: bytes,
+        classes: Optional[np.ndarray] = None,
+        has_proba: bool = True,
+        intra_op_threads: int = 1,
+        inter_op_threads: int = 1,
+    ) -> None:
+        try:
+            import onnxruntime as ort
+        except ImportError as exc:
+            raise OnnxUnavailable("onnxruntime is not installed") from exc
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        self.session = ort.InferenceSession(model_bytes, options, providers=["CPUExecutionProvider"])
+        self._input = self.session.get_inputs()[0].name
+        outputs = [o.name for o in self.session.get_outputs()]
+        self._label_output = outputs[0]
+        self._proba_output = outputs[1] if has_proba and len(outputs) > 1 else None
+        self.classes_ = classes
+        self.size_bytes = len(model_bytes)
+
+    def _run(self, X: np.ndarray, output: str) -> np.ndarray:
+        return self.session.run([output], {self._input: np.asarray(X, dtype=np.float32)})[0]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self._run(X, self._label_output).ravel()
+
+    @property
+    def predict_proba(self):
+        # Mirrors scikit-learn: estimators without probabilities have no predict_proba at all.
+        if self._proba_output is None:
+            raise AttributeError("predict_proba")
+        return lambda X: self._run(X, self._proba_output)
+
+
+def load_onnx_estimator(
+    estimator: Any,
+    onnx_path: str,
+    n_features: int,
+    intra_op_threads: int = 1,
+    inter_op_threads: int = 1,
+) -> OnnxEstimator:
+    """ONNX Runtime replacement for ``estimator``, converting and caching the graph on first use."""
+    if os.path.exists(onnx_path):
+        with open(onnx_path, "rb") as f:
+            model_bytes = f.read()
+    else:
+        model_bytes = convert_estimator(estimator, n_features)
+        tmp_path = f"{onnx_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(model_bytes)
+        os.replace(tmp_path, onnx_path)
+        logger.info("Converted %s to ONNX (%d bytes)", onnx_path, len(model_bytes))
+    return OnnxEstimator(
+        model_bytes,
+        classes=getattr(estimator, "classes_", None),
+        has_proba=hasattr(estimator, "predict_proba"),
+        intra_op_threads=intra_op_threads,
+        inter_op_threads=inter_op_threads,
+    )
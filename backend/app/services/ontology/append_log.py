@@ -0,0 +1,164 @@
+"""Append-only JSON Lines log with group commit and keyed lookups.
+
+Records go to numbered segment files (``segments/000001.jsonl`` ...) that roll
+over at ``segment_bytes``; nothing is ever rewritten. Records appended with a
+key (e.g. a candidate id) are also written to one of ``KEY_BUCKETS`` hash
+bucket files, so listing one key reads a single small bucket instead of the
+whole history. Inside ``batch()`` appends are buffered per thread and written
+with one ``write`` + ``fsync`` per file when the outermost batch exits.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Fixed: changing it would send existing keys to different buckets.
+KEY_BUCKETS = 64
+
+
+def _bucket(key: str) -> str:
+    return f"{zlib.crc32(key.encode('utf-8')) % KEY_BUCKETS:02x}"
+
+
+class AppendLog:
+    def __init__(self, directory: str, segment_bytes: int = 8 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.segments_dir = os.path.join(directory, "segments")
+        self.keys_dir = os.path.join(directory, "keys")
+        self.segment_bytes = max(1, segment_bytes)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._segment: Optional[Tuple[int, int]] = None  # (number, size) of the open segment
+        os.makedirs(self.segments_dir, exist_ok=True)
+        os.makedirs(self.keys_dir, exist_ok=True)
+
+    # -- writing ---------------------------------------------------------------------
+
+    def append(self, record: Dict[str, Any], key: Optional[str] = None) -> None:
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append((record, key))
+        else:
+            self.append_many([(record, key)])
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group every ``append`` in this thread into one commit when the outermost batch exits."""
+        if getattr(self._local, "pending", None) is not None:
+            yield
+            return
+        self._local.pending = []
+        try:
+            yield
+        finally:
+            pending, self._local.pending = self._local.pending, None
+            if pending:
+                self.append_many(pending)
+
+    def append_many(self, items: Iterable[Tuple[Dict[str, Any], Optional[str]]]) -> None:
+        lines: List[str] = []
+        by_bucket: Dict[str, List[str]] = {}
+        for record, key in items:
+            line = json.dumps(record, default=str, separators=(",", ":")) + "\n"
+            lines.append(line)
+            if key:
+                keyed = json.dumps({"k": key, "r": record}, default=str, separators=(",", ":")) + "\n"
+                by_bucket.setdefault(_bucket(key), []).append(keyed)
+        if not lines:
+            return
+        with self._lock:
+            self._write_segment("".join(lines))
+            for bucket, bucket_lines in by_bucket.items():
+                self._write(os.path.join(self.keys_dir, f"{bucket}.jsonl"), "".join(bucket_lines))
+
+    def _write(self, path: str, data: str) -> int:
+        encoded = data.encode("utf-8")
+        with open(path, "ab") as f:
+            f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(encoded)
+
+    def _write_segment(self, data: str) -> None:
+        if self._segment is None:
+            numbers = self._segment_numbers()
+            number = numbers[-1] if numbers else 1
+            path = self._segment_path(number)
+            self._segment = (number, os.path.getsize(path) if os.path.exists(path) else 0)
+        number, size = self._segment
+        if size >= self.segment_bytes:
+            number, size = number + 1, 0
+        size += self._write(self._segment_path(number), data)
+        self._segment = (number, size)
+
+    # -- reading ---------------------------------------------------------------------
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.segments_dir, f"{number:06d}.jsonl")
+
+    def _segment_numbers(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self.segments_dir):
+            stem, ext = os.path.splitext(name)
+            if ext == ".jsonl" and stem.isdigit():
+                numbers.append(int(stem))
+        return sorted(numbers)
+
+    @staticmethod
+    def _lines(path: str) -> List[str]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return [line for line in f.read().splitlines() if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def read(self, limit: Optional[int] = None, offset: int = 0, key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Records newest first, skipping ``offset`` and returning at most ``limit``.
+
+        Without a key only the newest segments needed to fill the page are read;
+        with a key only that key's bucket file is. Unparseable lines (a torn
+        final write) are skipped.
+        """
+        offset = max(0, offset)
+        if limit is not None and limit <= 0:
+            return []
+        out: List[Dict[str, Any]] = []
+
+        def take(lines: List[str], keyed: bool) -> bool:
+            nonlocal offset
+            for line in reversed(lines):
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if keyed:
+                    if row.get("k") != key:
+                        continue
+                    row = row.get("r") or {}
+                if offset:
+                    offset -= 1
+                    continue
+                out.append(row)
+                if limit is not None and len(out) >= limit:
+                    return True
+            return False
+
+        if key:
+            take(self._lines(os.path.join(self.keys_dir, f"{_bucket(key)}.jsonl")), keyed=True)
+            return out
+        for number in reversed(self._segment_numbers()):
+            lines = self._lines(self._segment_path(number))
+            if offset >= len(lines):
+                # Whole segment precedes the page: skip without parsing it.
+                offset -= len(lines)
+                continue
+            if take(lines, keyed=False):
+                break
+        return out
+
+    def is_empty(self) -> bool:
+        return not self._segment_numbers()
@@ -11,7 +11,7 @@ from app.models.ontology import SourceArtifact
 class ArtifactLoader:
     """Loads files from the ontology upload directory only. Never reads from main app UPLOAD_DIR."""
 
-    ALLOWED_EXTENSIONS = (".pdf", ".xml", ".docx", ".png", ".jpg", ".jpeg", ".gif", ".webp")
+    ALLOWED_EXTENSIONS = (".pdf", ".xml", ".docx", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ndjson")
 
     def __init__(self):
         ontology_dir = getattr(settings, "ONTOLOGY_UPLOAD_DIR", None) or os.path.join(settings.ONTOLOGY_DATA_DIR, "uploads")
@@ -107,6 +107,8 @@ class ArtifactLoader:
             source_type = "docx"
         elif ext in (".png", ".jpg", ".jpeg", ".gif", ".webp"):
             source_type = "image"
+        elif ext == ".ndjson":
+            source_type = "fabric_chunks"
         else:
             source_type = "xml"
         return SourceArtifact(
@@ -194,40 +194,45 @@ class ConceptExtractor:
     def extract_from_tabular_row_chunks(
         self,
         chunks: List[Dict[str, Any]],
-        max_chunks: int = 120,
+        max_chunks: Optional[int] = None,
+        batch_size: int = 5000,
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Infer entities, FK-style relationships, and attributes from database/CSV row text
         formatted as ``key: value | key: value`` (common for vectorized tabular rows).
+
+        Every row chunk (or the first ``max_chunks``) is fed through the vectorized
+        column profiler, so columns that are sparse in the leading rows are still found.
         """
+        from app.services.analytics.column_profiler import ColumnProfiler
+
         entities: List[Dict[str, Any]] = []
         relationships: List[Dict[str, Any]] = []
         attributes: List[Dict[str, Any]] = []
 
-        sampled_texts: List[str] = []
-        for c in chunks[:max_chunks]:
+        profiler = ColumnProfiler()
+        batch: List[str] = []
+        for c in chunks if max_chunks is None else chunks[:max_chunks]:
             text = (c.get("content") or "").strip()
             if len(text) < 8 or ":" not in text:
                 continue
             if "|" not in text and text.count(":") < 2:
                 continue
-            sampled_texts.append(text)
-
-        if not sampled_texts:
-            return {
-                "entities": entities,
-                "relationships": relationships,
-                "attributes": attributes,
-                "enumerations": [],
-            }
+            batch.append(text)
+            if len(batch) >= batch_size:
+                profiler.add_row_texts(batch)
+                batch = []
+        profiler.add_row_texts(batch)
 
-        pair_lists: List[List[Tuple[str, str]]] = []
-        for text in sampled_texts:
-            pairs = self._parse_kv_pipe_row(text)
-            if len(pairs) >= 2:
-                pair_lists.append(pairs)
+        unique_keys: List[str] = []
+        seen_k = set()
+        for k in profiler.columns:
+            lk = k.lower()
+            if lk not in seen_k:
+                seen_k.add(lk)
+                unique_keys.append(k)
 
-        if not pair_lists:
+        if len(unique_keys) < 2:
             return {
                 "entities": entities,
                 "relationships": relationships,
@@ -235,15 +240,6 @@ class ConceptExtractor:
                 "enumerations": [],
             }
 
-        unique_keys: List[str] = []
-        seen_k = set()
-        for pairs in pair_lists:
-            for k, _ in pairs:
-                lk = k.lower()
-                if lk not in seen_k:
-                    seen_k.add(lk)
-                    unique_keys.append(k)
-
         root_display = self._infer_root_entity_from_keys(unique_keys)
         entity_names_added: set = set()
 
@@ -558,18 +554,6 @@ class ConceptExtractor:
                 words.append(w.capitalize())
         return " ".join(words) or token
 
-    def _parse_kv_pipe_row(self, text: str) -> List[Tuple[str, str]]:
-        pairs: List[Tuple[str, str]] = []
-        for segment in re.split(r"\s*\|\s*", text):
-            segment = segment.strip()
-            if ":" not in segment:
-                continue
-            key, _, rest = segment.partition(":")
-            key, rest = key.strip(), rest.strip()
-            if key:
-                pairs.append((key, rest))
-        return pairs
-
     def _infer_root_entity_from_keys(self, keys: List[str]) -> str:
         kl = [k.lower() for k in keys]
         priority = [
@@ -16,6 +16,7 @@ from .pdf_processor import PDFProcessor
 from .docx_processor import DocxProcessor
 from .xml_processor import XMLProcessor
 from .image_processor import ImageProcessor
+from .fabric_artifact_bridge import load_fabric_chunks
 from .semantic_chunker import SemanticChunker
 from .concept_extractor import ConceptExtractor
 from .ontology_classifier import OntologyClassifier
@@ -156,6 +157,11 @@ class DiscoveryOrchestrator:
                     rule_relationships.extend(extracted["relationships"])
                     rule_attributes.extend(extracted["attributes"])
                     rule_rules.extend(extracted["business_rules"])
+            elif art.source_type == "fabric_chunks":
+                log(DiscoveryRunStage.ARTIFACT_LOAD.value, f"Loading fabric chunks {art.file_name}", 20.0)
+                chunks, ev_list = load_fabric_chunks(art)
+                all_evidence.extend(ev_list)
+                all_text_chunks.extend(chunks)
             else:
                 log(DiscoveryRunStage.XML_PROCESS.value, f"Processing XML {art.file_name}", 20.0)
                 full_text, hierarchy, repeated, ev_list = self.xml_processor.process(art)
@@ -1,17 +1,29 @@
-"""Bridge Knowledge Fabric sources (PDF, etc.) into ontology discovery artifacts."""
+"""Bridge Knowledge Fabric sources (PDF, etc.) into ontology discovery artifacts.
+
+A fabric whose uploaded files are not on disk (database, CSV and API fabrics)
+is linked through a chunk artifact: ``{fabric_id}_fabric_chunks.ndjson`` in
+the ontology upload directory, holding a header line and a stratified sample
+of the fabric's chunks as ``{"id", "content", "metadata"}`` records. The
+header carries the fabric's content version, so linking the same, unchanged
+fabric again reuses the file without touching the vector store, and discovery
+reads the chunks as they are instead of re-parsing and re-chunking them.
+"""
 from __future__ import annotations
 
-import html
+import json
 import os
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.config import settings
-from app.models.ontology import SourceArtifact
+from app.models.ontology import OntologyEvidence, SourceArtifact
+from app.services.graph.graph_insight_cache import content_version
 from app.services.platform.fabric_store import fabric_store
 from app.services.vector_service import vector_service
 
+FABRIC_CHUNKS_SUFFIX = "_fabric_chunks.ndjson"
+
 
 def _source_type_from_name(file_name: str, fallback: str = "xml") -> str:
     ext = os.path.splitext(file_name)[1].lower()
@@ -26,32 +38,97 @@ def _source_type_from_name(file_name: str, fallback: str = "xml") -> str:
     return fallback
 
 
-def _materialize_fabric_documents_to_xml(fabric_id: str) -> Optional[str]:
-    docs_payload = vector_service.get_source_documents(fabric_id)
-    documents = docs_payload.get("documents") if isinstance(docs_payload, dict) else []
-    if not isinstance(documents, list) or not documents:
-        return None
+def fabric_chunks_path(fabric_id: str) -> str:
+    return os.path.join(settings.ONTOLOGY_UPLOAD_DIR, f"{fabric_id}{FABRIC_CHUNKS_SUFFIX}")
 
-    upload_dir = settings.ONTOLOGY_UPLOAD_DIR
-    os.makedirs(upload_dir, exist_ok=True)
-    file_name = f"{fabric_id}_fabric_source.xml"
-    file_path = os.path.join(upload_dir, file_name)
 
-    selected_docs = [str(doc) for doc in documents[:300] if isinstance(doc, str) and doc.strip()]
-    if not selected_docs:
-        return None
+def _fabric_content_version(fabric: Dict[str, Any], sample_size: int) -> str:
+    return content_version(
+        fabric.get("id"),
+        {k: fabric.get(k) for k in ("updated_at", "document_count", "total_chunks")},
+        sample_size,
+    )
+
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write("<fabricSource>\n")
-        for idx, chunk in enumerate(selected_docs, start=1):
-            f.write(f'  <chunk id="{idx}">{html.escape(chunk)}</chunk>\n')
-        f.write("</fabricSource>\n")
-    return file_path
+def _read_header(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+    except (OSError, ValueError):
+        return {}
+    return header if isinstance(header, dict) else {}
+
+
+def materialize_fabric_chunks(fabric: Dict[str, Any]) -> Optional[str]:
+    """Write (or reuse) the fabric's chunk artifact; returns its path, or None if it has no chunks."""
+    fabric_id = str(fabric.get("id") or "")
+    if not fabric_id:
+        return None
+    sample_size = settings.ONTOLOGY_FABRIC_SAMPLE_CHUNKS
+    version = _fabric_content_version(fabric, sample_size)
+    path = fabric_chunks_path(fabric_id)
+    if os.path.isfile(path) and _read_header(path).get("content_version") == version:
+        return path
+
+    chunks = [
+        c for c in vector_service.sample_source_chunks(fabric_id, sample_size)
+        if isinstance(c.get("content"), str) and c["content"].strip()
+    ]
+    if not chunks:
+        return None
+    os.makedirs(settings.ONTOLOGY_UPLOAD_DIR, exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        header = {
+            "fabric_id": fabric_id,
+            "content_version": version,
+            "sampled_chunks": len(chunks),
+            "total_chunks": fabric.get("total_chunks"),
+        }
+        f.write(json.dumps(header, default=str) + "\n")
+        for chunk in chunks:
+            f.write(json.dumps(chunk, default=str) + "\n")
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_fabric_chunks(artifact: SourceArtifact) -> Tuple[List[Dict[str, Any]], List[OntologyEvidence]]:
+    """Text chunks and evidence for discovery, straight from a chunk artifact."""
+    chunks: List[Dict[str, Any]] = []
+    evidence: List[OntologyEvidence] = []
+    with open(artifact.file_path, "r", encoding="utf-8") as f:
+        f.readline()  # header
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            content = str(record.get("content") or "")
+            chunks.append({
+                "content": content,
+                "index": len(chunks),
+                "start_char": 0,
+                "end_char": len(content),
+                "chunk_id": record.get("id"),
+                "artifact_id": artifact.id,
+                "artifact_type": "fabric",
+            })
+            evidence.append(
+                OntologyEvidence(
+                    id=f"evt_{artifact.id}_{len(evidence)}",
+                    artifact_id=artifact.id,
+                    artifact_type="fabric",
+                    text_snippet=content[:200],
+                    extraction_stage="fabric_chunks",
+                )
+            )
+    return chunks, evidence
 
 
-def resolve_artifacts_for_fabric(fabric_id: str, project_id: str) -> List[SourceArtifact]:
+def resolve_artifacts_for_fabric(
+    fabric_id: str, project_id: str, fabric: Optional[Dict[str, Any]] = None
+) -> List[SourceArtifact]:
     """Find or materialize ontology-readable artifacts for a knowledge fabric."""
-    fabric = fabric_store.get(fabric_id)
+    fabric = fabric or fabric_store.get(fabric_id)
     if not fabric:
         return []
 
@@ -88,24 +165,40 @@ def resolve_artifacts_for_fabric(fabric_id: str, project_id: str) -> List[Source
             break
 
     if not linked:
-        materialized_path = _materialize_fabric_documents_to_xml(fabric_id)
+        materialized_path = materialize_fabric_chunks({**fabric, "id": fabric.get("id") or fabric_id})
         if materialized_path and os.path.isfile(materialized_path):
-            file_name = os.path.basename(materialized_path)
+            header = _read_header(materialized_path)
             linked.append(
                 SourceArtifact(
                     id=f"art_{uuid.uuid4().hex[:12]}",
-                    file_name=file_name,
+                    file_name=os.path.basename(materialized_path),
                     file_path=os.path.abspath(materialized_path),
-                    source_type="xml",
+                    source_type="fabric_chunks",
                     project_id=project_id,
                     ingestion_time=datetime.utcnow(),
-                    metadata={"fabric_id": fabric_id, "linked_from": "vector_documents"},
+                    version=header.get("content_version"),
+                    metadata={
+                        "fabric_id": fabric_id,
+                        "linked_from": "vector_documents",
+                        "sampled_chunks": header.get("sampled_chunks"),
+                    },
                 )
             )
 
     return linked
 
 
+def refresh_fabric_chunk_artifacts(artifacts: List[SourceArtifact]) -> None:
+    """Re-sample the chunk artifacts of fabrics that changed since they were linked."""
+    for artifact in artifacts:
+        fabric_id = (artifact.metadata or {}).get("fabric_id")
+        if artifact.source_type != "fabric_chunks" or not fabric_id:
+            continue
+        fabric = fabric_store.get(fabric_id)
+        if fabric:
+            materialize_fabric_chunks(fabric)
+
+
 def artifact_paths_for_discovery(artifacts: List[SourceArtifact]) -> List[str]:
     """Return absolute file paths for the discovery orchestrator."""
     return [a.file_path for a in artifacts if a.file_path and os.path.isfile(a.file_path)]
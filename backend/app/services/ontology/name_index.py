@@ -0,0 +1,110 @@
+"""Trigram inverted index for fuzzy attribute-name matching.
+
+Matching a field against every ontology attribute with ``SequenceMatcher`` is
+O(fields x attributes). The index maps character trigrams of normalised names
+to the entries containing them; a query ranks entries by shared trigrams (Dice
+coefficient), adds exact and synonym hits, and only those top-k candidates get
+the exact ``name_similarity`` score. Indexes with at most ``k`` entries are
+scored exhaustively, so small ontologies match exactly as before; on large
+ones near-duplicate names are always among the candidates, while a weaker
+match through a shared substring in an otherwise unrelated name can rank
+outside the top ``k``.
+"""
+from __future__ import annotations
+
+import heapq
+import re
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+
+def normalize_name(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(name).lower()).strip("_")
+
+
+def _trigrams(normalized: str) -> Set[str]:
+    padded = f"^{normalized}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _is_synonym(a: str, b: str, synonyms: Mapping[str, Sequence[str]]) -> bool:
+    return (a in synonyms and b in synonyms[a]) or (b in synonyms and a in synonyms[b])
+
+
+def name_similarity(a: str, b: str, synonyms: Optional[Mapping[str, Sequence[str]]] = None) -> float:
+    """Similarity of two normalised names: exact 1.0, synonym 0.95, else SequenceMatcher ratio."""
+    if a == b:
+        return 1.0
+    synonym = 0.95 if synonyms and _is_synonym(a, b, synonyms) else 0.0
+    return max(synonym, SequenceMatcher(None, a, b).ratio())
+
+
+class FuzzyNameIndex:
+    def __init__(
+        self,
+        entries: Iterable[Tuple[str, Any]],
+        synonyms: Optional[Mapping[str, Sequence[str]]] = None,
+    ) -> None:
+        """Index ``(name, payload)`` pairs; payloads are returned by ``best_match`` / ``matches``."""
+        self.synonyms = synonyms or {}
+        self.names: List[str] = []
+        self.payloads: List[Any] = []
+        self._gram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        for name, payload in entries:
+            normalized = normalize_name(name)
+            idx = len(self.names)
+            self.names.append(normalized)
+            self.payloads.append(payload)
+            grams = _trigrams(normalized)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(idx)
+            self._exact[normalized].append(idx)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def candidates(self, name: str, k: int = 64) -> List[int]:
+        """Entry ids worth exact scoring: exact and synonym hits plus the top ``k`` by trigram overlap."""
+        if len(self.names) <= k:
+            return list(range(len(self.names)))
+        query = normalize_name(name)
+        picked: Dict[int, None] = {}
+        for target in [query, *self.synonyms.get(query, ())]:
+            for idx in self._exact.get(target, ()):
+                picked[idx] = None
+        for source, targets in self.synonyms.items():
+            if query in targets:
+                for idx in self._exact.get(source, ()):
+                    picked[idx] = None
+        grams = _trigrams(query)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        size = len(grams)
+        counts = self._gram_counts
+        ranked = heapq.nsmallest(k, shared.items(), key=lambda item: (-item[1] / (size + counts[item[0]]), item[0]))
+        for idx, _ in ranked:
+            picked[idx] = None
+        return list(picked)
+
+    def matches(self, name: str, threshold: float, k: int = 64) -> List[Tuple[Any, float]]:
+        """All candidate payloads scoring at least ``threshold``, best first."""
+        query = normalize_name(name)
+        scored = [(idx, name_similarity(query, self.names[idx], self.synonyms)) for idx in self.candidates(name, k)]
+        scored = [item for item in scored if item[1] >= threshold]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return [(self.payloads[idx], score) for idx, score in scored]
+
+    def best_match(self, name: str, k: int = 64) -> Tuple[Optional[Any], float]:
+        """Highest-scoring payload (earliest entry on ties) and its score; ``(None, 0.0)`` if nothing overlaps."""
+        query = normalize_name(name)
+        best, best_score = None, 0.0
+        for idx in sorted(self.candidates(name, k)):
+            score = name_similarity(query, self.names[idx], self.synonyms)
+            if score > best_score:
+                best, best_score = self.payloads[idx], score
+        return best, best_score
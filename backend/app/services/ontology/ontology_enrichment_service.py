@@ -1,11 +1,11 @@
 """AI-assisted ontology enrichment engine with deterministic fallback."""
 from __future__ import annotations
 
-import re
 import uuid
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from difflib import SequenceMatcher
 from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.config import settings
@@ -20,6 +20,7 @@ from app.models.ontology import (
     RiskLevel,
     SensitivityClass,
 )
+from app.services.ontology.name_index import FuzzyNameIndex, name_similarity, normalize_name
 from app.services.ontology.ontology_persistence_service import OntologyPersistenceService
 
 
@@ -49,14 +50,18 @@ SYNONYM_MAP = {
     "provider_risk_tier": ["provider_tier", "risk_tier"],
 }
 
+# Start of one ``"f<i>": {`` entry in a batched LLM reply.
+_REPLY_ENTRY = re.compile(r'"(f\d+)"\s*:\s*(?=\{)')
+
 
 class OntologyEnrichmentService:
     def __init__(self, persistence: Optional[OntologyPersistenceService] = None):
         self.persistence = persistence or OntologyPersistenceService()
+        self._index_cache: Optional[Tuple[Any, FuzzyNameIndex]] = None
 
     @staticmethod
     def _normalize_name(name: str) -> str:
-        return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+        return normalize_name(name)
 
     def _infer_type(self, field: Dict[str, Any]) -> str:
         explicit = str(field.get("type") or "").strip().lower()
@@ -89,23 +94,28 @@ class OntologyEnrichmentService:
         return SensitivityClass.NON_SENSITIVE
 
     def _similarity(self, field_name: str, existing_name: str) -> float:
-        a = self._normalize_name(field_name)
-        b = self._normalize_name(existing_name)
-        exact = 1.0 if a == b else 0.0
-        synonym = 1.0 if (a in SYNONYM_MAP and b in SYNONYM_MAP[a]) or (b in SYNONYM_MAP and a in SYNONYM_MAP[b]) else 0.0
-        seq = SequenceMatcher(None, a, b).ratio()
-        return max(exact, synonym * 0.95, seq)
-
-    def _find_best_match(self, field_name: str, ontology_attributes: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], float]:
-        best = None
-        score = 0.0
-        for attr in ontology_attributes:
-            existing = attr.get("name") or attr.get("attribute_name") or ""
-            s = self._similarity(field_name, existing)
-            if s > score:
-                score = s
-                best = attr
-        return best, score
+        return name_similarity(self._normalize_name(field_name), self._normalize_name(existing_name), SYNONYM_MAP)
+
+    def _attribute_index(self, ontology_attributes: List[Dict[str, Any]], snapshot_version: Any = None) -> FuzzyNameIndex:
+        """Name index over the ontology attributes, rebuilt only when the snapshot changes."""
+        key = (snapshot_version, len(ontology_attributes))
+        cached = self._index_cache
+        if snapshot_version is None or cached is None or cached[0] != key:
+            index = FuzzyNameIndex(
+                ((attr.get("name") or attr.get("attribute_name") or "", attr) for attr in ontology_attributes),
+                synonyms=SYNONYM_MAP,
+            )
+            self._index_cache = cached = (key, index)
+        return cached[1]
+
+    def _find_best_match(
+        self,
+        field_name: str,
+        ontology_attributes: List[Dict[str, Any]],
+        index: Optional[FuzzyNameIndex] = None,
+    ) -> Tuple[Optional[Dict[str, Any]], float]:
+        index = index or self._attribute_index(ontology_attributes)
+        return index.best_match(field_name, k=settings.ONTOLOGY_MATCH_TOP_K)
 
     def _policy_decision(self, candidate: OntologyChangeCandidate, governance_mode: GovernanceMode) -> Tuple[RecommendationType, str]:
         if governance_mode == GovernanceMode.MANUAL:
@@ -133,11 +143,12 @@ class OntologyEnrichmentService:
         self,
         field: Dict[str, Any],
         ontology_attributes: List[Dict[str, Any]],
+        index: Optional[FuzzyNameIndex] = None,
     ) -> Dict[str, Any]:
         field_name = str(field.get("name") or "").strip()
         normalized = self._normalize_name(field_name)
         inferred_type = self._infer_type(field)
-        best_match, sim = self._find_best_match(field_name, ontology_attributes)
+        best_match, sim = self._find_best_match(field_name, ontology_attributes, index)
         domain = self._detect_domain(normalized)
         sensitivity = self._detect_sensitivity(normalized)
 
@@ -190,39 +201,124 @@ class OntologyEnrichmentService:
             },
         }
 
-    def _build_llm_recommendation(self, field: Dict[str, Any], fallback: Dict[str, Any]) -> Dict[str, Any]:
-        provider = llm_router.ontology_provider()
-        if not llm_router.is_provider_ready(provider):
+    @staticmethod
+    def _ontology_model(provider: str) -> Optional[str]:
+        if provider == "openai":
+            return "gpt-3.5-turbo"
+        if provider == "bedrock" and settings.BEDROCK_ONTOLOGY_MODEL_ID:
+            return settings.BEDROCK_ONTOLOGY_MODEL_ID
+        return None
+
+    @staticmethod
+    def _merge_recommendation(parsed: Any, fallback: Dict[str, Any]) -> Dict[str, Any]:
+        """LLM output over the fallback; any field with an unknown enum value keeps the fallback."""
+        if not isinstance(parsed, dict):
             return fallback
+        merged = {**fallback, **{k: v for k, v in parsed.items() if v is not None}}
         try:
-            prompt = (
-                "You are an ontology governance assistant. Return strict JSON with keys "
-                "changeType,suggestedEntity,suggestedAttribute,classification,businessDomain,"
-                "sensitivity,riskLevel,confidenceScore,aiRationale. "
-                f"Input field: {field} fallback: {fallback}"
-            )
-            model = None
-            if provider == "openai":
-                model = "gpt-3.5-turbo"
-            elif provider == "bedrock" and settings.BEDROCK_ONTOLOGY_MODEL_ID:
-                model = settings.BEDROCK_ONTOLOGY_MODEL_ID
+            ChangeType(merged["changeType"])
+            DomainClass(merged["businessDomain"])
+            SensitivityClass(merged["sensitivity"])
+            RiskLevel(merged["riskLevel"])
+            merged["confidenceScore"] = float(merged["confidenceScore"])
+        except (KeyError, TypeError, ValueError):
+            return fallback
+        if not isinstance(merged.get("classification"), list):
+            merged["classification"] = fallback["classification"]
+        return merged
+
+    @staticmethod
+    def _parse_batch_reply(content: str) -> Dict[str, Any]:
+        """The ``{"f<i>": {...}}`` reply; from a truncated or malformed reply, every complete entry.
 
+        A reply cut off at max_tokens loses only the entries it did not finish,
+        so only those fields fall back.
+        """
+        try:
+            parsed = json.loads(content)
+            if isinstance(parsed, dict):
+                return parsed
+        except ValueError:
+            pass
+        decoder = json.JSONDecoder()
+        entries: Dict[str, Any] = {}
+        consumed = 0
+        for match in _REPLY_ENTRY.finditer(content or ""):
+            if match.start() < consumed:
+                continue  # inside an entry already decoded
+            try:
+                value, consumed = decoder.raw_decode(content, match.end())
+            except ValueError:
+                continue
+            entries.setdefault(match.group(1), value)
+        return entries
+
+    def _llm_batch(self, provider: str, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """One chat completion for several fields; returns a recommendation per item, in order."""
+        fallbacks = [fallback for _, fallback in items]
+        payload = {
+            f"f{i}": {"field": field, "fallback": fallback}
+            for i, (field, fallback) in enumerate(items)
+        }
+        prompt = (
+            "You are an ontology governance assistant. For each input id return a recommendation "
+            "with keys changeType,suggestedEntity,suggestedAttribute,classification,businessDomain,"
+            "sensitivity,riskLevel,confidenceScore,aiRationale. Respond with strict JSON of the form "
+            '{"<id>": {...}, ...} covering every id.\n'
+            f"Fields: {json.dumps(payload, default=str)}"
+        )
+        try:
             content = llm_router.chat_completion(
                 provider=provider,
                 messages=[
                     {"role": "system", "content": "Return only JSON, no markdown."},
                     {"role": "user", "content": prompt},
                 ],
-                model=model,
+                model=self._ontology_model(provider),
                 temperature=0.1,
-                max_tokens=350,
+                max_tokens=min(
+                    settings.ONTOLOGY_ENRICHMENT_LLM_MAX_TOKENS,
+                    settings.ONTOLOGY_ENRICHMENT_LLM_TOKENS_PER_FIELD * len(items),
+                ),
             )
-            parsed = json.loads(content)
-            parsed.setdefault("lineage", fallback["lineage"])
-            parsed.setdefault("currentOntologyMatch", fallback["currentOntologyMatch"])
-            return parsed
         except Exception:
-            return fallback
+            return fallbacks
+        parsed = self._parse_batch_reply(content)
+        return [self._merge_recommendation(parsed.get(f"f{i}"), fb) for i, fb in enumerate(fallbacks)]
+
+    def _build_llm_recommendations(
+        self,
+        items: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """LLM recommendations for ``(field, fallback)`` pairs, batched and run concurrently.
+
+        Fields whose rule-based fallback already reaches
+        ONTOLOGY_ENRICHMENT_LLM_SKIP_CONFIDENCE keep it. The rest go out in
+        prompts of ONTOLOGY_ENRICHMENT_LLM_BATCH_SIZE fields (fewer if
+        ONTOLOGY_ENRICHMENT_LLM_TOKENS_PER_FIELD each would not fit in
+        ONTOLOGY_ENRICHMENT_LLM_MAX_TOKENS), at most
+        ONTOLOGY_ENRICHMENT_LLM_CONCURRENCY at a time.
+        """
+        results = [fallback for _, fallback in items]
+        provider = llm_router.ontology_provider()
+        if not items or not llm_router.is_provider_ready(provider):
+            return results
+        pending = [
+            i for i, (_, fallback) in enumerate(items)
+            if fallback["confidenceScore"] < settings.ONTOLOGY_ENRICHMENT_LLM_SKIP_CONFIDENCE
+        ]
+        per_field = max(1, settings.ONTOLOGY_ENRICHMENT_LLM_TOKENS_PER_FIELD)
+        size = max(1, min(settings.ONTOLOGY_ENRICHMENT_LLM_BATCH_SIZE, settings.ONTOLOGY_ENRICHMENT_LLM_MAX_TOKENS // per_field))
+        batches = [pending[i:i + size] for i in range(0, len(pending), size)]
+        if not batches:
+            return results
+        workers = max(1, min(settings.ONTOLOGY_ENRICHMENT_LLM_CONCURRENCY, len(batches)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrichment-llm") as pool:
+            futures = {pool.submit(self._llm_batch, provider, [items[i] for i in batch]): batch for batch in batches}
+            for future, batch in futures.items():
+                for index, recommendation in zip(batch, future.result()):
+                    results[index] = recommendation
+        return results
 
     def _build_drift_fields(self, source_dataset_id: str, fields: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate synthetic fields that represent schema drift events."""
@@ -261,25 +357,27 @@ class OntologyEnrichmentService:
         # Rename detection between removed and added fields by name similarity.
         renamed_removed: set[str] = set()
         renamed_added: set[str] = set()
-        for r in removed_norms:
-            for a in added_norms:
-                sim = self._similarity(str(previous_map[r].get("name")), str(current_map[a].get("name")))
-                if sim >= 0.88:
-                    renamed_removed.add(r)
-                    renamed_added.add(a)
-                    synthetic.append(
-                        {
-                            "name": str(current_map[a].get("name")),
-                            "type": self._infer_type(current_map[a]),
-                            "sample_values": current_map[a].get("sample_values", []),
-                            "_forced_change_type": ChangeType.RENAME_ATTRIBUTE.value,
-                            "_lineage_hint": {
-                                "renamed_from": previous_map[r].get("name"),
-                                "renamed_to": current_map[a].get("name"),
-                                "similarity_score": round(sim, 4),
-                            },
-                        }
-                    )
+        added_index = FuzzyNameIndex(
+            ((str(current_map[a].get("name")), a) for a in sorted(added_norms)), synonyms=SYNONYM_MAP
+        )
+        for r in sorted(removed_norms):
+            renames = added_index.matches(str(previous_map[r].get("name")), 0.88, k=settings.ONTOLOGY_MATCH_TOP_K)
+            for a, sim in renames:
+                renamed_removed.add(r)
+                renamed_added.add(a)
+                synthetic.append(
+                    {
+                        "name": str(current_map[a].get("name")),
+                        "type": self._infer_type(current_map[a]),
+                        "sample_values": current_map[a].get("sample_values", []),
+                        "_forced_change_type": ChangeType.RENAME_ATTRIBUTE.value,
+                        "_lineage_hint": {
+                            "renamed_from": previous_map[r].get("name"),
+                            "renamed_to": current_map[a].get("name"),
+                            "similarity_score": round(sim, 4),
+                        },
+                    }
+                )
 
         # Deprecation detection for truly removed fields.
         for r in removed_norms - renamed_removed:
@@ -303,68 +401,75 @@ class OntologyEnrichmentService:
         governance_mode = self.persistence.get_governance_mode()
         baseline = self.persistence.get_current_ontology_snapshot()
         ontology_attributes = baseline.get("attributes", [])
+        attribute_index = self._attribute_index(ontology_attributes, baseline.get("updated_at"))
         candidates: List[OntologyChangeCandidate] = []
         drift_fields = self._build_drift_fields(source_dataset_id, fields)
         all_fields = list(fields) + drift_fields
 
-        for field in all_fields:
-            fallback = self._build_fallback_recommendation(field, ontology_attributes)
-            suggested = self._build_llm_recommendation(field, fallback)
-            forced_change_type = field.get("_forced_change_type")
-            if forced_change_type:
-                suggested["changeType"] = forced_change_type
-
-            candidate = OntologyChangeCandidate(
-                id=f"chg_{uuid.uuid4().hex[:14]}",
-                sourceDatasetId=source_dataset_id,
-                changeType=ChangeType(suggested.get("changeType", fallback["changeType"])),
-                suggestedEntity=suggested.get("suggestedEntity", fallback["suggestedEntity"]),
-                suggestedAttribute=suggested.get("suggestedAttribute", fallback["suggestedAttribute"]),
-                suggestedRelationship=suggested.get("suggestedRelationship"),
-                currentOntologyMatch=suggested.get("currentOntologyMatch", fallback["currentOntologyMatch"]),
-                classification=suggested.get("classification", fallback["classification"]),
-                businessDomain=DomainClass(suggested.get("businessDomain", fallback["businessDomain"])),
-                sensitivity=SensitivityClass(suggested.get("sensitivity", fallback["sensitivity"])),
-                riskLevel=RiskLevel(suggested.get("riskLevel", fallback["riskLevel"])),
-                confidenceScore=float(suggested.get("confidenceScore", fallback["confidenceScore"])),
-                aiRationale=str(suggested.get("aiRationale", fallback["aiRationale"])),
-                createdBy=created_by,
-                lineage={
-                    **fallback["lineage"],
-                    "source_dataset": source_dataset_id,
-                    "metadata": metadata,
-                    **(field.get("_lineage_hint") or {}),
-                },
-                evidence={
-                    "sample_values": field.get("sample_values", []),
-                    "declared_type": field.get("type"),
+        fallbacks = [
+            self._build_fallback_recommendation(field, ontology_attributes, attribute_index) for field in all_fields
+        ]
+        recommendations = self._build_llm_recommendations(list(zip(all_fields, fallbacks)))
+
+        # One group commit for the run's policy decisions and audit entry.
+        with self.persistence.log_batch():
+            for field, fallback, suggested in zip(all_fields, fallbacks, recommendations):
+                suggested = dict(suggested)
+                forced_change_type = field.get("_forced_change_type")
+                if forced_change_type:
+                    suggested["changeType"] = forced_change_type
+
+                candidate = OntologyChangeCandidate(
+                    id=f"chg_{uuid.uuid4().hex[:14]}",
+                    sourceDatasetId=source_dataset_id,
+                    changeType=ChangeType(suggested.get("changeType", fallback["changeType"])),
+                    suggestedEntity=suggested.get("suggestedEntity", fallback["suggestedEntity"]),
+                    suggestedAttribute=suggested.get("suggestedAttribute", fallback["suggestedAttribute"]),
+                    suggestedRelationship=suggested.get("suggestedRelationship"),
+                    currentOntologyMatch=suggested.get("currentOntologyMatch", fallback["currentOntologyMatch"]),
+                    classification=suggested.get("classification", fallback["classification"]),
+                    businessDomain=DomainClass(suggested.get("businessDomain", fallback["businessDomain"])),
+                    sensitivity=SensitivityClass(suggested.get("sensitivity", fallback["sensitivity"])),
+                    riskLevel=RiskLevel(suggested.get("riskLevel", fallback["riskLevel"])),
+                    confidenceScore=float(suggested.get("confidenceScore", fallback["confidenceScore"])),
+                    aiRationale=str(suggested.get("aiRationale", fallback["aiRationale"])),
+                    createdBy=created_by,
+                    lineage={
+                        **fallback["lineage"],
+                        "source_dataset": source_dataset_id,
+                        "metadata": metadata,
+                        **(field.get("_lineage_hint") or {}),
+                    },
+                    evidence={
+                        "sample_values": field.get("sample_values", []),
+                        "declared_type": field.get("type"),
+                    },
+                    createdAt=datetime.utcnow(),
+                    updatedAt=datetime.utcnow(),
+                )
+                decision, reason = self._policy_decision(candidate, governance_mode)
+                candidate.policyDecision = decision
+                candidate.recommendation = decision
+                candidate.status = ChangeStatus.AUTO_APPLIED if decision == RecommendationType.AUTO_APPLY else ChangeStatus.PENDING_APPROVAL
+                candidates.append(candidate)
+                self.persistence.save_policy_decision(
+                    candidate.id,
+                    policy_rule="default_governance_policy",
+                    decision=decision,
+                    reason=reason,
+                )
+
+            self.persistence.save_candidates(candidates)
+            self.persistence.save_dataset_schema(source_dataset_id, fields, metadata)
+            self.persistence.save_audit_log(
+                user=created_by,
+                action="enrichment_discovery_run",
+                before_state={},
+                after_state={
+                    "source_dataset_id": source_dataset_id,
+                    "candidate_count": len(candidates),
+                    "drift_candidate_count": len(drift_fields),
                 },
-                createdAt=datetime.utcnow(),
-                updatedAt=datetime.utcnow(),
-            )
-            decision, reason = self._policy_decision(candidate, governance_mode)
-            candidate.policyDecision = decision
-            candidate.recommendation = decision
-            candidate.status = ChangeStatus.AUTO_APPLIED if decision == RecommendationType.AUTO_APPLY else ChangeStatus.PENDING_APPROVAL
-            candidates.append(candidate)
-            self.persistence.save_policy_decision(
-                candidate.id,
-                policy_rule="default_governance_policy",
-                decision=decision,
-                reason=reason,
+                rationale="Automated enrichment discovery executed.",
             )
-
-        self.persistence.save_candidates(candidates)
-        self.persistence.save_dataset_schema(source_dataset_id, fields, metadata)
-        self.persistence.save_audit_log(
-            user=created_by,
-            action="enrichment_discovery_run",
-            before_state={},
-            after_state={
-                "source_dataset_id": source_dataset_id,
-                "candidate_count": len(candidates),
-                "drift_candidate_count": len(drift_fields),
-            },
-            rationale="Automated enrichment discovery executed.",
-        )
         return candidates
@@ -1,9 +1,11 @@
 """Persist and load ontology projects, versions, and discovery runs."""
 import json
 import os
+import threading
 import uuid
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from app.core.config import settings
 from app.models.ontology import (
@@ -19,6 +21,7 @@ from app.models.ontology import (
     PolicyDecisionLog,
     OntologyAuditLog,
 )
+from app.services.ontology.append_log import AppendLog
 
 
 class OntologyPersistenceService:
@@ -39,6 +42,8 @@ class OntologyPersistenceService:
         self.dataset_schemas_file = os.path.join(self.enrichment_dir, "dataset_schemas.json")
         os.makedirs(self.versions_dir, exist_ok=True)
         os.makedirs(self.enrichment_dir, exist_ok=True)
+        self._logs: Dict[str, AppendLog] = {}
+        self._logs_lock = threading.Lock()
 
     def _load_json(self, path: str, default: Any = None) -> Any:
         if default is None:
@@ -298,6 +303,7 @@ class OntologyPersistenceService:
                     before_state=before,
                     after_state=c,
                     rationale=notes or f"Candidate moved to {status}",
+                    candidate_id=candidate_id,
                 )
                 break
         if updated:
@@ -305,8 +311,39 @@ class OntologyPersistenceService:
             return OntologyChangeCandidate(**updated)
         return None
 
+    # Governance logs are append-only JSONL (see append_log); the *_logs_file paths name
+    # the legacy JSON arrays, imported once into the sibling directory on first use.
+
+    def _log(self, legacy_path: str) -> AppendLog:
+        with self._logs_lock:
+            log = self._logs.get(legacy_path)
+            if log is None:
+                log = AppendLog(os.path.splitext(legacy_path)[0], settings.ONTOLOGY_LOG_SEGMENT_BYTES)
+                if os.path.exists(legacy_path):
+                    rows = self._load_json(legacy_path, [])
+                    if log.is_empty():
+                        log.append_many((row, self._log_key(row)) for row in rows if isinstance(row, dict))
+                    os.replace(legacy_path, legacy_path + ".migrated")
+                self._logs[legacy_path] = log
+            return log
+
+    @staticmethod
+    def _log_key(row: Dict[str, Any]) -> Optional[str]:
+        if row.get("candidateId"):
+            return row["candidateId"]
+        if str(row.get("action", "")).startswith("candidate_status_"):
+            return (row.get("afterState") or {}).get("id")
+        return None
+
+    @contextmanager
+    def log_batch(self) -> Iterator[None]:
+        """Commit all policy and audit records written inside the block together."""
+        with ExitStack() as stack:
+            stack.enter_context(self._log(self.policy_logs_file).batch())
+            stack.enter_context(self._log(self.audit_logs_file).batch())
+            yield
+
     def save_policy_decision(self, candidate_id: str, policy_rule: str, decision: RecommendationType, reason: str) -> PolicyDecisionLog:
-        logs = self._load_json(self.policy_logs_file, [])
         log = PolicyDecisionLog(
             id=f"plog_{uuid.uuid4().hex[:12]}",
             candidateId=candidate_id,
@@ -315,16 +352,19 @@ class OntologyPersistenceService:
             reason=reason,
             timestamp=datetime.utcnow(),
         )
-        logs.append(log.model_dump())
-        self._save_json(self.policy_logs_file, logs)
+        self._log(self.policy_logs_file).append(log.model_dump(mode="json"), key=candidate_id)
         return log
 
-    def list_policy_decisions(self, candidate_id: Optional[str] = None) -> List[PolicyDecisionLog]:
-        rows = self._load_json(self.policy_logs_file, [])
+    def list_policy_decisions(
+        self,
+        candidate_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[PolicyDecisionLog]:
+        """Policy decisions newest first, optionally for one candidate and paged."""
+        rows = self._log(self.policy_logs_file).read(limit=limit, offset=offset, key=candidate_id)
         out = []
         for r in rows:
-            if candidate_id and r.get("candidateId") != candidate_id:
-                continue
             try:
                 out.append(PolicyDecisionLog(**r))
             except Exception:
@@ -338,8 +378,8 @@ class OntologyPersistenceService:
         before_state: Dict[str, Any],
         after_state: Dict[str, Any],
         rationale: Optional[str] = None,
+        candidate_id: Optional[str] = None,
     ) -> OntologyAuditLog:
-        rows = self._load_json(self.audit_logs_file, [])
         item = OntologyAuditLog(
             id=f"audit_{uuid.uuid4().hex[:12]}",
             user=user,
@@ -349,19 +389,23 @@ class OntologyPersistenceService:
             afterState=after_state,
             rationale=rationale,
         )
-        rows.append(item.model_dump())
-        self._save_json(self.audit_logs_file, rows)
+        self._log(self.audit_logs_file).append(item.model_dump(mode="json"), key=candidate_id)
         return item
 
-    def list_audit_logs(self) -> List[OntologyAuditLog]:
-        rows = self._load_json(self.audit_logs_file, [])
+    def list_audit_logs(
+        self,
+        candidate_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[OntologyAuditLog]:
+        """Audit entries newest first, optionally only those about one candidate, paged."""
+        rows = self._log(self.audit_logs_file).read(limit=limit, offset=offset, key=candidate_id)
         out = []
         for r in rows:
             try:
                 out.append(OntologyAuditLog(**r))
             except Exception:
                 continue
-        out.sort(key=lambda x: (x.timestamp or datetime.utcnow()), reverse=True)
         return out
 
     def get_current_ontology_snapshot(self) -> Dict[str, Any]:
@@ -2,9 +2,8 @@
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
-import PyPDF2
-
 from app.models.ontology import OntologyEvidence, SourceArtifact
+from app.services.pdf_text_service import pdf_text_service
 
 
 class PDFProcessor:
@@ -31,27 +30,24 @@ class PDFProcessor:
         evidence_list: List[OntologyEvidence] = []
 
         try:
-            with open(artifact.file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page_num, page in enumerate(reader.pages, 1):
-                    text = page.extract_text() or ""
-                    if not text.strip():
-                        continue
-                    full_text_parts.append(text)
-                    # Section detection: split by likely headers
-                    page_sections = self._detect_sections(text, page_num)
-                    for sec in page_sections:
-                        sections.append(sec)
-                        evidence_list.append(
-                            OntologyEvidence(
-                                id=f"evt_{artifact.id}_{page_num}_{len(evidence_list)}",
-                                artifact_id=artifact.id,
-                                artifact_type="pdf",
-                                page_number=page_num,
-                                text_snippet=sec.get("content", "")[:500],
-                                extraction_stage="pdf_processor",
-                            )
+            for page_num, text in pdf_text_service.iter_pages(artifact.file_path):
+                if not text.strip():
+                    continue
+                full_text_parts.append(text)
+                # Section detection: split by likely headers
+                page_sections = self._detect_sections(text, page_num)
+                for sec in page_sections:
+                    sections.append(sec)
+                    evidence_list.append(
+                        OntologyEvidence(
+                            id=f"evt_{artifact.id}_{page_num}_{len(evidence_list)}",
+                            artifact_id=artifact.id,
+                            artifact_type="pdf",
+                            page_number=page_num,
+                            text_snippet=sec.get("content", "")[:500],
+                            extraction_stage="pdf_processor",
                         )
+                    )
         except Exception as e:
             full_text_parts.append(f"[PDF read error: {e}]")
 
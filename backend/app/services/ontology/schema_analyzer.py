@@ -32,16 +32,56 @@ class SchemaAnalyzer:
         if tables:
             return {"tables": tables, "source": "connection_info"}
         if conn.get("type") in ("csv_upload", "database"):
-            return {
-                "tables": [{
-                    "name": conn.get("database_profile") or fabric.get("name") or "dataset",
-                    "columns": conn.get("columns") or [],
-                    "sample_rows": conn.get("sample_rows") or [],
-                }],
-                "source": "fabric_metadata",
+            table: Dict[str, Any] = {
+                "name": conn.get("database_profile") or fabric.get("name") or "dataset",
+                "columns": conn.get("columns") or [],
+                "sample_rows": conn.get("sample_rows") or [],
             }
+            profile = self.profile_fabric_rows(fabric)
+            if profile and profile.get("row_count"):
+                table.update(profile)
+                known = {self._column_name(c) for c in table["columns"]}
+                # Columns that are sparse in the preview rows still show up in the full profile.
+                table["columns"] = list(table["columns"]) + [
+                    s["name"] for s in profile["column_stats"] if s["name"] not in known
+                ]
+            return {"tables": [table], "source": "fabric_metadata"}
         return None
 
+    def profile_fabric_rows(self, fabric: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Stream the fabric's row chunks once (or a stratified sample) into column sketches."""
+        from app.services.analytics.column_profiler import ColumnProfiler, stratified_offsets
+        from app.services.vector_service import vector_service
+
+        fabric_id = fabric.get("id")
+        if not fabric_id:
+            return None
+        batch_size = max(1, settings.ONTOLOGY_PROFILE_BATCH_SIZE)
+        max_rows = settings.ONTOLOGY_PROFILE_MAX_ROWS
+        profiler = ColumnProfiler()
+        try:
+            ids = vector_service.source_chunk_ids(fabric_id, where={"chunk_type": "row"})
+            total = len(ids)
+            sampled = max_rows > 0 and total > max_rows
+            if sampled:
+                picked: List[str] = []
+                for offset in stratified_offsets(total, max_rows, batch_size, seed=0):
+                    remaining = max_rows - len(picked)
+                    if remaining <= 0:
+                        break
+                    picked.extend(ids[offset:offset + min(batch_size, remaining)])
+                ids = picked
+            for page in vector_service.iter_source_documents(
+                fabric_id, batch_size=batch_size, ids=ids, include=["documents"]
+            ):
+                profiler.add_row_texts(page.get("documents") or [])
+        except Exception as exc:
+            logger.warning("Column profiling skipped for fabric %s: %s", fabric_id, exc)
+            return None
+        result = profiler.result()
+        result["sampled"] = sampled
+        return result
+
     def analyze(self, schema_profile: Dict[str, Any]) -> Dict[str, Any]:
         llm_result = self._llm_analyze(schema_profile)
         rule_result = self._rule_analyze(schema_profile)
@@ -57,11 +97,20 @@ class SchemaAnalyzer:
             tname = str(table.get("name") or "Table")
             norm = self._normalize(tname)
             cols = table.get("columns") or []
-            if isinstance(cols, list) and cols and isinstance(cols[0], str):
-                col_objs = [{"name": c, "type": "string"} for c in cols]
-            else:
-                col_objs = cols
+            col_objs = [{"name": c, "type": "string"} if isinstance(c, str) else c for c in cols]
+            stats = {s["name"]: s for s in table.get("column_stats") or []}
             pk_cols = [c["name"] for c in col_objs if self._looks_like_pk(c["name"])]
+            if stats:
+                # With full-data evidence, a key must also be unique and never null.
+                profiled_pks = [
+                    c for c in pk_cols
+                    if c in stats and stats[c]["null_ratio"] == 0 and stats[c]["unique_ratio"] >= 0.98
+                ]
+                pk_cols = profiled_pks or pk_cols
+            value_fks = {
+                o["column"]: o for o in table.get("column_overlaps") or []
+                if o.get("target_column") in pk_cols
+            }
             entities.append({
                 "id": f"ent_{uuid.uuid4().hex[:8]}",
                 "name": tname,
@@ -74,18 +123,39 @@ class SchemaAnalyzer:
             })
             for col in col_objs:
                 cname = col.get("name") or ""
+                col_stats = stats.get(cname) or {}
+                data_type = col.get("type") or "string"
+                if data_type == "string" and col_stats.get("type") not in (None, "unknown"):
+                    data_type = col_stats["type"]
                 attributes.append({
                     "id": f"attr_{uuid.uuid4().hex[:8]}",
                     "entity": norm,
                     "name": cname,
                     "normalized_name": self._normalize(cname),
-                    "data_type": col.get("type") or "string",
-                    "required": bool(col.get("required", False)),
+                    "data_type": data_type,
+                    "required": bool(col.get("required", False)) or (
+                        bool(col_stats) and col_stats.get("null_ratio") == 0
+                    ),
                     "confidence": 0.7,
                     "extraction_source": "rule_based",
                     "source_table": tname,
                     "source_column": cname,
                 })
+                overlap = value_fks.get(cname)
+                if overlap and cname not in pk_cols:
+                    relationships.append({
+                        "id": f"rel_{uuid.uuid4().hex[:8]}",
+                        "name": self._fk_role(cname),
+                        "source_entity": norm,
+                        "target_entity": norm,
+                        "source_columns": [cname],
+                        "target_columns": [overlap["target_column"]],
+                        "cardinality": "n:1",
+                        "confidence": round(min(0.9, 0.6 + 0.3 * overlap["containment"]), 2),
+                        "extraction_source": "column_profile",
+                        "tabular_binding": True,
+                    })
+                    continue
                 fk_target = self._fk_target(cname, [t.get("name") for t in tables])
                 if fk_target:
                     relationships.append({
@@ -147,6 +217,14 @@ class SchemaAnalyzer:
         parts = [p.capitalize() for p in cleaned.split("_") if p]
         return "".join(parts) or "Entity"
 
+    def _column_name(self, col: Any) -> str:
+        return col if isinstance(col, str) else str((col or {}).get("name") or "")
+
+    def _fk_role(self, col: str) -> str:
+        """``prior_claim_id`` -> ``prior_claim``: the role a self-reference plays."""
+        base = re.sub(r"(_id|id)$", "", col.strip(), flags=re.I).strip("_")
+        return re.sub(r"[^a-z0-9]+", "_", base.lower()).strip("_") or "references"
+
     def _looks_like_pk(self, col: str) -> bool:
         c = col.lower()
         return c in ("id", "uuid", "pk") or c.endswith("_id") or c.endswith("key")
@@ -0,0 +1,186 @@
+"""Shared PDF text extraction: page-parallel, cached on disk by file hash."""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import PyPDF2
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = "weave.pdf_text/v1"
+_HASH_BLOCK = 1024 * 1024
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract text for pages ``[start, stop)``; runs inside pool workers."""
+    texts: List[str] = []
+    with open(file_path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        for index in range(start, stop):
+            try:
+                texts.append(reader.pages[index].extract_text() or "")
+            except Exception as exc:
+                logger.warning("Page %d of %s failed to extract: %s", index + 1, file_path, exc)
+                texts.append("")
+    return texts
+
+
+class PDFTextService:
+    """Extract PDF page text once per file content and serve it from cache.
+
+    Pages are split into contiguous ranges across a process pool (PyPDF2 is
+    pure Python, so threads would serialise on the GIL). Extracted pages are
+    written as JSON Lines under ``PDF_TEXT_CACHE_DIR`` keyed by the SHA-256 of
+    the file, so re-reading the same upload costs one hash pass.
+    """
+
+    def __init__(self) -> None:
+        self._pool: Optional[Executor] = None
+        self._pool_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def file_hash(self, file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def iter_pages(self, file_path: str) -> Iterator[Tuple[int, str]]:
+        """Yield ``(page_number, text)`` for every page, 1-based, in order.
+
+        Cached files stream straight from disk; uncached files are extracted in
+        parallel and pages are yielded as each range completes.
+        """
+        cache_path = self._cache_path(self.file_hash(file_path))
+        if cache_path.exists():
+            if self._read_header(cache_path) is not None:
+                yield from self._read_cache(cache_path)
+                return
+            logger.warning("Discarding unreadable PDF text cache %s", cache_path)
+            cache_path.unlink(missing_ok=True)
+        yield from self._extract_and_cache(file_path, cache_path)
+
+    def extract_pages(self, file_path: str) -> List[str]:
+        """Return the text of every page (empty string for image-only pages)."""
+        return [text for _, text in self.iter_pages(file_path)]
+
+    def extract_text(self, file_path: str, separator: str = "\n") -> str:
+        """Return the whole document as one string, each page followed by ``separator``."""
+        return "".join(text + separator for _, text in self.iter_pages(file_path))
+
+    def page_count(self, file_path: str) -> int:
+        cache_path = self._cache_path(self.file_hash(file_path))
+        header = self._read_header(cache_path) if cache_path.exists() else None
+        if header:
+            return int(header.get("page_count") or 0)
+        with open(file_path, "rb") as f:
+            return len(PyPDF2.PdfReader(f).pages)
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    # ------------------------------------------------------------------
+    # Extraction
+    # ------------------------------------------------------------------
+
+    def _extract_and_cache(self, file_path: str, cache_path: Path) -> Iterator[Tuple[int, str]]:
+        with open(file_path, "rb") as f:
+            total_pages = len(PyPDF2.PdfReader(f).pages)
+
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        complete = False
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as out:
+                out.write(json.dumps({"format": CACHE_FORMAT, "page_count": total_pages}) + "\n")
+                page_number = 0
+                for texts in self._extract_ranges(file_path, total_pages):
+                    for text in texts:
+                        page_number += 1
+                        out.write(json.dumps(text) + "\n")
+                        yield page_number, text
+            tmp_path.replace(cache_path)
+            complete = True
+        finally:
+            if not complete:
+                tmp_path.unlink(missing_ok=True)
+
+    def _extract_ranges(self, file_path: str, total_pages: int) -> Iterator[List[str]]:
+        """Yield page-text lists for consecutive page ranges, in document order."""
+        workers = self._worker_count()
+        if workers <= 1 or total_pages < settings.PDF_PARALLEL_MIN_PAGES:
+            yield _extract_page_range(file_path, 0, total_pages)
+            return
+
+        # A few ranges per worker keeps the pool busy when pages vary in cost
+        # while still letting the caller stream the first range early.
+        range_size = max(8, -(-total_pages // (workers * 4)))
+        ranges = [(start, min(start + range_size, total_pages)) for start in range(0, total_pages, range_size)]
+        try:
+            pool = self._get_pool(workers)
+            futures = [pool.submit(_extract_page_range, file_path, start, stop) for start, stop in ranges]
+        except Exception as exc:
+            logger.warning("PDF process pool unavailable (%s); extracting %s serially", exc, file_path)
+            yield _extract_page_range(file_path, 0, total_pages)
+            return
+        for (start, stop), future in zip(ranges, futures):
+            try:
+                yield future.result()
+            except Exception as exc:
+                logger.warning("Parallel extraction of pages %d-%d failed (%s); retrying in-process", start + 1, stop, exc)
+                yield _extract_page_range(file_path, start, stop)
+
+    def _worker_count(self) -> int:
+        configured = settings.PDF_EXTRACT_WORKERS
+        if configured > 0:
+            return configured
+        return max(1, min(8, os.cpu_count() or 1))
+
+    def _get_pool(self, workers: int) -> Executor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=workers)
+            return self._pool
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _cache_path(self, digest: str) -> Path:
+        root = Path(settings.PDF_TEXT_CACHE_DIR)
+        root.mkdir(parents=True, exist_ok=True)
+        return root / f"{digest}.jsonl"
+
+    def _read_header(self, cache_path: Path) -> Optional[dict]:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+        except Exception:
+            return None
+        return header if header.get("format") == CACHE_FORMAT else None
+
+    def _read_cache(self, cache_path: Path) -> Iterator[Tuple[int, str]]:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            f.readline()
+            for page_number, line in enumerate(f, 1):
+                yield page_number, json.loads(line)
+
+
+pdf_text_service = PDFTextService()
+atexit.register(pdf_text_service.shutdown)
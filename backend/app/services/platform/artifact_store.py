@@ -0,0 +1,82 @@
+"""Content-addressed store for bulky fabric sub-documents (code graphs, inventories, blueprints).
+
+Each artifact is canonical JSON, gzip-compressed, stored once under the
+SHA-256 of its JSON bytes; identical content is never written twice.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import uuid
+from typing import Any, Dict, Iterator
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def encode_artifact(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class ArtifactStore:
+    def __init__(self, root: str | None = None) -> None:
+        self._root = root
+
+    @property
+    def root(self) -> str:
+        return self._root or settings.FABRIC_ARTIFACT_DIR
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}.json.gz")
+
+    def put_bytes(self, raw: bytes) -> Dict[str, Any]:
+        """Store encoded JSON; returns the reference kept in the fabric record."""
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self.path_for(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        return {"sha256": digest, "bytes": len(raw)}
+
+    def put(self, value: Any) -> Dict[str, Any]:
+        return self.put_bytes(encode_artifact(value))
+
+    def get(self, digest: str) -> Any:
+        path = self.path_for(digest)
+        try:
+            with gzip.open(path, "rb") as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            logger.warning("Fabric artifact %s is missing", digest)
+            return None
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path_for(digest))
+
+    def iter_digests(self) -> Iterator[str]:
+        if not os.path.isdir(self.root):
+            return
+        for prefix in os.listdir(self.root):
+            folder = os.path.join(self.root, prefix)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if name.endswith(".json.gz"):
+                    yield name[: -len(".json.gz")]
+
+    def delete(self, digest: str) -> bool:
+        try:
+            os.remove(self.path_for(digest))
+            return True
+        except FileNotFoundError:
+            return False
+
+
+artifact_store = ArtifactStore()
@@ -0,0 +1,363 @@
+"""Pooled connections to user source systems for the connector endpoints.
+
+Connections are keyed by a fingerprint of everything that identifies the
+target (type, host, database, credentials); only the hash is kept. Each
+target gets a bounded pool of DB-API connections that are health-checked
+when they have sat idle for a while and closed once idle for longer than
+``CONNECTOR_POOL_IDLE_SECONDS``. Clients that already pool internally
+(``MongoClient``, ``httpx.Client``) are shared per fingerprint instead and
+checked out like connections, so a long import never loses its client.
+Schema and collection listings are cached for ``CONNECTOR_SCHEMA_CACHE_SECONDS``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(kind: str, **params: Any) -> str:
+    payload = json.dumps({"kind": kind, **params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _sql_ping(conn: Any) -> None:
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+def _close(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class _Pool:
+    def __init__(self, connect: Callable[[], Any], ping: Callable[[Any], None], max_size: int) -> None:
+        self.connect = connect
+        self.ping = ping
+        self.max_size = max(1, max_size)
+        self.idle: List[Tuple[Any, float]] = []
+        self.in_use = 0
+        self.cond = threading.Condition()
+
+
+class _SharedClient:
+    def __init__(self, client: Any, close: Callable[[Any], None]) -> None:
+        self.client = client
+        self.close = close
+        self.users = 1
+        self.last_used = time.monotonic()
+        # Dropped from the registry while checked out; closed by its last user.
+        self.retired = False
+
+
+class ConnectionManager:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pools: Dict[str, _Pool] = {}
+        self._shared: Dict[str, _SharedClient] = {}
+        self._schema_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._reaper: Optional[threading.Thread] = None
+        self._counters = {"created": 0, "reused": 0, "health_failures": 0, "evicted": 0,
+                          "schema_hits": 0, "schema_misses": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    # -- pooled DB-API connections -------------------------------------------------
+
+    @contextmanager
+    def connection(
+        self,
+        key: str,
+        connect: Callable[[], Any],
+        ping: Callable[[Any], None] = _sql_ping,
+    ) -> Iterator[Any]:
+        """Check out a connection for ``key``; it returns to the pool (rolled back) afterwards."""
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = _Pool(connect, ping, settings.CONNECTOR_POOL_MAX_PER_TARGET)
+        self._ensure_reaper()
+        conn = self._acquire(pool)
+        try:
+            yield conn
+        finally:
+            self._release(pool, conn)
+
+    def sql_connection(
+        self,
+        dialect: str,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        database: Optional[str] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+    ):
+        """Pooled PostgreSQL / MySQL / SQLite connection (``database`` is the file path for SQLite)."""
+        def connect() -> Any:
+            if dialect == "postgresql":
+                import psycopg2
+                return psycopg2.connect(host=host, port=port, database=database, user=user, password=password)
+            if dialect == "mysql":
+                import mysql.connector
+                return mysql.connector.connect(host=host, port=port, database=database, user=user, password=password)
+            if dialect == "sqlite":
+                import sqlite3
+                # Pooled connections may be checked out from different worker threads.
+                return sqlite3.connect(database, check_same_thread=False)
+            raise ValueError(f"Unsupported database type: {dialect}")
+
+        key = fingerprint(dialect, host=host, port=port, database=database, user=user, password=password)
+        return self.connection(key, connect)
+
+    def _acquire(self, pool: _Pool) -> Any:
+        deadline = time.monotonic() + settings.CONNECTOR_POOL_ACQUIRE_TIMEOUT_SECONDS
+        conn, idle_since = None, 0.0
+        with pool.cond:
+            while True:
+                if pool.idle:
+                    conn, idle_since = pool.idle.pop()
+                    pool.in_use += 1
+                    break
+                if pool.in_use < pool.max_size:
+                    pool.in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a pooled source connection")
+                pool.cond.wait(remaining)
+        try:
+            if conn is not None and time.monotonic() - idle_since > settings.CONNECTOR_POOL_HEALTHCHECK_SECONDS:
+                try:
+                    pool.ping(conn)
+                except Exception as exc:
+                    logger.info("Discarding unhealthy pooled connection: %s", exc)
+                    self._count("health_failures")
+                    _close(conn)
+                    conn = None
+            if conn is None:
+                conn = pool.connect()
+                self._count("created")
+            else:
+                self._count("reused")
+            return conn
+        except BaseException:
+            with pool.cond:
+                pool.in_use -= 1
+                pool.cond.notify()
+            raise
+
+    def _release(self, pool: _Pool, conn: Any) -> None:
+        healthy = True
+        try:
+            # End whatever transaction the caller left open (or aborted) before reuse.
+            conn.rollback()
+        except Exception:
+            healthy = False
+        with pool.cond:
+            pool.in_use -= 1
+            if healthy:
+                pool.idle.append((conn, time.monotonic()))
+            pool.cond.notify()
+        if not healthy:
+            _close(conn)
+
+    # -- shared self-pooling clients ----------------------------------------------
+
+    @contextmanager
+    def shared_client(
+        self,
+        key: str,
+        factory: Callable[[], Any],
+        close: Callable[[Any], None] = _close,
+        ping: Optional[Callable[[Any], None]] = None,
+    ) -> Iterator[Any]:
+        """Check out the long-lived client for ``key`` (libraries that pool internally); never close it yourself.
+
+        A checked-out client is never evicted; its idle clock starts when the
+        last user releases it.
+        """
+        entry = self._checkout_shared(key, factory, close, ping)
+        try:
+            yield entry.client
+        finally:
+            self._release_shared(entry)
+
+    def mongo_client(self, connection_string: str, server_selection_timeout_ms: int = 5000):
+        from pymongo import MongoClient
+
+        return self.shared_client(
+            fingerprint("mongodb", connection_string=connection_string),
+            lambda: MongoClient(connection_string, serverSelectionTimeoutMS=server_selection_timeout_ms),
+            ping=lambda client: client.admin.command("ping"),
+        )
+
+    def _checkout_shared(
+        self,
+        key: str,
+        factory: Callable[[], Any],
+        close: Callable[[Any], None],
+        ping: Optional[Callable[[Any], None]],
+    ) -> _SharedClient:
+        with self._lock:
+            entry = self._shared.get(key)
+            if entry is not None:
+                entry.users += 1
+        if entry is not None:
+            idle = entry.users == 1 and time.monotonic() - entry.last_used > settings.CONNECTOR_POOL_HEALTHCHECK_SECONDS
+            if ping is not None and idle:
+                try:
+                    ping(entry.client)
+                except Exception as exc:
+                    logger.info("Discarding unhealthy shared client: %s", exc)
+                    self._count("health_failures")
+                    with self._lock:
+                        if self._shared.get(key) is entry:
+                            self._shared.pop(key)
+                        entry.retired = True
+                    self._release_shared(entry)
+                    entry = None
+        if entry is not None:
+            self._count("reused")
+            return entry
+
+        client = factory()
+        if ping is not None:
+            try:
+                ping(client)
+            except Exception:
+                close(client)
+                raise
+        with self._lock:
+            entry = self._shared.get(key)
+            if entry is not None:
+                # Another request created one first; keep that one.
+                entry.users += 1
+            else:
+                entry = self._shared[key] = _SharedClient(client, close)
+        if entry.client is not client:
+            close(client)
+            self._count("reused")
+            return entry
+        self._count("created")
+        self._ensure_reaper()
+        return entry
+
+    def _release_shared(self, entry: _SharedClient) -> None:
+        with self._lock:
+            entry.users -= 1
+            entry.last_used = time.monotonic()
+            retire = entry.retired and entry.users == 0
+        if retire:
+            entry.close(entry.client)
+
+    # -- schema / metadata cache ----------------------------------------------------
+
+    def cached_metadata(self, key: str, name: str, loader: Callable[[], Any]) -> Any:
+        """``loader()`` result for (target, name), reused for CONNECTOR_SCHEMA_CACHE_SECONDS."""
+        ttl = settings.CONNECTOR_SCHEMA_CACHE_SECONDS
+        now = time.monotonic()
+        with self._lock:
+            hit = self._schema_cache.get((key, name))
+        if ttl > 0 and hit is not None and now - hit[0] < ttl:
+            self._count("schema_hits")
+            return hit[1]
+        self._count("schema_misses")
+        value = loader()
+        if ttl > 0:
+            with self._lock:
+                self._schema_cache[(key, name)] = (now, value)
+        return value
+
+    def invalidate_metadata(self, key: str) -> None:
+        with self._lock:
+            for cache_key in [k for k in self._schema_cache if k[0] == key]:
+                self._schema_cache.pop(cache_key, None)
+
+    # -- housekeeping ---------------------------------------------------------------
+
+    def evict_idle(self, max_idle_seconds: Optional[float] = None) -> int:
+        """Close pooled connections and shared clients idle for longer than the limit."""
+        limit = settings.CONNECTOR_POOL_IDLE_SECONDS if max_idle_seconds is None else max_idle_seconds
+        cutoff = time.monotonic() - limit
+        to_close: List[Tuple[Any, Callable[[Any], None]]] = []
+        with self._lock:
+            pools = list(self._pools.items())
+        for key, pool in pools:
+            with pool.cond:
+                keep = [(c, t) for c, t in pool.idle if t > cutoff]
+                to_close.extend((c, _close) for c, t in pool.idle if t <= cutoff)
+                pool.idle = keep
+                empty = not pool.idle and pool.in_use == 0
+            if empty:
+                with self._lock:
+                    if self._pools.get(key) is pool:
+                        self._pools.pop(key)
+        with self._lock:
+            for key, entry in list(self._shared.items()):
+                if entry.users == 0 and entry.last_used <= cutoff:
+                    self._shared.pop(key)
+                    to_close.append((entry.client, entry.close))
+            expired = time.monotonic() - settings.CONNECTOR_SCHEMA_CACHE_SECONDS
+            for cache_key in [k for k, (t, _) in self._schema_cache.items() if t <= expired]:
+                self._schema_cache.pop(cache_key, None)
+        for client, close in to_close:
+            close(client)
+        if to_close:
+            with self._lock:
+                self._counters["evicted"] += len(to_close)
+        return len(to_close)
+
+    def close_all(self) -> None:
+        self.evict_idle(max_idle_seconds=-1)
+        with self._lock:
+            # Clients still checked out close when their last user releases them.
+            for entry in self._shared.values():
+                entry.retired = True
+            self._shared.clear()
+            self._schema_cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pools = list(self._pools.values())
+            stats = dict(self._counters, shared_clients=len(self._shared), targets=len(pools),
+                         shared_in_use=sum(e.users for e in self._shared.values()))
+        stats["idle"] = sum(len(p.idle) for p in pools)
+        stats["in_use"] = sum(p.in_use for p in pools)
+        return stats
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is not None:
+            return
+        with self._lock:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name="connector-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        while True:
+            time.sleep(max(1.0, settings.CONNECTOR_POOL_IDLE_SECONDS / 2))
+            try:
+                self.evict_idle()
+            except Exception:
+                logger.exception("Connector pool eviction failed")
+
+
+connection_manager = ConnectionManager()
@@ -0,0 +1,256 @@
+"""Resumable database fabric builds (``database_fabric`` jobs).
+
+Rows arrive from the source in batches of DATABASE_FABRIC_BATCH_ROWS. Each
+batch is appended to an NDJSON spool, turned into row chunks and upserted
+under ids derived from the batch number; only then does the checkpoint
+(rows fetched, documents embedded, ids written) move forward. Linked-pair
+chunks need every row's primary id, so they are built from the spool once the
+source is exhausted: link columns are inferred in streaming passes, only a
+primary id -> spool offset index is held in memory, and the pairs of
+DATABASE_FABRIC_BATCH_ROWS rows at a time are indexed with a checkpoint at
+the spool offset of the next row.
+
+A build that stops part-way resumes from its last checkpoint: the spool is
+cut back to the committed length, the source skips the rows already fetched,
+and a batch that was written but not checkpointed is upserted again under the
+same ids instead of being duplicated. Skipping only lands on the right rows
+when the source returns them in a stable order; a source that cannot promise
+one restarts its row stage from the beginning, under the same ids.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+from app.core.config import settings
+from app.services.document_service import document_service
+from app.services.vector_service import vector_service
+from app.utils.json_sanitize import sanitize_for_json
+
+logger = logging.getLogger(__name__)
+
+ROWS_SPOOL = "rows.ndjson"
+
+
+@dataclass
+class DatabaseSource:
+    """Where a build reads rows from.
+
+    ``batches(skip_rows)`` yields lists of row dicts, starting after the
+    first ``skip_rows`` rows of the source. ``resumable`` is False when a
+    re-run may return the rows in another order (e.g. SQL without ORDER BY).
+    """
+
+    source_name: str
+    batches: Callable[[int], Iterator[List[Dict[str, Any]]]]
+    total_rows: Optional[int] = None
+    resumable: bool = True
+
+
+def build_dir(fabric_id: str) -> str:
+    return os.path.join(settings.DATABASE_FABRIC_SPOOL_DIR, quote(fabric_id, safe=""))
+
+
+def discard_build(fabric_id: str) -> None:
+    """Remove a finished build's spool and staged uploads."""
+    shutil.rmtree(build_dir(fabric_id), ignore_errors=True)
+
+
+def _initial_checkpoint() -> Dict[str, Any]:
+    return {
+        "stage": "rows",
+        "rows_fetched": 0,
+        "spool_bytes": 0,
+        "row_batches": 0,
+        "link_batches": 0,
+        "documents_embedded": 0,
+        "link_documents": 0,
+        "link_spool_bytes": 0,
+        "link_rows": 0,
+        "ids_written": 0,
+        "columns": [],
+    }
+
+
+def _resume_spool(path: str, spool_bytes: int) -> Any:
+    """Open the row spool for appending after cutting off anything past the checkpoint."""
+    spool = open(path, "a+b")
+    spool.truncate(spool_bytes)
+    spool.seek(spool_bytes)
+    return spool
+
+
+def _iter_spool(path: str, start: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """``(offset past the row, row)`` for every spooled row from byte ``start`` on."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as spool:
+        spool.seek(start)
+        for line in iter(spool.readline, b""):
+            if line.strip():
+                yield spool.tell(), json.loads(line)
+
+
+def _build_links(
+    fabric_id: str,
+    source_name: str,
+    spool_path: str,
+    cp: Dict[str, Any],
+    batch_rows: int,
+    commit: Callable[[], None],
+) -> None:
+    """Index linked-pair chunks ``batch_rows`` spooled rows at a time, resuming at ``link_spool_bytes``."""
+    plan = document_service.plan_database_links(lambda: (row for _, row in _iter_spool(spool_path)))
+    if not plan:
+        return
+    # Targets are read back from the spool by offset; the last row with an id wins, as in memory.
+    offsets: Dict[str, int] = {}
+    previous = 0
+    for end, row in _iter_spool(spool_path):
+        row_id = document_service.link_row_id(row, plan)
+        if row_id:
+            offsets[row_id] = previous
+        previous = end
+
+    seen_pairs: Set[Tuple[str, str, str]] = set()
+    with open(spool_path, "rb") as targets:
+
+        def target_row(target_id: str) -> Optional[Dict[str, Any]]:
+            if target_id not in offsets:
+                return None
+            targets.seek(offsets[target_id])
+            return json.loads(targets.readline())
+
+        # Pairs already indexed before a restart still count as seen.
+        if cp["link_spool_bytes"]:
+            for end, row in _iter_spool(spool_path):
+                if end > cp["link_spool_bytes"]:
+                    break
+                document_service.link_row_documents(0, row, plan, lambda _: None, source_name, seen_pairs)
+
+        documents: List[Dict[str, Any]] = []
+        rows = 0
+        row_idx = cp["link_rows"]
+        end = cp["link_spool_bytes"]
+        for end, row in _iter_spool(spool_path, cp["link_spool_bytes"]):
+            documents.extend(document_service.link_row_documents(
+                row_idx, row, plan, target_row, source_name, seen_pairs,
+                first_page=cp["link_documents"] + len(documents) + 1,
+            ))
+            row_idx += 1
+            rows += 1
+            if rows < batch_rows:
+                continue
+            _index_links(fabric_id, documents, cp, end, rows)
+            commit()
+            documents, rows = [], 0
+        if rows:
+            _index_links(fabric_id, documents, cp, end, rows)
+            commit()
+
+
+def _index_links(fabric_id: str, documents: List[Dict[str, Any]], cp: Dict[str, Any], end: int, rows: int) -> None:
+    ids = vector_service.add_documents(documents, fabric_id, batch_key=f"links{cp['link_batches']:06d}") if documents else []
+    cp["link_batches"] += 1
+    cp["link_documents"] += len(documents)
+    cp["link_spool_bytes"] = end
+    cp["link_rows"] += rows
+    cp["documents_embedded"] += len(documents)
+    cp["ids_written"] += len(ids)
+
+
+def build_database_fabric(
+    fabric_id: str,
+    source: DatabaseSource,
+    checkpoint: Optional[Dict[str, Any]] = None,
+    on_checkpoint: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None,
+    batch_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Fetch, embed and index ``source`` into ``fabric_id``, checkpointing every batch.
+
+    ``on_checkpoint(checkpoint, metrics)`` runs after each committed batch;
+    metrics are this run's elapsed time and row / document throughput. Returns
+    the final checkpoint with ``stage == "done"``.
+    """
+    batch_rows = max(1, batch_rows or settings.DATABASE_FABRIC_BATCH_ROWS)
+    cp = {**_initial_checkpoint(), **(checkpoint or {})}
+    if cp["stage"] == "rows" and cp["rows_fetched"] and not source.resumable:
+        # The rows after the checkpoint need not be the ones still missing; the link stage reads the spool.
+        logger.warning("Source of fabric %s has no stable row order; rebuilding its rows from the start", fabric_id)
+        cp = _initial_checkpoint()
+    os.makedirs(build_dir(fabric_id), exist_ok=True)
+    spool_path = os.path.join(build_dir(fabric_id), ROWS_SPOOL)
+    started = time.monotonic()
+    start_rows, start_docs = cp["rows_fetched"], cp["ids_written"]
+
+    def commit() -> None:
+        if not on_checkpoint:
+            return
+        elapsed = max(time.monotonic() - started, 1e-9)
+        on_checkpoint(dict(cp), {
+            "elapsed_seconds": round(elapsed, 2),
+            "rows_per_second": round((cp["rows_fetched"] - start_rows) / elapsed, 1),
+            "documents_per_second": round((cp["ids_written"] - start_docs) / elapsed, 1),
+            "total_rows": source.total_rows,
+        })
+
+    if cp["stage"] == "rows":
+        with _resume_spool(spool_path, cp["spool_bytes"]) as spool:
+            for batch in _rebatch(source.batches(cp["rows_fetched"]), batch_rows):
+                for row in batch:
+                    spool.write((json.dumps(sanitize_for_json(row), default=str) + "\n").encode("utf-8"))
+                spool.flush()
+                os.fsync(spool.fileno())
+                documents = document_service.process_database_rows(
+                    batch, source.source_name, row_offset=cp["rows_fetched"], total_rows=source.total_rows
+                )
+                ids = vector_service.add_documents(documents, fabric_id, batch_key=f"rows{cp['row_batches']:06d}")
+                if not cp["columns"]:
+                    cp["columns"] = [str(k) for k in batch[0].keys()]
+                cp["rows_fetched"] += len(batch)
+                cp["spool_bytes"] = spool.tell()
+                cp["row_batches"] += 1
+                cp["documents_embedded"] += len(documents)
+                cp["ids_written"] += len(ids)
+                commit()
+        cp["stage"] = "links"
+        commit()
+
+    if cp["stage"] == "links":
+        _build_links(fabric_id, source.source_name, spool_path, cp, batch_rows, commit)
+        cp["stage"] = "done"
+        commit()
+    return cp
+
+
+def sample_rows(fabric_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """First ``limit`` spooled rows of a build, for the fabric's connection preview."""
+    path = os.path.join(build_dir(fabric_id), ROWS_SPOOL)
+    rows: List[Dict[str, Any]] = []
+    if not os.path.exists(path):
+        return rows
+    with open(path, "rb") as spool:
+        for line in spool:
+            if len(rows) >= limit:
+                break
+            if line.strip():
+                rows.append(json.loads(line))
+    return rows
+
+
+def _rebatch(batches: Iterator[List[Dict[str, Any]]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Re-cut source batches to ``size`` rows so checkpoints land on predictable boundaries."""
+    pending: List[Dict[str, Any]] = []
+    for batch in batches:
+        pending.extend(batch)
+        while len(pending) >= size:
+            yield pending[:size]
+            del pending[:size]
+    if pending:
+        yield pending
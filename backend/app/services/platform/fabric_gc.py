@@ -0,0 +1,450 @@
+"""Cascading fabric deletion and orphan reclamation.
+
+Everything a fabric owns outside its ``FabricRecord`` is registered here as a
+resource kind: Chroma chunks, canonical graph rows and the insight cache,
+files (uploads, materialized ontology XML, graph exports), progress entries
+and content-addressed artifacts. Deleting a fabric purges every kind and
+leaves a tombstone. The ``fabric_gc`` job sweeps owners that no longer have a
+record (older deletes, crashed builds) in batches. Chroma gives deleted
+chunks' space back on its own; the sweep never touches its files. The vector
+store also holds sources that never had a
+record (``/upload``, ``/database/connect``), so only chunks of tombstoned or
+``fabric_``-prefixed owners are swept there.
+
+An orphan is only purged once it has stayed orphaned for
+``FABRIC_GC_GRACE_SECONDS``, so a fabric whose chunks are written before its
+record is saved is never collected mid-build. When an owner was first seen
+orphaned is kept in the database, so restarts do not reset the clock.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+from urllib.parse import quote, unquote
+
+from sqlalchemy import Text, cast
+
+from app.core.config import settings
+from app.db.models import (
+    FabricGcSuspectRecord,
+    FabricRecord,
+    FabricTombstoneRecord,
+    GraphBuildRunRecord,
+    GraphEdgeRecord,
+    GraphInsightRecord,
+    GraphNodeRecord,
+)
+from app.db.session import db_session, get_session_factory
+from app.services.platform.artifact_store import artifact_store
+from app.services.platform.fabric_store import fabric_store
+from app.services.platform.progress_store import TERMINAL_STATUSES, progress_store
+
+logger = logging.getLogger(__name__)
+
+Reclaimed = Dict[str, int]
+
+# Every fabric id minted by the fabric endpoints except the ServiceNow connector's.
+FABRIC_ID_PREFIX = "fabric_"
+
+
+def _reclaimed(rows: int = 0, nbytes: int = 0) -> Reclaimed:
+    return {"rows": rows, "bytes": nbytes}
+
+
+def _add(total: Reclaimed, part: Reclaimed) -> Reclaimed:
+    total["rows"] += part.get("rows", 0)
+    total["bytes"] += part.get("bytes", 0)
+    return total
+
+
+def _path_bytes(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _remove_path(path: str) -> int:
+    """Delete a file or directory tree; returns the bytes freed."""
+    if not os.path.exists(path):
+        return 0
+    size = _path_bytes(path)
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        os.remove(path)
+    return size
+
+
+def live_fabric_ids() -> Set[str]:
+    """Ids of every fabric record, across all owners."""
+    session = get_session_factory()()
+    try:
+        return {row[0] for row in session.query(FabricRecord.id)}
+    finally:
+        session.close()
+
+
+def fabric_tombstones() -> Set[str]:
+    """Ids of deleted fabrics."""
+    session = get_session_factory()()
+    try:
+        return {row[0] for row in session.query(FabricTombstoneRecord.fabric_id)}
+    finally:
+        session.close()
+
+
+class ResourceKind(ABC):
+    """One kind of fabric-owned data: ``purge`` one owner's share, list ``orphan_owners``."""
+
+    name = "resource"
+
+    @abstractmethod
+    def purge(self, fabric_id: str, fabric: Optional[Dict[str, Any]]) -> Reclaimed:
+        """Remove everything of this kind that ``fabric_id`` owns."""
+
+    def orphan_owners(self, live: Set[str]) -> Set[str]:
+        return set()
+
+
+class VectorChunks(ResourceKind):
+    name = "vectors"
+
+    def __init__(self, collection: Optional[Callable[[], Any]] = None) -> None:
+        self._collection = collection
+
+    def collection(self) -> Any:
+        if self._collection is not None:
+            return self._collection()
+        from app.services.vector_service import vector_service
+
+        return vector_service.documents_collection
+
+    def purge(self, fabric_id: str, fabric: Optional[Dict[str, Any]]) -> Reclaimed:
+        collection = self.collection()
+        batch_size = max(1, settings.FABRIC_GC_BATCH_SIZE)
+        deleted = 0
+        while True:
+            ids = collection.get(where={"source_id": fabric_id}, limit=batch_size, include=[]).get("ids") or []
+            if not ids:
+                break
+            collection.delete(ids=ids)
+            deleted += len(ids)
+        return _reclaimed(rows=deleted)
+
+    def orphan_owners(self, live: Set[str]) -> Set[str]:
+        collection = self.collection()
+        batch_size = max(1, settings.FABRIC_GC_BATCH_SIZE)
+        tombstones = fabric_tombstones()
+        owners: Set[str] = set()
+        # One id-only snapshot, then metadata by id batch: offset paging rescans the collection per page.
+        ids = collection.get(include=[]).get("ids") or []
+        for start in range(0, len(ids), batch_size):
+            page = collection.get(ids=ids[start:start + batch_size], include=["metadatas"])
+            for metadata in page.get("metadatas") or []:
+                source_id = (metadata or {}).get("source_id")
+                if not source_id or source_id in live:
+                    continue
+                if source_id in tombstones or source_id.startswith(FABRIC_ID_PREFIX):
+                    owners.add(source_id)
+        return owners
+
+
+class GraphRows(ResourceKind):
+    name = "graph"
+    MODELS = (GraphEdgeRecord, GraphNodeRecord, GraphBuildRunRecord, GraphInsightRecord)
+
+    def purge(self, fabric_id: str, fabric: Optional[Dict[str, Any]]) -> Reclaimed:
+        rows = 0
+        with db_session() as session:
+            # The insight row is the graph_insight_cache entry; removing it invalidates the cache.
+            for model in self.MODELS:
+                rows += session.query(model).filter(model.fabric_id == fabric_id).delete(synchronize_session=False)
+        return _reclaimed(rows=rows)
+
+    def orphan_owners(self, live: Set[str]) -> Set[str]:
+        session = get_session_factory()()
+        try:
+            owners: Set[str] = set()
+            for model in self.MODELS:
+                owners.update(row[0] for row in session.query(model.fabric_id).distinct())
+            return owners - live
+        finally:
+            session.close()
+
+
+class FabricFiles(ResourceKind):
+    """Uploaded source files, ontology chunk artifacts, graph exports and database build spools."""
+
+    name = "files"
+    # Fabric chunk artifacts linked into ontology projects, and the XML files that preceded them.
+    OWNED_SUFFIXES = ("_fabric_chunks.ndjson", "_fabric_source.xml")
+
+    def _shared_upload(self, filename: str, fabric_id: str) -> bool:
+        text = cast(FabricRecord.payload, Text)
+        session = get_session_factory()()
+        try:
+            return (
+                session.query(FabricRecord.id)
+                .filter(FabricRecord.id != fabric_id, text.like(f'%"{filename}"%'))
+                .first()
+                is not None
+            )
+        finally:
+            session.close()
+
+    def purge(self, fabric_id: str, fabric: Optional[Dict[str, Any]]) -> Reclaimed:
+        total = _reclaimed()
+        for item in (fabric or {}).get("processed_files") or []:
+            filename = os.path.basename(str((item or {}).get("filename") or "")) if isinstance(item, dict) else ""
+            if not filename or self._shared_upload(filename, fabric_id):
+                continue
+            path = os.path.join(settings.UPLOAD_DIR, filename)
+            if os.path.isfile(path):
+                _add(total, _reclaimed(rows=1, nbytes=_remove_path(path)))
+        for path in (
+            *(os.path.join(settings.ONTOLOGY_UPLOAD_DIR, f"{fabric_id}{suffix}") for suffix in self.OWNED_SUFFIXES),
+            os.path.join(settings.GRAPH_EXPORT_DIR, quote(fabric_id, safe="")),
+            os.path.join(settings.DATABASE_FABRIC_SPOOL_DIR, quote(fabric_id, safe="")),
+        ):
+            if os.path.exists(path):
+                _add(total, _reclaimed(rows=1, nbytes=_remove_path(path)))
+        return total
+
+    def orphan_owners(self, live: Set[str]) -> Set[str]:
+        owners: Set[str] = set()
+        if os.path.isdir(settings.ONTOLOGY_UPLOAD_DIR):
+            for name in os.listdir(settings.ONTOLOGY_UPLOAD_DIR):
+                for suffix in self.OWNED_SUFFIXES:
+                    if name.endswith(suffix):
+                        owners.add(name[: -len(suffix)])
+        for root in (settings.GRAPH_EXPORT_DIR, settings.DATABASE_FABRIC_SPOOL_DIR):
+            if os.path.isdir(root):
+                owners.update(unquote(name) for name in os.listdir(root))
+        # Uploads carry no owner on disk; they are only removed with their fabric.
+        return owners - live
+
+
+class ProgressEntries(ResourceKind):
+    name = "progress"
+
+    def _entries(self) -> Iterator[tuple]:
+        for progress_id in list(progress_store.keys()):
+            entry = progress_store.get(progress_id)
+            if entry and entry.get("fabric_id"):
+                yield progress_id, entry
+
+    def purge(self, fabric_id: str, fabric: Optional[Dict[str, Any]]) -> Reclaimed:
+        rows = 0
+        for progress_id, entry in self._entries():
+            if entry["fabric_id"] == fabric_id:
+                progress_store.delete(progress_id)
+                rows += 1
+        return _reclaimed(rows=rows)
+
+    def orphan_owners(self, live: Set[str]) -> Set[str]:
+        # Running builds report progress before their record exists; only finished ones count.
+        return {
+            entry["fabric_id"]
+            for _, entry in self._entries()
+            if entry["fabric_id"] not in live and entry.get("status") in TERMINAL_STATUSES
+        }
+
+
+class FabricArtifacts(ResourceKind):
+    """Content-addressed artifacts, shared by digest: removed once no record references them."""
+
+    name = "artifacts"
+
+    @staticmethod
+    def _referenced(exclude: Optional[str] = None) -> Set[str]:
+        session = get_session_factory()()
+        try:
+            query = session.query(FabricRecord.id, FabricRecord.payload)
+            if exclude:
+                query = query.filter(FabricRecord.id != exclude)
+            digests: Set[str] = set()
+            for _, payload in query.yield_per(200):
+                for ref in ((payload or {}).get("artifact_refs") or {}).values():
+                    if isinstance(ref, dict) and ref.get("sha256"):
+                        digests.add(ref["sha256"])
+            return digests
+        finally:
+            session.close()
+
+    def _delete(self, digests: Iterable[str]) -> Reclaimed:
+        total = _reclaimed()
+        for digest in digests:
+            path = artifact_store.path_for(digest)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if artifact_store.delete(digest):
+                _add(total, _reclaimed(rows=1, nbytes=size))
+        return total
+
+    def purge(self, fabric_id: str, fabric: Optional[Dict[str, Any]]) -> Reclaimed:
+        refs = (fabric or {}).get("artifact_refs") or {}
+        own = {ref["sha256"] for ref in refs.values() if isinstance(ref, dict) and ref.get("sha256")}
+        if not own:
+            return _reclaimed()
+        return self._delete(own - self._referenced(exclude=fabric_id))
+
+    def sweep(self, min_age_seconds: float) -> Reclaimed:
+        referenced = self._referenced()
+        cutoff = time.time() - min_age_seconds
+        unreferenced = []
+        for digest in artifact_store.iter_digests():
+            if digest in referenced:
+                continue
+            try:
+                # Artifacts are written just before the record that references them.
+                if os.path.getmtime(artifact_store.path_for(digest)) <= cutoff:
+                    unreferenced.append(digest)
+            except OSError:
+                continue
+        return self._delete(unreferenced)
+
+
+class FabricReclaimer:
+    def __init__(self, kinds: Optional[List[ResourceKind]] = None) -> None:
+        self.kinds: List[ResourceKind] = list(kinds or [])
+
+    def register(self, kind: ResourceKind) -> ResourceKind:
+        self.kinds.append(kind)
+        return kind
+
+    def _kind(self, name: str) -> Optional[ResourceKind]:
+        return next((k for k in self.kinds if k.name == name), None)
+
+    def purge(self, fabric_id: str, fabric: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Remove everything ``fabric_id`` owns; one failing kind does not stop the others."""
+        reclaimed: Dict[str, Reclaimed] = {}
+        errors: Dict[str, str] = {}
+        for kind in self.kinds:
+            try:
+                reclaimed[kind.name] = kind.purge(fabric_id, fabric)
+            except Exception as exc:
+                logger.exception("Purging %s of fabric %s failed", kind.name, fabric_id)
+                errors[kind.name] = str(exc)
+        totals = _reclaimed()
+        for part in reclaimed.values():
+            _add(totals, part)
+        return {"fabric_id": fabric_id, "reclaimed": reclaimed, "totals": totals, "errors": errors}
+
+    def delete_fabric(self, fabric_id: str) -> Optional[Dict[str, Any]]:
+        """Delete the record (subject to ownership) and cascade; None if not found."""
+        fabric = fabric_store.get(fabric_id)
+        if not fabric or not fabric_store.delete(fabric_id):
+            return None
+        with db_session() as session:
+            session.merge(FabricTombstoneRecord(fabric_id=fabric_id, deleted_at=datetime.utcnow()))
+        report = self.purge(fabric_id, fabric)
+        logger.info("Deleted fabric %s, reclaimed %s", fabric_id, report["totals"])
+        return report
+
+    @staticmethod
+    def _due_owners(kind: str, owners: Set[str], grace: float) -> List[str]:
+        """Record when ``owners`` were first seen orphaned; those orphaned for ``grace`` seconds are due."""
+        now = datetime.utcnow()
+        due: List[str] = []
+        with db_session() as session:
+            seen = {
+                row.owner_id: row
+                for row in session.query(FabricGcSuspectRecord).filter(FabricGcSuspectRecord.kind == kind)
+            }
+            # Owners no longer orphaned (record saved meanwhile, or cleaned up) stop being suspects.
+            for owner, row in seen.items():
+                if owner not in owners:
+                    session.delete(row)
+            for owner in sorted(owners):
+                row = seen.get(owner)
+                if row is None:
+                    session.add(FabricGcSuspectRecord(kind=kind, owner_id=owner, first_seen=now))
+                first_seen = row.first_seen if row is not None else now
+                if (now - first_seen).total_seconds() >= grace:
+                    due.append(owner)
+        return due
+
+    @staticmethod
+    def _forget(kind: str, owner: str) -> None:
+        with db_session() as session:
+            row = session.get(FabricGcSuspectRecord, (kind, owner))
+            if row is not None:
+                session.delete(row)
+
+    def collect_garbage(
+        self,
+        grace_seconds: Optional[float] = None,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> Dict[str, Any]:
+        """Purge resources whose owning fabric is gone."""
+        grace = settings.FABRIC_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+        live = live_fabric_ids()
+        reclaimed: Dict[str, Reclaimed] = {kind.name: _reclaimed() for kind in self.kinds}
+        errors: Dict[str, str] = {}
+        purged: Set[str] = set()
+        pending = 0
+        steps = len(self.kinds) + 1
+        for step, kind in enumerate(self.kinds, start=1):
+            if isinstance(kind, FabricArtifacts):
+                continue
+            try:
+                owners = kind.orphan_owners(live)
+            except Exception as exc:
+                logger.exception("Listing orphaned %s failed", kind.name)
+                errors[kind.name] = str(exc)
+                continue
+            due = self._due_owners(kind.name, owners, grace)
+            pending += len(owners) - len(due)
+            for owner in due:
+                try:
+                    _add(reclaimed[kind.name], kind.purge(owner, None))
+                    purged.add(owner)
+                    self._forget(kind.name, owner)
+                except Exception as exc:
+                    logger.exception("Purging orphaned %s of %s failed", kind.name, owner)
+                    errors[f"{kind.name}:{owner}"] = str(exc)
+            if on_progress:
+                on_progress(step / steps)
+
+        artifacts = self._kind("artifacts")
+        if isinstance(artifacts, FabricArtifacts):
+            try:
+                reclaimed[artifacts.name] = artifacts.sweep(grace)
+            except Exception as exc:
+                logger.exception("Artifact sweep failed")
+                errors[artifacts.name] = str(exc)
+        if on_progress:
+            on_progress(1.0)
+
+        totals = _reclaimed()
+        for part in reclaimed.values():
+            _add(totals, part)
+        report = {
+            "orphaned_fabrics": sorted(purged),
+            "pending_grace": pending,
+            "reclaimed": reclaimed,
+            "totals": totals,
+            "errors": errors,
+        }
+        logger.info("Fabric GC reclaimed %s (%d orphan owners awaiting grace)", totals, pending)
+        return report
+
+
+fabric_reclaimer = FabricReclaimer([
+    VectorChunks(),
+    GraphRows(),
+    FabricFiles(),
+    ProgressEntries(),
+    FabricArtifacts(),
+])
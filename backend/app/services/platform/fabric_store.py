@@ -4,19 +4,86 @@ from __future__ import annotations
 import json
 import logging
 import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Text, and_, cast, func, or_
 
 from app.core.config import settings
 from app.core.user_context import get_current_user_id
 from app.db.models import FabricRecord
 from app.db.session import db_session, get_session_factory, init_db
+from app.services.platform.artifact_store import artifact_store, encode_artifact
 from app.utils.json_sanitize import sanitize_for_json
 
 logger = logging.getLogger(__name__)
 
 FABRICS_JSON = os.path.join(settings.DATA_DIR, "fabrics.json")
 
+# Sub-documents stored by reference (``artifact_refs``) once they outgrow
+# FABRIC_ARTIFACT_INLINE_MAX_BYTES; load them with ``load_artifacts``.
+ARTIFACT_KEYS = (
+    "code_graph",
+    "codebase_inventory",
+    "contracts",
+    "module_summaries",
+    "domain_concepts",
+    "migration_blueprint",
+)
+
+# Columns of the listing projection; written by ``_upsert_record`` on every save,
+# so listing never loads payloads.
+SUMMARY_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "source_type",
+    "status",
+    "model_status",
+    "document_count",
+    "total_chunks",
+    "tags",
+    "weave_domain",
+    "ontology_project_id",
+    "approved_ontology_version_id",
+    "owner_id",
+    "created_at",
+    "updated_at",
+)
+
+
+def _artifact_summary(value: Any) -> Dict[str, Any]:
+    if isinstance(value, list):
+        return {"count": len(value)}
+    if isinstance(value, dict):
+        if "nodes" in value or "edges" in value:
+            return {"node_count": len(value.get("nodes") or []), "edge_count": len(value.get("edges") or [])}
+        return {"keys": len(value)}
+    return {}
+
+
+def _offload_artifacts(fabric: Dict[str, Any]) -> Dict[str, Any]:
+    """Payload for ``fabric`` with large artifact keys replaced by content-addressed refs.
+
+    Keys missing from ``fabric`` (not loaded by the caller) keep their existing ref.
+    """
+    payload = dict(fabric)
+    refs = dict(payload.pop("artifact_refs", None) or {})
+    for key in ARTIFACT_KEYS:
+        if key not in payload:
+            continue
+        value = payload[key]
+        refs.pop(key, None)
+        if value is None:
+            continue
+        raw = encode_artifact(value)
+        if len(raw) <= settings.FABRIC_ARTIFACT_INLINE_MAX_BYTES:
+            continue
+        refs[key] = {**artifact_store.put_bytes(raw), "summary": _artifact_summary(value)}
+        del payload[key]
+    payload["artifact_refs"] = refs
+    return payload
+
 
 class FabricStore:
     """Single source of truth for fabric metadata."""
@@ -30,6 +97,7 @@ class FabricStore:
             return
         init_db()
         self._migrate_json_if_needed()
+        self._offload_inline_artifacts()
         self._cache = self.list_all_dicts()
         self._initialized = True
         logger.info("FabricStore ready (%d fabrics)", len(self._cache))
@@ -54,6 +122,28 @@ class FabricStore:
         finally:
             session.close()
 
+    def _offload_inline_artifacts(self) -> None:
+        """One-time move of bulky sub-documents out of records saved before artifact refs existed."""
+        text = cast(FabricRecord.payload, Text)
+        session = get_session_factory()()
+        try:
+            records = (
+                session.query(FabricRecord)
+                .filter(~text.like('%"artifact_refs"%'))
+                .filter(or_(*[text.like(f'%"{key}"%') for key in ARTIFACT_KEYS]))
+                .all()
+            )
+            for rec in records:
+                rec.payload = _offload_artifacts(rec.payload or {})
+            session.commit()
+            if records:
+                logger.info("Moved bulky artifacts out of %d fabric records", len(records))
+        except Exception as exc:
+            session.rollback()
+            logger.warning("Artifact offload skipped: %s", exc)
+        finally:
+            session.close()
+
     def _record_to_dict(self, rec: FabricRecord) -> Dict[str, Any]:
         data = dict(rec.payload or {})
         data.update({
@@ -81,6 +171,11 @@ class FabricStore:
         rec = session.get(FabricRecord, fid)
         if rec is None:
             rec = FabricRecord(id=fid, payload={})
+            try:
+                created = datetime.fromisoformat(str(fabric["created_at"]))
+                rec.created_at = created.astimezone(timezone.utc).replace(tzinfo=None) if created.tzinfo else created
+            except (KeyError, ValueError):
+                pass
             session.add(rec)
         rec.name = fabric.get("name") or fid
         owner_id = fabric.get("owner_id") or get_current_user_id()
@@ -99,7 +194,7 @@ class FabricStore:
         rec.ontology_project_id = fabric.get("ontology_project_id")
         rec.approved_ontology_version_id = fabric.get("approved_ontology_version_id")
         rec.ontology_waiver = bool(fabric.get("ontology_waiver", False))
-        rec.payload = fabric
+        rec.payload = _offload_artifacts(fabric)
         rec.updated_at = datetime.utcnow()
         return rec
 
@@ -125,7 +220,96 @@ class FabricStore:
                 pass
         return []
 
-    def get(self, fabric_id: str) -> Optional[Dict[str, Any]]:
+    def _summary_criteria(
+        self,
+        source_type: Optional[str] = None,
+        status: Optional[str] = None,
+        q: Optional[str] = None,
+    ):
+        criteria = []
+        owner_id = get_current_user_id()
+        if owner_id:
+            criteria.append(FabricRecord.owner_id == owner_id)
+        if source_type:
+            criteria.append(FabricRecord.source_type == source_type)
+        if status:
+            criteria.append(FabricRecord.status == status)
+        if q:
+            criteria.append(FabricRecord.name.ilike(f"%{q}%"))
+        return criteria
+
+    def summary_revision(self, **filters: Any) -> Dict[str, Any]:
+        """Row count and newest ``updated_at`` of the filtered listing; changes on every save/delete."""
+        session = get_session_factory()()
+        try:
+            count, newest = (
+                session.query(func.count(), func.max(FabricRecord.updated_at))
+                .filter(*self._summary_criteria(**filters))
+                .one()
+            )
+            return {"count": count, "updated_at": newest.isoformat() if newest else None}
+        finally:
+            session.close()
+
+    def list_summaries(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+        **filters: Any,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """Summary projection (``SUMMARY_COLUMNS``), newest first, without loading payloads.
+
+        ``after`` is the ``(created_at, id)`` of the last row of the previous
+        page; returns the page and the key to pass for the next one (None at the end).
+        """
+        columns = [getattr(FabricRecord, name) for name in SUMMARY_COLUMNS]
+        session = get_session_factory()()
+        try:
+            query = session.query(*columns).filter(*self._summary_criteria(**filters))
+            if after:
+                created_at, fid = datetime.fromisoformat(after[0]), after[1]
+                query = query.filter(
+                    or_(
+                        FabricRecord.created_at < created_at,
+                        and_(FabricRecord.created_at == created_at, FabricRecord.id < fid),
+                    )
+                )
+            query = query.order_by(FabricRecord.created_at.desc(), FabricRecord.id.desc())
+            rows = query.limit(limit + 1).all() if limit else query.all()
+        finally:
+            session.close()
+        next_key = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_key = (rows[-1].created_at.isoformat(), rows[-1].id)
+        items = []
+        for row in rows:
+            item = dict(zip(SUMMARY_COLUMNS, row))
+            item["tags"] = item["tags"] or []
+            for key in ("created_at", "updated_at"):
+                item[key] = item[key].isoformat() if item[key] else None
+            items.append(item)
+        return items, next_key
+
+    def load_artifacts(
+        self, fabric: Optional[Dict[str, Any]], keys: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Fill in referenced artifacts (all, or just ``keys``) on a fabric dict, in place."""
+        if not fabric:
+            return fabric
+        refs = fabric.get("artifact_refs") or {}
+        for key in keys if keys is not None else list(refs):
+            ref = refs.get(key)
+            if ref and key not in fabric:
+                fabric[key] = artifact_store.get(ref["sha256"])
+        return fabric
+
+    def get(self, fabric_id: str, with_artifacts: bool = False) -> Optional[Dict[str, Any]]:
+        """Fabric metadata; bulky artifacts stay as ``artifact_refs`` unless ``with_artifacts``."""
+        fabric = self._get(fabric_id)
+        return self.load_artifacts(fabric) if with_artifacts else fabric
+
+    def _get(self, fabric_id: str) -> Optional[Dict[str, Any]]:
         owner_id = get_current_user_id()
         session = get_session_factory()()
         try:
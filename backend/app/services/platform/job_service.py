@@ -1,13 +1,25 @@
-"""Platform background jobs."""
+"""Platform background jobs.
+
+Credentials a job needs (database connection data) are sealed with Fernet
+before they reach ``FabricJobRecord.config``; only the worker opens them.
+Job dicts handed to API callers never include secret config keys.
+"""
 from __future__ import annotations
 
+import base64
+import hashlib
+import json
 import logging
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
 
+from app.core.config import settings
 from app.db.models import FabricJobRecord
 from app.db.session import db_session, get_session_factory
+from app.services.platform.progress_store import progress_store
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +30,17 @@ JOB_TYPES = (
     "graph_build",
     "graph_export",
     "codebase_analysis",
+    "model_training",
+    "fabric_gc",
+    "database_fabric",
 )
+# Config keys that may hold credentials; never returned by ``get``/``list_for_fabric``.
+SECRET_CONFIG_KEYS = ("connection_data", "connection_secret", "pat", "ssh_private_key", "password", "token")
+
+
+def _fernet() -> Fernet:
+    key = settings.JOB_SECRETS_KEY or settings.SECRET_KEY
+    return Fernet(base64.urlsafe_b64encode(hashlib.sha256(key.encode("utf-8")).digest()))
 
 
 class JobService:
@@ -51,7 +73,7 @@ class JobService:
                 session.query(FabricJobRecord)
                 .filter(
                     FabricJobRecord.status == "running",
-                    FabricJobRecord.job_type == "codebase_analysis",
+                    FabricJobRecord.job_type.in_(("codebase_analysis", "database_fabric", "fabric_gc")),
                 )
                 .order_by(FabricJobRecord.created_at.asc())
                 .all()
@@ -59,10 +81,23 @@ class JobService:
             now = datetime.utcnow()
             for job in stale:
                 started = job.started_at or job.created_at
-                if started and (now - started).total_seconds() > 45:
+                limit = 45.0
+                if job.job_type in ("database_fabric", "fabric_gc"):
+                    # Checkpointed builds heartbeat on every batch and resume from the checkpoint;
+                    # GC sweeps heartbeat per resource kind and are safe to rerun from the start.
+                    heartbeat = (job.result or {}).get("checkpointed_at")
+                    if heartbeat and started:
+                        started = max(started, datetime.fromisoformat(heartbeat))
+                    limit = (
+                        settings.DATABASE_FABRIC_STALE_SECONDS
+                        if job.job_type == "database_fabric"
+                        else settings.FABRIC_GC_STALE_SECONDS
+                    )
+                if started and (now - started).total_seconds() > limit:
                     logger.warning("Re-queueing stale running job %s", job.id)
                     job.status = "queued"
                     job.started_at = None
+            self._fail_stale_training(session, now)
             if stale:
                 session.commit()
 
@@ -77,13 +112,48 @@ class JobService:
             job.status = "running"
             job.started_at = datetime.utcnow()
             session.commit()
-            return self._to_dict(job)
+            # The worker gets the full config, sealed secrets included.
+            return {**self._to_dict(job), "config": dict(job.config or {})}
         except Exception:
             session.rollback()
             raise
         finally:
             session.close()
 
+    @staticmethod
+    def _fail_stale_training(session: Any, now: datetime) -> None:
+        """Fail training jobs whose worker died: they hold no checkpoint, and their progress would spin forever."""
+        running = (
+            session.query(FabricJobRecord)
+            .filter(FabricJobRecord.status == "running", FabricJobRecord.job_type == "model_training")
+            .all()
+        )
+        for job in running:
+            heartbeat = (job.result or {}).get("checkpointed_at")
+            last_seen = max(filter(None, (
+                job.started_at or job.created_at,
+                datetime.fromisoformat(heartbeat) if heartbeat else None,
+            )))
+            if (now - last_seen).total_seconds() <= settings.TRAINING_STALE_SECONDS:
+                continue
+            message = "Training was interrupted (the worker stopped); start it again"
+            logger.warning("Failing stale training job %s", job.id)
+            job.status = "failed"
+            job.completed_at = now
+            job.error_payload = {"message": message}
+            progress_id = (job.config or {}).get("progress_id")
+            if progress_id:
+                progress_store[progress_id] = {
+                    "status": "error",
+                    "progress": 0,
+                    "message": message,
+                    "stage": "error",
+                    "training_id": (job.config or {}).get("training_id"),
+                    "job_id": job.id,
+                }
+        if running:
+            session.commit()
+
     def update(
         self,
         job_id: str,
@@ -108,6 +178,38 @@ class JobService:
             if status in ("ready", "failed"):
                 job.completed_at = datetime.utcnow()
 
+    def seal_secret(self, value: Any) -> str:
+        """Encrypt a JSON-serialisable secret for a job config."""
+        return _fernet().encrypt(json.dumps(value).encode("utf-8")).decode("ascii")
+
+    def open_secret(self, sealed: str) -> Any:
+        """Decrypt a ``seal_secret`` value; ``ValueError`` if the key changed or it was tampered with."""
+        try:
+            return json.loads(_fernet().decrypt(sealed.encode("ascii")))
+        except (InvalidToken, ValueError) as exc:
+            raise ValueError("Stored job credentials cannot be read; submit the connection details again") from exc
+
+    def scrub_config(self, job_id: str, keys: Iterable[str]) -> None:
+        """Drop ``keys`` from a job's stored config once it no longer needs them."""
+        keys = tuple(keys)
+        with db_session() as session:
+            job = session.get(FabricJobRecord, job_id)
+            if job and job.config and any(k in job.config for k in keys):
+                job.config = {k: v for k, v in job.config.items() if k not in keys}
+
+    def has_pending(self, job_type: str) -> bool:
+        """True while a job of ``job_type`` is queued or running."""
+        session = get_session_factory()()
+        try:
+            return (
+                session.query(FabricJobRecord.id)
+                .filter(FabricJobRecord.job_type == job_type, FabricJobRecord.status.in_(("queued", "running")))
+                .first()
+                is not None
+            )
+        finally:
+            session.close()
+
     def get(self, job_id: str) -> Optional[Dict[str, Any]]:
         session = get_session_factory()()
         try:
@@ -139,7 +241,7 @@ class JobService:
             "progress_percent": job.progress_percent,
             "error_payload": job.error_payload,
             "result": job.result,
-            "config": job.config or {},
+            "config": {k: v for k, v in (job.config or {}).items() if k not in SECRET_CONFIG_KEYS},
             "started_at": job.started_at.isoformat() if job.started_at else None,
             "completed_at": job.completed_at.isoformat() if job.completed_at else None,
             "created_at": job.created_at.isoformat() if job.created_at else None,
@@ -20,6 +20,7 @@ class JobWorker:
     def __init__(self) -> None:
         self._thread: Optional[threading.Thread] = None
         self._stop = threading.Event()
+        self._last_gc = time.monotonic()
 
     def start(self) -> None:
         if not settings.ENABLE_JOB_WORKER or self._thread:
@@ -35,6 +36,7 @@ class JobWorker:
         while not self._stop.is_set():
             job = job_service.claim_next()
             if not job:
+                self._schedule_gc()
                 time.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
                 continue
             try:
@@ -47,12 +49,23 @@ class JobWorker:
                     error_payload={"message": str(exc)},
                 )
 
+    def _schedule_gc(self) -> None:
+        interval = settings.FABRIC_GC_INTERVAL_SECONDS
+        if interval <= 0 or time.monotonic() - self._last_gc < interval:
+            return
+        self._last_gc = time.monotonic()
+        if not job_service.has_pending("fabric_gc"):
+            job_service.enqueue("fabric_gc", config={"scheduled": True})
+
     def _dispatch(self, job: Dict[str, Any]) -> None:
         handlers = {
             "ontology_discovery": self._handle_ontology_discovery,
             "graph_build": self._handle_graph_build,
             "graph_export": self._handle_graph_export,
             "codebase_analysis": self._handle_codebase_analysis,
+            "model_training": self._handle_model_training,
+            "fabric_gc": self._handle_fabric_gc,
+            "database_fabric": self._handle_database_fabric,
         }
         handler = handlers.get(job["job_type"])
         if not handler:
@@ -148,21 +161,157 @@ class JobWorker:
         job_service.update(job["id"], status="ready", progress_percent=100.0, result=result)
 
     def _handle_graph_export(self, job: Dict[str, Any]) -> None:
+        """Stream the canonical graph to each target, checkpointing after every batch.
+
+        Checkpoints are kept in the job result; enqueue a new export with
+        ``config.resume_job_id`` set to a failed job to continue where it stopped.
+        """
         from app.services.graph.adapters.neo4j_adapter import neo4j_adapter
         from app.services.graph.adapters.rdf_adapter import rdf_adapter
+        from app.services.graph.graph_store import graph_store
 
         config = job.get("config") or {}
         fabric_id = job.get("fabric_id")
-        version_id = config.get("ontology_version_id")
+        version_id = graph_store.resolve_version_id(fabric_id, config.get("ontology_version_id"))
         targets = config.get("targets") or ["rdf"]
+        batch_size = config.get("batch_size")
+        checkpoints: Dict[str, Any] = {}
+        resume_job = job_service.get(config["resume_job_id"]) if config.get("resume_job_id") else None
+        if resume_job:
+            checkpoints.update((resume_job.get("result") or {}).get("checkpoints") or {})
+
+        counts = graph_store.count_graph(fabric_id, version_id) if version_id else {}
+        graph_rows = counts.get("node_count", 0) + counts.get("edge_count", 0)
+        streams = int("neo4j" in targets) + int("rdf" in targets or "stardog" in targets)
+        total_rows = max(1, graph_rows * streams)
         exports: Dict[str, Any] = {}
+
+        def tracker(target: str, done_before: int):
+            def on_checkpoint(cp: Dict[str, Any]) -> None:
+                checkpoints[target] = cp
+                written = done_before + cp.get("nodes_written", 0) + cp.get("edges_written", 0)
+                job_service.update(
+                    job["id"],
+                    progress_percent=round(min(99.0, 100.0 * written / total_rows), 1),
+                    result={"checkpoints": checkpoints, "exports": exports},
+                )
+            return on_checkpoint
+
+        done_rows = 0
         if "neo4j" in targets:
-            exports["neo4j"] = neo4j_adapter.export_fabric_graph(fabric_id, version_id)
+            exports["neo4j"] = neo4j_adapter.stream_export(
+                fabric_id, version_id, batch_size=batch_size,
+                checkpoint=checkpoints.get("neo4j"), on_checkpoint=tracker("neo4j", done_rows),
+            )
+            done_rows += graph_rows
         if "rdf" in targets or "stardog" in targets:
-            exports["rdf"] = rdf_adapter.export_fabric_graph(fabric_id, version_id)
-            if "stardog" in targets:
-                exports["stardog"] = rdf_adapter.push_to_stardog(fabric_id, version_id)
-        job_service.update(job["id"], status="ready", progress_percent=100.0, result=exports)
+            exports["rdf"] = rdf_adapter.stream_ntriples(
+                fabric_id, version_id, path=config.get("rdf_path"), batch_size=batch_size,
+                compress=config.get("compress", True),
+                checkpoint=checkpoints.get("rdf"), on_checkpoint=tracker("rdf", done_rows),
+            )
+            if "stardog" in targets and exports["rdf"].get("path"):
+                exports["stardog"] = rdf_adapter.push_file_to_stardog(fabric_id, exports["rdf"]["path"])
+        job_service.update(
+            job["id"],
+            status="ready",
+            progress_percent=100.0,
+            result={**exports, "checkpoints": checkpoints},
+        )
+
+    def _handle_fabric_gc(self, job: Dict[str, Any]) -> None:
+        """Purge data of deleted fabrics; the report is the job result."""
+        from app.services.platform.fabric_gc import fabric_reclaimer
+
+        config = job.get("config") or {}
+        report = fabric_reclaimer.collect_garbage(
+            grace_seconds=config.get("grace_seconds"),
+            on_progress=lambda frac: job_service.update(
+                job["id"],
+                progress_percent=round(99.0 * frac, 1),
+                result={"checkpointed_at": datetime.utcnow().isoformat()},
+            ),
+        )
+        job_service.update(job["id"], status="ready", progress_percent=100.0, result=report)
+
+    def _handle_database_fabric(self, job: Dict[str, Any]) -> None:
+        """Build a database fabric batch by batch; the job result holds the resume checkpoint.
+
+        A job re-claimed after a crash continues from its own checkpoint; a new
+        job with ``config.resume_job_id`` continues a failed one.
+        """
+        from app.api.v1.endpoints import knowledge as knowledge_endpoints
+        from app.services.platform.database_fabric_build import build_database_fabric, discard_build
+
+        config = dict(job.get("config") or {})
+        fabric_id = job.get("fabric_id")
+        progress_id = config.get("progress_id")
+        checkpoint = (job.get("result") or {}).get("checkpoint")
+        if not checkpoint and config.get("resume_job_id"):
+            previous = job_service.get(config["resume_job_id"]) or {}
+            checkpoint = (previous.get("result") or {}).get("checkpoint")
+
+        def publish(status: str, pct: float, message: str, stage: str, extra: Dict[str, Any]) -> None:
+            if progress_id:
+                knowledge_endpoints.progress_store[progress_id] = {
+                    "status": status,
+                    "progress": pct,
+                    "message": message,
+                    "stage": stage,
+                    "fabric_id": fabric_id,
+                    "job_id": job["id"],
+                    **extra,
+                }
+
+        def on_checkpoint(cp: Dict[str, Any], metrics: Dict[str, Any]) -> None:
+            total = metrics.get("total_rows")
+            if cp["stage"] == "rows":
+                pct = 5.0 + (85.0 * min(1.0, cp["rows_fetched"] / total) if total else 0.0)
+                message = f"Indexed {cp['rows_fetched']:,} rows ({metrics['rows_per_second']:,.0f} rows/s)"
+            else:
+                pct = 95.0 if cp["stage"] == "links" else 99.0
+                message = f"Indexed {cp['link_documents']:,} linked-row chunks"
+            pct = round(pct, 1)
+            job_service.update(
+                job["id"],
+                progress_percent=pct,
+                result={"checkpoint": cp, "metrics": metrics, "checkpointed_at": datetime.utcnow().isoformat()},
+            )
+            publish("processing", pct, message, cp["stage"], {"checkpoint": cp, "metrics": metrics})
+
+        def scrub_credentials() -> None:
+            try:
+                job_service.scrub_config(job["id"], ("connection_data", "connection_secret"))
+            except Exception:
+                logger.debug("Failed scrubbing database job credentials", exc_info=True)
+
+        try:
+            if not fabric_id:
+                raise ValueError("Missing fabric_id")
+            if config.get("connection_secret"):
+                config["connection_data"] = job_service.open_secret(config.pop("connection_secret"))
+            publish("processing", 2.0, "Connecting to source", "connect", {})
+            source, describe = knowledge_endpoints._database_source(config)
+            final = build_database_fabric(fabric_id, source, checkpoint=checkpoint, on_checkpoint=on_checkpoint)
+            summary = knowledge_endpoints._complete_database_fabric(fabric_id, config, describe, final)
+            done = (job_service.get(job["id"]) or {}).get("result") or {}
+            result = {**summary, "checkpoint": final, "metrics": done.get("metrics")}
+            job_service.update(job["id"], status="ready", progress_percent=100.0, result=result)
+            publish("completed", 100, "Database fabric ready", "done", {"result": result})
+            discard_build(fabric_id)
+            scrub_credentials()
+        except Exception as exc:
+            logger.exception("Database fabric build failed for %s", fabric_id)
+            detail = getattr(exc, "detail", None) or str(exc)
+            fabric = fabric_store.get(fabric_id) if fabric_id else None
+            if fabric:
+                fabric["status"] = "failed"
+                fabric["error"] = str(detail)
+                fabric_store.save(fabric)
+            # The result keeps the last checkpoint so a resume job can pick it up.
+            job_service.update(job["id"], status="failed", error_payload={"message": str(detail)})
+            publish("error", 0, str(detail), "error", {})
+            scrub_credentials()
 
     def _handle_codebase_analysis(self, job: Dict[str, Any]) -> None:
         from app.api.v1.endpoints import knowledge as knowledge_endpoints
@@ -175,16 +324,7 @@ class JobWorker:
 
         def _scrub_secrets() -> None:
             try:
-                with __import__("app.db.session", fromlist=["db_session"]).db_session() as session:
-                    from app.db.models import FabricJobRecord
-
-                    row = session.get(FabricJobRecord, job["id"])
-                    if not row:
-                        return
-                    cfg = dict(row.config or {})
-                    for key in ("pat", "ssh_private_key", "password", "token"):
-                        cfg.pop(key, None)
-                    row.config = cfg
+                job_service.scrub_config(job["id"], ("pat", "ssh_private_key", "password", "token"))
             except Exception:
                 logger.debug("Failed scrubbing codebase job secrets", exc_info=True)
 
@@ -251,5 +391,73 @@ class JobWorker:
         finally:
             _scrub_secrets()
 
+    def _handle_model_training(self, job: Dict[str, Any]) -> None:
+        """Train the staged Parquet datasets; candidate and CV-fold fits run in a process pool."""
+        from app.api.v1.endpoints import knowledge as knowledge_endpoints
+        from app.services.model_service import model_service
+
+        config = job.get("config") or {}
+        progress_id = config.get("progress_id")
+        training_id = config.get("training_id")
+
+        def on_progress(pct: float, message: str) -> None:
+            job_service.update(
+                job["id"],
+                progress_percent=round(min(pct, 99.0), 1),
+                result={"checkpointed_at": datetime.utcnow().isoformat()},
+            )
+            if progress_id:
+                knowledge_endpoints.progress_store[progress_id] = {
+                    "status": "processing",
+                    "progress": round(pct, 1),
+                    "message": message,
+                    "stage": "training",
+                    "training_id": training_id,
+                    "job_id": job["id"],
+                }
+
+        try:
+            data = model_service.load_training_dataset(config.get("dataset_paths") or [config["dataset_path"]])
+            trained = model_service.train_models(
+                data,
+                config.get("data_type") or "enterprise",
+                config.get("preprocessing_options") or {},
+                progress=on_progress,
+                max_workers=config.get("max_workers"),
+            )
+            metadata = trained["metadata"]
+            result = {
+                "training_id": training_id,
+                "model_id": trained["model_id"],
+                "best_model": metadata["best_model"],
+                "cross_validation": metadata["cross_validation"],
+                "training_seconds": metadata["training_seconds"],
+                "training_workers": metadata["training_workers"],
+                "models": trained["models"],
+            }
+            job_service.update(job["id"], status="ready", progress_percent=100.0, result=result)
+            if progress_id:
+                knowledge_endpoints.progress_store[progress_id] = {
+                    "status": "completed",
+                    "progress": 100,
+                    "message": f"Training complete; best model {metadata['best_model']}",
+                    "stage": "done",
+                    "training_id": training_id,
+                    "job_id": job["id"],
+                    "result": result,
+                }
+        except Exception as exc:
+            logger.exception("Model training failed for %s", training_id)
+            job_service.update(job["id"], status="failed", error_payload={"message": str(exc)})
+            if progress_id:
+                knowledge_endpoints.progress_store[progress_id] = {
+                    "status": "error",
+                    "progress": 0,
+                    "message": str(exc),
+                    "stage": "error",
+                    "training_id": training_id,
+                    "job_id": job["id"],
+                }
+
 
 job_worker = JobWorker()
@@ -1,16 +1,27 @@
-"""Disk-backed progress store so uvicorn --reload does not lose fabric progress."""
+"""In-memory progress bus with periodic disk snapshots so uvicorn --reload does not lose fabric progress.
+
+Updates live in memory and are pushed to subscribers (the SSE endpoint);
+changed entries are written to one JSON file per progress_id every
+``PROGRESS_SNAPSHOT_SECONDS`` (immediately for terminal states), and read back
+on a miss after a restart. A terminal entry leaves memory once its snapshot is
+written; late readers are served from disk. ``PROGRESS_SNAPSHOT_SECONDS=0``
+disables disk snapshots entirely, and memory then keeps only the newest
+``PROGRESS_MEMORY_TERMINAL_ENTRIES`` terminal entries.
+"""
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import threading
 from pathlib import Path
-from typing import Any, Dict, Iterator, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
-_lock = threading.Lock()
+
+TERMINAL_STATUSES = ("completed", "error", "failed")
 
 
 def _root() -> Path:
@@ -24,13 +35,36 @@ def _path(progress_id: str) -> Path:
     return _root() / f"{safe}.json"
 
 
+def _offer(queue: asyncio.Queue, value: Dict[str, Any]) -> None:
+    # Progress is state, not an event log: a slow subscriber only needs the latest value.
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(value)
+
+
 class ProgressStore:
-    """dict-like store persisted as one JSON file per progress_id."""
+    """dict-like progress store; ``subscribe`` yields each update as it is published."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        # Serializes flushes, so a stale snapshot cannot land after a delete removed the file.
+        self._flush_lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Set[str] = set()
+        # Deleted ids whose snapshot file is not removed yet.
+        self._deleted: Set[str] = set()
+        # Memory-only mode: terminal ids, oldest first.
+        self._terminal: Dict[str, None] = {}
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.publishes = 0
+        self.disk_writes = 0
 
     def __contains__(self, progress_id: object) -> bool:
         if not isinstance(progress_id, str):
             return False
-        return _path(progress_id).exists()
+        return self.get(progress_id) is not None
 
     def __getitem__(self, progress_id: str) -> Dict[str, Any]:
         data = self.get(progress_id)
@@ -45,33 +79,167 @@ class ProgressStore:
         self.delete(progress_id)
 
     def get(self, progress_id: str, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
-        path = _path(progress_id)
-        if not path.exists():
-            return default
-        try:
-            with _lock:
-                return json.loads(path.read_text(encoding="utf-8"))
-        except Exception as exc:
-            logger.warning("Failed reading progress %s: %s", progress_id, exc)
+        with self._lock:
+            data = self._entries.get(progress_id)
+            if data is not None or progress_id in self._deleted:
+                return data if data is not None else default
+        data = self._read_snapshot(progress_id)
+        if data is None:
             return default
+        if data.get("status") in TERMINAL_STATUSES:
+            return data
+        with self._lock:
+            return self._entries.setdefault(progress_id, data)
 
     def set(self, progress_id: str, value: Dict[str, Any]) -> None:
-        path = _path(progress_id)
-        tmp = path.with_suffix(".tmp")
-        payload = json.dumps(value, default=str)
-        with _lock:
-            tmp.write_text(payload, encoding="utf-8")
-            tmp.replace(path)
+        value = dict(value)
+        with self._lock:
+            self._entries[progress_id] = value
+            self._deleted.discard(progress_id)
+            self._terminal.pop(progress_id, None)
+            self._dirty.add(progress_id)
+            self.publishes += 1
+            subscribers = list(self._subscribers.get(progress_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, value)
+            except RuntimeError:
+                pass  # subscriber's event loop already closed
+        if value.get("status") not in TERMINAL_STATUSES:
+            self._ensure_flusher()
+        elif settings.PROGRESS_SNAPSHOT_SECONDS > 0:
+            self.flush([progress_id])
+        else:
+            self._retire_in_memory(progress_id)
+
+    def update(self, progress_id: str, **fields: Any) -> None:
+        """Merge ``fields`` into the entry and publish; mutating ``store[id][key]`` in place is not seen by subscribers."""
+        self.set(progress_id, {**(self.get(progress_id) or {}), **fields})
 
     def delete(self, progress_id: str) -> None:
-        path = _path(progress_id)
-        with _lock:
-            if path.exists():
-                path.unlink()
+        with self._lock:
+            self._entries.pop(progress_id, None)
+            self._dirty.discard(progress_id)
+            self._terminal.pop(progress_id, None)
+            if settings.PROGRESS_SNAPSHOT_SECONDS > 0:
+                self._deleted.add(progress_id)
+        self.flush([progress_id])
 
     def keys(self) -> Iterator[str]:
-        for path in _root().glob("*.json"):
-            yield path.stem
+        with self._lock:
+            seen = set(self._entries)
+            deleted = set(self._deleted)
+        yield from seen
+        if settings.PROGRESS_SNAPSHOT_SECONDS > 0:
+            for path in _root().glob("*.json"):
+                if path.stem not in seen and path.stem not in deleted:
+                    yield path.stem
+
+    async def subscribe(self, progress_id: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Current state, then each update; yields None on idle heartbeats (PROGRESS_HEARTBEAT_SECONDS)."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(progress_id, []).append(entry)
+        try:
+            current = self.get(progress_id)
+            if current is not None:
+                yield current
+                if current.get("status") in TERMINAL_STATUSES:
+                    return
+            while True:
+                try:
+                    value = await asyncio.wait_for(queue.get(), timeout=settings.PROGRESS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield value
+                if value.get("status") in TERMINAL_STATUSES:
+                    return
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(progress_id, [])
+                if entry in subscribers:
+                    subscribers.remove(entry)
+                if not subscribers:
+                    self._subscribers.pop(progress_id, None)
+
+    def flush(self, progress_ids: Optional[List[str]] = None) -> int:
+        """Write dirty entries (or just ``progress_ids``) to disk; returns files written."""
+        if settings.PROGRESS_SNAPSHOT_SECONDS <= 0:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                ids = list(progress_ids) if progress_ids is not None else list(self._dirty)
+                snapshot = {p: self._entries.get(p) for p in ids}
+                self._dirty.difference_update(ids)
+            written: Dict[str, Optional[Dict[str, Any]]] = {}
+            for progress_id, value in snapshot.items():
+                path = _path(progress_id)
+                try:
+                    if value is None:
+                        if path.exists():
+                            path.unlink()
+                    else:
+                        tmp = path.with_suffix(".tmp")
+                        tmp.write_text(json.dumps(value, default=str), encoding="utf-8")
+                        tmp.replace(path)
+                    written[progress_id] = value
+                except Exception as exc:
+                    logger.warning("Failed writing progress snapshot %s: %s", progress_id, exc)
+            with self._lock:
+                for progress_id, value in written.items():
+                    if value is None:
+                        self._deleted.discard(progress_id)
+                    elif value.get("status") in TERMINAL_STATUSES and self._entries.get(progress_id) is value:
+                        # On disk now and final: late readers load it from the snapshot.
+                        del self._entries[progress_id]
+                files = sum(1 for value in written.values() if value is not None)
+                self.disk_writes += files
+        return files
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "publishes": self.publishes,
+                "disk_writes": self.disk_writes,
+                "dirty": len(self._dirty),
+            }
+
+    def _retire_in_memory(self, progress_id: str) -> None:
+        """Without snapshots, finished entries stay in memory; only the newest few are kept."""
+        with self._lock:
+            self._terminal.pop(progress_id, None)
+            self._terminal[progress_id] = None
+            while len(self._terminal) > max(0, settings.PROGRESS_MEMORY_TERMINAL_ENTRIES):
+                oldest = next(iter(self._terminal))
+                del self._terminal[oldest]
+                self._entries.pop(oldest, None)
+
+    def _read_snapshot(self, progress_id: str) -> Optional[Dict[str, Any]]:
+        path = _path(progress_id)
+        if settings.PROGRESS_SNAPSHOT_SECONDS <= 0 or not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.warning("Failed reading progress %s: %s", progress_id, exc)
+            return None
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None or settings.PROGRESS_SNAPSHOT_SECONDS <= 0:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="progress-snapshot", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(settings.PROGRESS_SNAPSHOT_SECONDS):
+            self.flush()
 
 
 progress_store = ProgressStore()
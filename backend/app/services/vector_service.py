@@ -1,13 +1,46 @@
+import bisect
 import chromadb
 from chromadb.config import Settings
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 import uuid
 import json
 import os
 from datetime import datetime
 from app.core.config import settings
 
+# Chunk-adjacency metadata stamped by ``add_documents``; never taken from callers.
+ADJACENCY_KEYS = ("chunk_group", "chunk_ordinal", "chunk_group_size", "prev_chunk_id", "next_chunk_id")
+
+
+def _stratified_picks(sizes: Dict[str, int], limit: int) -> List[tuple]:
+    """``(group, ordinal)`` pairs: proportional, evenly spaced shares of ``limit`` across groups."""
+    total = sum(sizes.values())
+    if total <= limit:
+        return [(group, ordinal) for group, size in sorted(sizes.items()) for ordinal in range(size)]
+    # Largest groups first, so with more groups than slots the big ones are represented.
+    ordered = sorted(sizes.items(), key=lambda item: (-item[1], item[0]))
+    quotas = [max(1, size * limit // total) for _, size in ordered]
+    spare = limit - sum(quotas)
+    while spare > 0:
+        grown = False
+        for i, (_, size) in enumerate(ordered):
+            if spare > 0 and quotas[i] < size:
+                quotas[i] += 1
+                spare -= 1
+                grown = True
+        if not grown:
+            break
+    picks: List[tuple] = []
+    for (group, size), quota in zip(ordered, quotas):
+        quota = min(quota, limit - len(picks))
+        if quota <= 0:
+            break
+        step = size / quota
+        picks.extend((group, int(i * step)) for i in range(quota))
+    return picks
+
+
 class VectorService:
     def __init__(self):
         try:
@@ -97,8 +130,15 @@ class VectorService:
                 fallback_embeddings.append(vec.tolist())
             return fallback_embeddings
     
-    def add_documents(self, documents: List[Dict[str, Any]], source_id: str) -> List[str]:
-        """Add documents to the vector database"""
+    def add_documents(
+        self, documents: List[Dict[str, Any]], source_id: str, batch_key: Optional[str] = None
+    ) -> List[str]:
+        """Add documents to the vector database.
+
+        With a ``batch_key`` the chunk ids are derived from it instead of a
+        random prefix and written with upsert, so replaying the same batch
+        (e.g. a resumed job) replaces its chunks rather than duplicating them.
+        """
         if not documents:
             return []
         
@@ -106,9 +146,12 @@ class VectorService:
         texts = [doc["content"] for doc in documents]
         metadatas = []
         ids = []
+        adjacency = self._chunk_adjacency(documents, f"{source_id}_{batch_key or uuid.uuid4().hex[:8]}")
         
         for i, doc in enumerate(documents):
-            doc_metadata = doc.get("metadata", {}) or {}
+            doc_metadata = {
+                k: v for k, v in (doc.get("metadata", {}) or {}).items() if k not in ADJACENCY_KEYS
+            }
             metadata = {
                 **doc_metadata,
                 # Enforce target source identity last so nested metadata cannot override it.
@@ -117,15 +160,17 @@ class VectorService:
                 "page_number": doc.get("page_number"),
                 "file_name": doc.get("file_name"),
                 "created_at": doc.get("created_at"),
+                **adjacency[i],
             }
             metadatas.append(metadata)
-            ids.append(f"{source_id}_{i}_{uuid.uuid4().hex[:8]}")
+            ids.append(f"{adjacency[i]['chunk_group']}_{adjacency[i]['chunk_ordinal']}")
         
         # Create embeddings
         embeddings = self.create_embeddings(texts)
         
         # Add to collection
-        self.documents_collection.add(
+        write = self.documents_collection.upsert if batch_key else self.documents_collection.add
+        write(
             embeddings=embeddings,
             documents=texts,
             metadatas=metadatas,
@@ -134,6 +179,69 @@ class VectorService:
         
         return ids
     
+    @staticmethod
+    def _chunk_adjacency(documents: List[Dict[str, Any]], batch_prefix: str) -> List[Dict[str, Any]]:
+        """Neighbour metadata per document, in input order.
+
+        Consecutive chunks of one file (and chunk type) form a group; a chunk's
+        id is ``{chunk_group}_{chunk_ordinal}``, so any window of neighbours
+        can be addressed by id without another search.
+        """
+        groups: Dict[tuple, List[int]] = {}
+        for i, doc in enumerate(documents):
+            doc_metadata = doc.get("metadata") or {}
+            key = (
+                doc.get("file_name") or doc.get("source_name"),
+                doc_metadata.get("chunk_type") or doc_metadata.get("chunk_kind"),
+            )
+            groups.setdefault(key, []).append(i)
+        adjacency: List[Dict[str, Any]] = [{} for _ in documents]
+        for g, members in enumerate(groups.values()):
+            group = f"{batch_prefix}_{g}"
+            for ordinal, i in enumerate(members):
+                entry = {"chunk_group": group, "chunk_ordinal": ordinal, "chunk_group_size": len(members)}
+                if ordinal > 0:
+                    entry["prev_chunk_id"] = f"{group}_{ordinal - 1}"
+                if ordinal + 1 < len(members):
+                    entry["next_chunk_id"] = f"{group}_{ordinal + 1}"
+                adjacency[i] = entry
+        return adjacency
+
+    def expand_context(
+        self, results: List[Dict[str, Any]], window: int
+    ) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """The ``window`` chunks before and after each hit, fetched in one ``get`` by id.
+
+        Returns ``{hit_id: {"before": [...], "after": [...]}}`` with
+        ``{"id", "content", "metadata"}`` entries in document order. Hits
+        ingested before chunks recorded adjacency get no context.
+        """
+        if window <= 0:
+            return {}
+        wanted: Dict[str, Dict[str, List[str]]] = {}
+        for result in results:
+            metadata = result.get("metadata") or {}
+            group, ordinal = metadata.get("chunk_group"), metadata.get("chunk_ordinal")
+            if group is None or ordinal is None:
+                continue
+            size = int(metadata.get("chunk_group_size") or ordinal + 1)
+            wanted[result["id"]] = {
+                "before": [f"{group}_{o}" for o in range(max(0, ordinal - window), ordinal)],
+                "after": [f"{group}_{o}" for o in range(ordinal + 1, min(size, ordinal + window + 1))],
+            }
+        ids = sorted({cid for sides in wanted.values() for side in sides.values() for cid in side})
+        if not ids:
+            return {}
+        fetched = self.documents_collection.get(ids=ids, include=["documents", "metadatas"])
+        chunks = {
+            cid: {"id": cid, "content": doc, "metadata": meta}
+            for cid, doc, meta in zip(fetched.get("ids") or [], fetched.get("documents") or [], fetched.get("metadatas") or [])
+        }
+        return {
+            hit_id: {side: [chunks[cid] for cid in cids if cid in chunks] for side, cids in sides.items()}
+            for hit_id, sides in wanted.items()
+        }
+
     def search_documents(self, query: str, limit: int = 5, threshold: float = 0.7, 
                         filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search for similar documents"""
@@ -361,21 +469,162 @@ class VectorService:
             print(f"Error getting source documents: {e}")
             return {"documents": [], "metadatas": [], "ids": []}
 
-    def export_source(self, source_id: str):
-        """Export a knowledge source"""
-        try:
-            source = self.get_source(source_id)
-            if not source:
-                return None
-            
-            documents = self.get_source_documents(source_id)
-            return {
-                "source": source,
-                "documents": documents
+    def source_chunk_ids(self, source_id: str, where: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Ids of a source's chunks, from one id-only ``get``; ``where`` is AND-ed with the source filter."""
+        where_clause: Dict[str, Any] = {"source_id": source_id}
+        if where:
+            where_clause = {"$and": [where_clause] + [{k: v} for k, v in where.items()]}
+        return self.documents_collection.get(where=where_clause, include=[]).get("ids") or []
+
+    def iter_source_documents(
+        self,
+        source_id: str,
+        batch_size: int = 1000,
+        where: Optional[Dict[str, Any]] = None,
+        ids: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield a source's chunks page by page, fetched by id.
+
+        Unlike ``get_source_documents`` this never holds more than one page in
+        memory. Pages come from ``source_chunk_ids(source_id, where)`` (e.g.
+        ``where={"chunk_type": "row"}``) or from ``ids``, such as a sample of
+        that snapshot; offset paging would re-scan every skipped row.
+        """
+        if ids is None:
+            ids = self.source_chunk_ids(source_id, where)
+        include = include if include is not None else ["documents", "metadatas"]
+        for start in range(0, len(ids), batch_size):
+            page = self.documents_collection.get(ids=ids[start:start + batch_size], include=include)
+            if page.get("ids"):
+                yield page
+
+    def page_source_documents(
+        self,
+        source_id: str,
+        limit: int,
+        after: Optional[str] = None,
+        include_documents: bool = True,
+    ) -> Dict[str, Any]:
+        """One page of a source's chunks after chunk id ``after``: ``ids``, ``metadatas``, ``total``, ``has_more``.
+
+        Chunks that record adjacency come first, ordered by (chunk group,
+        ordinal): the groups' first chunks give every group's size, so their
+        ids are generated rather than listed. Chunks ingested before chunks
+        recorded adjacency follow, ordered by id. ``documents`` is included if
+        asked.
+        """
+        heads = self.documents_collection.get(
+            where={"$and": [{"source_id": source_id}, {"chunk_ordinal": 0}]}, include=["metadatas"]
+        )
+        sizes = {
+            meta["chunk_group"]: max(1, int(meta.get("chunk_group_size") or 1))
+            for meta in heads.get("metadatas") or []
+            if meta and meta.get("chunk_group")
+        }
+
+        def grouped(chunk_id: str) -> bool:
+            group, _, ordinal = chunk_id.rpartition("_")
+            return group in sizes and ordinal.isdigit() and int(ordinal) < sizes[group]
+
+        all_ids = self.documents_collection.get(where={"source_id": source_id}, include=[]).get("ids") or []
+        total = len(all_ids)
+        ungrouped = sorted(chunk_id for chunk_id in all_ids if not grouped(chunk_id))
+        del all_ids
+        wanted: List[str] = []
+        if not after or grouped(after):
+            group, _, ordinal = (after or "").rpartition("_")
+            for name in sorted(sizes):
+                if after and name < group:
+                    continue
+                first = int(ordinal) + 1 if after and name == group else 0
+                stop = min(sizes[name], first + limit + 1 - len(wanted))
+                wanted.extend(f"{name}_{o}" for o in range(first, stop))
+                if len(wanted) > limit:
+                    break
+            start = 0
+        else:
+            start = bisect.bisect_right(ungrouped, after)
+        wanted.extend(ungrouped[start:start + limit + 1 - len(wanted)])
+        page_ids = wanted[:limit]
+        include = ["metadatas", "documents"] if include_documents else ["metadatas"]
+        fetched = self.documents_collection.get(ids=page_ids, include=include) if page_ids else {}
+        # ``get`` by id does not keep the requested order.
+        rows = {chunk_id: i for i, chunk_id in enumerate(fetched.get("ids") or [])}
+        ids = [chunk_id for chunk_id in page_ids if chunk_id in rows]
+        out: Dict[str, Any] = {
+            "ids": ids,
+            "metadatas": [(fetched.get("metadatas") or [])[rows[c]] for c in ids],
+            "total": total,
+            "has_more": len(wanted) > limit,
+            "last_id": page_ids[-1] if page_ids else after,
+        }
+        if include_documents:
+            out["documents"] = [(fetched.get("documents") or [])[rows[c]] for c in ids]
+        return out
+
+    def iter_export_records(self, source_id: str, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """``{"id", "document", "metadata"}`` per chunk, read from Chroma one batch at a time.
+
+        Snapshots the source's ids first and fetches bodies by id: Chroma's
+        ``offset`` re-scans every skipped row, so offset paging through a whole
+        source is quadratic, while the id list alone is a few bytes per chunk.
+        """
+        all_ids = self.documents_collection.get(where={"source_id": source_id}, include=[]).get("ids") or []
+        for start in range(0, len(all_ids), batch_size):
+            page = self.documents_collection.get(
+                ids=all_ids[start:start + batch_size], include=["documents", "metadatas"]
+            )
+            ids = page.get("ids") or []
+            documents = page.get("documents") or []
+            metadatas = page.get("metadatas") or []
+            for i, doc_id in enumerate(ids):
+                yield {
+                    "id": doc_id,
+                    "document": documents[i] if i < len(documents) else None,
+                    "metadata": metadatas[i] if i < len(metadatas) else None,
+                }
+
+    def sample_source_chunks(self, source_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Up to ``limit`` of a source's chunks, spread evenly across its chunk groups.
+
+        Only each group's first chunk is looked up; its recorded
+        ``chunk_group_size`` is enough to address the rest, so sampling costs
+        one query per group rather than a pass over the source. Each group (a
+        file or batch) gets a share proportional to its size, at least one
+        while the limit allows, with evenly spaced ordinals. Sources ingested
+        before chunks recorded adjacency fall back to evenly spaced ids from an
+        id-only snapshot. Returns ``{"id", "content", "metadata"}`` entries.
+        """
+        if limit <= 0:
+            return []
+        heads = self.documents_collection.get(
+            where={"$and": [{"source_id": source_id}, {"chunk_ordinal": 0}]}, include=["metadatas"]
+        )
+        sizes = {
+            meta["chunk_group"]: max(1, int(meta.get("chunk_group_size") or 1))
+            for meta in heads.get("metadatas") or []
+            if meta and meta.get("chunk_group")
+        }
+        if sizes:
+            ids = [f"{group}_{ordinal}" for group, ordinal in _stratified_picks(sizes, limit)]
+        else:
+            all_ids = sorted(self.documents_collection.get(where={"source_id": source_id}, include=[]).get("ids") or [])
+            step = max(1.0, len(all_ids) / limit)
+            ids = [all_ids[int(i * step)] for i in range(min(limit, len(all_ids)))]
+        if not ids:
+            return []
+        fetched = self.documents_collection.get(ids=ids, include=["documents", "metadatas"])
+        documents = fetched.get("documents") or []
+        metadatas = fetched.get("metadatas") or []
+        return [
+            {
+                "id": chunk_id,
+                "content": documents[i] if i < len(documents) else None,
+                "metadata": metadatas[i] if i < len(metadatas) else None,
             }
-        except Exception as e:
-            print(f"Error exporting source: {e}")
-            return None
+            for i, chunk_id in enumerate(fetched.get("ids") or [])
+        ]
 
     def add_documents_simple(self, documents: List[str], source_name: str, source_type: str, metadata: Dict[str, Any] = None) -> str:
         """Add documents with simplified interface"""
@@ -408,12 +657,23 @@ class VectorService:
         doc_ids = self.add_documents(doc_list, source_id)
         return source_id
 
+    def count_chunk_types(self, source_id: str, batch_size: int = 5000) -> Dict[str, int]:
+        """Chunks per ``chunk_type`` ("unknown" when unset), read as metadata in id batches."""
+        counts: Dict[str, int] = {}
+        ids = self.source_chunk_ids(source_id)
+        for start in range(0, len(ids), batch_size):
+            page = self.documents_collection.get(ids=ids[start:start + batch_size], include=["metadatas"])
+            for meta in page.get("metadatas") or []:
+                chunk_type = str((meta or {}).get("chunk_type") or "unknown")
+                counts[chunk_type] = counts.get(chunk_type, 0) + 1
+        return counts
+
     def count_source_documents(self, source_id: str) -> int:
         """Return how many chunks are stored for a fabric/source id."""
         try:
-            results = self.documents_collection.get(where={"source_id": source_id})
-            docs = results.get("documents") if isinstance(results, dict) else None
-            return len(docs) if docs else 0
+            results = self.documents_collection.get(where={"source_id": source_id}, include=[])
+            ids = results.get("ids") if isinstance(results, dict) else None
+            return len(ids) if ids else 0
         except Exception as e:
             print(f"Error counting source documents for {source_id}: {e}")
             return 0
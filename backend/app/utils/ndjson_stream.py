@@ -0,0 +1,33 @@
+"""Incremental NDJSON encoding and gzip compression for streamed responses.
+
+Both helpers are generators over generators: nothing is buffered beyond the
+record being encoded and zlib's internal window, so an export's memory use
+does not depend on how many records it contains.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Iterable, Iterator
+
+from app.utils.json_sanitize import sanitize_for_json
+
+
+def ndjson_lines(records: Iterable[Any]) -> Iterator[bytes]:
+    for record in records:
+        yield (json.dumps(sanitize_for_json(record), default=str, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6, min_flush_bytes: int = 64 * 1024) -> Iterator[bytes]:
+    """Gzip-compress a byte stream, emitting output roughly every ``min_flush_bytes`` of input."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    pending = 0
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        pending += len(chunk)
+        if pending >= min_flush_bytes:
+            out += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if out:
+            yield out
+    yield compressor.flush()
@@ -0,0 +1,161 @@
+"""Bounded and batched reads from source SQL databases (PostgreSQL, MySQL, SQLite).
+
+Previews push the row limit down to the database instead of materialising the
+whole result and slicing it; imports stream rows through server-side cursors in
+``fetchmany`` batches so a large table is never held twice (driver buffer plus
+DataFrame) in API memory.
+"""
+from __future__ import annotations
+
+import re
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SQL_DIALECTS = ("postgresql", "mysql", "sqlite")
+
+
+def normalize_dialect(name: str) -> str:
+    """Canonical dialect for a connection type; raises ValueError if unsupported."""
+    name = (name or "").lower()
+    if name in ("postgresql", "postgres"):
+        return "postgresql"
+    if name in ("mysql", "mariadb"):
+        return "mysql"
+    if name == "sqlite":
+        return "sqlite"
+    raise ValueError(f"Unsupported database type: {name}")
+
+
+def _strip(query: str) -> str:
+    return query.strip().rstrip(";").strip()
+
+
+def is_ordered(query: str) -> bool:
+    """True if ``query`` ends in a top-level ORDER BY, i.e. re-running it returns rows in the same order."""
+    return re.search(r"\border\s+by\b[^()]*$", _strip(query), re.IGNORECASE) is not None
+
+
+def limited_query(query: str, limit: int) -> str:
+    """Wrap ``query`` so the database itself stops after ``limit`` rows."""
+    return f"SELECT * FROM ({_strip(query)}) AS kf_preview LIMIT {int(limit)}"
+
+
+def count_query(query: str) -> str:
+    return f"SELECT COUNT(*) FROM ({_strip(query)}) AS kf_count"
+
+
+def _rollback(conn: Any) -> None:
+    # A failed statement aborts the transaction on PostgreSQL; clear it before retrying.
+    try:
+        conn.rollback()
+    except Exception:
+        pass
+
+
+def _cursor(conn: Any, dialect: str, batch_size: int) -> Any:
+    if dialect == "postgresql":
+        # Named cursors are server-side: rows arrive itersize at a time.
+        cursor = conn.cursor(name=f"kf_{uuid.uuid4().hex[:12]}")
+        cursor.itersize = batch_size
+        return cursor
+    if dialect == "mysql":
+        return conn.cursor(buffered=False)
+    return conn.cursor()
+
+
+def _plain_cursor(conn: Any, dialect: Optional[str]) -> Any:
+    """Cursor for bounded statements that may be closed with rows left unread.
+
+    mysql-connector cursors are unbuffered by default and refuse to close
+    ("Unread result found") before every row was fetched.
+    """
+    if dialect == "mysql":
+        return conn.cursor(buffered=True)
+    return conn.cursor()
+
+
+def _columns(cursor: Any) -> List[str]:
+    return [desc[0] for desc in cursor.description] if cursor.description else []
+
+
+def iter_query_batches(
+    conn: Any,
+    query: str,
+    dialect: str,
+    batch_size: int = 5_000,
+) -> Iterator[Tuple[List[str], List[Dict[str, Any]]]]:
+    """Yield ``(columns, rows)`` with at most ``batch_size`` row dicts per batch."""
+    cursor = _cursor(conn, dialect, batch_size)
+    try:
+        cursor.execute(_strip(query))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            # Server-side cursors only describe their columns after the first fetch.
+            columns = _columns(cursor)
+            if not rows:
+                break
+            yield columns, [dict(zip(columns, row)) for row in rows]
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+
+def fetch_records(
+    conn: Any,
+    query: str,
+    dialect: str,
+    batch_size: int = 5_000,
+    max_rows: Optional[int] = None,
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """All rows of ``query`` (or the first ``max_rows``) as dicts, fetched in batches."""
+    columns: List[str] = []
+    records: List[Dict[str, Any]] = []
+    for columns, batch in iter_query_batches(conn, query, dialect, batch_size):
+        records.extend(batch)
+        if max_rows is not None and len(records) >= max_rows:
+            del records[max_rows:]
+            break
+    return columns, records
+
+
+def fetch_preview(
+    conn: Any,
+    query: str,
+    dialect: str,
+    limit: int,
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """First ``limit`` rows of ``query`` with the limit pushed down to the database.
+
+    Statements that cannot be used as a subquery (``PRAGMA``, ``SHOW`` ...) fall
+    back to running as written and fetching only ``limit`` rows.
+    """
+    limit = max(1, int(limit))
+    try:
+        cursor = _plain_cursor(conn, dialect)
+        try:
+            cursor.execute(limited_query(query, limit))
+            rows = cursor.fetchmany(limit)
+            columns = _columns(cursor)
+        finally:
+            cursor.close()
+        return columns, [dict(zip(columns, row)) for row in rows]
+    except Exception:
+        _rollback(conn)
+    return fetch_records(conn, query, dialect, batch_size=limit, max_rows=limit)
+
+
+def count_rows(conn: Any, query: str, dialect: Optional[str] = None) -> Optional[int]:
+    """Row count of ``query`` computed by the database; None when it cannot be wrapped."""
+    try:
+        cursor = _plain_cursor(conn, dialect)
+        try:
+            cursor.execute(count_query(query))
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        return int(row[0]) if row else 0
+    except Exception:
+        _rollback(conn)
+        return None
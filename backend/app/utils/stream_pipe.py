@@ -0,0 +1,70 @@
+"""Bounded pipe from an async producer (a request body) to a blocking reader thread.
+
+Lets synchronous parsers such as ``tarfile`` consume an upload while it is
+still arriving: the event loop ``feed``s chunks, the worker thread reads, and
+at most ``max_chunks`` chunks are buffered in between.
+"""
+from __future__ import annotations
+
+import io
+import queue
+from typing import Optional
+
+_EOF = object()
+
+
+class StreamPipe(io.RawIOBase):
+    def __init__(self, max_chunks: int = 16) -> None:
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max_chunks)
+        self._pending = b""
+        self._eof = False
+        self._abandoned = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending and not self._eof:
+            item = self._queue.get()
+            if item is _EOF:
+                self._eof = True
+            else:
+                self._pending = item  # type: ignore[assignment]
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def feed(self, chunk: bytes, timeout: Optional[float] = 1.0) -> bool:
+        """Hand a chunk to the reader; blocks while the buffer is full.
+
+        Returns False once the reader has abandoned the stream, so the
+        producer can stop sending instead of blocking forever.
+        """
+        if not chunk:
+            return not self._abandoned
+        while not self._abandoned:
+            try:
+                self._queue.put(chunk, timeout=timeout)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def finish(self) -> None:
+        """Signal end of stream to the reader."""
+        while not self._abandoned:
+            try:
+                self._queue.put(_EOF, timeout=1.0)
+                return
+            except queue.Full:
+                continue
+
+    def abandon(self) -> None:
+        """Reader side: stop accepting data (e.g. after a parse error)."""
+        self._abandoned = True
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
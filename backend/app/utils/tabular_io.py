@@ -0,0 +1,244 @@
+"""Chunked readers for tabular files (CSV, Parquet, NDJSON) used by ML scoring and training."""
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+TABULAR_FORMATS = ("csv", "parquet", "ndjson", "json", "excel")
+
+
+class EmptyTableError(ValueError):
+    """A tabular file with no data rows (empty, or only a header)."""
+
+
+def detect_format(filename: str, content_type: Optional[str] = None) -> str:
+    """Tabular format from a file name (or content type); raises ValueError if unsupported."""
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext in (".csv", ".txt"):
+        return "csv"
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext in (".ndjson", ".jsonl"):
+        return "ndjson"
+    if ext == ".json":
+        return "json"
+    if ext in (".xlsx", ".xls"):
+        return "excel"
+    content_type = (content_type or "").lower()
+    if "csv" in content_type:
+        return "csv"
+    if "parquet" in content_type:
+        return "parquet"
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        return "ndjson"
+    raise ValueError(f"Unsupported tabular file: {filename or content_type}")
+
+
+def iter_table_chunks(path: str, fmt: str, chunk_rows: int = 10_000) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of at most ``chunk_rows`` rows without loading the whole file.
+
+    JSON documents and Excel workbooks cannot be parsed incrementally; they are
+    read once and then sliced.
+    """
+    if fmt == "csv":
+        with pd.read_csv(path, chunksize=chunk_rows) as reader:
+            yield from reader
+    elif fmt == "ndjson":
+        with pd.read_json(path, lines=True, chunksize=chunk_rows) as reader:
+            yield from reader
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    elif fmt in ("json", "excel"):
+        frame = _read_whole(path, fmt)
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start:start + chunk_rows].reset_index(drop=True)
+    else:
+        raise ValueError(f"Unsupported tabular format: {fmt}")
+
+
+def _read_whole(path: str, fmt: str) -> pd.DataFrame:
+    if fmt == "excel":
+        return pd.read_excel(path)
+    import json
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return pd.DataFrame(data) if isinstance(data, list) else pd.json_normalize(data)
+
+
+def copy_and_hash(source: BinaryIO, dest_path: str, block_size: int = 1 << 20) -> str:
+    """Copy a file object to ``dest_path`` in blocks; returns the SHA-256 of its bytes."""
+    digest = hashlib.sha256()
+    with open(dest_path, "wb") as out:
+        while True:
+            block = source.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+            out.write(block)
+    return digest.hexdigest()
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    return series.astype(str).where(series.notna())
+
+
+def _int_dtype(lo: float, hi: float) -> str:
+    for dtype in ("int8", "int16", "int32"):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return "int64"
+
+
+def _float32_lossless(values: pd.Series) -> bool:
+    """True if every value survives float32: in range and still the same shortest decimal.
+
+    ``0.1`` passes (float32 prints it back as ``0.1``); ``12345.6789`` does not
+    (float32 keeps about seven significant digits and prints ``12345.679``).
+    """
+    exact = values.to_numpy(dtype=np.float64)
+    with np.errstate(over="ignore"):
+        narrowed = exact.astype(np.float32)  # out of range becomes inf and fails the comparison
+    return bool((narrowed.astype(str).astype(np.float64) == exact).all())
+
+
+def plan_dtypes(chunks: Iterator[pd.DataFrame], category_max_unique: int = 1000) -> Dict[str, Any]:
+    """Profile chunks and choose the narrowest dtype that holds every value of each column.
+
+    Integers without nulls get the smallest signed int, other numerics float32
+    when it keeps every value's digits (float64 otherwise), strings with at most
+    ``category_max_unique`` distinct values a categorical, the rest plain strings.
+    """
+    stats: Dict[str, Dict[str, Any]] = {}
+    for chunk in chunks:
+        for col in chunk.columns:
+            series = chunk[col]
+            st = stats.setdefault(col, {
+                "kind": None, "min": np.inf, "max": -np.inf, "integral": True, "nulls": False, "values": set(),
+                "float32": True,
+            })
+            values = series.dropna()
+            if len(values) < len(series):
+                st["nulls"] = True
+            if not len(values):
+                continue
+            if pd.api.types.is_bool_dtype(values):
+                kind = "bool"
+            elif pd.api.types.is_numeric_dtype(values):
+                kind = "number"
+            else:
+                kind = "category"
+            if st["kind"] is None:
+                st["kind"] = kind
+            elif st["kind"] != kind:
+                # Mixed types across chunks: keep everything as text.
+                st["kind"], st["values"] = "text", set()
+            if st["kind"] == "number":
+                st["min"] = min(st["min"], float(values.min()))
+                st["max"] = max(st["max"], float(values.max()))
+                if st["integral"] and not pd.api.types.is_integer_dtype(values):
+                    st["integral"] = bool((values % 1 == 0).all())
+                if st["float32"] and not st["integral"]:
+                    st["float32"] = _float32_lossless(values)
+            elif st["kind"] == "category":
+                st["values"].update(values.astype(str).unique())
+                if len(st["values"]) > category_max_unique:
+                    st["kind"], st["values"] = "text", set()
+
+    plan: Dict[str, Any] = {}
+    for col, st in stats.items():
+        if st["kind"] == "bool":
+            plan[col] = "boolean" if st["nulls"] else "bool"
+        elif st["kind"] == "number":
+            if st["integral"] and not st["nulls"]:
+                plan[col] = _int_dtype(st["min"], st["max"])
+            elif st["integral"]:
+                # Nullable integers: float32 is exact only up to 2**24.
+                plan[col] = "float32" if max(abs(st["min"]), abs(st["max"])) <= 2 ** 24 else "float64"
+            else:
+                plan[col] = "float32" if st["float32"] else "float64"
+        elif st["kind"] == "category":
+            plan[col] = pd.CategoricalDtype(sorted(st["values"]))
+        elif st["kind"] == "text":
+            plan[col] = "str"
+        else:
+            plan[col] = "float32"  # never saw a value
+    return plan
+
+
+def apply_dtypes(chunk: pd.DataFrame, plan: Dict[str, Any]) -> pd.DataFrame:
+    """Cast a chunk to a ``plan_dtypes`` plan; text is normalised like the profiling pass."""
+    chunk = chunk.reindex(columns=list(plan))
+    out = {}
+    for col, dtype in plan.items():
+        series = chunk[col]
+        if isinstance(dtype, pd.CategoricalDtype) or dtype == "str":
+            out[col] = _as_text(series).astype(dtype)
+        else:
+            out[col] = series.astype(dtype)
+    return pd.DataFrame(out)
+
+
+def ingest_to_parquet(
+    path: str,
+    fmt: str,
+    dest_path: str,
+    chunk_rows: int = 100_000,
+    category_max_unique: int = 1000,
+    on_chunk: Optional[Callable[[int], None]] = None,
+) -> Dict[str, Any]:
+    """Convert a tabular file to a downcast Parquet file, holding one chunk in memory at a time.
+
+    Two passes over the source: one to plan dtypes, one to cast and write. The
+    file is written next to ``dest_path`` and renamed into place when complete;
+    a failed conversion leaves nothing behind. Raises ``EmptyTableError`` when
+    the source has no data rows.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    try:
+        plan = plan_dtypes(iter_table_chunks(path, fmt, chunk_rows), category_max_unique)
+    except pd.errors.EmptyDataError:
+        raise EmptyTableError("The file is empty")
+    tmp_path = f"{dest_path}.tmp"
+    writer = None
+    rows = 0
+    try:
+        for chunk in iter_table_chunks(path, fmt, chunk_rows):
+            if not len(chunk):
+                continue
+            table = pa.Table.from_pandas(apply_dtypes(chunk, plan), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema, compression="snappy")
+            writer.write_table(table.cast(writer.schema))
+            rows += len(chunk)
+            if on_chunk:
+                on_chunk(rows)
+        if writer is None:
+            raise EmptyTableError("The file has a header but no data rows" if plan else "The file has no data rows")
+        writer.close()
+        writer = None
+        os.replace(tmp_path, dest_path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return {
+        "path": dest_path,
+        "rows": rows,
+        "columns": len(plan),
+        "dtypes": {col: str(dtype) if not isinstance(dtype, pd.CategoricalDtype) else "category"
+                   for col, dtype in plan.items()},
+        "bytes": os.path.getsize(dest_path),
+    }
@@ -0,0 +1,29 @@
+"""Shared pytest setup for the backend test suite.
+
+Settings resolve every persistent directory at import time, so the
+overrides below must be in place before any ``app`` module is imported.
+Pointing them at a throwaway directory keeps test runs from writing into
+``backend/data``, ``backend/chroma_db`` and the other runtime paths.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+_TEST_STATE_ROOT = tempfile.mkdtemp(prefix="kf-tests-")
+
+for _env_var, _subdir in (
+    ("KF_DATA_DIR", "data"),
+    ("KF_MODELS_DIR", "models"),
+    ("KF_UPLOAD_DIR", "uploads"),
+    ("KF_CHROMA_DIR", "chroma_db"),
+    ("KF_ONTOLOGY_DATA_DIR", "ontology_data"),
+    ("KF_ONTOLOGY_UPLOAD_DIR", os.path.join("ontology_data", "uploads")),
+):
+    os.environ.setdefault(_env_var, os.path.join(_TEST_STATE_ROOT, _subdir))
+os.environ.setdefault(
+    "KF_INBOUND_KEYS_FILE", os.path.join(_TEST_STATE_ROOT, "data", "inbound_api_keys.json")
+)
+
+atexit.register(shutil.rmtree, _TEST_STATE_ROOT, ignore_errors=True)
@@ -0,0 +1,258 @@
+"""Tests for tabular model training, the resident model registry and prediction."""
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.services.model_registry import model_registry
+from app.services.model_service import ModelService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MODELS_DIR", str(tmp_path / "models"))
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path / "data"))
+    model_registry.clear()
+    yield ModelService()
+    model_registry.clear()
+
+
+def training_frame(rows: int = 240) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    region = rng.choice(["north", "south", "east", "west"], size=rows)
+    amount = rng.normal(100, 25, size=rows).round(2)
+    target = np.where((region == "north") | (amount > 120), "flag", "ok")
+    return pd.DataFrame({"region": region, "amount": amount, "target": target})
+
+
+def test_predict_uses_registry_and_training_encoders(service, monkeypatch):
+    trained = service.train_models(training_frame(), "enterprise", {})
+    model_id = trained["model_id"]
+
+    batch = [{"region": r, "amount": 90.0} for r in ("west", "north", "south")]
+    first = service.predict(model_id, batch)
+    assert first["predictions"][1] == "flag"
+
+    def no_disk(*_args, **_kwargs):
+        raise AssertionError("resident model should not be unpickled again")
+
+    monkeypatch.setattr("app.services.model_registry.pickle.load", no_disk)
+    # A single record gets the same categorical code as within the batch.
+    single = service.predict(model_id, [{"region": "north", "amount": 90.0}])
+    assert single["predictions"] == ["flag"]
+    assert model_registry.stats()["hits"] >= 1
+
+    assert service.delete_model(model_id)
+    assert model_id not in model_registry.stats()["loaded_models"]
+    with pytest.raises(ValueError):
+        service.predict(model_id, batch)
+
+
+def test_stream_predictions_matches_single_predict(service, tmp_path):
+    import json
+
+    from app.utils.tabular_io import iter_table_chunks
+
+    model_id = service.train_models(training_frame(), "enterprise", {})["model_id"]
+    frame = training_frame(25).drop(columns=["target"])
+    frame.insert(0, "claim_id", [f"C{i}" for i in range(len(frame))])
+    csv_path = tmp_path / "score.csv"
+    frame.to_csv(csv_path, index=False)
+
+    lines = "".join(service.stream_predictions(
+        model_id, iter_table_chunks(str(csv_path), "csv", chunk_rows=10), id_column="claim_id",
+    )).splitlines()
+    rows = [json.loads(line) for line in lines]
+    expected = service.predict(model_id, frame.drop(columns=["claim_id"]).to_dict("records"))
+
+    assert [r["row"] for r in rows] == list(range(25))
+    assert [r["claim_id"] for r in rows] == frame["claim_id"].tolist()
+    assert [r["prediction"] for r in rows] == expected["predictions"]
+
+    csv_text = "".join(service.stream_predictions(
+        model_id, [frame.iloc[:10], frame.iloc[10:]], output_format="csv", include_probabilities=True,
+    ))
+    assert csv_text.count("row,") == 1
+    assert len(csv_text.strip().splitlines()) == 26
+
+    with pytest.raises(ValueError):
+        service.stream_predictions(model_id, [frame.drop(columns=["amount"])])
+
+
+def test_training_reports_cross_validation_and_pool_matches_inline(service, monkeypatch):
+    monkeypatch.setattr(settings, "TRAINING_CV_FOLDS", 3)
+    messages = []
+    inline = service.train_models(
+        training_frame(), "enterprise", {}, progress=lambda pct, msg: messages.append(pct), max_workers=1,
+    )
+    meta = inline["metadata"]
+    assert meta["cross_validation"]["folds"] == 3
+    assert all(len(m["cv_scores"]) == 3 for m in inline["models"])
+    best = next(m for m in inline["models"] if m["type"] == meta["best_model"])
+    assert meta["cross_validation"]["best_cv_score"] == best["cv_mean"]
+    assert messages[-1] == 100.0 and messages == sorted(messages)
+
+    pooled = service.train_models(training_frame(), "enterprise", {}, max_workers=2)
+    assert pooled["metadata"]["training_workers"] == 2
+    assert [m["cv_scores"] for m in pooled["models"]] == [m["cv_scores"] for m in inline["models"]]
+    assert pooled["metadata"]["best_model"] == meta["best_model"]
+
+
+def test_staged_upload_is_downcast_cached_and_trainable(service, tmp_path, monkeypatch):
+    import io
+
+    monkeypatch.setattr(settings, "TRAINING_INGEST_CHUNK_ROWS", 50)
+    frame = training_frame()
+    frame["visits"] = np.arange(len(frame)) % 7
+    frame.loc[::9, "amount"] = np.nan
+    payload = frame.to_csv(index=False).encode()
+
+    staged = service.stage_training_upload(io.BytesIO(payload), "claims.csv", "csv")
+    assert staged["rows"] == len(frame) and not staged["cached"]
+    data = service.load_training_dataset([staged["path"]])
+    assert isinstance(data["region"].dtype, pd.CategoricalDtype)
+    assert str(data["amount"].dtype) == "float32" and str(data["visits"].dtype) == "int8"
+    assert data["amount"].isna().sum() == frame["amount"].isna().sum()
+
+    def no_parse(*_args, **_kwargs):
+        raise AssertionError("re-uploaded file should not be parsed again")
+
+    monkeypatch.setattr("app.services.model_service.ingest_to_parquet", no_parse)
+    again = service.stage_training_upload(io.BytesIO(payload), "copy.csv", "csv")
+    assert again["cached"] and again["path"] == staged["path"]
+
+    model_id = service.train_models(data.fillna({"amount": 100.0}), "enterprise", {})["model_id"]
+    result = service.predict(model_id, [{"region": "north", "amount": 90.0, "visits": 1}])
+    assert result["predictions"] == ["flag"]
+
+
+
+def test_large_staged_dataset_loads_as_stratified_sample(service, monkeypatch):
+    import io
+
+    monkeypatch.setattr(settings, "TRAINING_INGEST_CHUNK_ROWS", 64)
+    frame = training_frame(2_000)
+    frame.loc[:19, "target"] = "rare"
+    staged = service.stage_training_upload(io.BytesIO(frame.to_csv(index=False).encode()), "big.csv", "csv")
+
+    sample = service.load_training_dataset([staged["path"]], max_rows=400)
+    assert 395 <= len(sample) <= 405 and isinstance(sample["region"].dtype, pd.CategoricalDtype)
+    full = frame["target"].value_counts(normalize=True)
+    got = sample["target"].astype(str).value_counts(normalize=True)
+    assert abs(got["flag"] - full["flag"]) < 0.02
+    # Small classes keep enough rows to cross-validate.
+    assert (sample["target"].astype(str) == "rare").sum() >= settings.TRAINING_CV_FOLDS
+    assert len(service.load_training_dataset([staged["path"]], max_rows=0)) == 2_000
+
+def test_onnx_backend_matches_native_and_falls_back(service, monkeypatch):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("skl2onnx")
+    from app.services.onnx_serving import OnnxUnavailable
+
+    model_id = service.train_models(training_frame(), "enterprise", {})["model_id"]
+    records = training_frame(60).drop(columns=["target"]).to_dict("records")
+    native = service.predict(model_id, records)
+    assert native["serving_backend"] == "native"
+
+    service.set_serving_options(model_id, backend="onnx", intra_op_threads=2)
+    onnx = service.predict(model_id, records)
+    assert onnx["serving_backend"] == "onnx"
+    assert onnx["predictions"] == native["predictions"]
+    np.testing.assert_allclose(onnx["probabilities"], native["probabilities"], atol=1e-4)
+
+    def unsupported(*_args, **_kwargs):
+        raise OnnxUnavailable("no converter")
+
+    monkeypatch.setattr("app.services.onnx_serving.convert_estimator", unsupported)
+    model_registry.clear()
+    for path in glob.glob(os.path.join(settings.MODELS_DIR, model_id, "*.onnx")):
+        os.remove(path)
+    assert service.predict(model_id, records)["serving_backend"] == "native"
+
+
+def test_model_metadata_reads_survive_cache_reset_and_return_copies(service, monkeypatch):
+    service.save_models_metadata([{"id": "m1", "serving": {"backend": "native"}}, {"id": "m2"}])
+    got = service.get_model("m1")
+    got["serving"]["backend"] = "onnx"
+    service.load_models_metadata()[0]["id"] = "changed"
+    assert service.get_model("m1")["serving"]["backend"] == "native"
+    assert [m["id"] for m in service.load_models_metadata()] == ["m1", "m2"]
+
+    real_load = service.load_models_metadata
+
+    def load_then_concurrent_save():
+        models = real_load()
+        service._metadata_cache = None  # what a concurrent save_models_metadata leaves behind
+        return models
+
+    monkeypatch.setattr(service, "load_models_metadata", load_then_concurrent_save)
+    assert service.delete_model("m1") is True
+    assert service.get_model("m1") is None and service.get_model("m2") == {"id": "m2"}
+
+
+def test_ingest_keeps_float64_for_lossy_values_and_cleans_up_failures(tmp_path, monkeypatch):
+    import os
+
+    from app.utils import tabular_io
+    from app.utils.tabular_io import EmptyTableError, ingest_to_parquet
+
+    source = tmp_path / "values.csv"
+    source.write_text("price,ratio\n12345.6789,0.5\n1.25,0.1\n")
+    info = ingest_to_parquet(str(source), "csv", str(tmp_path / "values.parquet"))
+    assert info["dtypes"] == {"price": "float64", "ratio": "float32"}
+    assert pd.read_parquet(tmp_path / "values.parquet")["price"].tolist() == [12345.6789, 1.25]
+
+    header_only = tmp_path / "header.csv"
+    header_only.write_text("a,b\n")
+    empty = tmp_path / "empty.csv"
+    empty.write_text("")
+    for path, message in ((header_only, "header but no data rows"), (empty, "empty")):
+        with pytest.raises(EmptyTableError, match=message):
+            ingest_to_parquet(str(path), "csv", str(tmp_path / "out.parquet"))
+
+    real_apply, calls = tabular_io.apply_dtypes, []
+
+    def fails_on_second_chunk(chunk, plan):
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("disk full")
+        return real_apply(chunk, plan)
+
+    monkeypatch.setattr(tabular_io, "apply_dtypes", fails_on_second_chunk)
+    with pytest.raises(RuntimeError):
+        ingest_to_parquet(str(source), "csv", str(tmp_path / "broken.parquet"), chunk_rows=1)
+    assert len(calls) == 2
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp") or name.startswith("out")]
+
+
+def test_predict_batch_upload_spool_is_removed_on_every_path(service, tmp_path, monkeypatch):
+    import os
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.v1.endpoints import knowledge
+
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    os.makedirs(settings.UPLOAD_DIR)
+    monkeypatch.setattr(knowledge, "model_service", service)
+    model_id = service.train_models(training_frame(), "enterprise", {})["model_id"]
+    app = FastAPI()
+    app.include_router(knowledge.router, prefix="/knowledge")
+    client = TestClient(app)
+    upload = {"file": ("rows.csv", training_frame(20).drop(columns=["target"]).to_csv(index=False), "text/csv")}
+
+    for url in (
+        "/knowledge/models/missing/predict-batch",
+        f"/knowledge/models/{model_id}/predict-batch?output_format=xml",
+    ):
+        response = client.post(url, files=upload)
+        assert response.json()["success"] is False
+        assert os.listdir(settings.UPLOAD_DIR) == []
+
+    response = client.post(f"/knowledge/models/{model_id}/predict-batch", files=upload)
+    assert len(response.text.splitlines()) == 20
+    assert os.listdir(settings.UPLOAD_DIR) == []
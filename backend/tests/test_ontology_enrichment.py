@@ -114,3 +114,146 @@ def test_schema_drift_detection_generates_candidates():
     change_types = {c.changeType.value for c in second}
     assert "change_data_type" in change_types
     assert "rename_attribute" in change_types or "deprecate_attribute" in change_types
+
+
+def test_discovery_batches_llm_calls_concurrently_and_skips_confident_fields(monkeypatch):
+    import json
+    import threading
+    import time
+
+    from app.core.config import settings
+    from app.services.ontology import ontology_enrichment_service as enrichment_module
+
+    persistence = _tmp_persistence()
+    persistence.upsert_ontology_snapshot({"entities": [], "relationships": [],
+                                          "attributes": [{"name": "member_id", "class_name": "Member"}]})
+    monkeypatch.setattr(settings, "ONTOLOGY_ENRICHMENT_LLM_BATCH_SIZE", 10)
+    monkeypatch.setattr(settings, "ONTOLOGY_ENRICHMENT_LLM_CONCURRENCY", 4)
+
+    calls = []
+    lock = threading.Lock()
+
+    def fake_chat_completion(*, provider, messages, model=None, max_tokens=500, temperature=0.1):
+        payload = json.loads(messages[-1]["content"].split("Fields: ", 1)[1])
+        with lock:
+            calls.append(sorted(item["field"]["name"] for item in payload.values()))
+        time.sleep(0.2)
+        response = {key: {"suggestedEntity": "LlmEntity", "aiRationale": "stub"} for key in payload}
+        response["f0"] = {"riskLevel": "not-a-risk-level"}  # invalid values fall back per field
+        return json.dumps(response)
+
+    monkeypatch.setattr(enrichment_module.llm_router, "ontology_provider", lambda: "stub")
+    monkeypatch.setattr(enrichment_module.llm_router, "is_provider_ready", lambda provider: True)
+    monkeypatch.setattr(enrichment_module.llm_router, "chat_completion", fake_chat_completion)
+
+    fields = [{"name": "member_id", "type": "string"}] + [
+        {"name": f"custom_metric_{i}", "type": "number"} for i in range(40)
+    ]
+    start = time.perf_counter()
+    candidates = OntologyEnrichmentService(persistence=persistence).discover_candidates("ds_llm", fields)
+    elapsed = time.perf_counter() - start
+
+    assert len(calls) == 4 and all(len(batch) == 10 for batch in calls)
+    assert "member_id" not in {name for batch in calls for name in batch}
+    assert elapsed < 40 * 0.2 / 2  # four concurrent batches, not forty sequential calls
+    by_name = {c.lineage["source_field"]: c for c in candidates}
+    assert by_name["member_id"].suggestedEntity == "Member"
+    assert sum(c.suggestedEntity == "LlmEntity" for c in candidates) == 36
+
+
+def test_llm_batches_fit_the_token_budget_and_truncated_replies_keep_complete_entries(monkeypatch):
+    import json
+
+    from app.core.config import settings
+    from app.services.ontology import ontology_enrichment_service as enrichment_module
+
+    persistence = _tmp_persistence()
+    monkeypatch.setattr(settings, "ONTOLOGY_ENRICHMENT_LLM_BATCH_SIZE", 20)
+    monkeypatch.setattr(settings, "ONTOLOGY_ENRICHMENT_LLM_TOKENS_PER_FIELD", 350)
+    monkeypatch.setattr(settings, "ONTOLOGY_ENRICHMENT_LLM_MAX_TOKENS", 4000)
+    calls = []
+
+    def truncated_chat_completion(*, provider, messages, model=None, max_tokens=500, temperature=0.1):
+        payload = json.loads(messages[-1]["content"].split("Fields: ", 1)[1])
+        calls.append((len(payload), max_tokens))
+        reply = json.dumps({key: {"suggestedEntity": "LlmEntity", "aiRationale": "stub"} for key in payload})
+        return reply[: len(reply) - 30]  # cut off inside the last entry, as at max_tokens
+
+    monkeypatch.setattr(enrichment_module.llm_router, "ontology_provider", lambda: "stub")
+    monkeypatch.setattr(enrichment_module.llm_router, "is_provider_ready", lambda provider: True)
+    monkeypatch.setattr(enrichment_module.llm_router, "chat_completion", truncated_chat_completion)
+
+    fields = [{"name": f"custom_metric_{i}", "type": "number"} for i in range(22)]
+    candidates = OntologyEnrichmentService(persistence=persistence).discover_candidates("ds_budget", fields)
+
+    assert calls == [(11, 3850), (11, 3850)]  # 4000 // 350 fields per prompt, not 20
+    # Only the entry each truncated reply did not finish falls back.
+    assert sum(c.suggestedEntity == "LlmEntity" for c in candidates) == 20
+
+
+def test_fuzzy_name_index_matches_exhaustive_scan():
+    import random
+
+    from app.services.ontology.name_index import FuzzyNameIndex, name_similarity, normalize_name
+    from app.services.ontology.ontology_enrichment_service import SYNONYM_MAP
+
+    rng = random.Random(7)
+    words = ["member", "claim", "provider", "amount", "status", "date", "code", "risk", "tier", "plan", "id", "type"]
+    names = sorted({"_".join(rng.sample(words, 3)) + f"_{i % 40}" for i in range(1_000)})
+    names += ["member_id", "subscriber_identifier"]
+    index = FuzzyNameIndex(((name, {"name": name}) for name in names), synonyms=SYNONYM_MAP)
+
+    def exhaustive(query):
+        scores = [name_similarity(normalize_name(query), normalize_name(n), SYNONYM_MAP) for n in names]
+        best = max(range(len(names)), key=lambda i: (scores[i], -i))
+        return names[best], scores[best]
+
+    queries = [names[rng.randrange(len(names))].replace("_", "", 1) for _ in range(30)]
+    queries += ["Member-ID", "subscriber_id"]
+    for query in queries:
+        payload, score = index.best_match(query)
+        expected_name, expected_score = exhaustive(query)
+        assert round(score, 6) == round(expected_score, 6), query
+        if expected_score >= 0.7:
+            assert payload["name"] == expected_name
+    assert index.best_match("subscriber_id")[0]["name"] == "member_id"
+    assert len(index.candidates("member_id")) <= 66
+    assert len(FuzzyNameIndex([("a", 1), ("b", 2)]).candidates("zzz", k=32)) == 2
+
+
+def test_governance_logs_are_append_only_and_paged(monkeypatch):
+    import json
+
+    persistence = _tmp_persistence()
+    with open(persistence.policy_logs_file, "w", encoding="utf-8") as f:
+        json.dump([{"id": "plog_legacy", "candidateId": "chg_old", "policyRule": "r",
+                    "decision": "require_approval", "reason": "legacy", "timestamp": "2024-01-01T00:00:00"}], f)
+    enrichment = OntologyEnrichmentService(persistence=persistence)
+    persistence.set_governance_mode(GovernanceMode.ASSISTED, "tester")
+    assert [p.id for p in persistence.list_policy_decisions("chg_old")] == ["plog_legacy"]
+
+    writes = []
+    from app.services.ontology import append_log
+
+    real_fsync = append_log.os.fsync
+    monkeypatch.setattr(append_log.os, "fsync", lambda fd: (writes.append(fd), real_fsync(fd)))
+    candidates = enrichment.discover_candidates(
+        source_dataset_id="ds_logs",
+        fields=[{"name": f"field_{i}", "type": "string", "sample_values": ["x"]} for i in range(12)],
+        created_by="tester",
+    )
+    # One commit per log segment plus one per touched key bucket, not one per candidate.
+    buckets = {append_log._bucket(c.id) for c in candidates}
+    assert len(writes) == 2 + len(buckets)
+    assert not os.path.exists(persistence.policy_logs_file)
+
+    page = persistence.list_policy_decisions(limit=5)
+    assert [p.candidateId for p in page] == [c.id for c in reversed(candidates)][:5]
+    rest = persistence.list_policy_decisions(limit=100, offset=5)
+    assert len(rest) == len(candidates) - 5 + 1 and rest[-1].id == "plog_legacy"
+    assert [p.candidateId for p in persistence.list_policy_decisions(candidates[3].id)] == [candidates[3].id]
+
+    persistence.update_candidate_status(candidates[3].id, "approved", "steward", "ok")
+    audit = persistence.list_audit_logs(candidates[3].id)
+    assert [a.action for a in audit] == ["candidate_status_approved"]
+    assert [a.action for a in persistence.list_audit_logs(limit=2)] == ["candidate_status_approved", "enrichment_discovery_run"]
@@ -0,0 +1,83 @@
+"""Tests for the shared PDF text extraction service."""
+import pytest
+
+from app.core.config import settings
+from app.services.document_service import document_service
+from app.services.pdf_text_service import pdf_text_service
+
+
+def write_text_pdf(path, page_texts):
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    page_count = len(page_texts)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % (4 + i * 2) for i in range(page_count)), page_count),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1")
+        stream = b"BT /F1 12 Tf 72 720 Td (" + escaped + b") Tj ET"
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + i * 2)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PDF_TEXT_CACHE_DIR", str(tmp_path / "pdf_cache"))
+
+
+def test_iter_pages_populates_cache_and_reuses_it(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    write_text_pdf(pdf_path, ["Claim overview", "", "Policy terms"])
+
+    pages = list(pdf_text_service.iter_pages(str(pdf_path)))
+    assert [n for n, _ in pages] == [1, 2, 3]
+    assert "Claim overview" in pages[0][1]
+    assert pages[1][1].strip() == ""
+    assert len(list((tmp_path / "pdf_cache").glob("*.jsonl"))) == 1
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("cached file should not be re-extracted")
+
+    monkeypatch.setattr("app.services.pdf_text_service._extract_page_range", fail)
+    assert list(pdf_text_service.iter_pages(str(pdf_path))) == pages
+    assert pdf_text_service.page_count(str(pdf_path)) == 3
+
+
+def test_parallel_extraction_preserves_page_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PDF_EXTRACT_WORKERS", 2)
+    monkeypatch.setattr(settings, "PDF_PARALLEL_MIN_PAGES", 1)
+    texts = [f"Page marker {i}" for i in range(1, 41)]
+    pdf_path = tmp_path / "long.pdf"
+    write_text_pdf(pdf_path, texts)
+
+    pages = pdf_text_service.extract_pages(str(pdf_path))
+    assert [p.strip() for p in pages] == texts
+    pdf_text_service.shutdown()
+
+
+def test_document_service_skips_empty_pages(tmp_path):
+    pdf_path = tmp_path / "mixed.pdf"
+    write_text_pdf(pdf_path, ["First", "", "Third"])
+
+    documents = document_service.extract_text_from_pdf(str(pdf_path))
+    assert [d["page_number"] for d in documents] == [1, 3]
+    assert all(d["metadata"]["total_pages"] == 3 for d in documents)
+    assert document_service.extract_text_from_pdf_simple(str(pdf_path)).count("\n") == 3
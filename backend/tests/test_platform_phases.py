@@ -58,6 +58,28 @@ def test_schema_analyzer_rules():
     assert any(a["name"] == "member_id" for a in result["attributes"])
 
 
+def test_schema_analyzer_uses_column_profile_for_fk():
+    from app.services.analytics.column_profiler import ColumnProfiler
+
+    profiler = ColumnProfiler()
+    profiler.add_rows([
+        {"claim_id": f"C{i}", "prior_claim_id": f"C{i - 3}" if i % 4 == 0 else None, "amount": str(i)}
+        for i in range(10, 400)
+    ])
+    profile = {"tables": [{"name": "Claims", "columns": ["claim_id", "amount"], **profiler.result()}]}
+    table = profile["tables"][0]
+    table["columns"] = table["columns"] + ["prior_claim_id"]
+
+    result = schema_analyzer._rule_analyze(profile)
+    entity = result["entities"][0]
+    assert entity["primary_key_columns"] == ["claim_id"]
+    rels = [r for r in result["relationships"] if r["extraction_source"] == "column_profile"]
+    assert rels and rels[0]["source_columns"] == ["prior_claim_id"]
+    assert rels[0]["target_columns"] == ["claim_id"]
+    amount = next(a for a in result["attributes"] if a["name"] == "amount")
+    assert amount["data_type"] == "integer"
+
+
 def test_graph_materialization_from_ontology():
     project_id = f"proj_{uuid.uuid4().hex[:8]}"
     version_id = f"ver_{uuid.uuid4().hex[:8]}"
@@ -95,6 +117,46 @@ def test_graph_materialization_from_ontology():
 
     payload = graph_store.get_graph_payload(fabric_id, version_id)
     assert payload["node_count"] == 2
+    assert result["changes"]["nodes_inserted"] == 2
+    assert "store_ms" in result["phase_timings"]
+
+
+def test_graph_rebuild_only_writes_changes():
+    version_id = f"ver_{uuid.uuid4().hex[:8]}"
+    fabric_id = f"fabric_{uuid.uuid4().hex[:8]}"
+    classes = [
+        OntologyClass(
+            id=f"cls_{name.lower()}", name=name, normalized_name=name, confidence_score=0.9,
+            status=OntologyElementStatus.APPROVED,
+        )
+        for name in ("Member", "Claim", "Provider")
+    ]
+    rel = OntologyRelationship(
+        id="rel_1", source_class_id="cls_member", target_class_id="cls_claim",
+        relationship_name="has_claim", confidence_score=0.8, status=OntologyElementStatus.APPROVED,
+    )
+    version = OntologyVersion(
+        id=version_id, project_id="proj_rebuild", version_label="1.0", is_draft=False,
+        classes=classes, relationships=[rel],
+    )
+    ontology_db_repository.save_version(version)
+
+    first = graph_materialization_service.materialize(fabric_id, version_id, "postgres")
+    ids = {n["id"] for n in graph_store.get_graph_payload(fabric_id, version_id)["nodes"]}
+
+    version.classes = classes[:2]
+    version.classes[1].name = "Insurance Claim"
+    ontology_db_repository.save_version(version)
+    second = graph_materialization_service.materialize(fabric_id, version_id, "postgres")
+
+    assert first["changes"]["nodes_inserted"] == 3
+    assert second["changes"] == {
+        "nodes_inserted": 0, "nodes_updated": 1, "nodes_deleted": 1,
+        "edges_inserted": 0, "edges_updated": 0, "edges_deleted": 0,
+    }
+    payload = graph_store.get_graph_payload(fabric_id, version_id)
+    assert {n["id"] for n in payload["nodes"]} < ids
+    assert {n["label"] for n in payload["nodes"]} == {"Member", "Insurance Claim"}
 
 
 def test_retrieval_orchestrator_vector_only():
@@ -104,3 +166,1060 @@ def test_retrieval_orchestrator_vector_only():
     assert result["fabric_id"] == fabric_id
     assert "chunks" in result
     assert result["graph_retrieval_enabled"] is False
+
+
+def _seed_graph(node_count: int, edge_count: int):
+    fabric_id = f"fabric_{uuid.uuid4().hex[:8]}"
+    version_id = f"ver_{uuid.uuid4().hex[:8]}"
+    nodes = [
+        {"id": f"gn_{fabric_id}_{i:03d}", "label": f"Entity {i}", "normalized_name": f"entity_{i}"}
+        for i in range(node_count)
+    ]
+    edges = [
+        {
+            "id": f"ge_{fabric_id}_{i:03d}",
+            "source_node_id": nodes[i % node_count]["id"],
+            "target_node_id": nodes[(i + 1) % node_count]["id"],
+            "relationship_type": "related to",
+        }
+        for i in range(edge_count)
+    ]
+    graph_store.sync_graph(fabric_id, version_id, nodes, edges)
+    return fabric_id, version_id
+
+
+class _FakeNeo4jSession:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        self.calls.append((query, params))
+
+
+class _FakeNeo4jDriver:
+    def __init__(self):
+        self.calls = []
+
+    def session(self):
+        return _FakeNeo4jSession(self.calls)
+
+    def close(self):
+        pass
+
+
+def test_neo4j_stream_export_batches_unwind_and_resumes():
+    from app.services.graph.adapters.neo4j_adapter import neo4j_adapter
+
+    fabric_id, version_id = _seed_graph(5, 3)
+    driver = _FakeNeo4jDriver()
+    result = neo4j_adapter.stream_export(fabric_id, version_id, batch_size=2, driver=driver)
+
+    unwinds = [params for query, params in driver.calls if "UNWIND" in query]
+    assert [len(p["rows"]) for p in unwinds] == [2, 2, 1, 2, 1]
+    assert any("DETACH DELETE" in query for query, _ in driver.calls)
+    assert result["node_count"] == 5 and result["edge_count"] == 3
+    assert result["metrics"]["batches"] == 5
+
+    resumed_driver = _FakeNeo4jDriver()
+    checkpoint = {"phase": "edges", "after_id": f"ge_{fabric_id}_000", "nodes_written": 5, "edges_written": 1}
+    resumed = neo4j_adapter.stream_export(
+        fabric_id, version_id, batch_size=2, checkpoint=checkpoint, driver=resumed_driver
+    )
+    rows = [r["id"] for q, p in resumed_driver.calls if "UNWIND" in q for r in p["rows"]]
+    assert rows == [f"ge_{fabric_id}_001", f"ge_{fabric_id}_002"]
+    assert not any("DETACH DELETE" in q for q, _ in resumed_driver.calls)
+    assert resumed["edge_count"] == 3
+
+
+def test_rdf_stream_ntriples_gzip_resumes_without_duplicates(tmp_path):
+    import gzip
+
+    from app.services.graph.adapters.rdf_adapter import rdf_adapter
+
+    fabric_id, version_id = _seed_graph(5, 3)
+    out = tmp_path / "graph.nt.gz"
+    saved = []
+
+    def crash_after_two(cp):
+        saved.append(cp)
+        if len(saved) == 2:
+            raise RuntimeError("worker killed")
+
+    with pytest.raises(RuntimeError):
+        rdf_adapter.stream_ntriples(
+            fabric_id, version_id, path=str(out), batch_size=2, on_checkpoint=crash_after_two
+        )
+    result = rdf_adapter.stream_ntriples(
+        fabric_id, version_id, path=str(out), batch_size=2, checkpoint=saved[-1]
+    )
+
+    lines = gzip.decompress(out.read_bytes()).decode("utf-8").splitlines()
+    assert len(lines) == 5 * 3 + 3
+    assert len(set(lines)) == len(lines)
+    assert all(line.endswith(" .") for line in lines)
+    assert result["checkpoint"]["phase"] == "done"
+    assert result["metrics"]["nodes_exported"] == 1
+
+
+def test_graph_pages_top_n_and_neighbours():
+    from starlette.requests import Request
+
+    from app.services.graph.graph_window import make_etag, not_modified
+
+    fabric_id, version_id = _seed_graph(7, 9)
+    node_ids, edge_ids = [], []
+    node_after = edge_after = None
+    while True:
+        page = graph_store.get_graph_page(
+            fabric_id, version_id, 3, node_after=node_after, edge_after=edge_after, fields="ids"
+        )
+        node_ids += [n["id"] for n in page["nodes"]]
+        edge_ids += [e["id"] for e in page["edges"]]
+        assert all(set(n) == {"id", "label"} for n in page["nodes"])
+        if not page["has_more"]:
+            break
+        node_after, edge_after = page["node_after"], page["edge_after"]
+    assert len(node_ids) == len(set(node_ids)) == 7
+    assert len(edge_ids) == len(set(edge_ids)) == 9
+
+    top = graph_store.top_nodes_by_degree(fabric_id, version_id, 2)
+    assert [n["degree"] for n in top["nodes"]] == sorted((n["degree"] for n in top["nodes"]), reverse=True)
+    kept = {n["id"] for n in top["nodes"]}
+    assert all(e["source"] in kept and e["target"] in kept for e in top["edges"])
+
+    hub = f"gn_{fabric_id}_001"
+    both = graph_store.get_neighbors(fabric_id, hub, direction="both")
+    assert {e["id"] for e in both["edges"]} == {f"ge_{fabric_id}_{i:03d}" for i in (0, 1, 7, 8)}
+    capped = graph_store.get_neighbors(fabric_id, hub, direction="both", limit=1)
+    assert len(capped["edges"]) == 1 and capped["truncated"] is True
+
+    etag = make_etag(fabric_id, graph_store.graph_revision(fabric_id, version_id))
+    request = Request({"type": "http", "headers": [(b"if-none-match", etag.encode())]})
+    assert not_modified(request, etag).status_code == 304
+
+    from fastapi import HTTPException
+
+    from app.services.graph.graph_window import encode_cursor, window_graph
+
+    graph = {"nodes": [{"id": i} for i in range(5)], "edges": []}
+    assert window_graph(dict(graph), limit=2, cursor=encode_cursor({"n": 2, "e": 0}))["nodes"] == [{"id": 2}, {"id": 3}]
+    for bad in ("%%%", encode_cursor({"n": "x"}), encode_cursor({"n": -1}), encode_cursor({"e": [1]})):
+        with pytest.raises(HTTPException) as exc:
+            window_graph(dict(graph), limit=2, cursor=bad)
+        assert exc.value.status_code == 400
+
+
+def test_graph_insights_cached_per_content_version(monkeypatch):
+    from app.api.v1.endpoints import knowledge
+    from app.services.graph.graph_insight_cache import content_version, graph_insight_cache
+
+    calls = []
+
+    def fake_insight(name, analytics, **_kwargs):
+        calls.append(analytics["edge_count"])
+        return {"generated": True, "summary": f"briefing {len(calls)}"}
+
+    monkeypatch.setattr(knowledge, "_generate_graph_llm_insight", fake_insight)
+    fid = f"fabric_insight_{uuid.uuid4().hex[:8]}"
+    fabric = {"id": fid, "name": "Claims"}
+    graph = {
+        "nodes": [{"id": f"n{i}", "type": "entity"} for i in range(3)],
+        "edges": [{"source": "n0", "target": "n1", "relation": "related_to"}],
+    }
+    v1 = content_version(fid, 1)
+
+    analytics, insight = knowledge._cached_graph_insights(fabric, graph, v1, True, graph_insight_cache.get(fid))
+    assert insight["summary"] == "briefing 1" and analytics["top_entities"][0]["weight"] == 1
+    _, insight = knowledge._cached_graph_insights(fabric, graph, v1, True, graph_insight_cache.get(fid))
+    assert insight["cached"] and len(calls) == 1
+
+    # Content changed: the old briefing is served as stale while a new one is generated.
+    graph["edges"].append({"source": "n1", "target": "n2", "relation": "related_to"})
+    v2 = content_version(fid, 2)
+    analytics, insight = knowledge._cached_graph_insights(fabric, graph, v2, True, graph_insight_cache.get(fid))
+    assert insight["stale"] and insight["summary"] == "briefing 1"
+    assert analytics["edge_count"] == 2
+    graph_insight_cache.wait(5)
+    entry = graph_insight_cache.get(fid)
+    assert entry["insight_version"] == v2 and entry["llm_insight"]["summary"] == "briefing 2"
+    assert calls == [1, 2]
+
+
+def test_fabric_artifacts_offloaded_and_loaded_on_demand(tmp_path, monkeypatch):
+    from app.core.config import settings
+    from app.db.models import FabricRecord
+    from app.db.session import db_session
+    from app.services.platform.artifact_store import artifact_store
+
+    monkeypatch.setattr(settings, "FABRIC_ARTIFACT_DIR", str(tmp_path / "artifacts"))
+    monkeypatch.setattr(settings, "FABRIC_ARTIFACT_INLINE_MAX_BYTES", 1024)
+    fid = f"fabric_code_{uuid.uuid4().hex[:8]}"
+    code_graph = {
+        "nodes": [{"id": f"mod_{i}", "label": f"module {i}", "type": "module"} for i in range(200)],
+        "edges": [{"source": f"mod_{i}", "target": f"mod_{i + 1}", "type": "imports"} for i in range(199)],
+    }
+    fabric_store.save({
+        "id": fid, "name": "Repo", "source_type": "codebase", "tags": [],
+        "code_graph": code_graph, "contracts": [],
+    })
+
+    with db_session() as session:
+        payload = session.get(FabricRecord, fid).payload
+    assert "code_graph" not in payload and payload["contracts"] == []
+    assert payload["artifact_refs"]["code_graph"]["summary"] == {"node_count": 200, "edge_count": 199}
+
+    listed = next(f for f in fabric_store.list_all_dicts() if f["id"] == fid)
+    assert "code_graph" not in listed
+    # Saving a fabric without its artifacts loaded keeps the existing references.
+    light = fabric_store.get(fid)
+    light["name"] = "Repo renamed"
+    fabric_store.save(light)
+    full = fabric_store.get(fid, with_artifacts=True)
+    assert full["name"] == "Repo renamed" and full["code_graph"] == code_graph
+    assert len(list(artifact_store.iter_digests())) == 1
+
+    legacy_id = f"fabric_legacy_{uuid.uuid4().hex[:8]}"
+    with db_session() as session:
+        session.add(FabricRecord(id=legacy_id, name="Legacy", payload={"id": legacy_id, "code_graph": code_graph}))
+    fabric_store._offload_inline_artifacts()
+    with db_session() as session:
+        assert "code_graph" not in session.get(FabricRecord, legacy_id).payload
+    assert fabric_store.get(legacy_id, with_artifacts=True)["code_graph"] == code_graph
+
+
+def test_progress_bus_pushes_updates_and_snapshots_lazily(tmp_path, monkeypatch):
+    import asyncio
+    import threading
+
+    from app.core.config import settings
+    from app.services.platform.progress_store import ProgressStore
+
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROGRESS_SNAPSHOT_SECONDS", 3600)
+    monkeypatch.setattr(settings, "PROGRESS_HEARTBEAT_SECONDS", 5)
+    store = ProgressStore()
+    store["p1"] = {"status": "processing", "progress": 0}
+
+    async def consume():
+        received = []
+        async for data in store.subscribe("p1"):
+            received.append(data)
+            if len(received) == 1:
+                publisher.start()
+        return received
+
+    def publish():
+        for pct in range(1, 50):
+            store.update("p1", progress=pct)
+        store.update("p1", status="completed", progress=100)
+
+    publisher = threading.Thread(target=publish)
+    received = asyncio.run(asyncio.wait_for(consume(), timeout=10))
+    # The terminal update reaches the subscriber before the publisher's flush returns.
+    publisher.join()
+    assert received[0]["progress"] == 0
+    assert received[-1] == {"status": "completed", "progress": 100}
+    # 51 publishes, one snapshot: the terminal state is flushed immediately, ticks are not.
+    assert store.stats()["publishes"] == 51 and store.stats()["disk_writes"] == 1
+
+    # Once on disk, the finished entry leaves memory; readers are served from the snapshot.
+    assert store.stats()["entries"] == 0 and store["p1"]["progress"] == 100
+    assert store.stats()["entries"] == 0
+
+    restarted = ProgressStore()
+    assert restarted["p1"]["status"] == "completed"
+    del restarted["p1"]
+    assert "p1" not in ProgressStore() and "p1" not in restarted
+    assert restarted._deleted == set()
+
+    # Without snapshots only the newest finished entries stay in memory.
+    monkeypatch.setattr(settings, "PROGRESS_SNAPSHOT_SECONDS", 0)
+    monkeypatch.setattr(settings, "PROGRESS_MEMORY_TERMINAL_ENTRIES", 2)
+    memory = ProgressStore()
+    memory["running"] = {"status": "processing"}
+    for i in range(5):
+        memory[f"done{i}"] = {"status": "completed"}
+    assert sorted(memory.keys()) == ["done3", "done4", "running"]
+
+
+def test_connection_manager_pools_health_checks_and_caches_schemas(tmp_path, monkeypatch):
+    import sqlite3
+
+    from app.core.config import settings
+    from app.services.platform.connection_manager import ConnectionManager
+
+    monkeypatch.setattr(settings, "CONNECTOR_POOL_MAX_PER_TARGET", 1)
+    monkeypatch.setattr(settings, "CONNECTOR_POOL_ACQUIRE_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "CONNECTOR_POOL_HEALTHCHECK_SECONDS", 3600)
+    path = str(tmp_path / "source.db")
+    with sqlite3.connect(path) as seed:
+        seed.execute("CREATE TABLE claims (id INTEGER)")
+    manager = ConnectionManager()
+
+    with manager.sql_connection("sqlite", database=path) as first:
+        first.execute("INSERT INTO claims VALUES (1)")  # left uncommitted: rolled back on release
+        with pytest.raises(TimeoutError):
+            with manager.sql_connection("sqlite", database=path):
+                pass
+    with manager.sql_connection("sqlite", database=path) as second:
+        assert second is first
+        assert second.execute("SELECT COUNT(*) FROM claims").fetchone()[0] == 0
+    assert manager.stats()["created"] == 1 and manager.stats()["reused"] == 1
+
+    # Idle connections are pinged before reuse; a dead one is replaced transparently.
+    monkeypatch.setattr(settings, "CONNECTOR_POOL_HEALTHCHECK_SECONDS", 0)
+    first.close()
+    with manager.sql_connection("sqlite", database=path) as third:
+        assert third is not first and third.execute("SELECT 1").fetchone() == (1,)
+    assert manager.stats()["health_failures"] == 1
+
+    assert manager.evict_idle(max_idle_seconds=0) == 1
+    assert manager.stats()["targets"] == 0 and manager.stats()["idle"] == 0
+
+    loads = []
+    for _ in range(3):
+        manager.cached_metadata("target", "schemas", lambda: loads.append(1) or {"default": ["claims"]})
+    assert len(loads) == 1
+    manager.invalidate_metadata("target")
+    manager.cached_metadata("target", "schemas", lambda: loads.append(1))
+    assert len(loads) == 2
+
+
+def test_shared_clients_are_never_evicted_while_checked_out():
+    from app.services.platform.connection_manager import ConnectionManager
+
+    closed = []
+
+    class Client:
+        pass
+
+    manager = ConnectionManager()
+    with manager.shared_client("workspace", Client, close=closed.append) as client:
+        # A long import outlives the idle limit; the reaper must leave its client alone.
+        assert manager.evict_idle(max_idle_seconds=-1) == 0
+        with manager.shared_client("workspace", Client, close=closed.append) as again:
+            assert again is client
+        assert manager.evict_idle(max_idle_seconds=-1) == 0 and not closed
+    assert manager.evict_idle(max_idle_seconds=3600) == 0
+    assert manager.evict_idle(max_idle_seconds=-1) == 1 and closed == [client]
+
+    # Shutting down retires checked-out clients; they close when released.
+    with manager.shared_client("workspace", Client, close=closed.append) as busy:
+        manager.close_all()
+        assert closed == [client] and manager.stats()["shared_clients"] == 0
+    assert closed == [client, busy]
+
+
+def test_fabric_delete_cascades_and_gc_reclaims_orphans(tmp_path, monkeypatch):
+    from datetime import timedelta
+
+    from app.core.config import settings
+    from app.db.models import FabricGcSuspectRecord, GraphEdgeRecord, GraphInsightRecord, GraphNodeRecord
+    from app.db.session import db_session
+    from app.services.platform.fabric_gc import (
+        FabricArtifacts,
+        FabricFiles,
+        FabricReclaimer,
+        GraphRows,
+        ProgressEntries,
+        VectorChunks,
+    )
+    from app.services.platform.progress_store import progress_store
+
+    for name in ("UPLOAD_DIR", "ONTOLOGY_UPLOAD_DIR", "GRAPH_EXPORT_DIR", "FABRIC_ARTIFACT_DIR"):
+        monkeypatch.setattr(settings, name, str(tmp_path / name.lower()))
+        (tmp_path / name.lower()).mkdir()
+    monkeypatch.setattr(settings, "FABRIC_ARTIFACT_INLINE_MAX_BYTES", 64)
+    monkeypatch.setattr(settings, "FABRIC_GC_BATCH_SIZE", 7)
+
+    class FakeCollection:
+        def __init__(self):
+            self.rows = {}
+            self.get_calls = 0
+
+        def get(self, ids=None, where=None, limit=None, offset=None, include=None):
+            assert offset is None, "the sweep must not page by offset"
+            self.get_calls += 1
+            if ids is None:
+                ids = [i for i, m in self.rows.items() if not where or m["source_id"] == where["source_id"]]
+            ids = [i for i in ids if i in self.rows][:limit]
+            return {"ids": ids, "metadatas": [self.rows[i] for i in ids]}
+
+        def delete(self, ids):
+            for i in ids:
+                self.rows.pop(i)
+
+    collection = FakeCollection()
+    reclaimer = FabricReclaimer([
+        VectorChunks(collection=lambda: collection), GraphRows(), FabricFiles(), ProgressEntries(), FabricArtifacts(),
+    ])
+    doomed, kept, ghost = (f"fabric_{tag}_{uuid.uuid4().hex[:6]}" for tag in ("doomed", "kept", "ghost"))
+    # /upload and /database/connect index chunks under a bare uuid and never save a record.
+    upload_source = str(uuid.uuid4())
+    for fid, n in ((doomed, 20), (kept, 5), (ghost, 9), (upload_source, 4)):
+        collection.rows.update({f"{fid}_{i}": {"source_id": fid} for i in range(n)})
+    upload = tmp_path / "upload_dir"
+    (upload / "own.pdf").write_bytes(b"x" * 100)
+    (upload / "shared.pdf").write_bytes(b"y" * 50)
+    fabric_store.save({"id": doomed, "name": "Doomed", "source_type": "pdf", "tags": [],
+                       "processed_files": [{"filename": "own.pdf"}, {"filename": "shared.pdf"}],
+                       "code_graph": {"nodes": [{"id": f"n{i}"} for i in range(20)]}})
+    fabric_store.save({"id": kept, "name": "Kept", "source_type": "pdf", "tags": [],
+                       "processed_files": [{"filename": "shared.pdf"}]})
+    for fid in (doomed, ghost):
+        (tmp_path / "ontology_upload_dir" / f"{fid}_fabric_source.xml").write_text("<fabricSource/>")
+        progress_store[f"prog_{fid}"] = {"status": "completed", "fabric_id": fid}
+        with db_session() as session:
+            session.add_all([
+                GraphNodeRecord(id=f"{fid}_a", fabric_id=fid, ontology_version_id="v1", label="A", normalized_name="a"),
+                GraphNodeRecord(id=f"{fid}_b", fabric_id=fid, ontology_version_id="v1", label="B", normalized_name="b"),
+            ])
+            session.flush()
+            session.add(GraphEdgeRecord(fabric_id=fid, source_node_id=f"{fid}_a", target_node_id=f"{fid}_b",
+                                        relationship_type="rel", ontology_version_id="v1"))
+            session.add(GraphInsightRecord(fabric_id=fid, content_version="c1"))
+    (tmp_path / "graph_export_dir" / doomed).mkdir()
+    (tmp_path / "graph_export_dir" / doomed / "v1.nt.gz").write_bytes(b"z" * 30)
+
+    report = reclaimer.delete_fabric(doomed)
+    assert fabric_store.get(doomed) is None
+    assert report["reclaimed"]["vectors"]["rows"] == 20
+    assert report["reclaimed"]["graph"]["rows"] == 4
+    assert report["reclaimed"]["files"] == {"rows": 3, "bytes": 100 + len("<fabricSource/>") + 30}
+    assert report["reclaimed"]["progress"]["rows"] == 1 and report["reclaimed"]["artifacts"]["rows"] == 1
+    assert (upload / "shared.pdf").exists() and not (upload / "own.pdf").exists()
+    assert reclaimer.delete_fabric(doomed) is None
+
+    # A fabric without the usual id prefix is swept through its tombstone, e.g. chunks a late writer adds.
+    connector = f"servicenow_{uuid.uuid4().hex[:6]}"
+    fabric_store.save({"id": connector, "name": "Connector", "source_type": "servicenow_connection", "tags": []})
+    reclaimer.delete_fabric(connector)
+    collection.rows.update({f"{connector}_{i}": {"source_id": connector} for i in range(3)})
+
+    # The ghost fabric's record never existed: first sweep only marks it, a sweep past grace purges it.
+    first = reclaimer.collect_garbage(grace_seconds=3600)
+    assert first["pending_grace"] >= 5 and ghost not in first["orphaned_fabrics"]
+    assert len(collection.rows) == 21
+    # The grace clock is persisted: a restarted reclaimer neither resets it nor purges early.
+    with db_session() as session:
+        for row in session.query(FabricGcSuspectRecord).filter(FabricGcSuspectRecord.owner_id == ghost):
+            row.first_seen -= timedelta(hours=2)
+    restarted = FabricReclaimer([
+        VectorChunks(collection=lambda: collection), GraphRows(), FabricFiles(), ProgressEntries(), FabricArtifacts(),
+    ])
+    second = restarted.collect_garbage(grace_seconds=3600)
+    assert ghost in second["orphaned_fabrics"] and connector not in second["orphaned_fabrics"]
+    assert second["reclaimed"]["vectors"]["rows"] == 9 and second["reclaimed"]["graph"]["rows"] >= 4
+    third = restarted.collect_garbage(grace_seconds=0)
+    assert connector in third["orphaned_fabrics"] and third["reclaimed"]["vectors"]["rows"] == 3
+    assert set(m["source_id"] for m in collection.rows.values()) == {kept, upload_source}
+    assert f"prog_{ghost}" not in progress_store
+    assert not (tmp_path / "ontology_upload_dir" / f"{ghost}_fabric_source.xml").exists()
+    with db_session() as session:
+        assert session.query(GraphNodeRecord).filter(GraphNodeRecord.fabric_id.in_([doomed, ghost])).count() == 0
+
+
+
+def test_stale_fabric_gc_job_is_requeued():
+    from datetime import datetime, timedelta
+
+    from app.db.models import FabricJobRecord
+    from app.db.session import db_session
+    from app.services.platform.fabric_gc import ResourceKind
+    from app.services.platform.job_service import job_service
+
+    # Every kind has to say how it purges an owner.
+    with pytest.raises(TypeError):
+        ResourceKind()
+
+    job_id = job_service.enqueue("fabric_gc", config={"scheduled": True})
+    while job_service.claim_next()["id"] != job_id:
+        pass
+    # A live sweep heartbeats and stays claimed; a worker that died mid-sweep must not block GC forever.
+    with db_session() as session:
+        row = session.get(FabricJobRecord, job_id)
+        row.started_at = datetime.utcnow() - timedelta(hours=2)
+        row.result = {"checkpointed_at": datetime.utcnow().isoformat()}
+    job_service.claim_next()
+    assert job_service.get(job_id)["status"] == "running"
+    with db_session() as session:
+        session.get(FabricJobRecord, job_id).result = {
+            "checkpointed_at": (datetime.utcnow() - timedelta(hours=2)).isoformat()
+        }
+    while job_service.claim_next()["id"] != job_id:
+        pass
+    assert job_service.get(job_id)["status"] == "running"
+
+
+def test_training_job_orphaned_by_a_dead_worker_is_failed():
+    from datetime import datetime, timedelta
+
+    from app.db.models import FabricJobRecord
+    from app.db.session import db_session
+    from app.services.platform.job_service import job_service
+    from app.services.platform.progress_store import progress_store
+
+    progress_id = f"train_{uuid.uuid4().hex[:8]}"
+    job_id = job_service.enqueue("model_training", config={"progress_id": progress_id, "training_id": "t1"})
+    while job_service.claim_next()["id"] != job_id:
+        pass
+    progress_store[progress_id] = {"status": "processing", "progress": 40}
+    with db_session() as session:
+        row = session.get(FabricJobRecord, job_id)
+        row.started_at = datetime.utcnow() - timedelta(hours=3)
+        row.result = {"checkpointed_at": datetime.utcnow().isoformat()}
+    job_service.claim_next()
+    assert job_service.get(job_id)["status"] == "running"
+
+    with db_session() as session:
+        session.get(FabricJobRecord, job_id).result = {
+            "checkpointed_at": (datetime.utcnow() - timedelta(hours=3)).isoformat()
+        }
+    job_service.claim_next()
+    failed = job_service.get(job_id)
+    assert failed["status"] == "failed" and "interrupted" in failed["error_payload"]["message"]
+    assert progress_store[progress_id]["status"] == "error" and progress_store[progress_id]["job_id"] == job_id
+
+def test_source_documents_paginate_and_export_streams(monkeypatch):
+    import asyncio
+    import gzip
+    import json
+
+    import chromadb
+    from chromadb.config import Settings as ChromaSettings
+
+    from app.api.v1.endpoints import knowledge
+    from app.services.vector_service import vector_service
+
+    client = chromadb.EphemeralClient(ChromaSettings(anonymized_telemetry=False, allow_reset=True))
+    collection = client.get_or_create_collection(f"docs_{uuid.uuid4().hex[:8]}")
+    monkeypatch.setattr(vector_service, "documents_collection", collection)
+    fid = f"fabric_docs_{uuid.uuid4().hex[:8]}"
+    collection.add(
+        ids=[f"{fid}_{i:03d}" for i in range(25)],
+        documents=[f"row {i}" for i in range(25)],
+        embeddings=[[float(i), 1.0] for i in range(25)],
+        metadatas=[{"source_id": fid, "row": i} for i in range(25)],
+    )
+    collection.add(ids=["other_0"], documents=["x"], embeddings=[[0.0, 0.0]], metadatas=[{"source_id": "other"}])
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = asyncio.run(knowledge.get_source_documents(fid, limit=10, cursor=cursor, fields="ids"))
+        assert "documents" not in page and len(page["ids"]) == len(page["metadatas"]) <= 10
+        seen.extend(page["ids"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 3 and seen == [f"{fid}_{i:03d}" for i in range(25)] and page["total"] == 25
+    full = asyncio.run(knowledge.get_source_documents(fid, limit=5, cursor=None, fields="full"))
+    assert len(full["documents"]) == 5 and full["next_cursor"] and full["total"] == 25
+    assert full["documents"] == [f"row {i}" for i in range(5)]
+    with pytest.raises(knowledge.HTTPException):
+        asyncio.run(knowledge.get_source_documents("other", limit=5, cursor=full["next_cursor"], fields="ids"))
+    stale = knowledge.encode_cursor({"source": fid, "offset": 10})
+    with pytest.raises(knowledge.HTTPException):
+        asyncio.run(knowledge.get_source_documents(fid, limit=5, cursor=stale, fields="ids"))
+
+    # Chunks with adjacency page in (group, ordinal) order, addressed by id.
+    chunked = f"fabric_chunked_{uuid.uuid4().hex[:8]}"
+    order = [(f"{chunked}_b{g}", o, size) for g, size in enumerate((12, 9)) for o in range(size)]
+    collection.add(
+        ids=[f"{group}_{o}" for group, o, _ in order],
+        documents=[f"{group} #{o}" for group, o, _ in order],
+        embeddings=[[float(o), 2.0] for _, o, _ in order],
+        metadatas=[{"source_id": chunked, "chunk_group": group, "chunk_ordinal": o, "chunk_group_size": size}
+                   for group, o, size in order],
+    )
+    # Chunks ingested before adjacency was recorded follow the grouped ones, by id.
+    legacy = [f"{chunked}_legacy{i}" for i in range(4)]
+    collection.add(
+        ids=legacy,
+        documents=[f"{i.rsplit('_', 1)[0]} #{i.rsplit('_', 1)[1]}" for i in legacy],
+        embeddings=[[float(i), 3.0] for i in range(4)],
+        metadatas=[{"source_id": chunked, "chunk_type": "row"} for _ in legacy],
+    )
+    seen, cursor = [], None
+    while True:
+        page = asyncio.run(knowledge.get_source_documents(chunked, limit=10, cursor=cursor, fields="full"))
+        assert page["total"] == 25 and page["documents"] == [f"{i.rsplit('_', 1)[0]} #{i.rsplit('_', 1)[1]}" for i in page["ids"]]
+        seen.extend(page["ids"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"{group}_{o}" for group, o, _ in order] + legacy
+    types = asyncio.run(knowledge.get_source_chunk_types(chunked))
+    assert types == {"source_id": chunked, "total": 25, "chunk_types": {"unknown": 21, "row": 4}}
+    assert asyncio.run(knowledge.get_source_chunk_types(fid))["chunk_types"] == {"unknown": 25}
+
+    async def body(response):
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    response = asyncio.run(knowledge.export_knowledge_source(fid, compress=True, batch_size=7))
+    lines = [json.loads(line) for line in gzip.decompress(asyncio.run(body(response))).splitlines()]
+    assert response.media_type == "application/gzip"
+    assert lines[0]["source"]["id"] == fid and lines[-1] == {"end": True, "document_count": 25}
+    assert sorted(r["document"] for r in lines[1:-1]) == sorted(f"row {i}" for i in range(25))
+    assert vector_service.count_source_documents(fid) == 25
+    with pytest.raises(knowledge.HTTPException):
+        asyncio.run(knowledge.export_knowledge_source("missing_fabric"))
+
+
+def test_migration_package_streams_roundtrip_and_rejects_damage(tmp_path, monkeypatch):
+    import asyncio
+    import io
+    import tarfile
+
+    import chromadb
+    from chromadb.config import Settings as ChromaSettings
+    from starlette.requests import Request
+
+    from app.api.v1.endpoints import knowledge
+    from app.core.config import settings
+    from app.services.codebase.migration_import import import_migration_stream
+    from app.services.codebase.migration_package import iter_migration_package
+    from app.services.vector_service import vector_service
+
+    client = chromadb.EphemeralClient(ChromaSettings(anonymized_telemetry=False, allow_reset=True))
+    collection = client.get_or_create_collection(f"docs_{uuid.uuid4().hex[:8]}")
+    monkeypatch.setattr(vector_service, "documents_collection", collection)
+    monkeypatch.setattr(vector_service, "create_embeddings", lambda texts: [[1.0, float(len(t))] for t in texts])
+    monkeypatch.setattr(settings, "FABRIC_ARTIFACT_DIR", str(tmp_path / "artifacts"))
+    monkeypatch.setattr(settings, "MIGRATION_PACKAGE_PART_BYTES", 2048)
+
+    fid = f"fabric_codebase_{uuid.uuid4().hex[:8]}"
+    nodes = [{"id": f"mod.{i}", "kind": "module", "path": f"src/mod_{i}.py"} for i in range(300)]
+    edges = [{"source": f"mod.{i}", "target": f"mod.{i + 1}", "kind": "imports"} for i in range(299)]
+    fabric_store.save({
+        "id": fid, "name": "Big Repo", "source_type": "codebase", "tags": [],
+        "codebase": {"languages": {"python": 300}},
+        "code_graph": {"nodes": nodes, "edges": edges, "stats": {"node_count": 300}},
+        "codebase_inventory": {"file_count": 300, "all_relative_files": [n["path"] for n in nodes]},
+        "module_summaries": [{"name": "mod.0", "summary": "entry point"}],
+        "migration_blueprint": {"narrative": "strangle the monolith", "risks": [{"id": "r1"}]},
+        "discovery_summary": "A big repo",
+    })
+    assert "code_graph" in fabric_store.get(fid)["artifact_refs"]
+    collection.add(
+        ids=[f"{fid}_{i}" for i in range(120)],
+        documents=[f"def f{i}(): return {i}" for i in range(120)],
+        embeddings=[[0.0, 1.0]] * 120,
+        metadatas=[{"source_id": fid, "file_name": f"src/mod_{i}.py", "chunk_kind": "code"} for i in range(120)],
+    )
+
+    async def body(response):
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    response = asyncio.run(knowledge.export_codebase_migration_json(fid))
+    package = asyncio.run(body(response))
+    assert response.media_type == "application/gzip" and "tar.gz" in response.headers["content-disposition"]
+    with tarfile.open(fileobj=io.BytesIO(package), mode="r:gz") as tar:
+        names = tar.getnames()
+    assert names[0] == "manifest.json" and names[-1] == "end.json"
+    assert len([n for n in names if n.startswith("sections/graph_nodes/")]) > 1
+
+    imported = import_migration_stream(io.BytesIO(package), name="Copy")
+    assert imported["name"] == "Copy" and imported["status"] == "active"
+    assert imported["code_graph"]["nodes"] == nodes and imported["code_graph"]["edges"] == edges
+    assert imported["migration_blueprint"]["risks"] == [{"id": "r1"}]
+    assert imported["codebase_inventory"]["file_count"] == 300
+    assert imported["total_chunks"] == 120
+    copied = collection.get(where={"source_id": imported["id"]})
+    assert sorted(copied["documents"]) == sorted(f"def f{i}(): return {i}" for i in range(120))
+    assert {m["chunk_kind"] for m in copied["metadatas"]} == {"code"}
+
+    # Raw-body upload: the importer reads through the pipe while chunks are still being sent.
+    pieces = [package[i:i + 1000] for i in range(0, len(package), 1000)]
+
+    async def receive():
+        chunk = pieces.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(pieces)}
+
+    request = Request({"type": "http", "method": "POST", "headers": [(b"content-type", b"application/gzip")]}, receive)
+    streamed = asyncio.run(knowledge.import_codebase_migration_json(request, name="Streamed"))
+    assert streamed.data["total_chunks"] == 120 and len(streamed.data["code_graph"]["nodes"]) == 300
+
+    before = {f["id"] for f in fabric_store.list_all_dicts()}
+    with pytest.raises(ValueError, match="truncated|Corrupt"):
+        import_migration_stream(io.BytesIO(package[: len(package) // 2]))
+    plain = b"".join(iter_migration_package(fabric_store.get(fid), compress=False))
+    tampered = plain.replace(b"mod_7.py", b"mod_8.py", 1)
+    with pytest.raises(ValueError, match="Checksum"):
+        import_migration_stream(io.BytesIO(tampered))
+    assert {f["id"] for f in fabric_store.list_all_dicts()} == before
+    assert collection.count() == 120 * 3
+
+
+def test_fabric_listing_is_a_paged_summary_projection_with_etag():
+    import asyncio
+
+    from fastapi import Response
+    from starlette.requests import Request
+
+    from app.api.v1.endpoints import knowledge
+    from app.services.platform.fabric_store import SUMMARY_COLUMNS
+
+    def request(etag=None):
+        headers = [(b"if-none-match", etag.encode())] if etag else []
+        return Request({"type": "http", "method": "GET", "headers": headers})
+
+    tag = uuid.uuid4().hex[:6]
+    for i in range(5):
+        fabric_store.save({
+            "id": f"fabric_list_{tag}_{i}", "name": f"List {tag} {i}", "tags": ["t"],
+            "source_type": "pdf" if i % 2 else "database", "document_count": i,
+            "created_at": f"2026-01-0{i + 1}T00:00:00",
+            "processed_files": [{"filename": f"f{j}.pdf"} for j in range(50)],
+        })
+
+    def listing(etag=None, **params):
+        response = Response()
+        params = {"source_type": None, "status": None, "q": tag, "limit": None, "cursor": None, **params}
+        result = asyncio.run(knowledge.list_knowledge_sources(request(etag), response, **params))
+        return result, response
+
+    everything, response = listing()
+    assert [f["id"] for f in everything.data] == [f"fabric_list_{tag}_{i}" for i in range(4, -1, -1)]
+    assert set(everything.data[0]) == set(SUMMARY_COLUMNS)
+    assert everything.data[0]["created_at"] == "2026-01-05T00:00:00" and everything.data[0]["tags"] == ["t"]
+    assert response.headers["X-Total-Count"] == "5" and "X-Next-Cursor" not in response.headers
+
+    pdfs, _ = listing(source_type="pdf")
+    assert [f["document_count"] for f in pdfs.data] == [3, 1]
+
+    seen, cursor = [], None
+    while True:
+        page, response = listing(limit=2, cursor=cursor)
+        seen += [f["id"] for f in page.data]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [f["id"] for f in everything.data]
+    with pytest.raises(knowledge.HTTPException):
+        listing(limit=2, cursor=cursor or knowledge.encode_cursor({"filters": {}, "after": ["x", "y"]}))
+    filters = {"source_type": None, "status": None, "q": tag}
+    for after in (["not-a-date", "id"], [5, "id"]):
+        with pytest.raises(knowledge.HTTPException) as exc:
+            listing(limit=2, cursor=knowledge.encode_cursor({"filters": filters, "after": after}))
+        assert exc.value.status_code == 400
+
+    fresh, fresh_response = listing(limit=2)
+    etag = fresh_response.headers["ETag"]
+    assert listing(etag=etag, limit=2)[0].status_code == 304
+    fabric_store.save({**fabric_store.get(f"fabric_list_{tag}_0"), "status": "error"})
+    changed, changed_response = listing(etag=etag, limit=2)
+    assert changed.success and changed_response.headers["ETag"] != etag
+
+
+def test_semantic_search_expands_context_from_chunk_adjacency(monkeypatch):
+    import asyncio
+
+    import chromadb
+    from chromadb.config import Settings as ChromaSettings
+
+    from app.api.v1.endpoints import search
+    from app.services.vector_service import vector_service
+
+    client = chromadb.EphemeralClient(ChromaSettings(anonymized_telemetry=False, allow_reset=True))
+    collection = client.get_or_create_collection(f"docs_{uuid.uuid4().hex[:8]}", metadata={"hnsw:space": "cosine"})
+    monkeypatch.setattr(vector_service, "documents_collection", collection)
+    fid = f"fabric_adj_{uuid.uuid4().hex[:8]}"
+    docs = []
+    for name in ("a.pdf", "b.pdf"):
+        docs += [
+            {"content": f"{name} paragraph {i} " + ("zebra migration" if (name, i) == ("a.pdf", 5) else "filler text"),
+             "page_number": i + 1, "file_name": name, "source_name": name,
+             "created_at": "2026-01-01T00:00:00",
+             "metadata": {"chunk_index": i, "prev_chunk_id": "stale"}}
+            for i in range(8)
+        ]
+    ids = vector_service.add_documents(docs, fid)
+    stored = collection.get(ids=ids[:9], include=["metadatas"])
+    by_id = dict(zip(stored["ids"], stored["metadatas"]))
+    first_a, second_a, first_b = by_id[ids[0]], by_id[ids[1]], by_id[ids[8]]
+    assert "prev_chunk_id" not in first_a and first_a["next_chunk_id"] == ids[1]
+    assert second_a["prev_chunk_id"] == ids[0] and second_a["chunk_ordinal"] == 1
+    assert first_b["chunk_group"] != first_a["chunk_group"] and first_b["chunk_group_size"] == 8
+
+    gets = []
+    real_get = collection.get
+
+    class CountingCollection:
+        def __getattr__(self, name):
+            return getattr(collection, name)
+
+        def get(self, **kw):
+            gets.append(kw)
+            return real_get(**kw)
+
+    monkeypatch.setattr(vector_service, "documents_collection", CountingCollection())
+    response = asyncio.run(search.semantic_search("zebra migration", limit=1, threshold=0.0, context_window=2))
+    hit = response.results[0]
+    assert hit.id == ids[5]
+    assert hit.metadata["context_chunk_ids"] == [ids[3], ids[4], ids[6], ids[7]]
+    assert hit.content.index("a.pdf paragraph 4") < hit.content.index("Main Content") < hit.content.index("a.pdf paragraph 6")
+    assert "b.pdf" not in hit.content and len(gets) == 1
+
+    edge = vector_service.expand_context([{"id": ids[7], "metadata": real_get(ids=[ids[7]])["metadatas"][0]}], 3)
+    assert [c["id"] for c in edge[ids[7]]["before"]] == ids[4:7] and edge[ids[7]]["after"] == []
+    assert vector_service.expand_context([{"id": "legacy", "metadata": {"source_id": fid}}], 3) == {}
+
+
+def test_database_fabric_job_checkpoints_batches_and_resumes(tmp_path, monkeypatch):
+    import io
+    import os
+    import sqlite3
+    from datetime import datetime, timedelta
+
+    import chromadb
+    from chromadb.config import Settings as ChromaSettings
+    from fastapi import UploadFile
+
+    from app.api.v1.endpoints import knowledge
+    from app.core.config import settings
+    from app.db.models import FabricJobRecord
+    from app.db.session import db_session
+    from app.services.platform.database_fabric_build import build_dir
+    from app.services.platform.job_worker import job_worker
+    from app.services.vector_service import vector_service
+
+    monkeypatch.setattr(settings, "DATABASE_FABRIC_SPOOL_DIR", str(tmp_path / "builds"))
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "DATABASE_FABRIC_BATCH_ROWS", 25)
+    client = chromadb.EphemeralClient(ChromaSettings(anonymized_telemetry=False, allow_reset=True))
+    collection = client.get_or_create_collection(f"docs_{uuid.uuid4().hex[:8]}", metadata={"hnsw:space": "cosine"})
+    monkeypatch.setattr(vector_service, "documents_collection", collection)
+
+    source = str(tmp_path / "source.db")
+    with sqlite3.connect(source) as seed:
+        seed.execute("CREATE TABLE records (id TEXT, parent_id TEXT, amount INTEGER)")
+        seed.executemany(
+            "INSERT INTO records VALUES (?, ?, ?)",
+            [(f"R{i:03d}", f"R{i - 1:03d}" if i % 2 else None, i) for i in range(100)],
+        )
+    connection_data = {
+        "host": "", "port": 0, "database": source, "username": "", "password": "secret",
+        "table_name": "records", "database_type": "sqlite", "query": "SELECT * FROM records ORDER BY id",
+    }
+    started = knowledge._start_database_fabric_job(
+        connection_type="sqlite", connection_data=connection_data, train_model=False,
+        weave_domain=None, input_mode="live",
+    ).data
+    fid = started["fabric_id"]
+    assert fabric_store.get(fid)["status"] == "processing"
+    # Credentials are sealed in the stored config and never handed back by the job API.
+    with db_session() as session:
+        stored = dict(session.get(FabricJobRecord, started["job_id"]).config)
+    assert "connection_data" not in stored and "secret" not in stored["connection_secret"]
+    assert job_service.open_secret(stored["connection_secret"]) == connection_data
+    queued = job_service.get(started["job_id"])
+    assert "connection_secret" not in queued["config"] and queued["config"]["progress_id"]
+    assert all(not {"connection_data", "connection_secret"} & set(j["config"]) for j in job_service.list_for_fabric(fid))
+
+    def claim(job_id):
+        # Skips other queued jobs, e.g. the ontology_discovery a finished build queues.
+        while True:
+            job = job_service.claim_next()
+            if job["id"] == job_id:
+                return job
+
+    # The worker dies (not an ordinary failure) after the second committed batch.
+    class Crash(BaseException):
+        pass
+
+    writes = []
+    real_add = vector_service.add_documents
+
+    def add(documents, source_id, batch_key=None):
+        writes.append(batch_key)
+        if len(writes) == 3:
+            raise Crash()
+        return real_add(documents, source_id, batch_key=batch_key)
+
+    monkeypatch.setattr(vector_service, "add_documents", add)
+    job = claim(started["job_id"])
+    with pytest.raises(Crash):
+        job_worker._dispatch(job)
+    crashed = job_service.get(job["id"])
+    assert crashed["status"] == "running"
+    assert crashed["result"]["checkpoint"]["rows_fetched"] == 50
+    assert crashed["result"]["metrics"]["total_rows"] == 100
+
+    # A fresh heartbeat keeps it claimed; a stale one re-queues it with its checkpoint.
+    assert job_service.get(job["id"])["status"] == "running"
+    job_service.claim_next()
+    assert job_service.get(job["id"])["status"] == "running"
+    with db_session() as session:
+        row = session.get(FabricJobRecord, job["id"])
+        row.result = {**row.result, "checkpointed_at": (datetime.utcnow() - timedelta(hours=1)).isoformat()}
+        row.started_at = datetime.utcnow() - timedelta(hours=1)
+    job_worker._dispatch(claim(job["id"]))
+
+    done = job_service.get(job["id"])
+    assert done["status"] == "ready"
+    with db_session() as session:
+        assert not {"connection_data", "connection_secret"} & set(session.get(FabricJobRecord, job["id"]).config)
+    assert writes[:3] == ["rows000000", "rows000001", "rows000002"]
+    assert writes[3:] == ["rows000002", "rows000003", "links000000", "links000001", "links000002", "links000003"]
+    assert done["result"]["rows_imported"] == 100
+    assert done["result"]["checkpoint"]["ids_written"] == collection.count() == 150
+    fabric = fabric_store.get(fid)
+    assert fabric["status"] == "active" and fabric["total_chunks"] == 150
+    assert fabric["name"] == f"{source}_records" and len(fabric["connection_info"]["sample_rows"]) == 10
+    assert not os.path.exists(build_dir(fid))
+    rows = collection.get(where={"$and": [{"source_id": fid}, {"chunk_type": "row"}]}, include=["metadatas"])
+    assert sorted(m["row_number"] for m in rows["metadatas"]) == list(range(1, 101))
+
+    # A failed CSV build resumes from its checkpoint through a new job.
+    csv = "id,parent_id\n" + "".join(f"C{i},{f'C{i - 1}' if i else ''}\n" for i in range(60))
+    started = knowledge._start_database_fabric_job(
+        connection_type="databricks", csv_uploads=[UploadFile(io.BytesIO(csv.encode()), filename="claims.csv")],
+        dataset_label="claims", train_model=False, weave_domain=None, input_mode="csv",
+    ).data
+    writes.clear()
+
+    def flaky(documents, source_id, batch_key=None):
+        writes.append(batch_key)
+        if batch_key == "rows000001" and writes.count(batch_key) == 1:
+            raise RuntimeError("embedding service unavailable")
+        return real_add(documents, source_id, batch_key=batch_key)
+
+    monkeypatch.setattr(vector_service, "add_documents", flaky)
+    job_worker._dispatch(claim(started["job_id"]))
+    failed = job_service.get(started["job_id"])
+    assert failed["status"] == "failed" and "embedding service" in failed["error_payload"]["message"]
+    assert fabric_store.get(started["fabric_id"])["status"] == "failed"
+
+    resumed = knowledge._start_database_fabric_job(
+        connection_type="databricks", train_model=False, weave_domain=None, input_mode="csv",
+        resume_job_id=started["job_id"],
+    ).data
+    assert resumed["fabric_id"] == started["fabric_id"]
+    job_worker._dispatch(claim(resumed["job_id"]))
+    assert job_service.get(resumed["job_id"])["status"] == "ready"
+    assert writes == ["rows000000", "rows000001", "rows000001", "rows000002", "links000000", "links000001", "links000002"]
+    fabric = fabric_store.get(started["fabric_id"])
+    assert fabric["name"] == "databricks_csv_claims_60rows" and fabric["total_chunks"] == 60 + 59
+
+
+
+def test_database_fabric_links_stream_from_spool_and_resume_at_offset(tmp_path, monkeypatch):
+    import chromadb
+    from chromadb.config import Settings as ChromaSettings
+
+    from app.core.config import settings
+    from app.services.platform.database_fabric_build import DatabaseSource, build_database_fabric
+    from app.services.vector_service import vector_service
+
+    monkeypatch.setattr(settings, "DATABASE_FABRIC_SPOOL_DIR", str(tmp_path / "builds"))
+    client = chromadb.EphemeralClient(ChromaSettings(anonymized_telemetry=False, allow_reset=True))
+    collection = client.get_or_create_collection(f"docs_{uuid.uuid4().hex[:8]}", metadata={"hnsw:space": "cosine"})
+    monkeypatch.setattr(vector_service, "documents_collection", collection)
+    fid = f"fabric_links_{uuid.uuid4().hex[:8]}"
+    # Every row links to the next one, so most targets sit in a later window than their source row.
+    rows = [{"id": f"C{i}", "parent_id": f"C{i + 1}" if i < 29 else ""} for i in range(30)]
+    source = DatabaseSource("claims", lambda skip: iter([rows[skip:]]), total_rows=30)
+
+    real_add = vector_service.add_documents
+    writes, failed = [], []
+
+    def flaky(documents, source_id, batch_key=None):
+        writes.append((batch_key, len(documents)))
+        if batch_key == "links000001" and not failed:
+            failed.append(batch_key)
+            raise RuntimeError("embedding service unavailable")
+        return real_add(documents, source_id, batch_key=batch_key)
+
+    monkeypatch.setattr(vector_service, "add_documents", flaky)
+    checkpoints = []
+    with pytest.raises(RuntimeError):
+        build_database_fabric(fid, source, on_checkpoint=lambda cp, _: checkpoints.append(cp), batch_rows=10)
+    cp = checkpoints[-1]
+    assert cp["stage"] == "links" and cp["link_rows"] == 10 and cp["link_documents"] == 10
+    assert 0 < cp["link_spool_bytes"] < cp["spool_bytes"]
+
+    done = build_database_fabric(fid, source, checkpoint=cp, batch_rows=10)
+    assert done["stage"] == "done" and done["link_documents"] == 29 and done["link_spool_bytes"] == done["spool_bytes"]
+    assert [w for w in writes if w[0].startswith("links")] == [
+        ("links000000", 10), ("links000001", 10), ("links000001", 10), ("links000002", 9),
+    ]
+    links = collection.get(
+        where={"$and": [{"source_id": fid}, {"chunk_type": "linked_pair"}]}, include=["metadatas", "documents"]
+    )
+    assert sorted(m["row_number"] for m in links["metadatas"]) == list(range(1, 30))
+    assert all(m["pair_found_target"] for m in links["metadatas"])
+    assert any("Target Row: id: C29" in d for d in links["documents"])
+
+    # Without a stable row order, skipping the fetched rows could skip the wrong ones: the rows restart.
+    writes.clear()
+    unordered = DatabaseSource("claims", lambda skip: iter([rows[skip:]]), total_rows=30, resumable=False)
+    rebuilt = build_database_fabric(fid, unordered, checkpoint={**cp, "stage": "rows"}, batch_rows=10)
+    assert writes[0] == ("rows000000", 10) and rebuilt["rows_fetched"] == 30 and rebuilt["link_documents"] == 29
+    assert len(collection.get(where={"source_id": fid}, include=[])["ids"]) == 30 + 29
+
+def test_fabric_ontology_bridge_samples_caches_and_feeds_chunks(tmp_path, monkeypatch):
+    import os
+
+    import chromadb
+    from chromadb.config import Settings as ChromaSettings
+
+    from app.core.config import settings
+    from app.services.ontology.artifact_loader import ArtifactLoader
+    from app.services.ontology.fabric_artifact_bridge import load_fabric_chunks, resolve_artifacts_for_fabric
+    from app.services.vector_service import vector_service
+
+    client = chromadb.EphemeralClient(ChromaSettings(anonymized_telemetry=False, allow_reset=True))
+    collection = client.get_or_create_collection(f"docs_{uuid.uuid4().hex[:8]}", metadata={"hnsw:space": "cosine"})
+    monkeypatch.setattr(vector_service, "documents_collection", collection)
+    monkeypatch.setattr(settings, "ONTOLOGY_UPLOAD_DIR", str(tmp_path / "ontology_uploads"))
+    monkeypatch.setattr(settings, "ONTOLOGY_FABRIC_SAMPLE_CHUNKS", 20)
+    fid = f"fabric_onto_{uuid.uuid4().hex[:8]}"
+    base = {"source_name": "customers", "file_name": "customers", "page_number": 1, "created_at": "2026-01-01"}
+    rows = [{**base, "content": f"customer_id: {i} | region: r{i % 4}", "metadata": {"chunk_type": "row"}}
+            for i in range(90)]
+    links = [{**base, "content": f"order_id: {i} | customer_id: {i}", "metadata": {"chunk_type": "link"}}
+             for i in range(10)]
+    vector_service.add_documents(rows + links, fid, batch_key="rows000000")
+    fabric_store.save({"id": fid, "name": "Customers", "source_type": "database", "tags": [],
+                       "document_count": 100, "total_chunks": 100, "processed_files": []})
+
+    gets = []
+    real_get = collection.get
+
+    class CountingCollection:
+        def __getattr__(self, name):
+            return getattr(collection, name)
+
+        def get(self, **kw):
+            gets.append(kw)
+            return real_get(**kw)
+
+    monkeypatch.setattr(vector_service, "documents_collection", CountingCollection())
+    [artifact] = resolve_artifacts_for_fabric(fid, "proj_1")
+    assert artifact.source_type == "fabric_chunks" and artifact.metadata["sampled_chunks"] == 20
+    # Group heads only, then bodies for the sampled ids alone; no pass over the fabric.
+    assert gets[0]["include"] == ["metadatas"] and {"chunk_ordinal": 0} in gets[0]["where"]["$and"]
+    assert len(gets[1]["ids"]) == 20 and len(gets) == 2
+
+    chunks, evidence = load_fabric_chunks(ArtifactLoader()._path_to_artifact(artifact.file_path, "proj_1"))
+    assert len(chunks) == len(evidence) == 20
+    # Stratified: the small link group is sampled too, in proportion, and picks are spread out.
+    assert sum(c["content"].startswith("order_id") for c in chunks) == 2
+    regions = {c["content"].rsplit("r", 1)[1] for c in chunks if c["content"].startswith("customer_id")}
+    assert regions == {"0", "1", "2", "3"}
+
+    mtime = os.stat(artifact.file_path).st_mtime_ns
+    again = resolve_artifacts_for_fabric(fid, "proj_2")
+    assert again[0].file_path == artifact.file_path and len(gets) == 2
+    assert os.stat(artifact.file_path).st_mtime_ns == mtime
+
+    fabric_store.save({**fabric_store.get(fid), "total_chunks": 101})
+    resolve_artifacts_for_fabric(fid, "proj_3")
+    assert len(gets) == 4
@@ -0,0 +1,106 @@
+import sqlite3
+
+from app.utils.sql_io import (
+    count_rows,
+    fetch_preview,
+    fetch_records,
+    is_ordered,
+    iter_query_batches,
+    limited_query,
+)
+
+
+def _db(tmp_path, rows=2_500):
+    path = str(tmp_path / "source.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE claims (id INTEGER PRIMARY KEY, status TEXT, amount REAL)")
+    conn.executemany(
+        "INSERT INTO claims VALUES (?, ?, ?)",
+        [(i, "open" if i % 3 else "closed", i * 1.5) for i in range(rows)],
+    )
+    conn.commit()
+    return conn
+
+
+def test_preview_pushes_limit_down_and_counts_separately(tmp_path):
+    conn = _db(tmp_path)
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    columns, rows = fetch_preview(conn, "SELECT * FROM claims WHERE status = 'open';", "sqlite", 5)
+    assert columns == ["id", "status", "amount"]
+    assert [r["id"] for r in rows] == [1, 2, 4, 5, 7]
+    assert statements == [limited_query("SELECT * FROM claims WHERE status = 'open';", 5)]
+    assert count_rows(conn, "SELECT * FROM claims WHERE status = 'open'") == 1_666
+
+    # Statements that cannot be wrapped run as written, still fetching only `limit` rows.
+    columns, rows = fetch_preview(conn, "PRAGMA table_info(claims)", "sqlite", 2)
+    assert len(rows) == 2 and "name" in columns
+    assert count_rows(conn, "PRAGMA table_info(claims)") is None
+
+
+def test_import_fetches_in_batches(tmp_path):
+    conn = _db(tmp_path)
+    sizes = [len(batch) for _, batch in iter_query_batches(conn, "SELECT * FROM claims", "sqlite", batch_size=1_000)]
+    assert sizes == [1_000, 1_000, 500]
+    columns, records = fetch_records(conn, "SELECT id, amount FROM claims", "sqlite", batch_size=700)
+    assert columns == ["id", "amount"] and len(records) == 2_500
+    assert records[-1] == {"id": 2_499, "amount": 2_499 * 1.5}
+
+
+def test_only_top_level_order_by_counts_as_stable_order():
+    assert is_ordered("SELECT * FROM claims ORDER BY id;")
+    assert is_ordered("select * from claims order by status, id desc")
+    assert not is_ordered("SELECT * FROM claims")
+    assert not is_ordered("SELECT * FROM (SELECT * FROM claims ORDER BY id) AS c WHERE amount > 1")
+
+
+class _MySQLCursorDouble:
+    """Mimics mysql-connector: an unbuffered cursor cannot close before its result is read to the end."""
+
+    def __init__(self, buffered):
+        self.buffered = buffered
+        self.description = None
+        self._rows = []
+        self._exhausted = True
+
+    def execute(self, statement):
+        if statement.startswith("SELECT COUNT(*)"):
+            self.description, self._rows = [("COUNT(*)",)], [(42,)]
+        else:
+            self.description, self._rows = [("id",), ("status",)], [(i, "open") for i in range(3)]
+        self._exhausted = self.buffered
+
+    def fetchmany(self, size):
+        batch, self._rows = self._rows[:size], self._rows[size:]
+        self._exhausted = self._exhausted or len(batch) < size
+        return batch
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def close(self):
+        if not self._exhausted:
+            raise RuntimeError("Unread result found")
+
+
+class _MySQLConnectionDouble:
+    def __init__(self):
+        self.cursors = []
+
+    def cursor(self, buffered=False):
+        self.cursors.append(_MySQLCursorDouble(buffered))
+        return self.cursors[-1]
+
+    def rollback(self):
+        pass
+
+
+def test_mysql_preview_and_count_close_cleanly_with_rows_left_unread():
+    conn = _MySQLConnectionDouble()
+    columns, rows = fetch_preview(conn, "SELECT id, status FROM claims", "mysql", 2)
+    assert columns == ["id", "status"] and [r["id"] for r in rows] == [0, 1]
+    assert count_rows(conn, "SELECT id, status FROM claims", "mysql") == 42
+    # Both ran on a single buffered cursor each, without falling back to the streaming path.
+    assert [c.buffered for c in conn.cursors] == [True, True]
@@ -1,6 +1,7 @@
 """Validation: Test with LLM analytical queries run over full tabular fabrics."""
 from __future__ import annotations
 
+from app.services.analytics.column_profiler import ColumnProfiler
 from app.services.analytics.tabular_analytics import (
     analyze_tabular_query,
     is_analytical_query,
@@ -10,6 +11,35 @@ from app.services.analytics.tabular_analytics import (
 from app.services.document_service import document_service
 
 
+
+def test_profile_fabric_rows_caps_sample_below_one_batch(monkeypatch):
+    from app.core.config import settings
+    from app.services.ontology.schema_analyzer import schema_analyzer
+    from app.services.vector_service import vector_service
+
+    rows = {f"row_{i}": f"claim_id: C{i} | status: open" for i in range(100)}
+    fetched = []
+
+    def iter_source_documents(source_id, batch_size=1000, where=None, ids=None, include=None):
+        for start in range(0, len(ids), batch_size):
+            page = ids[start:start + batch_size]
+            fetched.append(len(page))
+            yield {"ids": page, "documents": [rows[i] for i in page]}
+
+    monkeypatch.setattr(vector_service, "source_chunk_ids", lambda source_id, where=None: list(rows))
+    monkeypatch.setattr(vector_service, "iter_source_documents", iter_source_documents)
+    monkeypatch.setattr(settings, "ONTOLOGY_PROFILE_BATCH_SIZE", 50)
+
+    # A sample smaller than one batch is still a capped sample, not a full read.
+    monkeypatch.setattr(settings, "ONTOLOGY_PROFILE_MAX_ROWS", 30)
+    sampled = schema_analyzer.profile_fabric_rows({"id": "fabric_x"})
+    assert sampled["row_count"] == 30 and sampled["sampled"] is True and fetched == [30]
+
+    fetched.clear()
+    monkeypatch.setattr(settings, "ONTOLOGY_PROFILE_MAX_ROWS", 0)
+    full = schema_analyzer.profile_fabric_rows({"id": "fabric_x"})
+    assert full["row_count"] == 100 and full["sampled"] is False and fetched == [50, 50]
+
 def _cyp_like_rows(n: int = 200):
     """Synthetic NCATS CYP2C9-style rows (larger than sample_rows preview)."""
     outcomes = ["Active", "Inactive", "Inconclusive"]
@@ -340,3 +370,34 @@ def test_soft_group_by_outcome_on_cyp_fabric():
     assert result is not None
     assert result["intent"] == "group_by_counts"
     assert result["group_by"] == "PUBCHEM_ACTIVITY_OUTCOME"
+
+
+def test_column_profiler_sketches_full_rows():
+    rows = _cyp_like_rows(3000)
+    profiler = ColumnProfiler()
+    for start in range(0, len(rows), 700):
+        profiler.add_rows(rows[start:start + 700])
+    stats = {s["name"]: s for s in profiler.column_stats()}
+
+    assert profiler.row_count == 3000
+    assert abs(stats["PUBCHEM_SID"]["distinct_estimate"] - 3000) < 150
+    assert stats["PUBCHEM_CID"]["distinct_estimate"] == 50
+    assert stats["PUBCHEM_ACTIVITY_SCORE"]["type"] == "integer"
+    assert stats["PUBCHEM_ACTIVITY_OUTCOME"]["type"] == "string"
+
+
+def test_column_profiler_finds_sparse_reference_column_in_row_text():
+    texts = []
+    for i in range(1, 2001):
+        text = f"claim_id: C{i} | status: open"
+        if i > 500 and i % 10 == 0:  # absent from the leading rows entirely
+            text += f" | prior_claim_id: C{i - 7}"
+        texts.append(text)
+    profiler = ColumnProfiler()
+    profiler.add_row_texts(texts[:1000])
+    profiler.add_row_texts(texts[1000:])
+
+    stats = {s["name"]: s for s in profiler.column_stats()}
+    assert stats["prior_claim_id"]["null_ratio"] > 0.9
+    overlaps = profiler.column_overlaps()
+    assert any(o["column"] == "prior_claim_id" and o["target_column"] == "claim_id" for o in overlaps)
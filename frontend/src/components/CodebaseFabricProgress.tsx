@@ -37,8 +37,32 @@ const CodebaseFabricProgress: React.FC<CodebaseFabricProgressProps> = ({
 
   useEffect(() => {
     let cancelled = false;
+    let finished = false;
     let consecutiveErrors = 0;
+    let pollId: number | undefined;
+    const controller = new AbortController();
+
+    // Returns true once the job reached a terminal state.
+    const apply = (data: any): boolean => {
+      if (cancelled) return true;
+      setError(null);
+      setProgress(Number(data.progress || 0));
+      setMessage(data.message || 'Processing…');
+      setStage(data.stage || 'stage');
+      if (data.status === 'error') {
+        setError(data.message || 'Analysis failed');
+        return true;
+      }
+      if (data.status === 'completed' || Number(data.progress) >= 100) {
+        setDone(true);
+        setTimeout(() => onComplete(), 1200);
+        return true;
+      }
+      return false;
+    };
+
     const tick = async () => {
+      if (finished) return;
       try {
         const res = await apiRequest(`api/v1/knowledge/progress/${progressId}`);
         const payload = await res.json().catch(() => ({}));
@@ -51,32 +75,62 @@ const CodebaseFabricProgress: React.FC<CodebaseFabricProgressProps> = ({
           return;
         }
         consecutiveErrors = 0;
-        const data = payload.data || payload;
-        if (cancelled) return;
-        setError(null);
-        setProgress(Number(data.progress || 0));
-        setMessage(data.message || 'Processing…');
-        setStage(data.stage || 'stage');
-        if (data.status === 'error') {
-          setError(data.message || 'Analysis failed');
-          return;
-        }
-        if (data.status === 'completed' || Number(data.progress) >= 100) {
-          setDone(true);
-          setTimeout(() => onComplete(), 1200);
-          return;
-        }
+        finished = apply(payload.data || payload);
+        if (finished) window.clearInterval(pollId);
       } catch (err) {
         if (!cancelled) {
           setError(err instanceof Error ? err.message : 'Failed to poll progress');
         }
       }
     };
-    tick();
-    const id = window.setInterval(tick, 2000);
+
+    const startPolling = () => {
+      if (cancelled || finished || pollId !== undefined) return;
+      tick();
+      pollId = window.setInterval(tick, 2000);
+    };
+
+    // Server-sent events over fetch (EventSource cannot send auth headers); polling is the fallback.
+    const stream = async () => {
+      const res = await apiRequest(`api/v1/knowledge/progress/${progressId}/stream`, {
+        headers: { Accept: 'text/event-stream' },
+        signal: controller.signal,
+      });
+      if (!res.ok || !res.body) throw new Error('Progress stream unavailable');
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      for (;;) {
+        const { value, done: ended } = await reader.read();
+        if (ended) break;
+        buffer += decoder.decode(value, { stream: true });
+        let sep = buffer.indexOf('\n\n');
+        while (sep >= 0) {
+          const event = buffer.slice(0, sep);
+          buffer = buffer.slice(sep + 2);
+          const data = event
+            .split('\n')
+            .filter((line) => line.startsWith('data:'))
+            .map((line) => line.slice(5).trim())
+            .join('\n');
+          if (data && apply(JSON.parse(data))) {
+            finished = true;
+            return;
+          }
+          sep = buffer.indexOf('\n\n');
+        }
+      }
+    };
+
+    stream()
+      .catch(() => undefined)
+      .finally(() => {
+        if (!cancelled && !finished) startPolling();
+      });
     return () => {
       cancelled = true;
-      window.clearInterval(id);
+      controller.abort();
+      window.clearInterval(pollId);
     };
   }, [progressId, onComplete]);
 
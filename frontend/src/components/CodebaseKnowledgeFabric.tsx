@@ -157,13 +157,22 @@ const CodebaseKnowledgeFabric: React.FC<CodebaseKnowledgeFabricProps> = ({
     setImporting(true);
     setError(null);
     try {
-      const form = new FormData();
-      form.append('file', file);
-      if (name.trim()) form.append('name', name.trim());
-      const response = await fetch(getApiUrl('api/v1/knowledge/import-codebase-migration'), {
+      // Archives go up as the raw body so the server indexes them while they upload.
+      const isArchive = /\.tar(\.gz)?$|\.tgz$/i.test(file.name);
+      const query = isArchive && name.trim() ? `?name=${encodeURIComponent(name.trim())}` : '';
+      let body: BodyInit = file;
+      if (!isArchive) {
+        const form = new FormData();
+        form.append('file', file);
+        if (name.trim()) form.append('name', name.trim());
+        body = form;
+      }
+      const response = await fetch(getApiUrl(`api/v1/knowledge/import-codebase-migration${query}`), {
         method: 'POST',
-        headers: { ...getAuthHeaders() },
-        body: form,
+        headers: isArchive
+          ? { ...getAuthHeaders(), 'Content-Type': 'application/gzip' }
+          : { ...getAuthHeaders() },
+        body,
       });
       const payload = await response.json();
       if (!response.ok || payload?.success === false) {
@@ -381,10 +390,10 @@ const CodebaseKnowledgeFabric: React.FC<CodebaseKnowledgeFabricProps> = ({
 
           <div className="flex flex-wrap items-center justify-between gap-3 border-t border-[rgba(148,163,184,0.1)] pt-4">
             <label className="text-xs text-[#8b9cb0]">
-              Or import migration JSON:{' '}
+              Or import migration package:{' '}
               <input
                 type="file"
-                accept="application/json,.json"
+                accept="application/json,.json,application/gzip,.tar.gz,.tgz,.tar"
                 disabled={importing}
                 onChange={(e) => handleImportJson(e.target.files?.[0] || null)}
                 className="ml-1 inline text-xs"
@@ -359,6 +359,31 @@ const DatabaseKnowledgeFabric: React.FC<DatabaseKnowledgeFabricProps> = ({
         requestAnimationFrame(tick);
       });
 
+    // Builds run as background jobs; follow the job's progress entry until the fabric is ready.
+    const waitForDatabaseFabric = async (data: { source_id: string; progress_id?: string }) => {
+      if (!data.progress_id) return data.source_id;
+      let consecutiveErrors = 0;
+      for (;;) {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const res = await apiRequest(`api/v1/knowledge/progress/${data.progress_id}`);
+        const payload = await res.json().catch(() => ({}));
+        if (!res.ok || payload?.success === false) {
+          consecutiveErrors += 1;
+          if (consecutiveErrors >= 8) {
+            throw new Error(payload?.detail || payload?.message || 'Progress unavailable');
+          }
+          continue;
+        }
+        consecutiveErrors = 0;
+        const progress = payload.data || payload;
+        if (progress.status === 'error') {
+          throw new Error(progress.message || 'Database fabric build failed');
+        }
+        if (progress.status === 'completed') return data.source_id;
+        if (progress.message) setConnectionMessage(progress.message);
+      }
+    };
+
     const runCreationProgressAndComplete = async (createFabricRequest: () => Promise<string>) => {
       try {
         const creationPromise = createFabricRequest();
@@ -427,7 +452,7 @@ const DatabaseKnowledgeFabric: React.FC<DatabaseKnowledgeFabricProps> = ({
             )
           );
         }
-        return result.data.source_id;
+        return waitForDatabaseFabric(result.data);
       });
       return;
     }
@@ -450,7 +475,7 @@ const DatabaseKnowledgeFabric: React.FC<DatabaseKnowledgeFabricProps> = ({
       if (!result.success) {
         throw new Error(result.message || 'Failed to create knowledge fabric');
       }
-      return result.data.source_id;
+      return waitForDatabaseFabric(result.data);
     });
   };
 
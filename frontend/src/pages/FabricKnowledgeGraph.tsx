@@ -710,7 +710,7 @@ const FabricKnowledgeGraph: React.FC = () => {
               <div>
                 <p className="text-sm font-semibold text-[#e8edf4]">Migration package</p>
                 <p className="text-xs text-[#8b9cb0]">
-                  Download the full migration JSON (inventory, graph, blueprint, risks).
+                  Download the full migration package (inventory, graph, blueprint, risks, indexed chunks).
                 </p>
               </div>
               <button
@@ -727,7 +727,7 @@ const FabricKnowledgeGraph: React.FC = () => {
                     const url = window.URL.createObjectURL(blob);
                     const a = document.createElement('a');
                     a.href = url;
-                    a.download = `fabric_${fabricId}_migration.json`;
+                    a.download = `fabric_${fabricId}_migration.tar.gz`;
                     document.body.appendChild(a);
                     a.click();
                     window.URL.revokeObjectURL(url);
@@ -738,7 +738,7 @@ const FabricKnowledgeGraph: React.FC = () => {
                 }}
                 className="rounded-lg border border-[rgba(62,207,155,0.45)] bg-[rgba(62,207,155,0.2)] px-4 py-2 text-sm font-medium text-[#9af0ca] hover:bg-[rgba(62,207,155,0.3)]"
               >
-                Download migration JSON
+                Download migration package
               </button>
             </div>
           )}
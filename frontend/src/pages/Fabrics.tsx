@@ -221,7 +221,7 @@ const Fabrics: React.FC = () => {
       a.href = url;
       a.download =
         sourceType === 'codebase'
-          ? `fabric_${fabricId}_migration.json`
+          ? `fabric_${fabricId}_migration.tar.gz`
           : `fabric_${fabricId}.json`;
       document.body.appendChild(a);
       a.click();
@@ -602,7 +602,7 @@ const Fabrics: React.FC = () => {
                     className="flex w-full items-center justify-center gap-2 rounded-lg border border-[rgba(62,207,155,0.4)] bg-[rgba(62,207,155,0.12)] py-2 px-4 text-sm font-medium text-[#9af0ca] transition-colors hover:bg-[rgba(62,207,155,0.2)]"
                   >
                     <ArrowDownTrayIcon className="h-4 w-4" />
-                    Download migration JSON
+                    Download migration package
                   </button>
                 )}
 
@@ -244,7 +244,7 @@ const Knowledge: React.FC = () => {
           'Multi-language structural analysis',
           'LLM enrichment via Bedrock or OpenAI',
           'Typed knowledge graph + migration waves',
-          'Download complete migration JSON',
+          'Download complete migration package',
         ],
         color: 'cyan',
         gradient: 'from-cyan-500 to-blue-600',
@@ -176,52 +176,8 @@ const TrainMLModels: React.FC = () => {
     await startMLTraining();
   };
 
+  // Training runs as a background job: submit the files, then follow the job's progress entry.
   const startMLTraining = async () => {
-    // Step 1: Data Upload & Validation
-    await updateStep(0, 'processing');
-    await simulateProgress(0, 100, 2000);
-    await updateStep(0, 'completed');
-
-    // Step 2: Data Preprocessing
-    await updateStep(1, 'processing');
-    await simulateProgress(1, 100, 3000);
-    await updateStep(1, 'completed');
-
-    // Step 3: Feature Engineering
-    await updateStep(2, 'processing');
-    await simulateProgress(2, 100, 2500);
-    await updateStep(2, 'completed');
-
-    // Step 4: SMOTE Balancing (if needed)
-    await updateStep(3, 'processing');
-    await simulateProgress(3, 100, 2000);
-    await updateStep(3, 'completed');
-
-    // Step 5: Model Training
-    await updateStep(4, 'processing');
-    await simulateProgress(4, 100, 8000);
-    await updateStep(4, 'completed');
-
-    // Step 6: Model Validation
-    await updateStep(5, 'processing');
-    await simulateProgress(5, 100, 3000);
-    await updateStep(5, 'completed');
-
-    // Step 7: Hyperparameter Optimization
-    await updateStep(6, 'processing');
-    await simulateProgress(6, 100, 5000);
-    await updateStep(6, 'completed');
-
-    // Step 8: Model Deployment
-    await updateStep(7, 'processing');
-    await simulateProgress(7, 100, 2000);
-    await updateStep(7, 'completed');
-
-    // Training completed
-    setIsTraining(false);
-    setShowProgress(false);
-    
-    // Try to call backend API, but don't fail if it doesn't work
     try {
       const formData = new FormData();
       uploadedFiles.forEach(file => {
@@ -234,104 +190,82 @@ const TrainMLModels: React.FC = () => {
         feature_selection: true
       }));
 
+      showProgressAt(0);
       const response = await apiRequest('api/v1/knowledge/train-ml-models', {
         method: 'POST',
         body: formData,
       });
+      const payload = await response.json().catch(() => ({}));
+      if (!response.ok || payload?.success === false) {
+        throw new Error(payload?.message || payload?.detail || `Training request failed (${response.status})`);
+      }
+
+      const data = payload.data || {};
+      const result = data.progress_id ? await waitForTraining(data.progress_id) : data;
+      showProgressAt(100);
 
-      if (response.ok) {
-        const result = await response.json();
-        console.log('ML training result:', result);
-        
-        // Add trained models from API response
-        const newModels: MLModel[] = result.data.models_trained.map((model: any, index: number) => ({
-          id: `model_${Date.now()}_${index + 1}`,
-          name: model.name,
-          type: model.type,
-          accuracy: model.accuracy,
-          status: 'completed' as const,
-          createdAt: new Date().toISOString()
-        }));
-        
-        setTrainedModels(prev => [...prev, ...newModels]);
-      } else {
-        console.warn('Backend API call failed, using simulated models');
-        // Fallback to simulated models if API fails
-        const newModels: MLModel[] = [
-          {
-            id: `model_${Date.now()}_1`,
-            name: `${selectedDataType === 'enterprise' ? 'Enterprise' : selectedDataType === 'text' ? 'NLP' : 'General'} Model 1`,
-            type: selectedDataType === 'enterprise' ? 'Random Forest' : selectedDataType === 'text' ? 'BERT' : 'XGBoost',
-            accuracy: 0.92 + Math.random() * 0.07,
-            status: 'completed',
-            createdAt: new Date().toISOString()
-          },
-          {
-            id: `model_${Date.now()}_2`,
-            name: `${selectedDataType === 'enterprise' ? 'Enterprise' : selectedDataType === 'text' ? 'NLP' : 'General'} Model 2`,
-            type: selectedDataType === 'enterprise' ? 'Gradient Boosting' : selectedDataType === 'text' ? 'LSTM' : 'SVM',
-            accuracy: 0.89 + Math.random() * 0.08,
-            status: 'completed',
-            createdAt: new Date().toISOString()
-          }
-        ];
-        
-        setTrainedModels(prev => [...prev, ...newModels]);
+      const models: any[] = result.models || [];
+      const best = models.find((model: any) => model.type === (result.best_model || result.metadata?.best_model)) || models[0];
+      if (!result.model_id || !best) {
+        throw new Error('Training finished without a model');
       }
+      // Predictions, downloads and distribution address the trained run, which serves its best model.
+      setTrainedModels(prev => [...prev, {
+        id: result.model_id,
+        name: best.name,
+        type: best.type,
+        accuracy: best.accuracy,
+        status: 'completed',
+        createdAt: new Date().toISOString()
+      }]);
+      setIsTraining(false);
+      setShowProgress(false);
+      setShowModelDistribution(true);
     } catch (error) {
-      console.warn('Backend API call failed, using simulated models:', error);
-      // Fallback to simulated models if API fails
-      const newModels: MLModel[] = [
-        {
-          id: `model_${Date.now()}_1`,
-          name: `${selectedDataType === 'enterprise' ? 'Enterprise' : selectedDataType === 'text' ? 'NLP' : 'General'} Model 1`,
-          type: selectedDataType === 'enterprise' ? 'Random Forest' : selectedDataType === 'text' ? 'BERT' : 'XGBoost',
-          accuracy: 0.92 + Math.random() * 0.07,
-          status: 'completed',
-          createdAt: new Date().toISOString()
-        },
-        {
-          id: `model_${Date.now()}_2`,
-          name: `${selectedDataType === 'enterprise' ? 'Enterprise' : selectedDataType === 'text' ? 'NLP' : 'General'} Model 2`,
-          type: selectedDataType === 'enterprise' ? 'Gradient Boosting' : selectedDataType === 'text' ? 'LSTM' : 'SVM',
-          accuracy: 0.89 + Math.random() * 0.08,
-          status: 'completed',
-          createdAt: new Date().toISOString()
-        }
-      ];
-      
-      setTrainedModels(prev => [...prev, ...newModels]);
+      console.error('ML training failed:', error);
+      setTrainingSteps(prev => prev.map(step => 
+        step.status === 'processing' ? { ...step, status: 'error' as const } : step
+      ));
+      setIsTraining(false);
+      alert(`Model training failed: ${error instanceof Error ? error.message : 'Unknown error'}`);
     }
-    
-    // Always show the model distribution modal
-    setShowModelDistribution(true);
   };
 
-  const updateStep = async (stepIndex: number, status: 'processing' | 'completed' | 'error') => {
-    setTrainingSteps(prev => prev.map((step, index) => 
-      index === stepIndex ? { ...step, status } : step
-    ));
+  const waitForTraining = async (progressId: string) => {
+    let consecutiveErrors = 0;
+    for (;;) {
+      await new Promise(resolve => setTimeout(resolve, 2000));
+      const res = await apiRequest(`api/v1/knowledge/progress/${progressId}`);
+      const payload = await res.json().catch(() => ({}));
+      if (!res.ok || payload?.success === false) {
+        consecutiveErrors += 1;
+        if (consecutiveErrors >= 8) {
+          throw new Error(payload?.detail || payload?.message || 'Progress unavailable');
+        }
+        continue;
+      }
+      consecutiveErrors = 0;
+      const progress = payload.data || payload;
+      if (progress.status === 'error') {
+        throw new Error(progress.message || 'Model training failed');
+      }
+      if (progress.status === 'completed') return progress.result || {};
+      showProgressAt(Number(progress.progress) || 0);
+    }
   };
 
-  const simulateProgress = async (stepIndex: number, targetProgress: number, duration: number) => {
-    const steps = 20;
-    const increment = targetProgress / steps;
-    const delay = duration / steps;
-
-    for (let i = 0; i <= steps; i++) {
-      const progress = Math.min(i * increment, targetProgress);
-      setTrainingSteps(prev => prev.map((step, index) => 
-        index === stepIndex ? { ...step, progress } : step
-      ));
-      
-      // Update overall progress
-      const totalSteps = trainingStepsTemplate.length;
-      const stepWeight = 100 / totalSteps;
-      const overallProgressValue = (stepIndex * stepWeight) + (progress * stepWeight / 100);
-      setOverallProgress(Math.min(overallProgressValue, 100));
-      
-      await new Promise(resolve => setTimeout(resolve, delay));
-    }
+  // Spread the job's overall percentage across the pipeline steps shown on the page.
+  const showProgressAt = (percent: number) => {
+    const totalSteps = trainingStepsTemplate.length;
+    const stepWeight = 100 / totalSteps;
+    const overall = Math.max(0, Math.min(percent, 100));
+    const current = Math.min(Math.floor(overall / stepWeight), totalSteps - 1);
+    setTrainingSteps(prev => prev.map((step, index) => {
+      const progress = Math.max(0, Math.min((overall - index * stepWeight) / stepWeight * 100, 100));
+      const status = progress >= 100 ? 'completed' as const : index === current ? 'processing' as const : 'pending' as const;
+      return { ...step, progress, status };
+    }));
+    setOverallProgress(overall);
   };
 
   const handleDistributeModel = async (modelId: string) => {
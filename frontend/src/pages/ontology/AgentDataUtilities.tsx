@@ -1,5 +1,5 @@
 import * as d3 from 'd3';
-import React, { useCallback, useEffect, useMemo, useState } from 'react';
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { apiRequest } from '../../utils/api';
 import { ontologyApi, OntologyProject, KnowledgeFabricLite } from '../../utils/ontologyApi';
 import { renderLlmGraphInsight } from '../../utils/renderLlmGraphInsight';
@@ -8,8 +8,14 @@ type FabricDocPayload = {
   documents?: string[];
   metadatas?: Record<string, unknown>[];
   ids?: string[];
+  total?: number;
+  next_cursor?: string | null;
 };
 
+// Chunk bodies are paged in as the table grows; chunk types are counted by the
+// server over the whole fabric.
+const DOC_PAGE_SIZE = 200;
+
 type GraphNode = { id?: string; label?: string; type?: string; [k: string]: unknown };
 type GraphEdge = { source?: string; target?: string; relation?: string; [k: string]: unknown };
 
@@ -579,6 +585,9 @@ const AgentDataUtilities: React.FC = () => {
 
   const [fabricDocs, setFabricDocs] = useState<FabricDocPayload | null>(null);
   const [docsLoading, setDocsLoading] = useState(false);
+  const [moreDocsLoading, setMoreDocsLoading] = useState(false);
+  const [chunkTypeCounts, setChunkTypeCounts] = useState<Record<string, number>>({});
+  const docsRequest = useRef(0);
   const [graphPayload, setGraphPayload] = useState<KnowledgeGraphData | null>(null);
   const [graphLoading, setGraphLoading] = useState(false);
   const [graphRefreshedAt, setGraphRefreshedAt] = useState('');
@@ -611,7 +620,17 @@ const AgentDataUtilities: React.FC = () => {
     }).catch(() => setFabrics([]));
   }, []);
 
+  const countChunkTypes = useCallback(async (fabricId: string, request: number) => {
+    const res = await apiRequest(`api/v1/knowledge/${fabricId}/documents/chunk-types`);
+    if (!res.ok || request !== docsRequest.current) return;
+    const body = (await res.json()) as { chunk_types?: Record<string, number> };
+    if (request !== docsRequest.current) return;
+    setChunkTypeCounts(body.chunk_types ?? {});
+  }, []);
+
   const refreshFabricData = useCallback(async (fabricId: string) => {
+    const request = ++docsRequest.current;
+    setChunkTypeCounts({});
     if (!fabricId) {
       setFabricDocs(null);
       setGraphPayload(null);
@@ -621,11 +640,13 @@ const AgentDataUtilities: React.FC = () => {
     setGraphLoading(true);
     try {
       const [docsRes, graphRes] = await Promise.all([
-        apiRequest(`api/v1/knowledge/${fabricId}/documents`),
+        apiRequest(`api/v1/knowledge/${fabricId}/documents?limit=${DOC_PAGE_SIZE}`),
         apiRequest(`api/v1/knowledge/${fabricId}/knowledge-graph?include_llm=true`),
       ]);
       const docsJson = await docsRes.json();
+      if (request !== docsRequest.current) return;
       setFabricDocs(docsJson as FabricDocPayload);
+      countChunkTypes(fabricId, request).catch(() => undefined);
 
       const graphJson = await graphRes.json();
       if (graphJson?.success && graphJson?.data) {
@@ -641,7 +662,32 @@ const AgentDataUtilities: React.FC = () => {
       setDocsLoading(false);
       setGraphLoading(false);
     }
-  }, []);
+  }, [countChunkTypes]);
+
+  const loadMoreChunks = useCallback(async () => {
+    const wanted = chunkPanelLimit + 40;
+    const cursor = fabricDocs?.next_cursor;
+    if (wanted > (fabricDocs?.documents?.length ?? 0) && cursor && selectedFabricId) {
+      const request = docsRequest.current;
+      setMoreDocsLoading(true);
+      try {
+        const res = await apiRequest(
+          `api/v1/knowledge/${selectedFabricId}/documents?limit=${DOC_PAGE_SIZE}&cursor=${encodeURIComponent(cursor)}`
+        );
+        const page = (await res.json()) as FabricDocPayload;
+        if (!res.ok || request !== docsRequest.current) return;
+        setFabricDocs((prev) => ({
+          ...page,
+          documents: [...(prev?.documents ?? []), ...(page.documents ?? [])],
+          metadatas: [...(prev?.metadatas ?? []), ...(page.metadatas ?? [])],
+          ids: [...(prev?.ids ?? []), ...(page.ids ?? [])],
+        }));
+      } finally {
+        setMoreDocsLoading(false);
+      }
+    }
+    setChunkPanelLimit(wanted);
+  }, [chunkPanelLimit, fabricDocs, selectedFabricId]);
 
   useEffect(() => {
     refreshFabricData(selectedFabricId);
@@ -674,14 +720,7 @@ const AgentDataUtilities: React.FC = () => {
     [fabricDocs]
   );
 
-  const chunkTypeCounts = useMemo(() => {
-    const counts: Record<string, number> = {};
-    for (const m of metadatas) {
-      const ct = String((m?.chunk_type as string) || 'unknown');
-      counts[ct] = (counts[ct] || 0) + 1;
-    }
-    return counts;
-  }, [metadatas]);
+  const chunkTotal = fabricDocs?.total ?? documents.length;
 
   const nodes = graphPayload?.nodes ?? [];
   const edges = graphPayload?.edges ?? [];
@@ -689,13 +728,13 @@ const AgentDataUtilities: React.FC = () => {
   const evergreenAgentTips = useMemo(
     () =>
       collectEvergreenAgentTips({
-        chunkCount: documents.length,
+        chunkCount: chunkTotal,
         nodeCount: Number(graphPayload?.node_count ?? nodes.length ?? 0),
         edgeCount: Number(graphPayload?.edge_count ?? edges.length ?? 0),
         chunkTypeCounts,
         chunkTypeVariety: Object.keys(chunkTypeCounts).length,
       }),
-    [documents.length, graphPayload?.node_count, graphPayload?.edge_count, nodes.length, edges.length, chunkTypeCounts]
+    [chunkTotal, graphPayload?.node_count, graphPayload?.edge_count, nodes.length, edges.length, chunkTypeCounts]
   );
 
   const mergedDesignTips = useMemo(() => {
@@ -740,7 +779,7 @@ const AgentDataUtilities: React.FC = () => {
         query: talkQuery,
         answer: String((data?.data as Record<string, unknown> | undefined)?.answer ?? ''),
         confidence: Number((data?.data as Record<string, unknown> | undefined)?.confidence ?? 0),
-        chunkCount: documents.length,
+        chunkCount: chunkTotal,
         nodeCount,
         edgeCount,
         chunkTypeCounts,
@@ -800,14 +839,14 @@ const AgentDataUtilities: React.FC = () => {
     setFabricFitResult(
       assessPromptFabricFit({
         prompt: fabricFitPrompt,
-        chunkCount: documents.length,
+        chunkCount: chunkTotal,
         nodeCount: Number(graphPayload?.node_count ?? nodes.length ?? 0),
         edgeCount: Number(graphPayload?.edge_count ?? edges.length ?? 0),
         chunkTypeCounts,
         sourceType: String(fd.source_type ?? activeFabric?.source_type ?? ''),
       })
     );
-  }, [fabricFitPrompt, documents.length, graphPayload, chunkTypeCounts, activeFabric?.source_type, nodes.length, edges.length]);
+  }, [fabricFitPrompt, chunkTotal, graphPayload, chunkTypeCounts, activeFabric?.source_type, nodes.length, edges.length]);
 
   const fabricFetching = Boolean(selectedFabricId && (docsLoading || graphLoading));
 
@@ -859,10 +898,10 @@ const AgentDataUtilities: React.FC = () => {
       {selectedFabricId && (
         <div className="mt-8 grid gap-4 md:grid-cols-2 lg:grid-cols-4">
           {[
-            { label: 'Indexed chunks', value: documents.length, hint: 'Vector store documents', accent: 'from-cyan-500/20 to-blue-500/10 border-cyan-500/25' },
+            { label: 'Indexed chunks', value: chunkTotal, hint: 'Vector store documents', accent: 'from-cyan-500/20 to-blue-500/10 border-cyan-500/25' },
             { label: 'Graph nodes', value: Number(graphPayload?.node_count ?? nodes.length ?? 0), hint: 'Entity-like tokens', accent: 'from-violet-500/20 to-fuchsia-500/10 border-violet-500/25' },
             { label: 'Graph edges', value: Number(graphPayload?.edge_count ?? edges.length ?? 0), hint: 'Co-occurrence links', accent: 'from-amber-500/20 to-orange-500/10 border-amber-500/25' },
-            { label: 'Fabric chunks (meta)', value: Number(fabricDetails.total_chunks ?? 0) || documents.length, hint: 'Reported total_chunks', accent: 'from-emerald-500/20 to-teal-500/10 border-emerald-500/25' },
+            { label: 'Fabric chunks (meta)', value: Number(fabricDetails.total_chunks ?? 0) || chunkTotal, hint: 'Reported total_chunks', accent: 'from-emerald-500/20 to-teal-500/10 border-emerald-500/25' },
           ].map((card) => (
             <div
               key={card.label}
@@ -1127,7 +1166,7 @@ const AgentDataUtilities: React.FC = () => {
                 </div>
                 {Object.keys(chunkTypeCounts).length > 0 && (
                   <span className="rounded-full border border-cyan-500/25 bg-cyan-500/10 px-3 py-1 font-mono text-[11px] tabular-nums text-cyan-200/95">
-                    {Object.keys(chunkTypeCounts).length} types · {documents.length} indexed
+                    {Object.keys(chunkTypeCounts).length} types · {chunkTotal} indexed
                   </span>
                 )}
               </div>
@@ -1147,12 +1186,12 @@ const AgentDataUtilities: React.FC = () => {
             <div className="flex flex-wrap items-center justify-between gap-3 border-b border-white/[0.06] px-5 py-4">
               <div>
                 <p className="text-sm font-semibold text-[#f8fafc]">Indexed chunks</p>
-                <p className="text-[11px] text-[#64748b]">Showing {Math.min(chunkPanelLimit, documents.length)} of {documents.length}</p>
+                <p className="text-[11px] text-[#64748b]">Showing {Math.min(chunkPanelLimit, documents.length)} of {chunkTotal}</p>
               </div>
               <button
                 type="button"
-                onClick={() => setChunkPanelLimit((n) => Math.min(n + 40, documents.length || n + 40))}
-                disabled={chunkPanelLimit >= documents.length}
+                onClick={loadMoreChunks}
+                disabled={moreDocsLoading || chunkPanelLimit >= chunkTotal}
                 className="rounded-xl border border-white/10 bg-white/[0.05] px-3 py-1.5 text-xs text-[#cbd5e1] disabled:opacity-30"
               >
                 Load more
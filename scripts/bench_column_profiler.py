@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark the streaming column profiler used for tabular ontology inference."""
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from app.services.analytics.column_profiler import ColumnProfiler  # noqa: E402
+
+
+def make_batch(rng: np.random.Generator, start: int, size: int, columns: int) -> pd.DataFrame:
+    """Synthetic wide table: an id, a sparse self-reference, numeric, categorical and text columns."""
+    ids = np.arange(start, start + size)
+    data = {"record_id": pd.Series(ids).map("R{}".format)}
+    prior = pd.Series(rng.integers(0, max(start + size, 1), size)).map("R{}".format)
+    prior[rng.random(size) > 0.05] = None
+    data["prior_record_id"] = prior
+    for j in range(columns - 2):
+        kind = j % 3
+        if kind == 0:
+            data[f"num_{j}"] = pd.Series(rng.integers(0, 10_000, size)).astype(str)
+        elif kind == 1:
+            data[f"cat_{j}"] = pd.Series(rng.integers(0, 20, size)).map("level_{}".format)
+        else:
+            data[f"txt_{j}"] = pd.Series(rng.integers(0, 1_000_000, size)).map("value {}".format)
+    return pd.DataFrame(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark ColumnProfiler")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--columns", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    profiler = ColumnProfiler()
+    profile_seconds = 0.0
+    for start in range(0, args.rows, args.batch):
+        frame = make_batch(rng, start, min(args.batch, args.rows - start), args.columns)
+        t0 = time.perf_counter()
+        profiler.add_frame(frame)
+        profile_seconds += time.perf_counter() - t0
+    t0 = time.perf_counter()
+    result = profiler.result()
+    profile_seconds += time.perf_counter() - t0
+
+    cells = args.rows * args.columns
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    stats = {s["name"]: s for s in result["column_stats"]}
+    print(f"{args.rows:,} rows x {args.columns} columns in {profile_seconds:.1f}s "
+          f"({cells / profile_seconds / 1e6:.2f}M cells/s), peak RSS {peak_mb:.0f} MB")
+    print(f"record_id distinct ~{stats['record_id']['distinct_estimate']:,}; "
+          f"prior_record_id null_ratio {stats['prior_record_id']['null_ratio']}")
+    print("overlaps:", result["column_overlaps"][:3])
+
+
+if __name__ == "__main__":
+    main()
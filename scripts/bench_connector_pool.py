@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark connector requests (schema listing + preview): fresh connection per request vs pooled.
+
+SQLite is always measured. Pass --postgres host:port:database:user:password to
+measure a real PostgreSQL target, where connection setup (TCP, TLS, auth) dominates.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from app.services.platform.connection_manager import ConnectionManager, fingerprint  # noqa: E402
+from app.utils.sql_io import fetch_preview  # noqa: E402
+
+TABLES_SQL = {
+    "sqlite": "SELECT name FROM sqlite_master WHERE type='table'",
+    "postgresql": "SELECT tablename FROM pg_tables WHERE schemaname NOT IN ('information_schema', 'pg_catalog')",
+}
+
+
+def request(conn, dialect: str, table: str) -> None:
+    cursor = conn.cursor()
+    cursor.execute(TABLES_SQL[dialect])
+    cursor.fetchall()
+    cursor.close()
+    fetch_preview(conn, f"SELECT * FROM {table}", dialect, 10)
+
+
+def run(label: str, calls: int, fn) -> None:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    print(f"{label:<32} p50 {statistics.median(samples):8.3f} ms  p95 {samples[int(calls * 0.95) - 1]:8.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-request source connections")
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--postgres", help="host:port:database:user:password of a PostgreSQL target")
+    parser.add_argument("--table", default="events")
+    args = parser.parse_args()
+
+    manager = ConnectionManager()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "source.db")
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT)")
+            conn.executemany("INSERT INTO events VALUES (?, ?)", ((i, f"k{i % 7}") for i in range(50_000)))
+            for i in range(40):
+                conn.execute(f"CREATE TABLE extra_{i} (id INTEGER)")
+
+        def fresh_sqlite():
+            conn = sqlite3.connect(path)
+            try:
+                request(conn, "sqlite", "events")
+            finally:
+                conn.close()
+
+        def pooled_sqlite():
+            with manager.sql_connection("sqlite", database=path) as conn:
+                request(conn, "sqlite", "events")
+
+        def pooled_sqlite_cached():
+            key = fingerprint("sqlite", database=path)
+            with manager.sql_connection("sqlite", database=path) as conn:
+                manager.cached_metadata(key, "schemas", lambda: conn.execute(TABLES_SQL["sqlite"]).fetchall())
+                fetch_preview(conn, "SELECT * FROM events", "sqlite", 10)
+
+        run("sqlite fresh connection", args.calls, fresh_sqlite)
+        run("sqlite pooled", args.calls, pooled_sqlite)
+        run("sqlite pooled + schema cache", args.calls, pooled_sqlite_cached)
+
+    if args.postgres:
+        import psycopg2
+
+        host, port, database, user, password = args.postgres.split(":", 4)
+        params = dict(host=host, port=int(port), database=database, user=user, password=password)
+
+        def fresh_pg():
+            conn = psycopg2.connect(**params)
+            try:
+                request(conn, "postgresql", args.table)
+            finally:
+                conn.close()
+
+        def pooled_pg():
+            with manager.sql_connection("postgresql", **params) as conn:
+                request(conn, "postgresql", args.table)
+
+        run("postgres fresh connection", args.calls, fresh_pg)
+        run("postgres pooled", args.calls, pooled_pg)
+    print(manager.stats())
+    manager.close_all()
+
+
+if __name__ == "__main__":
+    main()
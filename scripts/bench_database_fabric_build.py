@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Benchmark database fabric builds: one in-request pass vs checkpointed batches.
+
+Seeds a SQLite table, then compares the old request-path build (fetch every
+row, build every document, embed and index in one call) with the batched
+``database_fabric`` build: wall time, peak traced memory, and how much work
+a crash at ``--crash-at`` of the rows costs to recover from.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+TMP = tempfile.mkdtemp()
+
+import chromadb  # noqa: E402
+from chromadb.config import Settings  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.services.document_service import document_service  # noqa: E402
+from app.services.platform.database_fabric_build import DatabaseSource, build_database_fabric  # noqa: E402
+from app.services.vector_service import vector_service  # noqa: E402
+from app.utils.sql_io import fetch_records, iter_query_batches  # noqa: E402
+
+
+class Crash(BaseException):
+    pass
+
+
+def seed(path: str, rows: int) -> None:
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE claims (claim_id TEXT, prior_id TEXT, member TEXT, amount REAL, notes TEXT)")
+        conn.executemany(
+            "INSERT INTO claims VALUES (?, ?, ?, ?, ?)",
+            [(f"C{i:07d}", f"C{i - 7:07d}" if i % 5 == 0 and i >= 7 else None, f"M{i % 977}", i * 1.5,
+              "routine claim review " * 6) for i in range(rows)],
+        )
+
+
+def source(path: str, batch_rows: int) -> DatabaseSource:
+    def batches(skip: int):
+        conn = sqlite3.connect(path)
+        try:
+            seen = 0
+            for _, rows in iter_query_batches(conn, "SELECT * FROM claims", "sqlite", batch_rows):
+                if seen + len(rows) > skip:
+                    yield rows[max(0, skip - seen):]
+                seen += len(rows)
+        finally:
+            conn.close()
+    return DatabaseSource("claims", batches)
+
+
+def measure(fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark database fabric builds")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=2000)
+    parser.add_argument("--crash-at", type=float, default=0.8, help="fraction of rows indexed before the crash")
+    args = parser.parse_args()
+
+    settings.DATABASE_FABRIC_SPOOL_DIR = os.path.join(TMP, "builds")
+    client = chromadb.PersistentClient(path=os.path.join(TMP, "chroma"), settings=Settings(anonymized_telemetry=False))
+    path = os.path.join(TMP, "source.db")
+    seed(path, args.rows)
+    runs = iter(range(1000))
+
+    def fresh_collection() -> None:
+        vector_service.documents_collection = client.get_or_create_collection(f"docs_{next(runs)}")
+
+    def old_build() -> None:
+        fresh_collection()
+        conn = sqlite3.connect(path)
+        _, rows = fetch_records(conn, "SELECT * FROM claims", "sqlite", batch_size=settings.SQL_FETCH_BATCH_ROWS)
+        conn.close()
+        vector_service.add_documents(document_service.process_database_data(rows, "claims"), "fabric_old")
+
+    def job_build() -> None:
+        fresh_collection()
+        build_database_fabric(f"fabric_job_{next(runs)}", source(path, args.batch), batch_rows=args.batch)
+
+    old_s, old_peak = measure(old_build)
+    job_s, job_peak = measure(job_build)
+
+    # Crash part-way through, then resume from the checkpoint.
+    fresh_collection()
+    fid, state = "fabric_crash", {}
+    crash_rows = int(args.rows * args.crash_at)
+
+    def on_checkpoint(cp, metrics):
+        state["cp"], state["metrics"] = cp, metrics
+        if cp["stage"] == "rows" and cp["rows_fetched"] >= crash_rows:
+            raise Crash()
+
+    start = time.perf_counter()
+    try:
+        build_database_fabric(fid, source(path, args.batch), on_checkpoint=on_checkpoint, batch_rows=args.batch)
+    except Crash:
+        pass
+    before_crash = time.perf_counter() - start
+    start = time.perf_counter()
+    final = build_database_fabric(fid, source(path, args.batch), checkpoint=state["cp"], batch_rows=args.batch)
+    resume_s = time.perf_counter() - start
+
+    print(f"{args.rows:,} rows, batch {args.batch:,}, {final['ids_written']:,} chunks")
+    print(f"  in-request build    : {old_s:6.2f} s, peak {old_peak / 1e6:7.1f} MB")
+    print(f"  checkpointed job    : {job_s:6.2f} s, peak {job_peak / 1e6:7.1f} MB, "
+          f"{state['metrics']['rows_per_second']:,.0f} rows/s reported")
+    print(f"  crash at {args.crash_at:.0%} rows   : {before_crash:6.2f} s done before it; "
+          f"resume {resume_s:6.2f} s (in-request build would redo {old_s:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
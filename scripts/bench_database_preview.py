@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Benchmark database preview: full read_sql_query + head() vs limit pushdown, and batched import memory."""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+import pandas as pd  # noqa: E402
+
+from app.utils.sql_io import count_rows, fetch_preview, iter_query_batches  # noqa: E402
+
+
+def measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<34} {elapsed * 1000:10.1f} ms  peak {peak / 1e6:8.1f} MB  -> {result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark database preview and import paths")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "source.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT, payload TEXT, amount REAL)")
+        conn.executemany(
+            "INSERT INTO events VALUES (?, ?, ?, ?)",
+            ((i, f"kind_{i % 50}", f"payload {i} " * 4, i * 0.25) for i in range(args.rows)),
+        )
+        conn.commit()
+        query = "SELECT * FROM events"
+
+        measure("preview: read_sql_query + head", lambda: len(pd.read_sql_query(query, conn).head(args.limit)))
+        measure("preview: limit pushdown", lambda: len(fetch_preview(conn, query, "sqlite", args.limit)[1]))
+        measure("preview: optional COUNT(*)", lambda: count_rows(conn, query))
+        measure("import: read_sql_query.to_dict", lambda: len(pd.read_sql_query(query, conn).to_dict("records")))
+        measure(
+            "import: batched cursor (streamed)",
+            lambda: sum(len(batch) for _, batch in iter_query_batches(conn, query, "sqlite", 5_000)),
+        )
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Benchmark source export: one get() + JSON body vs the paged NDJSON/gzip stream.
+
+Peak Python heap (tracemalloc) is what grows with fabric size in the old path;
+the streamed export reads Chroma ``--batch-size`` chunks at a time.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+import chromadb  # noqa: E402
+from chromadb.config import Settings  # noqa: E402
+
+from app.services.vector_service import VectorService  # noqa: E402
+from app.utils.ndjson_stream import gzip_chunks, ndjson_lines  # noqa: E402
+
+
+def measure(fn):
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()  # second pass: tracing slows allocation-heavy code too much to time it
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark document export")
+    parser.add_argument("--chunks", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    client = chromadb.PersistentClient(path=tempfile.mkdtemp(), settings=Settings(anonymized_telemetry=False))
+    collection = client.get_or_create_collection("documents")
+    for start in range(0, args.chunks, 5000):
+        n = min(5000, args.chunks - start)
+        collection.add(
+            ids=[f"fab_{start + i}" for i in range(n)],
+            documents=[f"customer_id: {start + i} | name: Customer {start + i} | " + "notes " * 30 for i in range(n)],
+            embeddings=[[float((start + i) % 97), 1.0, 0.5, 0.25] for i in range(n)],
+            metadatas=[{"source_id": "fab", "chunk_type": "row", "row_index": start + i} for i in range(n)],
+        )
+    service = VectorService.__new__(VectorService)
+    service.documents_collection = collection
+
+    def legacy():
+        return len(json.dumps(service.get_source_documents("fab")))
+
+    def streamed():
+        records = service.iter_export_records("fab", batch_size=args.batch_size)
+        return sum(len(chunk) for chunk in gzip_chunks(ndjson_lines(records)))
+
+    def first_page():
+        return len(json.dumps(service.page_source_documents("fab", 500, include_documents=False)))
+
+    print(f"{args.chunks:,} chunks in one source")
+    for label, fn in (("get() + JSON body", legacy), ("NDJSON gzip stream", streamed), ("first page (ids)", first_page)):
+        elapsed, peak, size = measure(fn)
+        print(f"  {label:20s}: {elapsed:6.2f} s, peak heap {peak / 1e6:7.1f} MB, {size / 1e6:6.1f} MB out")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Benchmark enrichment discovery against a stub LLM with injected latency: per-field vs batched prompts."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from app.core.config import settings  # noqa: E402
+from app.services.ontology import ontology_enrichment_service as enrichment_module  # noqa: E402
+from app.services.ontology.ontology_enrichment_service import OntologyEnrichmentService  # noqa: E402
+from app.services.ontology.ontology_persistence_service import OntologyPersistenceService  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batched enrichment LLM recommendations")
+    parser.add_argument("--fields", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    args = parser.parse_args()
+
+    calls = []
+    lock = threading.Lock()
+
+    def stub_chat_completion(*, provider, messages, model=None, max_tokens=500, temperature=0.1):
+        payload = json.loads(messages[-1]["content"].split("Fields: ", 1)[1])
+        with lock:
+            calls.append(len(payload))
+        time.sleep(args.latency_ms / 1000)
+        return json.dumps({key: {"aiRationale": "stub"} for key in payload})
+
+    enrichment_module.llm_router.ontology_provider = lambda: "stub"
+    enrichment_module.llm_router.is_provider_ready = lambda provider: True
+    enrichment_module.llm_router.chat_completion = stub_chat_completion
+
+    fields = [{"name": f"source_column_{i}", "type": "string"} for i in range(args.fields)]
+    for label, batch, concurrency in (("per-field, serial (before)", 1, 1), ("batched x20, 4 concurrent", 20, 4)):
+        settings.ONTOLOGY_ENRICHMENT_LLM_BATCH_SIZE = batch
+        settings.ONTOLOGY_ENRICHMENT_LLM_CONCURRENCY = concurrency
+        calls.clear()
+        with tempfile.TemporaryDirectory() as tmp:
+            settings.ONTOLOGY_DATA_DIR = tmp
+            service = OntologyEnrichmentService(persistence=OntologyPersistenceService())
+            start = time.perf_counter()
+            service.discover_candidates("bench", fields)
+            elapsed = time.perf_counter() - start
+        print(f"{label:<28} {args.fields} fields  {len(calls):4d} LLM calls  {elapsed:7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
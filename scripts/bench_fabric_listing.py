@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark fabric listing with codebase artifacts inline in FabricRecord.payload vs offloaded by reference."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+
+def code_graph(nodes: int) -> dict:
+    return {
+        "nodes": [
+            {"id": f"sym_{i}", "label": f"pkg.module_{i // 20}.Symbol{i}", "type": "function",
+             "properties": {"file": f"src/pkg/module_{i // 20}.py", "loc": 40 + i % 90}}
+            for i in range(nodes)
+        ],
+        "edges": [{"source": f"sym_{i}", "target": f"sym_{(i * 7) % nodes}", "type": "calls"} for i in range(nodes)],
+        "stats": {"node_count": nodes},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark fabric listing vs codebase size")
+    parser.add_argument("--fabrics", type=int, default=40)
+    parser.add_argument("--nodes", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        from app.core.config import settings
+
+        settings.FABRIC_ARTIFACT_DIR = os.path.join(tmp, "artifacts")
+        from app.db.session import init_db
+        from app.services.platform.fabric_store import fabric_store
+
+        graph = code_graph(args.nodes)
+        for mode, inline_max in (("inline payload (before)", 1 << 40), ("artifact refs (after)", 16384)):
+            settings.DATABASE_URL = f"sqlite:///{os.path.join(tmp, f'{inline_max}.db')}"
+            init_db()
+            settings.FABRIC_ARTIFACT_INLINE_MAX_BYTES = inline_max
+            fabric_store.save_all([
+                {"id": f"fabric_{i}", "name": f"Repo {i}", "source_type": "codebase", "tags": [],
+                 "code_graph": graph, "codebase_inventory": {"files": [f"f{j}.py" for j in range(2000)]}}
+                for i in range(args.fabrics)
+            ])
+            tracemalloc.start()
+            start = time.perf_counter()
+            listed = fabric_store.list_all_dicts()
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            start = time.perf_counter()
+            fabric_store.get("fabric_0")
+            get_ms = (time.perf_counter() - start) * 1000
+            size = len(json.dumps(listed, default=str))
+            print(f"{mode:<24} list {elapsed * 1000:8.1f} ms  peak {peak / 1e6:7.1f} MB  "
+                  f"payload {size / 1e6:7.2f} MB  get {get_ms:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Benchmark linking a vector-only fabric to ontology discovery.
+
+Compares the old bridge (``get_source_documents`` for the whole fabric, keep
+the first 300, write ``<fabricSource>`` XML, then ``XMLProcessor`` parses it and
+``SemanticChunker`` re-chunks it) with the chunk artifact: one lookup of the
+fabric's chunk-group heads, a stratified sample fetched by id and NDJSON that
+discovery reads as chunks, reused on the next link while the fabric is
+unchanged.
+"""
+from __future__ import annotations
+
+import argparse
+import html
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+TMP = tempfile.mkdtemp()
+os.environ["KF_ONTOLOGY_UPLOAD_DIR"] = os.path.join(TMP, "ontology_uploads")
+
+import chromadb  # noqa: E402
+from chromadb.config import Settings  # noqa: E402
+
+from app.models.ontology import SourceArtifact  # noqa: E402
+from app.services.ontology.artifact_loader import ArtifactLoader  # noqa: E402
+from app.services.ontology.fabric_artifact_bridge import load_fabric_chunks, materialize_fabric_chunks  # noqa: E402
+from app.services.ontology.semantic_chunker import SemanticChunker  # noqa: E402
+from app.services.ontology.xml_processor import XMLProcessor  # noqa: E402
+from app.services.vector_service import vector_service  # noqa: E402
+
+
+def old_link(fabric_id: str):
+    documents = vector_service.get_source_documents(fabric_id).get("documents") or []
+    path = os.path.join(TMP, f"{fabric_id}_fabric_source.xml")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<fabricSource>\n")
+        for idx, chunk in enumerate(documents[:300], start=1):
+            f.write(f'  <chunk id="{idx}">{html.escape(chunk)}</chunk>\n')
+        f.write("</fabricSource>\n")
+    art = SourceArtifact(id="art_old", file_name="old.xml", file_path=path, source_type="xml", project_id="p")
+    full_text, _, _, _ = XMLProcessor().process(art)
+    return SemanticChunker().chunk_text(full_text)
+
+
+def new_link(fabric: dict):
+    path = materialize_fabric_chunks(fabric)
+    chunks, _ = load_fabric_chunks(ArtifactLoader()._path_to_artifact(path, "p"))
+    return chunks
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark fabric -> ontology linking")
+    parser.add_argument("--sizes", default="2000,20000,100000", help="fabric sizes in chunks")
+    parser.add_argument("--tables", type=int, default=8, help="row groups (tables / batches) per fabric")
+    args = parser.parse_args()
+
+    client = chromadb.PersistentClient(path=os.path.join(TMP, "chroma"), settings=Settings(anonymized_telemetry=False))
+    vector_service.documents_collection = client.get_or_create_collection("documents", metadata={"hnsw:space": "cosine"})
+    print(f"{'chunks':>8} | {'old s':>7} {'old MB':>7} {'groups':>6} | {'cold s':>7} {'cold MB':>7} {'groups':>6} | {'warm ms':>7}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        fabric_id = f"fabric_{n}"
+        for t in range(args.tables):
+            docs = [{
+                "content": f"table: t{t} | id: {i} | name: item {i} | amount: {i * 3 % 997}",
+                "source_name": f"t{t}",
+                "file_name": f"t{t}",
+                "page_number": 1,
+                "created_at": "2026-01-01T00:00:00",
+                "metadata": {"chunk_type": "row"},
+            } for i in range(n // args.tables)]
+            for start in range(0, len(docs), 5000):
+                vector_service.add_documents(docs[start:start + 5000], fabric_id, batch_key=f"t{t}_{start}")
+        fabric = {"id": fabric_id, "updated_at": "2026-01-01", "document_count": n, "total_chunks": n}
+
+        old_chunks, old_s, old_peak = measure(old_link, fabric_id)
+        new_chunks, cold_s, cold_peak = measure(new_link, fabric)
+        _, warm_s, _ = measure(new_link, fabric)
+        old_groups = len({c["content"].split("table: ")[1].split(" ")[0] for c in old_chunks if "table: " in c["content"]})
+        new_groups = len({c["content"].split(" |")[0] for c in new_chunks})
+        print(f"{n:>8} | {old_s:>7.2f} {old_peak / 2**20:>7.1f} {old_groups:>6} | "
+              f"{cold_s:>7.2f} {cold_peak / 2**20:>7.1f} {new_groups:>6} | {warm_s * 1000:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
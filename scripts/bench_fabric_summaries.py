@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark GET /knowledge/: full fabric records vs the summary projection.
+
+Fills a throwaway platform database with fabrics carrying realistic payloads
+(processed files, analytics, connection info) and times the old listing
+(``list_all_dicts``) against ``list_summaries`` and the 304 revalidation path.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+TMP = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TMP, 'platform.db')}"
+
+from app.core.config import settings  # noqa: E402
+from app.db.models import FabricRecord  # noqa: E402
+from app.db.session import db_session, init_db  # noqa: E402
+from app.services.platform.fabric_store import _offload_artifacts, fabric_store  # noqa: E402
+
+
+def timed(fn, repeat: int = 5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark fabric listing")
+    parser.add_argument("--fabrics", type=int, default=2000)
+    parser.add_argument("--files", type=int, default=100, help="processed_files entries per fabric")
+    args = parser.parse_args()
+
+    settings.DATABASE_URL = os.environ["DATABASE_URL"]
+    settings.FABRIC_ARTIFACT_DIR = os.path.join(TMP, "artifacts")
+    settings.DATA_DIR = TMP
+    init_db()
+    with db_session() as session:
+        for i in range(args.fabrics):
+            fabric = {
+                "id": f"fabric_{i:06d}", "name": f"Fabric {i}", "source_type": "pdf", "tags": ["bench"],
+                "document_count": args.files, "total_chunks": args.files * 40,
+                "created_at": f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}",
+                "processed_files": [{"filename": f"report_{i}_{j}.pdf", "pages": 12, "chunks": 40,
+                                     "checksum": "0" * 64} for j in range(args.files)],
+                "analytics": {"columns": {f"col_{c}": {"mean": 1.5, "nulls": 0, "top": ["a", "b", "c"]}
+                                          for c in range(40)}},
+            }
+            session.add(FabricRecord(id=fabric["id"], name=fabric["name"], source_type="pdf", status="active",
+                                     document_count=fabric["document_count"], total_chunks=fabric["total_chunks"],
+                                     tags=fabric["tags"], payload=_offload_artifacts(fabric)))
+    fabric_store._initialized = True
+
+    full_s, full = timed(fabric_store.list_all_dicts)
+    summary_s, summary = timed(lambda: fabric_store.list_summaries()[0])
+    page_s, page = timed(lambda: fabric_store.list_summaries(limit=50)[0])
+    revision_s, _ = timed(fabric_store.summary_revision)
+
+    print(f"{args.fabrics:,} fabrics, {args.files} processed files each")
+    print(f"  full records (old)      : {full_s * 1000:8.1f} ms, {len(json.dumps(full)) / 1e6:7.2f} MB")
+    print(f"  summary projection, all : {summary_s * 1000:8.1f} ms, {len(json.dumps(summary)) / 1e6:7.2f} MB")
+    print(f"  summary page of 50      : {page_s * 1000:8.1f} ms, {len(json.dumps(page)) / 1e3:7.1f} KB")
+    print(f"  If-None-Match revision  : {revision_s * 1000:8.1f} ms (304, empty body)")
+
+
+if __name__ == "__main__":
+    main()
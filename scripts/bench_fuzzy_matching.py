@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark attribute matching: exhaustive SequenceMatcher scan vs the trigram FuzzyNameIndex."""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from app.services.ontology.name_index import FuzzyNameIndex, name_similarity, normalize_name  # noqa: E402
+from app.services.ontology.ontology_enrichment_service import SYNONYM_MAP  # noqa: E402
+
+WORDS = ["member", "claim", "provider", "amount", "status", "date", "code", "risk", "tier", "plan",
+         "policy", "payment", "balance", "diagnosis", "procedure", "facility", "region", "score", "type", "id"]
+
+
+def attribute_names(n: int, rng: random.Random) -> list:
+    names = set()
+    while len(names) < n:
+        names.add("_".join(rng.sample(WORDS, rng.randint(2, 4))) + f"_{rng.randint(0, 99)}")
+    return sorted(names)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy attribute matching")
+    parser.add_argument("--attributes", type=int, default=5_000)
+    parser.add_argument("--fields", type=int, default=2_000)
+    parser.add_argument("--k", type=int, default=64)
+    parser.add_argument("--exhaustive-sample", type=int, default=200,
+                        help="fields scored exhaustively (extrapolated to --fields)")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    attributes = attribute_names(args.attributes, rng)
+    # Half the fields are near-copies of existing attributes, half are unrelated.
+    fields = [
+        attributes[rng.randrange(len(attributes))].replace("_", "", 1) if i % 2 else f"{rng.choice(WORDS)}_x{i}"
+        for i in range(args.fields)
+    ]
+
+    start = time.perf_counter()
+    index = FuzzyNameIndex(((name, name) for name in attributes), synonyms=SYNONYM_MAP)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = [index.best_match(field, k=args.k) for field in fields]
+    indexed_s = time.perf_counter() - start
+
+    sample = fields[: args.exhaustive_sample]
+    start = time.perf_counter()
+    exhaustive = []
+    for field in sample:
+        query = normalize_name(field)
+        scores = [name_similarity(query, normalize_name(name), SYNONYM_MAP) for name in attributes]
+        best = max(range(len(attributes)), key=lambda i: (scores[i], -i))
+        exhaustive.append((attributes[best], scores[best]))
+    exhaustive_s = (time.perf_counter() - start) * len(fields) / len(sample)
+
+    # Only scores above the rename/synonym thresholds (>= 0.7) change a recommendation.
+    relevant = [(a, b) for a, b in zip(indexed[: len(sample)], exhaustive) if b[1] >= 0.7]
+    agree = sum(abs(a[1] - b[1]) < 1e-9 for a, b in relevant)
+    print(f"{args.attributes} attributes x {args.fields} fields")
+    print(f"exhaustive scan (extrapolated) {exhaustive_s:9.2f} s")
+    print(f"trigram index k={args.k:<3}          {indexed_s:9.2f} s  (+ build {build * 1000:.0f} ms)")
+    print(f"same best score where exhaustive >= 0.7: {agree}/{len(relevant)} of {len(sample)} sampled fields")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark governance logging for one enrichment run: JSON-array rewrite vs append-only JSONL.
+
+The legacy path loaded the whole policy log, appended one decision and rewrote
+the file once per candidate; the append log group-commits the run's records.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from app.services.ontology.append_log import AppendLog  # noqa: E402
+
+
+def decision(candidate_id: str) -> dict:
+    return {
+        "id": f"plog_{uuid.uuid4().hex[:12]}",
+        "candidateId": candidate_id,
+        "policyRule": "default_governance_policy",
+        "decision": "require_approval",
+        "reason": "Sensitive attribute requires steward approval under assisted governance.",
+        "timestamp": "2026-01-01T00:00:00",
+    }
+
+
+def legacy_run(path: str, candidates: list) -> None:
+    for cid in candidates:
+        with open(path, "r", encoding="utf-8") as f:
+            logs = json.load(f)
+        logs.append(decision(cid))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(logs, f, indent=2, default=str)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark governance log writes")
+    parser.add_argument("--history", type=int, default=50_000, help="decisions already logged")
+    parser.add_argument("--candidates", type=int, default=200, help="decisions written by the run")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    try:
+        history = [decision(f"chg_{i:08d}") for i in range(args.history)]
+        run = [f"chg_new_{i}" for i in range(args.candidates)]
+
+        legacy_path = os.path.join(tmp, "policy_logs.json")
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=2)
+        start = time.perf_counter()
+        legacy_run(legacy_path, run)
+        legacy_s = time.perf_counter() - start
+
+        log = AppendLog(os.path.join(tmp, "policy_logs"))
+        log.append_many((row, row["candidateId"]) for row in history)
+        start = time.perf_counter()
+        with log.batch():
+            for cid in run:
+                log.append(decision(cid), key=cid)
+        append_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        page = log.read(limit=50)
+        page_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        one = log.read(key="chg_00001234")
+        key_ms = (time.perf_counter() - start) * 1000
+        assert len(page) == 50 and len(one) == 1
+
+        print(f"history={args.history:,} decisions, run={args.candidates} candidates")
+        print(f"  JSON rewrite per candidate : {legacy_s:8.2f} s")
+        print(f"  append log, group commit   : {append_s * 1000:8.2f} ms")
+        print(f"  newest page of 50          : {page_ms:8.2f} ms")
+        print(f"  one candidate's decisions  : {key_ms:8.2f} ms")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark canonical graph payloads: full response vs pages, id projection and top-N overview."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+FABRIC_ID = "bench_fabric"
+VERSION_ID = "bench_version"
+
+
+def seed(node_count: int, edge_count: int) -> None:
+    from app.services.graph.graph_store import graph_store
+
+    rng = random.Random(7)
+    nodes = [
+        {
+            "id": f"gn_{i:07d}",
+            "label": f"Entity {i}",
+            "normalized_name": f"entity_{i}",
+            "properties": {"member_id": "string", "amount": "number", "status": "string"},
+        }
+        for i in range(node_count)
+    ]
+    # Preferential attachment-ish: a few hubs, long tail.
+    edges = [
+        {
+            "id": f"ge_{i:07d}",
+            "source_node_id": nodes[int(node_count * rng.random() ** 3)]["id"],
+            "target_node_id": nodes[rng.randrange(node_count)]["id"],
+            "relationship_type": rng.choice(["has_claim", "billed_by", "covers", "refers_to"]),
+            "confidence": 0.9,
+            "evidence_refs": [{"snippet": "column overlap between member_id and claims.member_id"}],
+        }
+        for i in range(edge_count)
+    ]
+    graph_store.sync_graph(FABRIC_ID, VERSION_ID, nodes, edges)
+    graph_store.record_build_run(FABRIC_ID, VERSION_ID, "ready", node_count, edge_count)
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    size = len(json.dumps(result, default=str))
+    print(f"{label:<38} {elapsed * 1000:9.1f} ms  {size / 1e6:8.2f} MB")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark graph API payload windowing")
+    parser.add_argument("--nodes", type=int, default=20_000)
+    parser.add_argument("--edges", type=int, default=100_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--top-n", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        from app.core.config import settings
+
+        settings.DATABASE_URL = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        from app.db.session import init_db
+        from app.services.graph.graph_store import graph_store
+        from app.services.graph.graph_window import make_etag
+
+        init_db()
+        start = time.perf_counter()
+        seed(args.nodes, args.edges)
+        print(f"seeded {args.nodes:,} nodes / {args.edges:,} edges in {time.perf_counter() - start:.1f}s")
+
+        timed("full payload (before)", lambda: graph_store.get_graph_payload(FABRIC_ID, VERSION_ID))
+        page = timed(
+            f"first page limit={args.page} fields=full",
+            lambda: graph_store.get_graph_page(FABRIC_ID, VERSION_ID, args.page),
+        )
+        timed(
+            f"first page limit={args.page} fields=ids",
+            lambda: graph_store.get_graph_page(FABRIC_ID, VERSION_ID, args.page, fields="ids"),
+        )
+        timed(
+            "deep page (cursor)",
+            lambda: graph_store.get_graph_page(
+                FABRIC_ID, VERSION_ID, args.page, node_after=page["node_after"], edge_after="ge_0090000",
+                fields="ids",
+            ),
+        )
+        top = timed(
+            f"top_n={args.top_n} overview fields=ids",
+            lambda: graph_store.top_nodes_by_degree(FABRIC_ID, VERSION_ID, args.top_n, fields="ids"),
+        )
+        hub = top["nodes"][0]["id"]
+        timed(
+            "neighbours of top hub (both, limit 500)",
+            lambda: graph_store.get_neighbors(FABRIC_ID, hub, direction="both", limit=500),
+        )
+        timed(
+            "ETag revision check (304 path)",
+            lambda: make_etag(FABRIC_ID, graph_store.graph_revision(FABRIC_ID, VERSION_ID)),
+        )
+
+
+if __name__ == "__main__":
+    main()
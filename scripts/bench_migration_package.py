@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Benchmark codebase migration packages: v1 single JSON document vs v2 streamed archive.
+
+Builds a synthetic codebase fabric (graph of ``--files`` modules, ``--chunks``
+indexed chunks) and reports wall time and peak Python heap for exporting and
+importing each format. v1 carries at most 300 evidence snippets; v2 carries
+every chunk. Embeddings are stubbed so indexing cost is the vector store's.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+TMP = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TMP, 'platform.db')}"
+
+import chromadb  # noqa: E402
+from chromadb.config import Settings  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.session import init_db  # noqa: E402
+from app.services.codebase.migration_export import build_migration_package  # noqa: E402
+from app.services.codebase.migration_import import import_migration_package, import_migration_stream  # noqa: E402
+from app.services.codebase.migration_package import iter_migration_package  # noqa: E402
+from app.services.platform.fabric_store import fabric_store  # noqa: E402
+from app.services.vector_service import vector_service  # noqa: E402
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark migration package export/import")
+    parser.add_argument("--files", type=int, default=50_000, help="modules in the code graph")
+    parser.add_argument("--chunks", type=int, default=20_000, help="indexed chunks")
+    args = parser.parse_args()
+
+    settings.DATABASE_URL = os.environ["DATABASE_URL"]
+    settings.FABRIC_ARTIFACT_DIR = os.path.join(TMP, "artifacts")
+    init_db()
+    fabric_store._initialized = False
+    fabric_store.initialize()
+    client = chromadb.PersistentClient(path=os.path.join(TMP, "chroma"), settings=Settings(anonymized_telemetry=False))
+    vector_service.documents_collection = client.get_or_create_collection("documents")
+    vector_service.create_embeddings = lambda texts: [[1.0, float(len(t) % 97), 0.5, 0.25] for t in texts]
+
+    fid = "fabric_codebase_bench"
+    paths = [f"src/pkg_{i % 500}/module_{i}.py" for i in range(args.files)]
+    fabric_store.save({
+        "id": fid, "name": "bench", "source_type": "codebase", "tags": [],
+        "code_graph": {
+            "nodes": [{"id": p, "kind": "module", "path": p, "language": "python", "loc": 120} for p in paths],
+            "edges": [{"source": paths[i % args.files], "target": paths[(i * 7 + 1) % args.files], "kind": "imports"}
+                      for i in range(args.files * 2)],
+        },
+        "codebase_inventory": {"file_count": args.files, "all_relative_files": paths},
+        "module_summaries": [{"name": f"pkg_{i}", "summary": "package " * 20} for i in range(500)],
+    })
+    for start in range(0, args.chunks, 5000):
+        n = min(5000, args.chunks - start)
+        vector_service.documents_collection.add(
+            ids=[f"{fid}_{start + i}" for i in range(n)],
+            documents=[f"def handler_{start + i}(request):\n" + "    return process(request)\n" * 20 for i in range(n)],
+            embeddings=[[0.0, 1.0, 0.5, 0.25]] * n,
+            metadatas=[{"source_id": fid, "file_name": paths[(start + i) % args.files], "chunk_kind": "code"}
+                       for i in range(n)],
+        )
+
+    v1_export_s, v1_export_peak, v1 = measure(
+        lambda: json.dumps(build_migration_package(fabric=fabric_store.get(fid, with_artifacts=True))).encode())
+    v1_import_s, v1_import_peak, _ = measure(lambda: import_migration_package(json.loads(v1)))
+    archive = os.path.join(TMP, "package.tar.gz")
+
+    def export_v2() -> int:
+        with open(archive, "wb") as f:
+            for chunk in iter_migration_package(fabric_store.get(fid), vector_service.iter_export_records(fid)):
+                f.write(chunk)
+        return os.path.getsize(archive)
+
+    def import_v2():
+        with open(archive, "rb") as f:
+            return import_migration_stream(f)
+
+    v2_export_s, v2_export_peak, v2_bytes = measure(export_v2)
+    v2_import_s, v2_import_peak, _ = measure(import_v2)
+
+    print(f"{args.files:,} modules, {args.files * 2:,} edges, {args.chunks:,} indexed chunks")
+    print(f"  v1 JSON export   : {v1_export_s:6.2f} s, peak heap {v1_export_peak / 1e6:7.1f} MB, "
+          f"{len(v1) / 1e6:6.1f} MB (300 evidence snippets)")
+    print(f"  v1 JSON import   : {v1_import_s:6.2f} s, peak heap {v1_import_peak / 1e6:7.1f} MB")
+    print(f"  v2 archive export: {v2_export_s:6.2f} s, peak heap {v2_export_peak / 1e6:7.1f} MB, "
+          f"{v2_bytes / 1e6:6.1f} MB gz (all chunks)")
+    print(f"  v2 archive import: {v2_import_s:6.2f} s, peak heap {v2_import_peak / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark per-call predict latency and resident size: native estimator vs ONNX Runtime backend."""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+from bench_batch_predict import make_frame  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+
+
+def latencies(service, model_id, records, calls: int):
+    service.predict(model_id, records[:1])  # load into the registry
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        service.predict(model_id, [records[i % len(records)]])
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark native vs ONNX Runtime model serving")
+    parser.add_argument("--train-rows", type=int, default=5_000)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.MODELS_DIR = os.path.join(tmp, "models")
+        settings.DATA_DIR = os.path.join(tmp, "data")
+        from app.services.model_registry import model_registry
+        from app.services.model_service import ModelService
+
+        service = ModelService()
+        model_id = service.train_models(make_frame(args.train_rows), "enterprise", {})["model_id"]
+        records = make_frame(1_000, seed=12).drop(columns=["target"]).to_dict("records")
+        print(f"best model: {service.get_model(model_id)['best_model']}")
+
+        for backend in ("native", "onnx"):
+            service.set_serving_options(model_id, backend=backend, intra_op_threads=1)
+            p50, p99 = latencies(service, model_id, records, args.calls)
+            bundle = service.get_bundle(model_id)
+            print(f"{bundle.backend:<7} p50 {p50:7.3f} ms  p99 {p99:7.3f} ms  "
+                  f"resident estimator+preprocessing {bundle.size_bytes / 1e6:7.2f} MB")
+        model_registry.clear()
+
+
+if __name__ == "__main__":
+    main()
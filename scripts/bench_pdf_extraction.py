@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark PDF text extraction: legacy sequential PyPDF2 vs pdf_text_service."""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+import PyPDF2  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.services.pdf_text_service import pdf_text_service  # noqa: E402
+
+LINES_PER_PAGE = 40
+
+
+def write_pdf(path: str, pages: int) -> None:
+    """Write a text-heavy PDF (LINES_PER_PAGE lines per page) without extra deps."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % (4 + i * 2) for i in range(pages)), pages),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page in range(pages):
+        lines = [
+            b"(Page %d line %d: claim %06d filed under policy P-%05d with status open) Tj 0 -16 Td"
+            % (page + 1, line, page * LINES_PER_PAGE + line, line)
+            for line in range(LINES_PER_PAGE)
+        ]
+        stream = b"BT /F1 10 Tf 40 760 Td " + b" ".join(lines) + b" ET"
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + page * 2)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+        xref_at = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at))
+
+
+def legacy_extract(path: str) -> int:
+    chars = 0
+    with open(path, "rb") as f:
+        for page in PyPDF2.PdfReader(f).pages:
+            chars += len(page.extract_text() or "")
+    return chars
+
+
+def timed(label: str, fn) -> float:
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f}s  ({result:,} chars)")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction")
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=0, help="0 = service default")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.PDF_TEXT_CACHE_DIR = os.path.join(tmp, "cache")
+        if args.workers:
+            settings.PDF_EXTRACT_WORKERS = args.workers
+        pdf_path = os.path.join(tmp, "bench.pdf")
+        write_pdf(pdf_path, args.pages)
+        print(f"{args.pages} pages, {os.path.getsize(pdf_path) / 1e6:.1f} MB, "
+              f"{pdf_text_service._worker_count()} worker(s)")
+
+        legacy = timed("sequential PyPDF2", lambda: legacy_extract(pdf_path))
+        cold = timed("service (cold, parallel)", lambda: len(pdf_text_service.extract_text(pdf_path)))
+        warm = timed("service (warm cache)", lambda: len(pdf_text_service.extract_text(pdf_path)))
+        print(f"speedup cold {legacy / cold:.1f}x, warm {legacy / warm:.1f}x")
+        pdf_text_service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark progress publishing: write-through JSON file per update vs the in-memory progress bus."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from app.core.config import settings  # noqa: E402
+
+
+def run_jobs(jobs: int, ticks: int, publish) -> float:
+    def job(j: int) -> None:
+        for t in range(ticks):
+            publish(f"progress_job_{j}", {"status": "processing", "progress": t * 100 / ticks, "message": f"tick {t}"})
+        publish(f"progress_job_{j}", {"status": "completed", "progress": 100, "message": "done"})
+
+    threads = [threading.Thread(target=job, args=(j,)) for j in range(jobs)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark progress store write-through vs in-memory bus")
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--ticks", type=int, default=400)
+    parser.add_argument("--job-seconds", type=float, default=120.0, help="job duration used for request estimates")
+    args = parser.parse_args()
+    updates = args.jobs * (args.ticks + 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.UPLOAD_DIR = tmp
+        from app.services.platform.progress_store import ProgressStore, _path
+
+        lock = threading.Lock()
+        writes = 0
+
+        def write_through(progress_id, value):
+            nonlocal writes
+            with lock:
+                Path(_path(progress_id)).write_text(json.dumps(value), encoding="utf-8")
+                writes += 1
+
+        elapsed = run_jobs(args.jobs, args.ticks, write_through)
+        print(f"{'write-through (before)':<24} {updates} updates  {elapsed * 1000:8.1f} ms  disk writes {writes}")
+
+        settings.PROGRESS_SNAPSHOT_SECONDS = 5
+        store = ProgressStore()
+        elapsed = run_jobs(args.jobs, args.ticks, store.set)
+        store.flush()
+        stats = store.stats()
+        print(f"{'progress bus (after)':<24} {updates} updates  {elapsed * 1000:8.1f} ms  "
+              f"disk writes {stats['disk_writes']}")
+
+    polls = int(args.jobs * args.job_seconds / 2)
+    print(f"HTTP requests for {args.jobs} jobs of {args.job_seconds:.0f}s: 2s polling {polls}, SSE {args.jobs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark semantic-search context expansion.
+
+Compares the old approach (over-fetch ``limit * 2`` hits and stitch context
+from whichever other hits happen to share a source) with the adjacency-based
+one (search ``limit`` hits, then one ``get(ids=...)`` for their recorded
+neighbours). Reports latency and how many of the old approach's context chunks
+really are adjacent to the hit in its document.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+TMP = tempfile.mkdtemp()
+
+import chromadb  # noqa: E402
+from chromadb.config import Settings  # noqa: E402
+
+from app.services.vector_service import vector_service  # noqa: E402
+
+WORDS = "ledger invoice payment account customer order refund tax shipment audit policy claim".split()
+
+
+def old_context(results, window):
+    by_source = {}
+    for result in results:
+        by_source.setdefault(result["source"], []).append(result)
+    out = {}
+    for group in by_source.values():
+        group.sort(key=lambda r: r.get("page_number") or 0)
+        for i, result in enumerate(group):
+            out[result["id"]] = [g["id"] for j, g in enumerate(group[max(0, i - window):i + window + 1]) if g is not result]
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark semantic search context expansion")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--chunks", type=int, default=50, help="chunks per file")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--window", type=int, default=2)
+    args = parser.parse_args()
+
+    client = chromadb.PersistentClient(path=os.path.join(TMP, "chroma"), settings=Settings(anonymized_telemetry=False))
+    vector_service.documents_collection = client.get_or_create_collection("documents", metadata={"hnsw:space": "cosine"})
+    rng = random.Random(7)
+    for f in range(args.files):
+        docs = [{
+            "content": " ".join(rng.choice(WORDS) for _ in range(60)),
+            "page_number": c + 1,
+            "file_name": f"file_{f}.pdf",
+            "source_name": f"file_{f}.pdf",
+            "created_at": "2026-01-01T00:00:00",
+            "metadata": {"chunk_index": c},
+        } for c in range(args.chunks)]
+        vector_service.add_documents(docs, f"fabric_{f % 10}")
+
+    queries = [" ".join(rng.choice(WORDS) for _ in range(4)) for _ in range(args.queries)]
+    old_t, new_t, old_true, old_total, new_total = [], [], 0, 0, 0
+    for q in queries:
+        start = time.perf_counter()
+        hits = vector_service.search_documents(q, limit=args.limit * 2, threshold=0.0)
+        ctx = old_context(hits, args.window)
+        old_t.append(time.perf_counter() - start)
+        for hit in hits[:args.limit]:
+            group, ordinal = hit["metadata"]["chunk_group"], hit["metadata"]["chunk_ordinal"]
+            adjacent = {f"{group}_{o}" for o in range(ordinal - args.window, ordinal + args.window + 1) if o != ordinal}
+            old_total += len(ctx.get(hit["id"], []))
+            old_true += len(adjacent & set(ctx.get(hit["id"], [])))
+
+        start = time.perf_counter()
+        hits = vector_service.search_documents(q, limit=args.limit, threshold=0.0)
+        windows = vector_service.expand_context(hits, args.window)
+        new_t.append(time.perf_counter() - start)
+        for w in windows.values():
+            new_total += len(w["before"]) + len(w["after"])
+
+    print(f"{args.files} files x {args.chunks} chunks, {args.queries} queries, limit {args.limit}, window {args.window}")
+    print(f"  over-fetch + regroup : median {statistics.median(old_t) * 1000:6.1f} ms, "
+          f"{old_total:,} context chunks, {old_true:,} actually adjacent")
+    print(f"  adjacency by id      : median {statistics.median(new_t) * 1000:6.1f} ms, "
+          f"{new_total:,} context chunks, all read by recorded neighbour id")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark training-upload ingestion: whole-file pandas parse vs chunked, downcast Parquet staging.
+
+Each step runs in a fresh subprocess so peak RSS (ru_maxrss) is attributable to it.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+
+def write_csv(path: str, rows: int, chunk: int = 200_000) -> None:
+    rng = np.random.default_rng(5)
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        pd.DataFrame({
+            "member_id": np.arange(start, start + n),
+            "region": rng.choice(["north", "south", "east", "west"], size=n),
+            "plan": rng.choice([f"plan_{i}" for i in range(40)], size=n),
+            "amount": rng.normal(100, 25, size=n).round(2),
+            "visits": rng.integers(0, 30, size=n),
+            "age": rng.integers(18, 90, size=n),
+            "target": rng.choice(["flag", "ok"], size=n),
+        }).to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+
+def run_step(step: str, csv_path: str, workdir: str) -> None:
+    start = time.perf_counter()
+    if step == "pandas":
+        frame = pd.read_csv(csv_path)
+        records = frame.to_dict("records")  # what the old endpoint also built
+        detail = f"frame {frame.memory_usage(deep=True).sum() / 1e6:.0f} MB, {len(records):,} records"
+    else:
+        from app.core.config import settings
+
+        settings.DATA_DIR = workdir
+        from app.services.model_service import ModelService
+
+        service = ModelService()
+        with open(csv_path, "rb") as f:
+            staged = service.stage_training_upload(f, "bench.csv", "csv")
+        if step == "load":
+            frame = service.load_training_dataset([staged["path"]])
+            detail = f"frame {frame.memory_usage(deep=True).sum() / 1e6:.0f} MB"
+        else:
+            detail = f"{os.path.getsize(staged['path']) / 1e6:.0f} MB parquet, cached={staged['cached']}"
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{step:<8} {elapsed:7.1f} s  peak RSS {peak_mb:7.0f} MB  {detail}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark chunked training ingestion")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--step", choices=["pandas", "ingest", "load"], help=argparse.SUPPRESS)
+    parser.add_argument("--csv", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.step:
+        run_step(args.step, args.csv, args.workdir)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "train.csv")
+        write_csv(csv_path, args.rows)
+        print(f"{args.rows:,} rows, CSV {os.path.getsize(csv_path) / 1e6:.0f} MB")
+        # "ingest" twice: the second run hits the upload-hash cache.
+        for step in ("pandas", "ingest", "ingest", "load"):
+            subprocess.run(
+                [sys.executable, __file__, "--step", step, "--csv", csv_path, "--workdir", tmp],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()